@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""Benchmark the available Myers differ backends.
+
+This compares the time taken by each backend in
+:py:class:`reviewboard.diffviewer.differ.DifferBackend` to diff pairs of
+files, and verifies that every backend produces identical opcodes.
+
+By default, this runs against the old/new file pairs in
+:file:`reviewboard/diffviewer/testdata`, along with some generated files
+covering sparse changes and large replaced blocks. Additional pairs can be
+passed on the command line:
+
+    ./contrib/profiling/benchmark_differ.py [old_file new_file ...]
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+
+SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
+SOURCE_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..', '..'))
+TESTDATA_DIR = os.path.join(SOURCE_ROOT, 'reviewboard', 'diffviewer',
+                            'testdata')
+
+sys.path.insert(0, SOURCE_ROOT)
+
+from reviewboard.diffviewer.differ import (DiffCompatVersion,  # noqa: E402
+                                          DifferBackend,
+                                          get_differ)
+
+
+def read_lines(path):
+    """Return the lines in a file.
+
+    Args:
+        path (str):
+            The path to the file.
+
+    Returns:
+        list of str:
+        The lines in the file.
+    """
+    with open(path, 'rb') as fp:
+        return fp.read().decode('utf-8', 'replace').splitlines()
+
+
+def get_testdata_cases():
+    """Yield the old/new file pairs in the diffviewer testdata.
+
+    Yields:
+        tuple:
+        A 3-tuple of the case name, old lines, and new lines.
+    """
+    pattern = os.path.join(TESTDATA_DIR, '**', '*-old.*')
+
+    for old_path in sorted(glob.glob(pattern, recursive=True)):
+        new_path = old_path.replace('-old.', '-new.')
+
+        if os.path.exists(new_path):
+            yield (os.path.relpath(old_path, TESTDATA_DIR),
+                   read_lines(old_path),
+                   read_lines(new_path))
+
+
+def get_generated_cases():
+    """Yield generated old/new files.
+
+    Yields:
+        tuple:
+        A 3-tuple of the case name, old lines, and new lines.
+    """
+    rand = random.Random(0)
+
+    old = ['line %d' % i for i in range(20000)]
+    new = list(old)
+
+    for i in range(50):
+        pos = rand.randint(0, len(new))
+        new[pos:pos + 3] = ['changed %d-%d' % (i, j) for j in range(5)]
+
+    yield 'generated: 20000 lines, sparse changes', old, new
+
+    old = ['value = %d' % (i % 50) for i in range(3000)]
+    new = ['value = %d' % ((i * 7) % 50) for i in range(3000)]
+
+    yield 'generated: 3000 line replaced block', old, new
+
+    old = ['%d' % rand.randint(0, 3) for i in range(1000)]
+    new = ['%d' % rand.randint(0, 3) for i in range(1000)]
+
+    yield 'generated: 1000 random lines', old, new
+
+
+def time_backend(backend, old, new, repeat):
+    """Return the best time and opcodes for diffing with a backend.
+
+    Args:
+        backend (str):
+            The differ backend.
+
+        old (list of str):
+            The old lines.
+
+        new (list of str):
+            The new lines.
+
+        repeat (int):
+            The number of times to run the diff.
+
+    Returns:
+        tuple:
+        A 2-tuple of the best time in seconds and the resulting opcodes.
+    """
+    best = None
+    opcodes = None
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        differ = get_differ(old, new,
+                            ignore_space=True,
+                            compat_version=DiffCompatVersion.DEFAULT,
+                            backend=backend)
+        opcodes = list(differ.get_opcodes())
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best, opcodes
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Myers differ backends.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='The number of runs per backend.')
+    parser.add_argument('files', nargs='*',
+                        help='Pairs of old and new files to diff.')
+    options = parser.parse_args()
+
+    if len(options.files) % 2 != 0:
+        parser.error('Files must be provided as old/new pairs.')
+
+    cases = list(get_testdata_cases()) + list(get_generated_cases())
+
+    for i in range(0, len(options.files), 2):
+        old_path, new_path = options.files[i:i + 2]
+        cases.append(('%s -> %s' % (old_path, new_path),
+                      read_lines(old_path),
+                      read_lines(new_path)))
+
+    backends = DifferBackend.BACKENDS
+    totals = dict.fromkeys(backends, 0.0)
+    mismatches = 0
+
+    for name, old, new in cases:
+        print('%s (%d/%d lines)' % (name, len(old), len(new)))
+        results = {}
+
+        for backend in backends:
+            elapsed, opcodes = time_backend(backend, old, new,
+                                            options.repeat)
+            results[backend] = opcodes
+            totals[backend] += elapsed
+
+            print('    %-12s %8.4fs' % (backend, elapsed))
+
+        expected = results[DifferBackend.DEFAULT]
+
+        for backend in backends:
+            if results[backend] != expected:
+                print('    ERROR: %s produced different opcodes' % backend)
+                mismatches += 1
+
+    print()
+    print('Total:')
+
+    for backend in backends:
+        print('    %-12s %8.4fs (%.2fx)'
+              % (backend, totals[backend],
+                 totals[DifferBackend.DEFAULT] / totals[backend]))
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
 import logging
 
 from django.core.exceptions import MultipleObjectsReturned
-from django.db.models import Manager
+from django.db import connections, router, transaction
+from django.db.models import (Case, Exists, F, Func, IntegerField, Manager,
+                              OuterRef, Q, Subquery, Value, When)
+from django.db.models.functions import Coalesce
 from djblets.db.managers import ConcurrencyManager
 
 from reviewboard.accounts.trophies import trophies_registry
@@ -10,6 +13,79 @@ from reviewboard.accounts.trophies import trophies_registry
 logger = logging.getLogger(__name__)
 
 
+def _count(queryset):
+    """Return an expression counting the results of a subquery.
+
+    Version Added:
+        7.0
+
+    Args:
+        queryset (django.db.models.query.QuerySet):
+            The queryset to count. This may reference the outer query.
+
+    Returns:
+        django.db.models.Expression:
+        The expression for the count.
+    """
+    return Coalesce(
+        Subquery(
+            queryset
+            .order_by()
+            .annotate(count=Func(F('pk'), function='COUNT'))
+            .values('count'),
+            output_field=IntegerField()),
+        0)
+
+
+def update_locked(queryset, values):
+    """Update rows after locking them in primary key order.
+
+    On databases that support ``SELECT ... FOR UPDATE``, the rows matching
+    the queryset are locked in primary key order and then updated, in a
+    single transaction. Concurrent calls for overlapping sets of rows will
+    wait on each other rather than deadlock. Elsewhere, the rows are
+    updated with a single UPDATE, which is atomic on its own.
+
+    The locks are only held until this returns, unless the caller has
+    started a transaction. Callers updating other rows in the same
+    transaction are responsible for the order of those updates.
+
+    Version Added:
+        7.0
+
+    Args:
+        queryset (django.db.models.query.QuerySet):
+            The queryset for the rows to update.
+
+        values (dict):
+            A mapping of field names to new values.
+    """
+    model = queryset.model
+    db = router.db_for_write(model)
+    queryset = queryset.using(db)
+
+    if not connections[db].features.has_select_for_update:
+        # There are no row locks to take. The UPDATE is atomic on its own.
+        queryset.update(**values)
+        return
+
+    with transaction.atomic(using=db):
+        pks = list(
+            queryset
+            .select_for_update()
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+
+        if pks:
+            (
+                model._default_manager
+                .using(db)
+                .filter(pk__in=pks)
+                .update(**values)
+            )
+
+
 class LocalSiteProfileManager(ConcurrencyManager):
     """Manager for Local Site profiles."""
 
@@ -64,6 +140,139 @@ class LocalSiteProfileManager(ConcurrencyManager):
 
         return site_profile, is_new
 
+    def update_incoming_request_counts(self, review_request, user_ids,
+                                       group_ids, delta):
+        """Update the incoming review request counters for reviewers.
+
+        This updates the direct and total incoming counters for the users
+        and review group members assigned as reviewers, and the starred
+        counters for users who starred the review request, in a single
+        UPDATE, regardless of the number of profiles affected.
+
+        The affected profiles are locked in primary key order before they're
+        updated (see :py:func:`update_locked`), so that concurrent calls for
+        overlapping sets of profiles can't deadlock each other.
+
+        Version Added:
+            7.0
+
+        Args:
+            review_request (reviewboard.reviews.models.ReviewRequest):
+                The review request being published, closed, or reopened.
+
+            user_ids (list of int):
+                The IDs of the users assigned directly as reviewers.
+
+            group_ids (list of int):
+                The IDs of the review groups assigned as reviewers.
+
+            delta (int):
+                The value to add to each counter.
+        """
+        from reviewboard.accounts.models import Profile
+        from reviewboard.reviews.models import Group
+
+        direct_q = Q()
+        incoming_q = Q()
+
+        if user_ids:
+            direct_q = Q(user__in=user_ids)
+            incoming_q |= direct_q
+
+        if group_ids:
+            incoming_q |= Q(user__in=(
+                Group.users.through.objects
+                .filter(group__in=group_ids)
+                .values('user_id')
+            ))
+
+        starred_q = Q(profile__in=(
+            Profile.starred_review_requests.through.objects
+            .filter(reviewrequest=review_request.pk)
+            .values('profile_id')
+        ))
+
+        def _get_delta(q):
+            return Case(When(q, then=Value(delta)),
+                        default=Value(0))
+
+        counts = {
+            'starred_public_request_count':
+                F('starred_public_request_count') + _get_delta(starred_q),
+        }
+
+        if incoming_q:
+            counts['total_incoming_request_count'] = \
+                F('total_incoming_request_count') + _get_delta(incoming_q)
+
+        if direct_q:
+            counts['direct_incoming_request_count'] = \
+                F('direct_incoming_request_count') + _get_delta(direct_q)
+
+        update_locked(
+            self.filter(Q(local_site=review_request.local_site_id) &
+                        (incoming_q | starred_q)),
+            counts)
+
+    def recalculate_review_request_counts(self):
+        """Recalculate the review request counters for all profiles.
+
+        The incoming and outgoing counters are computed by the database
+        with a single UPDATE for each kind of Local Site, rather than
+        with several queries for each profile. The starred counters depend
+        on access checks for each review request, and are reset to be
+        recalculated the next time each profile is loaded.
+
+        Version Added:
+            7.0
+        """
+        from reviewboard.accounts.models import Profile
+        from reviewboard.reviews.models import ReviewRequest
+
+        pending = ReviewRequest.PENDING_REVIEW
+        user_id = OuterRef(OuterRef('user'))
+        direct_q = (
+            Q(Exists(
+                ReviewRequest.target_people.through.objects
+                .filter(reviewrequest=OuterRef('pk'),
+                        user=user_id)
+            )) |
+            Q(Exists(
+                Profile.starred_review_requests.through.objects
+                .filter(reviewrequest=OuterRef('pk'),
+                        profile=OuterRef(OuterRef('profile')))
+            ))
+        )
+        incoming_q = direct_q | Q(Exists(
+            ReviewRequest.target_groups.through.objects
+            .filter(reviewrequest=OuterRef('pk'),
+                    group__users=user_id)
+        ))
+
+        with transaction.atomic():
+            for local_site_q, review_requests in (
+                (Q(local_site__isnull=True),
+                 ReviewRequest.objects.filter(local_site__isnull=True)),
+                (Q(local_site__isnull=False),
+                 ReviewRequest.objects.filter(
+                     local_site=OuterRef('local_site'))),
+            ):
+                review_requests = review_requests.filter(
+                    submitter__is_active=True)
+                incoming = review_requests.filter(public=True,
+                                                  status=pending)
+                outgoing = review_requests.filter(submitter=OuterRef('user'))
+
+                self.filter(local_site_q).update(
+                    direct_incoming_request_count=_count(
+                        incoming.filter(direct_q)),
+                    total_incoming_request_count=_count(
+                        incoming.filter(incoming_q)),
+                    pending_outgoing_request_count=_count(
+                        outgoing.filter(status=pending)),
+                    total_outgoing_request_count=_count(outgoing),
+                    starred_public_request_count=None)
+
     def _fix_duplicate_profiles(self, user, profile, local_site):
         """Fix the case where we end up with duplicate Local Site profiles.
 
@@ -14,6 +14,7 @@ from djblets.siteconfig.forms import SiteSettingsForm
 from reviewboard.admin.form_widgets import LexersMappingWidget
 from reviewboard.codesafety.checkers.trojan_source import \
     TrojanSourceCodeSafetyChecker
+from reviewboard.diffviewer.differ import DifferBackend
 
 
 class DiffSettingsForm(SiteSettingsForm):
@@ -107,6 +108,54 @@ class DiffSettingsForm(SiteSettingsForm):
             'is recommended</strong>.'),
         widget=forms.TextInput(attrs={'size': '15'}))
 
+    diffviewer_differ_backend = forms.ChoiceField(
+        label=_('Diff implementation'),
+        help_text=_(
+            'The implementation used to compute differences between files. '
+            'Both produce identical diffs. The accelerated implementation is '
+            'faster for large files.'
+        ),
+        choices=(
+            (DifferBackend.PYTHON, _('Standard')),
+            (DifferBackend.ACCELERATED, _('Accelerated')),
+        ),
+        required=False)
+
+    diffviewer_chunk_generation_workers = forms.IntegerField(
+        label=_('Concurrent file processing'),
+        help_text=_(
+            'The maximum number of files to process at once when generating '
+            'diffs for several files. This can speed up diffs with many '
+            'files when fetching them from the repository is slow. Enter 0 '
+            'to process one file at a time.'
+        ),
+        initial=0,
+        min_value=0,
+        required=False,
+        widget=forms.TextInput(attrs={'size': '5'}))
+
+    diffviewer_move_detection_work_budget = forms.IntegerField(
+        label=_('Move detection limit'),
+        help_text=_(
+            'The maximum amount of work to spend looking for moved lines in '
+            'a file. Files exceeding this are shown without moved lines. '
+            'Raise this to detect moves in very large files, at the cost of '
+            'slower diffs. Enter 0 for no limit.'
+        ),
+        initial=1_000_000,
+        min_value=0,
+        required=False,
+        widget=forms.TextInput(attrs={'size': '10'}))
+
+    diffviewer_warm_up_chunks = forms.BooleanField(
+        label=_('Prepare diffs after upload'),
+        help_text=_(
+            'Generate and cache diffs in the background as soon as they are '
+            'uploaded or published, so that reviewers don\'t have to wait '
+            'for them the first time they are viewed.'
+        ),
+        required=False)
+
     trojan_source_check_confusables = forms.BooleanField(
         label=_(
             'Check for potentially misleading Unicode characters '
@@ -229,6 +278,10 @@ class DiffSettingsForm(SiteSettingsForm):
                     'diffviewer_max_diff_size',
                     'diffviewer_max_binary_size',
                     'diffviewer_syntax_highlighting_threshold',
+                    'diffviewer_differ_backend',
+                    'diffviewer_chunk_generation_workers',
+                    'diffviewer_move_detection_work_budget',
+                    'diffviewer_warm_up_chunks',
                 ),
             },
             {
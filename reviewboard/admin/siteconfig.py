@@ -154,6 +154,10 @@ defaults.update({
     'diffviewer_syntax_highlighting': True,
     'diffviewer_syntax_highlighting_threshold': 20_000,
     'diffviewer_custom_pygments_lexers': {'.less': 'LessCss'},
+    'diffviewer_differ_backend': 'python',
+    'diffviewer_chunk_generation_workers': 0,
+    'diffviewer_move_detection_work_budget': 1_000_000,
+    'diffviewer_warm_up_chunks': False,
     'diffviewer_show_trailing_whitespace': True,
     'mail_send_review_mail': False,
     'mail_send_new_user_mail': False,
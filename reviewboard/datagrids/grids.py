@@ -46,7 +46,10 @@ from reviewboard.datagrids.builtin_items import (IncomingSection,
                                                  OverviewSection,
                                                  UserGroupsItem,
                                                  UserProfileItem)
-from reviewboard.reviews.models import Group, ReviewRequest, Review
+from reviewboard.reviews.models import (Group,
+                                        ReviewRequest,
+                                        ReviewRequestInboxEntry,
+                                        Review)
 from reviewboard.site.models import LocalSite
 from reviewboard.site.urlresolvers import local_site_reverse
 
@@ -469,6 +472,25 @@ class DashboardDataGrid(DataGridSidebarMixin, ReviewRequestDataGrid):
         queryset: QuerySet[ReviewRequest]
         title: StrOrPromise
 
+        if profile and 'show_archived' in profile.extra_data:
+            show_archived = profile.extra_data['show_archived']
+        else:
+            show_archived = self.show_archived
+
+        try:
+            show = request.GET.get('show-archived', show_archived)
+            show_archived = (int(show) != 0)
+        except ValueError:
+            pass
+
+        # When the dashboard inbox is enabled, the incoming views can filter
+        # out archived review requests using the inbox.
+        inbox_filters_archived = (
+            ReviewRequestInboxEntry.objects.is_enabled() and
+            (view in ('overview', 'to-me', 'incoming') or
+             (view in ('to-group', 'to-watched-group') and not group_name)))
+        include_archived = show_archived or not inbox_filters_archived
+
         if view == 'outgoing':
             queryset = ReviewRequest.objects.from_user(
                 user,  # The target user
@@ -481,7 +503,8 @@ class DashboardDataGrid(DataGridSidebarMixin, ReviewRequestDataGrid):
                 user,  # The target user
                 user,  # The accessing user
                 distinct=False,
-                local_site=self.local_site)
+                local_site=self.local_site,
+                include_archived=include_archived)
             title = _('Open Incoming and Outgoing Review Requests')
         elif view == 'mine':
             queryset = ReviewRequest.objects.from_user(
@@ -496,7 +519,8 @@ class DashboardDataGrid(DataGridSidebarMixin, ReviewRequestDataGrid):
                 user,  # The target user
                 user,  # The accessing user
                 distinct=False,
-                local_site=self.local_site)
+                local_site=self.local_site,
+                include_archived=include_archived)
             title = _('Incoming Review Requests to Me')
         elif view in ('to-group', 'to-watched-group'):
             if group_name:
@@ -527,7 +551,8 @@ class DashboardDataGrid(DataGridSidebarMixin, ReviewRequestDataGrid):
                     username=user,  # The target user
                     user=user,      # The accessing user
                     distinct=False,
-                    local_site=self.local_site)
+                    local_site=self.local_site,
+                    include_archived=include_archived)
                 title = _('All Incoming Review Requests to My Groups')
         elif view == 'starred':
             queryset = self.profile.starred_review_requests.public(
@@ -541,23 +566,13 @@ class DashboardDataGrid(DataGridSidebarMixin, ReviewRequestDataGrid):
                 user,  # The target user
                 user,  # The accessing user
                 distinct=False,
-                local_site=self.local_site)
+                local_site=self.local_site,
+                include_archived=include_archived)
             title = _('All Incoming Review Requests')
         else:
             raise Http404
 
-        if profile and 'show_archived' in profile.extra_data:
-            show_archived = profile.extra_data['show_archived']
-        else:
-            show_archived = self.show_archived
-
-        try:
-            show = request.GET.get('show-archived', show_archived)
-            show_archived = (int(show) != 0)
-        except ValueError:
-            pass
-
-        if not show_archived:
+        if not show_archived and not inbox_filters_archived:
             # This may produce a large number of archived review requests.
             # Rather than work with a large number of IDs, we'll use a
             # subquery here.
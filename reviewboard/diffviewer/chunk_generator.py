@@ -1,27 +1,30 @@
 import fnmatch
 import hashlib
 import logging
+import os
 import re
+from functools import lru_cache
 from itertools import zip_longest
 from typing import List
 
-import pygments.util
+import pygments
+from django.core.cache import cache
 from django.utils.encoding import force_str
 from django.utils.html import escape
 from django.utils.translation import get_language, gettext as _
 from djblets.log import log_timed
-from djblets.cache.backend import cache_memoize
+from djblets.cache.backend import cache_memoize, make_cache_key
 from djblets.siteconfig.models import SiteConfiguration
 from housekeeping.functions import deprecate_non_keyword_only_args
 from pygments import highlight
 from pygments.formatters import HtmlFormatter
-from pygments.lexers import (find_lexer_class,
-                             guess_lexer_for_filename)
+from pygments.lexers import find_lexer_class, get_all_lexers
 
 from reviewboard.codesafety import code_safety_checker_registry
 from reviewboard.deprecation import RemovedInReviewBoard70Warning
 from reviewboard.diffviewer.differ import DiffCompatVersion, get_differ
-from reviewboard.diffviewer.diffutils import (get_filediff_encodings,
+from reviewboard.diffviewer.diffutils import (get_chunks_in_range,
+                                              get_filediff_encodings,
                                               get_line_changed_regions,
                                               get_original_file,
                                               get_original_and_patched_files,
@@ -36,6 +39,123 @@ from reviewboard.diffviewer.settings import DiffSettings
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _get_all_lexer_classes():
+    """Return all available Pygments lexer classes.
+
+    Version Added:
+        7.0
+
+    Returns:
+        tuple of type:
+        All lexer classes, including those provided by plugins.
+    """
+    lexer_classes = []
+
+    for lexer_info in get_all_lexers():
+        lexer_class = find_lexer_class(lexer_info[0])
+
+        if lexer_class is not None:
+            lexer_classes.append(lexer_class)
+
+    return tuple(lexer_classes)
+
+
+@lru_cache(maxsize=256)
+def _find_lexer_class(lexer_name):
+    """Return the Pygments lexer class with the given name.
+
+    Version Added:
+        7.0
+
+    Args:
+        lexer_name (str):
+            The name of the lexer.
+
+    Returns:
+        type:
+        The lexer class, or ``None`` if not found.
+    """
+    return find_lexer_class(lexer_name)
+
+
+@lru_cache(maxsize=1024)
+def _get_lexer_classes_for_filename(filename):
+    """Return the Pygments lexer classes that match a filename.
+
+    This performs the same filename matching as
+    :py:func:`pygments.lexers.guess_lexer_for_filename`, but caches the
+    result, so the full list of lexers only needs to be scanned once for a
+    filename.
+
+    Version Added:
+        7.0
+
+    Args:
+        filename (str):
+            The base name of the file.
+
+    Returns:
+        dict:
+        A mapping of matching lexer classes to whether they matched a
+        primary filename pattern (rather than an alias pattern).
+    """
+    matches = {}
+
+    for lexer_class in _get_all_lexer_classes():
+        for pattern in lexer_class.filenames:
+            if fnmatch.fnmatch(filename, pattern):
+                matches[lexer_class] = True
+
+        for pattern in lexer_class.alias_filenames:
+            if fnmatch.fnmatch(filename, pattern):
+                matches[lexer_class] = False
+
+    return matches
+
+
+def _guess_lexer_class_for_filename(filename, data):
+    """Return the best Pygments lexer class for a file.
+
+    This chooses a lexer the same way as
+    :py:func:`pygments.lexers.guess_lexer_for_filename`, analyzing the file
+    contents only if several lexers match the filename.
+
+    Version Added:
+        7.0
+
+    Args:
+        filename (str):
+            The name of the file.
+
+        data (str):
+            The contents of the file.
+
+    Returns:
+        type:
+        The lexer class, or ``None`` if no lexer matches the filename.
+    """
+    matches = _get_lexer_classes_for_filename(os.path.basename(filename))
+
+    if not matches:
+        return None
+    elif len(matches) == 1:
+        return next(iter(matches))
+
+    results = []
+
+    for lexer_class, is_primary in matches.items():
+        rating = lexer_class.analyse_text(data)
+
+        if rating == 1.0:
+            return lexer_class
+
+        results.append((rating, is_primary, lexer_class.priority,
+                        lexer_class.__name__, lexer_class))
+
+    return max(results, key=lambda result: result[:4])[-1]
+
+
 class NoWrapperHtmlFormatter(HtmlFormatter):
     """An HTML Formatter for Pygments that doesn't wrap items in a div."""
     def __init__(self, *args, **kwargs):
@@ -108,6 +228,22 @@ class RawDiffChunkGenerator(object):
     # Default tab size used in browsers.
     TAB_SIZE = DiffOpcodeGenerator.TAB_SIZE
 
+    #: The minimum number of lines stored in each cached segment of chunks.
+    #:
+    #: Chunks are cached in segments, rather than as one list, so that they
+    #: can be streamed from cache and so that callers needing only a range
+    #: of lines only have to load the segments covering that range.
+    #:
+    #: Version Added:
+    #:     7.0
+    CACHE_SEGMENT_NUM_LINES = 2000
+
+    #: The version of the cached chunk index format.
+    #:
+    #: Version Added:
+    #:     7.0
+    CACHE_INDEX_VERSION = 1
+
     ######################
     # Instance variables #
     ######################
@@ -211,13 +347,14 @@ class RawDiffChunkGenerator(object):
         self.all_code_safety_results = {}
 
         # Chunk processing state.
-        self._last_header = [None, None]
-        self._last_header_index = [0, 0]
-        self._chunk_index = 0
+        self._reset_chunk_state()
 
     def get_opcode_generator(self):
         """Return the DiffOpcodeGenerator used to generate diff opcodes."""
-        return get_diff_opcode_generator(self.differ)
+        return get_diff_opcode_generator(
+            self.differ,
+            move_detection_work_budget=(
+                self.diff_settings.move_detection_work_budget))
 
     def get_chunks(self, cache_key=None):
         """Return the chunks for the given diff information.
@@ -225,17 +362,384 @@ class RawDiffChunkGenerator(object):
         If a cache key is provided and there are chunks already computed in the
         cache, they will be yielded. Otherwise, new chunks will be generated,
         stored in cache (given a cache key), and yielded.
+
+        Version Changed:
+            7.0:
+            Chunks are now stored in cache as a series of segments, which are
+            loaded and yielded one at a time, rather than as a single list.
+        """
+        if cache_key:
+            yield from self._iter_cached_chunks(cache_key)
+        else:
+            yield from self.get_chunks_uncached()
+
+    def get_chunks_index(self, cache_key):
+        """Return the index of chunks stored in cache.
+
+        If the chunks have not yet been generated, they will be generated and
+        cached first.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the chunks.
+
+        Returns:
+            dict:
+            The index of cached chunks. This contains:
+
+            Keys:
+                header_chunks (list of dict):
+                    Condensed versions of each chunk containing header
+                    information. These contain only the ``lines`` needed for
+                    finding headers, and the ``left_headers`` and
+                    ``right_headers`` keys in ``meta``.
+
+                last_line (int):
+                    The last virtual line number in the diff, or 0 if there
+                    are no chunks.
+
+                num_chunks (int):
+                    The total number of chunks.
+
+                segments (list of tuple):
+                    Information on each cached segment, as 4-tuples of
+                    the first chunk index, the number of chunks, the first
+                    virtual line number, and the last virtual line number.
+
+                version (int):
+                    The version of the index format.
+        """
+        return self._get_chunks_index(cache_key)
+
+    def get_chunks_in_range(self, first_line, num_lines, cache_key=None):
+        """Yield the chunks within a range of lines.
+
+        If a cache key is provided, only the cached segments containing the
+        requested lines will be loaded.
+
+        See :py:func:`~reviewboard.diffviewer.diffutils.get_chunks_in_range`
+        for details on the resulting chunks.
+
+        Version Added:
+            7.0
+
+        Args:
+            first_line (int):
+                The first virtual line number in the range.
+
+            num_lines (int):
+                The number of lines in the range.
+
+            cache_key (str, optional):
+                The cache key for the chunks.
+
+        Yields:
+            dict:
+            Each chunk in the range.
         """
         if cache_key:
-            chunks = cache_memoize(cache_key,
-                                   lambda: list(self.get_chunks_uncached()),
-                                   large_data=True)
+            yield from self._iter_cached_chunks_in_range(
+                cache_key=cache_key,
+                first_line=first_line,
+                num_lines=num_lines)
         else:
-            chunks = self.get_chunks_uncached()
+            yield from get_chunks_in_range(chunks=self.get_chunks_uncached(),
+                                           first_line=first_line,
+                                           num_lines=num_lines)
+
+    def _reset_chunk_state(self):
+        """Reset the state used when generating chunks.
+
+        Version Added:
+            7.0
+        """
+        self._last_header = [None, None]
+        self._last_header_index = [0, 0]
+        self._chunk_index = 0
+
+    def _get_chunks_index(self, cache_key):
+        """Return the index of chunks stored in cache.
+
+        If the chunks have not yet been generated, they will be generated and
+        cached first.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the chunks.
+
+        Returns:
+            dict:
+            The index of cached chunks.
+        """
+        index = self._load_chunks_index(cache_key)
+
+        if index is None:
+            # Generate and cache all the chunks. The index is returned once
+            # the generator finishes.
+            chunks = self._generate_and_cache_chunks(cache_key)
+
+            while index is None:
+                try:
+                    next(chunks)
+                except StopIteration as e:
+                    index = e.value
+
+        return index
+
+    def _iter_cached_chunks_in_range(self, cache_key, first_line,
+                                     num_lines):
+        """Yield cached chunks within a range of lines.
+
+        Only the cached segments containing the requested lines will be
+        loaded. If any are missing, the chunks will be regenerated.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the chunks.
+
+            first_line (int):
+                The first virtual line number in the range.
+
+            num_lines (int):
+                The number of lines in the range.
+
+        Yields:
+            dict:
+            Each chunk in the range.
+        """
+        index = self._get_chunks_index(cache_key)
+        last_line = first_line + num_lines - 1
+        segment_nums = [
+            i
+            for i, (seg_first_chunk, seg_num_chunks,
+                    seg_first_line, seg_last_line)
+            in enumerate(index['segments'])
+            if seg_first_line <= last_line and seg_last_line >= first_line
+        ]
+
+        if not segment_nums:
+            return
+
+        chunks = []
+
+        for i in segment_nums:
+            segment = self._load_chunks_segment(cache_key, i)
+
+            if segment is None:
+                chunks = None
+                break
+
+            chunks += segment
+
+        if chunks is None:
+            yield from get_chunks_in_range(
+                chunks=self._iter_cached_chunks(cache_key),
+                first_line=first_line,
+                num_lines=num_lines)
+        else:
+            # The chunk indexes generated for the range are relative to the
+            # first loaded segment.
+            index_offset = index['segments'][segment_nums[0]][0]
+
+            for chunk in get_chunks_in_range(chunks=chunks,
+                                             first_line=first_line,
+                                             num_lines=num_lines):
+                chunk['index'] += index_offset
+                yield chunk
+
+    def _make_chunks_segment_cache_key(self, cache_key, segment_num):
+        """Return the cache key for a segment of chunks.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the chunks.
+
+            segment_num (int):
+                The 0-based index of the segment.
+
+        Returns:
+            str:
+            The cache key for the segment.
+        """
+        return '%s-segment-%d' % (cache_key, segment_num)
+
+    def _load_chunks_index(self, cache_key):
+        """Load the index of cached chunks.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the chunks.
+
+        Returns:
+            dict:
+            The index, or ``None`` if not found in cache.
+        """
+        index = _load_from_cache('%s-index' % cache_key)
+
+        if (not isinstance(index, dict) or
+            index.get('version') != self.CACHE_INDEX_VERSION):
+            index = None
+
+        return index
+
+    def _load_chunks_segment(self, cache_key, segment_num):
+        """Load a cached segment of chunks.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the chunks.
+
+            segment_num (int):
+                The 0-based index of the segment.
+
+        Returns:
+            list of dict:
+            The chunks in the segment, or ``None`` if not found in cache.
+        """
+        return _load_from_cache(
+            self._make_chunks_segment_cache_key(cache_key, segment_num))
+
+    def _iter_cached_chunks(self, cache_key):
+        """Yield chunks from cache, one segment at a time.
+
+        If the chunks aren't in cache, they'll be generated and cached. If a
+        segment has fallen out of cache, the chunks will be regenerated and
+        re-cached, and the remaining chunks will be yielded from that.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the chunks.
+
+        Yields:
+            dict:
+            Each chunk.
+        """
+        index = self._load_chunks_index(cache_key)
+
+        if index is None:
+            yield from self._generate_and_cache_chunks(cache_key)
+            return
+
+        num_yielded = 0
+
+        for segment_num in range(len(index['segments'])):
+            segment = self._load_chunks_segment(cache_key, segment_num)
+
+            if segment is None:
+                break
+
+            yield from segment
+            num_yielded += len(segment)
+
+        if num_yielded < index['num_chunks']:
+            self._reset_chunk_state()
+
+            for i, chunk in enumerate(
+                self._generate_and_cache_chunks(cache_key)):
+                if i >= num_yielded:
+                    yield chunk
+
+    def _generate_and_cache_chunks(self, cache_key):
+        """Generate chunks, storing them in cache as they're generated.
+
+        Chunks are grouped into segments of at least
+        :py:attr:`CACHE_SEGMENT_NUM_LINES` lines. Each segment is stored
+        once complete, and the index is stored after the last segment.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the chunks.
+
+        Yields:
+            dict:
+            Each generated chunk.
+
+        Returns:
+            dict:
+            The index of the cached chunks, once all chunks have been
+            generated.
+        """
+        segments = []
+        segment_chunks = []
+        segment_num_lines = 0
+        num_chunks = 0
+
+        def _store_segment():
+            segment_num = len(segments)
+
+            cache_memoize(
+                self._make_chunks_segment_cache_key(cache_key, segment_num),
+                lambda: segment_chunks,
+                large_data=True,
+                force_overwrite=True)
+
+            segments.append((
+                num_chunks - len(segment_chunks),
+                len(segment_chunks),
+                segment_chunks[0]['lines'][0][0],
+                segment_chunks[-1]['lines'][-1][0],
+            ))
+
+        header_chunks = []
+
+        for chunk in self.get_chunks_uncached():
+            segment_chunks.append(chunk)
+            segment_num_lines += chunk['numlines']
+            num_chunks += 1
+            header_chunk = _build_header_chunk(chunk)
+
+            if header_chunk is not None:
+                header_chunks.append(header_chunk)
+
+            if segment_num_lines >= self.CACHE_SEGMENT_NUM_LINES:
+                _store_segment()
+                segment_chunks = []
+                segment_num_lines = 0
 
-        for chunk in chunks:
             yield chunk
 
+        if segment_chunks:
+            _store_segment()
+
+        index = {
+            'header_chunks': header_chunks,
+            'last_line': segments[-1][3] if segments else 0,
+            'num_chunks': num_chunks,
+            'segments': segments,
+            'version': self.CACHE_INDEX_VERSION,
+        }
+
+        cache_memoize('%s-index' % cache_key,
+                      lambda: index,
+                      large_data=True,
+                      force_overwrite=True)
+
+        return index
+
     def get_chunks_uncached(self):
         """Yield the list of chunks, bypassing the cache."""
         for chunk in self.generate_chunks(self.old, self.new):
@@ -326,8 +830,6 @@ class RawDiffChunkGenerator(object):
             markup_b = None
 
             if self._get_enable_syntax_highlighting(old, new, a, b):
-                # TODO: Try to figure out the right lexer for these files
-                #       once instead of twice.
                 markup_a = self._apply_pygments(
                     old or '',
                     self.normalize_path_for_display(self.orig_filename))
@@ -350,7 +852,8 @@ class RawDiffChunkGenerator(object):
                 break
 
         self.differ = get_differ(a, b, ignore_space=ignore_space,
-                                 compat_version=self.diff_compat)
+                                 compat_version=self.diff_compat,
+                                 backend=self.diff_settings.differ_backend)
         self.differ.add_interesting_lines_for_headers(self.orig_filename)
 
         context_num_lines = siteconfig.get("diffviewer_context_num_lines")
@@ -1034,6 +1537,15 @@ class RawDiffChunkGenerator(object):
         This will only apply syntax highlighting if a lexer is available and
         the file extension is not blacklisted.
 
+        The highlighted lines are cached based on the file's contents, the
+        lexer, and the version of Pygments, so that the same revision of a
+        file only needs to be highlighted once across diffs, interdiffs,
+        and commit ranges.
+
+        Version Changed:
+            7.0:
+            Added caching of the highlighted lines and of lexer lookups.
+
         Args:
             data (unicode):
                 The data to syntax highlight.
@@ -1050,31 +1562,96 @@ class RawDiffChunkGenerator(object):
         if filename.endswith(self.STYLED_EXT_BLACKLIST):
             return None
 
+        lexer_class = self._get_lexer_class(data, filename)
+
+        if lexer_class is None:
+            return None
+
+        return cache_memoize(
+            self._make_highlight_cache_key(data, lexer_class),
+            lambda: self._highlight(data, lexer_class),
+            large_data=True)
+
+    def _get_lexer_class(self, data, filename):
+        """Return the Pygments lexer class to use for a file.
+
+        Any custom lexers configured in the diff settings take precedence.
+        Otherwise, a lexer will be chosen based on the filename and, if
+        necessary, the contents.
+
+        Version Added:
+            7.0
+
+        Args:
+            data (str):
+                The contents of the file.
+
+            filename (str):
+                The name of the file.
+
+        Returns:
+            type:
+            The lexer class, or ``None`` if no suitable lexer was found.
+        """
         custom_pygments_lexers = self.diff_settings.custom_pygments_lexers
-        lexer = None
 
         for ext, lexer_name in custom_pygments_lexers.items():
             if ext and filename.endswith(ext):
-                lexer_class = find_lexer_class(lexer_name)
+                lexer_class = _find_lexer_class(lexer_name)
 
                 if lexer_class:
-                    lexer = lexer_class(stripnl=False,
-                                        encoding='utf-8')
-                    break
-                else:
-                    logger.error(
-                        'Pygments lexer "%s" for "%s" files in '
-                        'Diff Viewer Settings was not found.',
-                        lexer_name, ext)
-        else:
-            try:
-                lexer = guess_lexer_for_filename(filename,
-                                                 data,
-                                                 stripnl=False,
-                                                 encoding='utf-8')
-            except pygments.util.ClassNotFound:
-                return None
+                    return lexer_class
 
+                logger.error(
+                    'Pygments lexer "%s" for "%s" files in '
+                    'Diff Viewer Settings was not found.',
+                    lexer_name, ext)
+
+        return _guess_lexer_class_for_filename(filename, data)
+
+    def _make_highlight_cache_key(self, data, lexer_class):
+        """Return the cache key for a file's highlighted lines.
+
+        Version Added:
+            7.0
+
+        Args:
+            data (str):
+                The contents of the file.
+
+            lexer_class (type):
+                The lexer class used to highlight the file.
+
+        Returns:
+            str:
+            The cache key.
+        """
+        return 'diff-highlight-%s-%s.%s-%s' % (
+            pygments.__version__,
+            lexer_class.__module__,
+            lexer_class.__name__,
+            hashlib.sha256(
+                data.encode('utf-8', 'surrogatepass')).hexdigest())
+
+    def _highlight(self, data, lexer_class):
+        """Syntax-highlight a file's contents.
+
+        Version Added:
+            7.0
+
+        Args:
+            data (str):
+                The contents of the file.
+
+            lexer_class (type):
+                The lexer class used to highlight the file.
+
+        Returns:
+            list of str:
+            The list of highlighted lines.
+        """
+        lexer = lexer_class(stripnl=False,
+                            encoding='utf-8')
         lexer.add_filter('codetagify')
 
         return split_line_endings(
@@ -1221,11 +1798,24 @@ class DiffChunkGenerator(RawDiffChunkGenerator):
 
         if self.interfilediff:
             interdiff = self.interfilediff.diff
+
+            # Interdiffs are filtered using the ranges of the chunks in
+            # each diff, which are stored on the FileDiffs.
+            extra_kwargs = {
+                'diff_chunks_info': self.filediff.get_diff_chunks_info(),
+                'interdiff_chunks_info':
+                    self.interfilediff.get_diff_chunks_info(),
+            }
         else:
             interdiff = None
+            extra_kwargs = {}
 
-        return get_diff_opcode_generator(self.differ, diff, interdiff,
-                                         request=self.request)
+        return get_diff_opcode_generator(
+            self.differ, diff, interdiff,
+            request=self.request,
+            move_detection_work_budget=(
+                self.diff_settings.move_detection_work_budget),
+            **extra_kwargs)
 
     def get_chunks(self):
         """Return the chunks for the given diff information.
@@ -1238,14 +1828,7 @@ class DiffChunkGenerator(RawDiffChunkGenerator):
         yielded. Otherwise, new chunks will be generated, stored in cache,
         and yielded.
         """
-        counts = self.filediff.get_line_counts()
-
-        if (self.filediff.binary or
-            self.filediff.source_revision == '' or
-            ((self.filediff.is_new or self.filediff.deleted or
-              self.filediff.moved or self.filediff.copied) and
-             counts['raw_insert_count'] == 0 and
-             counts['raw_delete_count'] == 0)):
+        if self._has_no_chunks():
             return
 
         cache_key = self.make_cache_key()
@@ -1253,6 +1836,107 @@ class DiffChunkGenerator(RawDiffChunkGenerator):
         for chunk in super(DiffChunkGenerator, self).get_chunks(cache_key):
             yield chunk
 
+    def get_chunks_index(self):
+        """Return the index of chunks stored in cache.
+
+        See :py:meth:`RawDiffChunkGenerator.get_chunks_index` for details on
+        the index.
+
+        Version Added:
+            7.0
+
+        Returns:
+            dict:
+            The index of cached chunks.
+        """
+        if self._has_no_chunks():
+            return {
+                'header_chunks': [],
+                'last_line': 0,
+                'num_chunks': 0,
+                'segments': [],
+                'version': self.CACHE_INDEX_VERSION,
+            }
+
+        return super().get_chunks_index(self.make_cache_key())
+
+    def has_cached_chunks(self):
+        """Return whether the chunks for the file are already in cache.
+
+        Version Added:
+            7.0
+
+        Returns:
+            bool:
+            ``True`` if the chunks have already been generated and cached, or
+            if the file has no chunks to generate.
+        """
+        return (self._has_no_chunks() or
+                self._make_index_cache_key() in cache)
+
+    def get_chunks_in_range(self, first_line, num_lines):
+        """Yield the chunks within a range of lines.
+
+        Only the cached segments containing the requested lines will be
+        loaded.
+
+        Version Added:
+            7.0
+
+        Args:
+            first_line (int):
+                The first virtual line number in the range.
+
+            num_lines (int):
+                The number of lines in the range.
+
+        Yields:
+            dict:
+            Each chunk in the range.
+        """
+        if self._has_no_chunks():
+            return
+
+        yield from super().get_chunks_in_range(
+            first_line=first_line,
+            num_lines=num_lines,
+            cache_key=self.make_cache_key())
+
+    def _make_index_cache_key(self):
+        """Return the full cache key for the index of cached chunks.
+
+        Version Added:
+            7.0
+
+        Returns:
+            str:
+            The cache key.
+        """
+        return make_cache_key('%s-index' % self.make_cache_key())
+
+    def _has_no_chunks(self):
+        """Return whether the file is known to have no chunks.
+
+        This is the case if the file is binary or is an added or deleted
+        0-length file, or if the file has moved with no additional changes.
+
+        Version Added:
+            7.0
+
+        Returns:
+            bool:
+            ``True`` if there will be no chunks to generate.
+        """
+        counts = self.filediff.get_line_counts()
+
+        return bool(
+            self.filediff.binary or
+            self.filediff.source_revision == '' or
+            ((self.filediff.is_new or self.filediff.deleted or
+              self.filediff.moved or self.filediff.copied) and
+             counts['raw_insert_count'] == 0 and
+             counts['raw_delete_count'] == 0))
+
     def get_chunks_uncached(self):
         """Yield the list of chunks, bypassing the cache."""
         base_filediff = self.base_filediff
@@ -1517,6 +2201,91 @@ def compute_chunk_last_header(lines, numlines, meta, last_header=None):
     return last_header
 
 
+class _ChunksCacheMiss(Exception):
+    """Cached chunk data was not found in cache.
+
+    This is used internally by :py:func:`_load_from_cache` to detect a cache
+    miss without computing a new value.
+
+    Version Added:
+        7.0
+    """
+
+
+def _load_from_cache(cache_key):
+    """Load cached chunk data, without computing it on a cache miss.
+
+    Version Added:
+        7.0
+
+    Args:
+        cache_key (str):
+            The cache key to load.
+
+    Returns:
+        object:
+        The cached data, or ``None`` if not found in cache.
+    """
+    def _on_miss():
+        raise _ChunksCacheMiss()
+
+    try:
+        return cache_memoize(cache_key, _on_miss, large_data=True)
+    except _ChunksCacheMiss:
+        return None
+
+
+def _build_header_chunk(chunk):
+    """Return a condensed version of a chunk for looking up headers.
+
+    The condensed chunk contains only the lines needed by
+    :py:func:`reviewboard.diffviewer.diffutils.get_last_header_before_line`
+    (the first line, and the lines containing the last original and patched
+    line numbers), without any rendered content, along with the chunk's
+    headers.
+
+    Version Added:
+        7.0
+
+    Args:
+        chunk (dict):
+            The chunk to condense.
+
+    Returns:
+        dict:
+        The condensed chunk, or ``None`` if the chunk has no headers.
+    """
+    meta = chunk['meta']
+    left_headers = meta.get('left_headers')
+    right_headers = meta.get('right_headers')
+
+    if not left_headers and not right_headers:
+        return None
+
+    lines = chunk['lines']
+    line_indexes = {0}
+
+    for i in (1, 4):
+        for j in range(len(lines) - 1, -1, -1):
+            if lines[j][i]:
+                line_indexes.add(j)
+                break
+
+    return {
+        'lines': [
+            [line[0], line[1], '', [], line[4], '', [], False]
+            for line in (
+                lines[j]
+                for j in sorted(line_indexes)
+            )
+        ],
+        'meta': {
+            'left_headers': left_headers or [],
+            'right_headers': right_headers or [],
+        },
+    }
+
+
 _generator = DiffChunkGenerator
 
 
@@ -1535,3 +2304,39 @@ def set_diff_chunk_generator_class(renderer):
 def get_diff_chunk_generator(*args, **kwargs):
     """Returns a DiffChunkGenerator instance used for generating chunks."""
     return _generator(*args, **kwargs)
+
+
+def get_uncached_diff_chunk_generators(chunk_generators):
+    """Return the chunk generators whose chunks are not yet in cache.
+
+    This checks all the chunk generators with a single cache lookup, rather
+    than calling :py:meth:`DiffChunkGenerator.has_cached_chunks` on each.
+
+    Version Added:
+        7.0
+
+    Args:
+        chunk_generators (list of DiffChunkGenerator):
+            The chunk generators to check.
+
+    Returns:
+        list of DiffChunkGenerator:
+        The chunk generators that need to generate chunks, in the order
+        provided.
+    """
+    index_keys = {
+        chunk_generator: chunk_generator._make_index_cache_key()
+        for chunk_generator in chunk_generators
+        if not chunk_generator._has_no_chunks()
+    }
+
+    if not index_keys:
+        return []
+
+    cached_keys = cache.get_many(list(index_keys.values()))
+
+    return [
+        chunk_generator
+        for chunk_generator, index_key in index_keys.items()
+        if index_key not in cached_keys
+    ]
@@ -0,0 +1,464 @@
+"""Background warm-up of cached diff chunks for newly-uploaded diffs.
+
+Chunks for a diff are normally generated the first time someone views it,
+meaning the first reviewer has to wait for every file to be fetched from
+the repository, patched, diffed, and highlighted.
+
+When enabled (through the ``diffviewer_warm_up_chunks`` site configuration
+setting), newly-uploaded and newly-published diffs are placed in an
+in-process queue, and a background thread generates and caches their chunks
+using the default diff settings.
+
+The status of each diffset is stored in cache, so that it can be shown in
+the API and inspected by the :command:`warm-diff-chunks` management
+command from any process. The list of queued diffsets is stored in cache as
+well, so that the command can process anything still pending.
+
+Version Added:
+    7.0
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from typing import Deque, List, Optional, Sequence, Set, TYPE_CHECKING
+
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.utils import timezone
+from djblets.cache.backend import make_cache_key
+from djblets.siteconfig.models import SiteConfiguration
+from typing_extensions import TypedDict
+
+from reviewboard.diffviewer.diffutils import (get_diff_files,
+                                              populate_diff_chunks,
+                                              prefetch_original_files)
+from reviewboard.diffviewer.settings import DiffSettings
+
+if TYPE_CHECKING:
+    from reviewboard.diffviewer.models import DiffSet
+
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkWarmUpState:
+    """States for the warm-up of a diffset's chunks.
+
+    Version Added:
+        7.0
+    """
+
+    #: The diffset is waiting to be warmed up.
+    QUEUED = 'queued'
+
+    #: The diffset's chunks are being generated.
+    RUNNING = 'running'
+
+    #: The chunks for every file in the diffset have been generated.
+    DONE = 'done'
+
+    #: Chunks could not be generated for one or more files.
+    FAILED = 'failed'
+
+
+class ChunkWarmUpStatus(TypedDict):
+    """The warm-up status for a diffset.
+
+    Version Added:
+        7.0
+    """
+
+    #: The current state.
+    #:
+    #: This is one of the values in :py:class:`ChunkWarmUpState`.
+    state: str
+
+    #: The number of files in the diffset.
+    #:
+    #: This is ``None`` until the diffset's files have been loaded.
+    num_files: Optional[int]
+
+    #: The number of files that have had chunks generated.
+    num_files_warmed: int
+
+    #: The date and time of the last state change, in ISO 8601 format.
+    timestamp: str
+
+
+class ChunkWarmUpQueue:
+    """An in-process queue for warming up cached diff chunks.
+
+    Diffsets added to the queue are processed in order by a background
+    thread, which is started once the current database transaction (if any)
+    has been committed, and exits once the queue is empty.
+
+    Version Added:
+        7.0
+    """
+
+    #: The cache key for the list of queued diffset IDs.
+    PENDING_CACHE_KEY = 'diff-chunk-warmup-pending'
+
+    #: The cache key format for the status of a diffset.
+    STATUS_CACHE_KEY = 'diff-chunk-warmup-status-%s'
+
+    #: The maximum number of queued diffset IDs to store in cache.
+    MAX_PENDING = 1000
+
+    #: The expiration time for stored statuses and pending lists, in seconds.
+    CACHE_EXPIRATION = 7 * 24 * 60 * 60
+
+    def __init__(
+        self,
+        *,
+        run_in_background: bool = True,
+    ) -> None:
+        """Initialize the queue.
+
+        Args:
+            run_in_background (bool, optional):
+                Whether to process queued diffsets in a background thread.
+                If ``False``, diffsets will only be processed by calls to
+                :py:meth:`process_next` or :py:meth:`drain`.
+        """
+        self.run_in_background = run_in_background
+
+        self._lock = threading.Lock()
+        self._queue: Deque[int] = deque()
+        self._queued_ids: Set[int] = set()
+        self._worker: Optional[threading.Thread] = None
+
+    def enqueue(
+        self,
+        diffset: DiffSet,
+    ) -> bool:
+        """Add a diffset to the queue.
+
+        Diffsets that are already queued or have already been warmed up
+        will be skipped.
+
+        Args:
+            diffset (reviewboard.diffviewer.models.DiffSet):
+                The diffset to warm up.
+
+        Returns:
+            bool:
+            ``True`` if the diffset was added to the queue.
+        """
+        diffset_id = diffset.pk
+        status = self.get_status(diffset_id)
+
+        if status is not None and status['state'] == ChunkWarmUpState.DONE:
+            return False
+
+        with self._lock:
+            if diffset_id in self._queued_ids:
+                return False
+
+            self._queue.append(diffset_id)
+            self._queued_ids.add(diffset_id)
+
+        self._set_status(diffset_id,
+                         state=ChunkWarmUpState.QUEUED)
+        self._update_pending(add=[diffset_id])
+
+        if self.run_in_background:
+            transaction.on_commit(self._start_worker)
+
+        return True
+
+    def get_pending(self) -> List[int]:
+        """Return the IDs of all queued diffsets.
+
+        This includes diffsets queued in this process, and those queued by
+        any process and recorded in cache.
+
+        Returns:
+            list of int:
+            The queued diffset IDs, in queue order.
+        """
+        with self._lock:
+            pending = list(self._queue)
+
+        seen = set(pending)
+
+        for diffset_id in cache.get(make_cache_key(self.PENDING_CACHE_KEY),
+                                    []):
+            if diffset_id not in seen:
+                seen.add(diffset_id)
+                pending.append(diffset_id)
+
+        return pending
+
+    def get_status(
+        self,
+        diffset_id: int,
+    ) -> Optional[ChunkWarmUpStatus]:
+        """Return the warm-up status for a diffset.
+
+        Args:
+            diffset_id (int):
+                The ID of the diffset.
+
+        Returns:
+            ChunkWarmUpStatus:
+            The status, or ``None`` if the diffset has not been queued (or
+            the status has expired from cache).
+        """
+        return cache.get(make_cache_key(self.STATUS_CACHE_KEY % diffset_id))
+
+    def process_next(self) -> Optional[int]:
+        """Warm up the next diffset queued in this process.
+
+        Returns:
+            int:
+            The ID of the diffset that was processed, or ``None`` if the
+            queue was empty.
+        """
+        with self._lock:
+            if not self._queue:
+                return None
+
+            diffset_id = self._queue.popleft()
+
+        try:
+            self.warm_up(diffset_id)
+        finally:
+            with self._lock:
+                self._queued_ids.discard(diffset_id)
+
+        return diffset_id
+
+    def drain(self) -> List[int]:
+        """Warm up all queued diffsets.
+
+        This processes everything queued in this process, followed by any
+        diffsets queued by other processes that are still pending in cache.
+
+        Returns:
+            list of int:
+            The IDs of the diffsets that were processed.
+        """
+        processed: List[int] = []
+
+        while True:
+            diffset_id = self.process_next()
+
+            if diffset_id is None:
+                break
+
+            processed.append(diffset_id)
+
+        for diffset_id in self.get_pending():
+            if diffset_id not in processed:
+                self.warm_up(diffset_id)
+                processed.append(diffset_id)
+
+        return processed
+
+    def warm_up(
+        self,
+        diffset_id: int,
+    ) -> ChunkWarmUpStatus:
+        """Generate and cache the chunks for every file in a diffset.
+
+        Chunks are generated using the default diff settings for the site.
+        The source files are fetched from the repository in a batch first.
+        A failure in one file will be logged, and will not prevent other
+        files from being warmed up.
+
+        Args:
+            diffset_id (int):
+                The ID of the diffset to warm up.
+
+        Returns:
+            ChunkWarmUpStatus:
+            The resulting status for the diffset.
+        """
+        from reviewboard.diffviewer.models import DiffSet
+
+        try:
+            try:
+                diffset = DiffSet.objects.get(pk=diffset_id)
+            except DiffSet.DoesNotExist:
+                return self._set_status(diffset_id,
+                                        state=ChunkWarmUpState.FAILED)
+
+            files = get_diff_files(diffset=diffset)
+            num_files = len(files)
+            num_files_warmed = 0
+            state = ChunkWarmUpState.DONE
+
+            self._set_status(diffset_id,
+                             state=ChunkWarmUpState.RUNNING,
+                             num_files=num_files)
+
+            diff_settings = DiffSettings.create()
+
+            # Fetch all the source files from the repository in one batch,
+            # rather than once per file.
+            try:
+                prefetch_original_files(files,
+                                        diff_settings=diff_settings)
+            except Exception as e:
+                logger.exception('Unable to prefetch source files for '
+                                 'DiffSet %s: %s',
+                                 diffset_id, e)
+
+            for diff_file in files:
+                try:
+                    populate_diff_chunks(files=[diff_file],
+                                         diff_settings=diff_settings)
+                except Exception as e:
+                    logger.exception('Unable to warm up diff chunks for '
+                                     'FileDiff %s in DiffSet %s: %s',
+                                     diff_file['filediff'].pk, diffset_id, e)
+                    state = ChunkWarmUpState.FAILED
+                else:
+                    num_files_warmed += 1
+
+                # Don't hold onto the chunks any longer than needed.
+                diff_file.pop('chunks', None)
+
+                self._set_status(diffset_id,
+                                 state=ChunkWarmUpState.RUNNING,
+                                 num_files=num_files,
+                                 num_files_warmed=num_files_warmed)
+
+            return self._set_status(diffset_id,
+                                    state=state,
+                                    num_files=num_files,
+                                    num_files_warmed=num_files_warmed)
+        finally:
+            self._update_pending(remove=[diffset_id])
+
+    def _start_worker(self) -> None:
+        """Start the background worker thread, if not already running."""
+        with self._lock:
+            if self._worker is not None or not self._queue:
+                return
+
+            self._worker = threading.Thread(target=self._run_worker,
+                                            name='diff-chunk-warmup',
+                                            daemon=True)
+            self._worker.start()
+
+    def _run_worker(self) -> None:
+        """Process queued diffsets until the queue is empty.
+
+        This is run in the background worker thread.
+        """
+        try:
+            while True:
+                try:
+                    if self.process_next() is None:
+                        break
+                except Exception as e:
+                    logger.exception('Unexpected error warming up diff '
+                                     'chunks: %s',
+                                     e)
+        finally:
+            connections.close_all()
+
+            with self._lock:
+                self._worker = None
+                restart = bool(self._queue)
+
+            if restart:
+                # Something was queued after the loop finished.
+                self._start_worker()
+
+    def _set_status(
+        self,
+        diffset_id: int,
+        *,
+        state: str,
+        num_files: Optional[int] = None,
+        num_files_warmed: int = 0,
+    ) -> ChunkWarmUpStatus:
+        """Store the warm-up status for a diffset.
+
+        Args:
+            diffset_id (int):
+                The ID of the diffset.
+
+            state (str):
+                The new state.
+
+            num_files (int, optional):
+                The number of files in the diffset, if known.
+
+            num_files_warmed (int, optional):
+                The number of files that have had chunks generated.
+
+        Returns:
+            ChunkWarmUpStatus:
+            The stored status.
+        """
+        status: ChunkWarmUpStatus = {
+            'state': state,
+            'num_files': num_files,
+            'num_files_warmed': num_files_warmed,
+            'timestamp': timezone.now().isoformat(),
+        }
+
+        cache.set(make_cache_key(self.STATUS_CACHE_KEY % diffset_id),
+                  status,
+                  self.CACHE_EXPIRATION)
+
+        return status
+
+    def _update_pending(
+        self,
+        *,
+        add: Sequence[int] = (),
+        remove: Sequence[int] = (),
+    ) -> None:
+        """Update the list of queued diffsets stored in cache.
+
+        This is a best-effort record shared between processes. Concurrent
+        updates may occasionally drop an entry, which at worst means a
+        diffset isn't warmed up ahead of time.
+
+        Args:
+            add (list of int, optional):
+                The diffset IDs to add.
+
+            remove (list of int, optional):
+                The diffset IDs to remove.
+        """
+        cache_key = make_cache_key(self.PENDING_CACHE_KEY)
+        pending = [
+            diffset_id
+            for diffset_id in cache.get(cache_key, [])
+            if diffset_id not in remove and diffset_id not in add
+        ]
+        pending += add
+
+        cache.set(cache_key, pending[-self.MAX_PENDING:],
+                  self.CACHE_EXPIRATION)
+
+
+#: The queue used for warming up diff chunks in this process.
+#:
+#: Version Added:
+#:     7.0
+chunk_warmup_queue = ChunkWarmUpQueue()
+
+
+def is_chunk_warmup_enabled() -> bool:
+    """Return whether diff chunks should be warmed up after upload.
+
+    Version Added:
+        7.0
+
+    Returns:
+        bool:
+        ``True`` if chunk warm-up is enabled for the site.
+    """
+    siteconfig = SiteConfiguration.objects.get_current()
+
+    return bool(siteconfig.get('diffviewer_warm_up_chunks'))
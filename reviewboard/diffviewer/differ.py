@@ -23,6 +23,27 @@ class DiffCompatVersion(object):
     MYERS_VERSIONS = (MYERS, MYERS_SMS_COST_BAIL)
 
 
+class DifferBackend(object):
+    """The available backends for Myers diffs.
+
+    Every backend produces identical opcodes. They differ only in how the
+    work is performed.
+
+    Version Added:
+        7.0
+    """
+
+    #: The pure-Python implementation.
+    PYTHON = 'python'
+
+    #: The implementation using accelerated snake searches.
+    ACCELERATED = 'accelerated'
+
+    DEFAULT = PYTHON
+
+    BACKENDS = (PYTHON, ACCELERATED)
+
+
 class Differ(object):
     """Base class for differs."""
     def __init__(self, a, b, ignore_space=False, compat_version=None):
@@ -83,18 +104,29 @@ class Differ(object):
 
 
 def get_differ(a, b, ignore_space=False,
-               compat_version=DiffCompatVersion.DEFAULT):
+               compat_version=DiffCompatVersion.DEFAULT,
+               backend=DifferBackend.DEFAULT):
     """Returns a differ for with the given settings.
 
     By default, this will return the MyersDiffer. Older differs can be used
     by specifying a compat_version, but this is only for *really* ancient
     diffs, currently.
+
+    Version Changed:
+        7.0:
+        Added the ``backend`` argument, which selects the implementation
+        used for Myers diffs. Unknown backends fall back to the default.
     """
     cls = None
 
     if compat_version in DiffCompatVersion.MYERS_VERSIONS:
-        from reviewboard.diffviewer.myersdiff import MyersDiffer
-        cls = MyersDiffer
+        if backend == DifferBackend.ACCELERATED:
+            from reviewboard.diffviewer.myersdiff import \
+                AcceleratedMyersDiffer
+            cls = AcceleratedMyersDiffer
+        else:
+            from reviewboard.diffviewer.myersdiff import MyersDiffer
+            cls = MyersDiffer
     elif compat_version == DiffCompatVersion.SMDIFFER:
         from reviewboard.diffviewer.smdiff import SMDiffer
         cls = SMDiffer
@@ -9,13 +9,20 @@ import re
 import shutil
 import subprocess
 import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 from functools import cmp_to_key
-from typing import Any, AnyStr, Iterator, Optional, TYPE_CHECKING
+from typing import (Any, AnyStr, Iterable, Iterator, Optional,
+                    TYPE_CHECKING)
 
 from django.core.files.base import ContentFile
+from django.db import connections
+from django.utils import translation
 from django.utils.encoding import force_str
-from django.utils.translation import gettext as _
+from django.utils.translation import get_language, gettext as _
+from djblets.cache.backend import cache_memoize
 from djblets.log import log_timed
 from djblets.siteconfig.models import SiteConfiguration
 from djblets.util.compat.python.past import cmp
@@ -27,16 +34,20 @@ from reviewboard.attachments.mimetypes import guess_mimetype
 from reviewboard.deprecation import RemovedInReviewBoard70Warning
 from reviewboard.diffviewer.commit_utils import exclude_ancestor_filediffs
 from reviewboard.diffviewer.errors import DiffTooBigError, PatchError
+from reviewboard.diffviewer.patcher import InProcessPatchError, apply_patch
 from reviewboard.diffviewer.settings import DiffSettings
-from reviewboard.scmtools.core import FileLookupContext, PRE_CREATION, HEAD
+from reviewboard.scmtools.core import (FileLookup, FileLookupContext,
+                                       PRE_CREATION, HEAD)
 
 if TYPE_CHECKING:
     from django.http import HttpRequest
+    from reviewboard.diffviewer.chunk_generator import DiffChunkGenerator
     from reviewboard.diffviewer.models import (
         DiffCommit,
         DiffSet,
         FileDiff,
     )
+    from reviewboard.scmtools.models import Repository
 
 
 logger = logging.getLogger(__name__)
@@ -59,6 +70,19 @@ NEWLINE_UNICODE_RE = re.compile(r'(?:\n|\r(?:\r?\n)?)')
 _PATCH_GARBAGE_INPUT = 'patch: **** Only garbage was found in the patch input.'
 
 
+#: Hit and miss counts for the patched ancestor file cache.
+#:
+#: These are tracked per-process, and are useful for diagnosing how well
+#: the cache is working for commit series. Each lookup counts as a single
+#: hit (if any of the chain of ancestors was found in cache) or miss.
+#:
+#: Version Added:
+#:     7.0
+patched_ancestors_cache_stats: Counter[str] = Counter(hits=0, misses=0)
+
+_patched_ancestors_cache_stats_lock = threading.Lock()
+
+
 class SerializedDiffFile(TypedDict):
     """Serialized information on a diff file.
 
@@ -303,8 +327,13 @@ def split_line_endings(
 def patch(diff, orig_file, filename, request=None):
     """Apply a diff to a file.
 
-    This delegates out to ``patch`` because no one except Larry Wall knows how
-    to patch.
+    Diffs whose hunks all apply exactly where they claim to are applied
+    in-process. Anything else delegates out to ``patch`` because no one
+    except Larry Wall knows how to patch.
+
+    Version Changed:
+        7.0:
+        Diffs that apply cleanly are now applied without spawning ``patch``.
 
     Args:
         diff (bytes):
@@ -333,13 +362,24 @@ def patch(diff, orig_file, filename, request=None):
         # Someone uploaded an unchanged file. Return the one we're patching.
         return orig_file
 
+    orig_file = convert_line_endings(orig_file)
+    diff = convert_line_endings(diff)
+
+    try:
+        new_file = apply_patch(diff=diff,
+                               orig_file=orig_file)
+        log_timer.done()
+
+        return new_file
+    except InProcessPatchError as e:
+        logger.debug('Falling back on patch(1) for %s: %s',
+                     filename, e,
+                     extra={'request': request})
+
     # Prepare the temporary directory if none is available
     tempdir = tempfile.mkdtemp(prefix='reviewboard.')
 
     try:
-        orig_file = convert_line_endings(orig_file)
-        diff = convert_line_endings(diff)
-
         (fd, oldfile) = tempfile.mkstemp(dir=tempdir)
         f = os.fdopen(fd, 'w+b')
         f.write(orig_file)
@@ -397,41 +437,29 @@ def patch(diff, orig_file, filename, request=None):
         log_timer.done()
 
 
-def get_original_file_from_repo(filediff, request=None):
-    """Return the pre-patched file for the FileDiff from the repository.
-
-    The parent diff will be applied if it exists.
+def _get_original_file_lookup(
+    filediff: FileDiff,
+    *,
+    request: Optional[HttpRequest] = None,
+) -> FileLookup:
+    """Return the lookup for a FileDiff's source file in the repository.
 
     Version Added:
-        4.0
-
-    Version Changed:
-        5.0:
-        Removed the old ``encoding_list`` parameter.
+        7.0
 
     Args:
         filediff (reviewboard.diffviewer.models.filediff.FileDiff):
-            The FileDiff to retrieve the pre-patch file for.
+            The FileDiff to look up the source file for.
 
         request (django.http.HttpRequest, optional):
             The HTTP request from the client.
 
     Returns:
-        bytes:
-        The pre-patched file.
-
-    Raises:
-        UnicodeDecodeError:
-            The source file was not compatible with any of the available
-            encodings.
-
-        reviewboard.diffutils.errors.PatchError:
-            An error occurred when trying to apply the patch.
-
-        reviewboard.scmtools.errors.SCMError:
-            An error occurred while computing the pre-patch file.
+        reviewboard.scmtools.core.FileLookup:
+        The lookup for the source file. The revision will be
+        :py:data:`~reviewboard.scmtools.core.PRE_CREATION` if there's no
+        source file to fetch.
     """
-    data = b''
     extra_data = filediff.extra_data or {}
 
     # If the file has a parent source filename/revision recorded, we're
@@ -455,24 +483,71 @@ def get_original_file_from_repo(filediff, request=None):
     source_revision = extra_data.get('parent_source_revision',
                                      filediff.source_revision)
 
-    if source_revision != PRE_CREATION:
-        repository = filediff.get_repository()
+    if source_revision == PRE_CREATION:
+        return FileLookup(path=source_filename,
+                          revision=PRE_CREATION)
 
-        if filediff.commit_id is not None:
-            commit_extra_data = filediff.commit.extra_data
-        else:
-            commit_extra_data = {}
+    if filediff.commit_id is not None:
+        commit_extra_data = filediff.commit.extra_data
+    else:
+        commit_extra_data = {}
 
-        context = FileLookupContext(
+    return FileLookup(
+        path=source_filename,
+        revision=source_revision,
+        context=FileLookupContext(
             request=request,
             base_commit_id=filediff.diffset.base_commit_id,
             diff_extra_data=filediff.diffset.extra_data,
             commit_extra_data=commit_extra_data,
-            file_extra_data=extra_data)
+            file_extra_data=extra_data))
+
+
+def get_original_file_from_repo(filediff, request=None):
+    """Return the pre-patched file for the FileDiff from the repository.
 
-        data = repository.get_file(path=source_filename,
-                                   revision=source_revision,
-                                   context=context)
+    The parent diff will be applied if it exists.
+
+    Version Added:
+        4.0
+
+    Version Changed:
+        5.0:
+        Removed the old ``encoding_list`` parameter.
+
+    Args:
+        filediff (reviewboard.diffviewer.models.filediff.FileDiff):
+            The FileDiff to retrieve the pre-patch file for.
+
+        request (django.http.HttpRequest, optional):
+            The HTTP request from the client.
+
+    Returns:
+        bytes:
+        The pre-patched file.
+
+    Raises:
+        UnicodeDecodeError:
+            The source file was not compatible with any of the available
+            encodings.
+
+        reviewboard.diffutils.errors.PatchError:
+            An error occurred when trying to apply the patch.
+
+        reviewboard.scmtools.errors.SCMError:
+            An error occurred while computing the pre-patch file.
+    """
+    data = b''
+    lookup = _get_original_file_lookup(filediff=filediff,
+                                       request=request)
+    source_filename = lookup.path
+
+    if lookup.revision != PRE_CREATION:
+        repository = filediff.get_repository()
+
+        data = repository.get_file(path=lookup.path,
+                                   revision=lookup.revision,
+                                   context=lookup.context)
 
         # Convert to unicode before we do anything to manipulate the string.
         encoding_list = get_filediff_encodings(filediff)
@@ -518,6 +593,174 @@ def get_original_file_from_repo(filediff, request=None):
     return data
 
 
+class _PatchedAncestorsCacheMiss(Exception):
+    """A patched ancestor file was not found in cache.
+
+    This is used internally by :py:func:`_load_patched_ancestors_file` to
+    detect a cache miss without computing a new value.
+
+    Version Added:
+        7.0
+    """
+
+
+def _make_patched_ancestors_cache_key(
+    ancestors: list[FileDiff],
+) -> str:
+    """Return a cache key for a patched chain of ancestor FileDiffs.
+
+    The key identifies the repository, the revision of the base file the
+    chain applies on top of, and the IDs of every FileDiff in the chain. This
+    is enough to uniquely identify the resulting file content, since
+    FileDiffs are never modified once created.
+
+    Version Added:
+        7.0
+
+    Args:
+        ancestors (list of reviewboard.diffviewer.models.filediff.FileDiff):
+            The chain of ancestors, in application order.
+
+    Returns:
+        str:
+        The cache key.
+    """
+    oldest_ancestor = ancestors[0]
+
+    if oldest_ancestor.is_new:
+        base_revision = PRE_CREATION
+    else:
+        base_revision = (oldest_ancestor.extra_data or {}).get(
+            'parent_source_revision',
+            oldest_ancestor.source_revision)
+
+    return 'diffutils-patched-ancestors:%s:%s:%s' % (
+        oldest_ancestor.diffset.repository_id,
+        base_revision,
+        ','.join(
+            str(ancestor.pk)
+            for ancestor in ancestors
+        ))
+
+
+def _load_patched_ancestors_file(
+    ancestors: list[FileDiff],
+) -> Optional[bytes]:
+    """Load a patched chain of ancestor FileDiffs from cache.
+
+    Version Added:
+        7.0
+
+    Args:
+        ancestors (list of reviewboard.diffviewer.models.filediff.FileDiff):
+            The chain of ancestors, in application order.
+
+    Returns:
+        bytes:
+        The cached file content, or ``None`` if not in cache.
+    """
+    def _on_miss():
+        raise _PatchedAncestorsCacheMiss()
+
+    try:
+        return cache_memoize(_make_patched_ancestors_cache_key(ancestors),
+                             _on_miss,
+                             large_data=True)
+    except _PatchedAncestorsCacheMiss:
+        return None
+
+
+def _get_patched_ancestors_file(
+    ancestors: list[FileDiff],
+    request: Optional[HttpRequest] = None,
+) -> bytes:
+    """Return the result of applying a chain of ancestor FileDiffs.
+
+    Each intermediate result is cached, keyed off of the chain of ancestors
+    applied so far. When computing the file for a chain, the longest prefix
+    of the chain found in cache is used as a starting point, so a commit
+    whose parent commit's file was already computed only requires a single
+    patch.
+
+    Hits and misses are tracked in :py:data:`patched_ancestors_cache_stats`.
+
+    Version Added:
+        7.0
+
+    Args:
+        ancestors (list of reviewboard.diffviewer.models.filediff.FileDiff):
+            The chain of ancestors, in application order.
+
+        request (django.http.HttpRequest, optional):
+            The HTTP request from the client.
+
+    Returns:
+        bytes:
+        The file content after applying every ancestor.
+
+    Raises:
+        reviewboard.diffutils.errors.PatchError:
+            An error occurred when trying to apply the patch.
+
+        reviewboard.scmtools.errors.SCMError:
+            An error occurred while computing the pre-patch file.
+    """
+    data: Optional[bytes] = None
+    num_applied = len(ancestors)
+
+    # Find the longest chain of ancestors we've already computed.
+    while num_applied > 0:
+        data = _load_patched_ancestors_file(ancestors[:num_applied])
+
+        if data is not None:
+            break
+
+        num_applied -= 1
+
+    # This may be called from several chunk generation threads at once.
+    with _patched_ancestors_cache_stats_lock:
+        if data is None:
+            patched_ancestors_cache_stats['misses'] += 1
+        else:
+            patched_ancestors_cache_stats['hits'] += 1
+
+    if data is None:
+        oldest_ancestor = ancestors[0]
+
+        # If the file was created outside this history, fetch it from the
+        # repository and apply the parent diff if it exists.
+        if oldest_ancestor.is_new:
+            data = b''
+        else:
+            data = get_original_file_from_repo(filediff=oldest_ancestor,
+                                               request=request)
+
+        if not oldest_ancestor.is_diff_empty:
+            data = patch(diff=oldest_ancestor.diff,
+                         orig_file=data,
+                         filename=oldest_ancestor.source_file,
+                         request=request)
+
+        num_applied = 1
+        cache_memoize(_make_patched_ancestors_cache_key(ancestors[:1]),
+                      lambda: data,
+                      large_data=True,
+                      force_overwrite=True)
+
+    for i in range(num_applied, len(ancestors)):
+        ancestor = ancestors[i]
+        data = patch(diff=ancestor.diff,
+                     orig_file=data,
+                     filename=ancestor.source_file,
+                     request=request)
+        cache_memoize(_make_patched_ancestors_cache_key(ancestors[:i + 1]),
+                      lambda: data,
+                      large_data=True,
+                      force_overwrite=True)
+
+    return data
+
+
 def get_original_file(filediff, request=None):
     """Return the pre-patch file of a FileDiff.
 
@@ -532,6 +775,12 @@ def get_original_file(filediff, request=None):
         The ``encoding_list`` parameter has been removed. Encoding lists are
         now calculated automatically.
 
+    Version Changed:
+        7.0:
+        The results of applying ancestor FileDiffs in a commit series are
+        now cached, so computing the file for a commit only needs to apply
+        the patches not already computed for a previous commit.
+
     Args:
         filediff (reviewboard.diffviewer.models.filediff.FileDiff):
             The FileDiff to retrieve the pre-patch file for.
@@ -566,29 +815,8 @@ def get_original_file(filediff, request=None):
         ancestors = filediff.get_ancestors(minimal=True)
 
         if ancestors:
-            oldest_ancestor = ancestors[0]
-
-            # If the file was created outside this history, fetch it from the
-            # repository and apply the parent diff if it exists.
-            if not oldest_ancestor.is_new:
-                data = get_original_file_from_repo(filediff=oldest_ancestor,
-                                                   request=request)
-
-            if not oldest_ancestor.is_diff_empty:
-                data = patch(diff=oldest_ancestor.diff,
-                             orig_file=data,
-                             filename=oldest_ancestor.source_file,
-                             request=request)
-
-            for ancestor in ancestors[1:]:
-                # TODO: Cache these results so that if this ``filediff`` is an
-                # ancestor of another FileDiff, computing that FileDiff's
-                # original file will be cheaper. This will also allow an
-                # ancestor filediff's original file to be computed cheaper.
-                data = patch(diff=ancestor.diff,
-                             orig_file=data,
-                             filename=ancestor.source_file,
-                             request=request)
+            data = _get_patched_ancestors_file(ancestors=ancestors,
+                                               request=request)
         elif not filediff.is_new:
             data = get_original_file_from_repo(filediff=filediff,
                                                request=request)
@@ -1382,18 +1610,121 @@ def get_diff_files(
             key=lambda f: f['interfilediff'] or f['filediff'])
 
 
+def prefetch_original_files(
+    files: list[dict[str, Any]],
+    *,
+    request: Optional[HttpRequest] = None,
+    diff_settings: DiffSettings,
+) -> int:
+    """Fetch the source files needed to generate chunks for diff files.
+
+    This looks up the source files in the repository for every diff file
+    that doesn't already have chunks in cache, using a single batched
+    :py:meth:`Repository.get_files()
+    <reviewboard.scmtools.models.Repository.get_files>` call per repository.
+    The fetched files are stored in the file cache, so that generating the
+    chunks doesn't need to go back to the repository for each file.
+
+    Whether chunks are already in cache is checked for all the files with a
+    single cache lookup. If they're all cached, nothing else is done.
+
+    Any errors fetching files are ignored here. They'll be raised as normal
+    when generating the chunks for those files.
+
+    Version Added:
+        7.0
+
+    Args:
+        files (list of dict):
+            The list of diff files, as returned by :py:func:`get_diff_files`.
+
+        request (django.http.HttpRequest, optional):
+            The HTTP request from the client.
+
+        diff_settings (reviewboard.diffviewer.settings.DiffSettings):
+            The settings used to control the display of diffs.
+
+    Returns:
+        int:
+        The number of source files looked up.
+    """
+    from reviewboard.diffviewer.chunk_generator import \
+        get_uncached_diff_chunk_generators
+
+    # There's nothing in a repository to fetch for files without a FileDiff.
+    chunk_generators = [
+        _get_diff_file_chunk_generator(diff_file=diff_file,
+                                       request=request,
+                                       diff_settings=diff_settings)
+        for diff_file in files
+        if diff_file.get('filediff') is not None
+    ]
+    uncached_chunk_generators = \
+        get_uncached_diff_chunk_generators(chunk_generators)
+
+    lookups_by_repository: dict[int, tuple[Repository, list[FileLookup]]] = {}
+
+    for chunk_generator in uncached_chunk_generators:
+        filediff = chunk_generator.filediff
+        source_filediff: Optional[FileDiff] = None
+
+        # This mirrors the logic in get_original_file().
+        if filediff.parent_diff:
+            source_filediff = filediff
+        else:
+            ancestors = filediff.get_ancestors(minimal=True)
+
+            if ancestors:
+                if not ancestors[0].is_new:
+                    source_filediff = ancestors[0]
+            elif not filediff.is_new:
+                source_filediff = filediff
+
+        if source_filediff is None:
+            continue
+
+        lookup = _get_original_file_lookup(filediff=source_filediff,
+                                           request=request)
+
+        if lookup.revision != PRE_CREATION:
+            repository = source_filediff.get_repository()
+            lookups_by_repository.setdefault(
+                repository.pk, (repository, []))[1].append(lookup)
+
+    num_files = 0
+
+    for repository, lookups in lookups_by_repository.values():
+        repository.get_files(lookups)
+        num_files += len(lookups)
+
+    return num_files
+
+
 @deprecate_non_keyword_only_args(RemovedInReviewBoard70Warning)
 def populate_diff_chunks(
     files,
     *,
     request=None,
-    diff_settings: DiffSettings):
+    diff_settings: DiffSettings,
+    max_workers: Optional[int] = None):
     """Populate a list of diff files with chunk data.
 
     This accepts a list of files (generated by :py:func:`get_diff_files`) and
     generates diff chunk data for each file in the list. The chunk data is
     stored in memory in the file state.
 
+    Chunks can optionally be generated for several files at once, using a
+    pool of threads. This mostly helps when chunks aren't yet cached and
+    files must be fetched from a slow repository. The files are always
+    populated in the order provided.
+
+    Version Changed:
+        7.0:
+        * Added the ``max_workers`` argument.
+        * When populating several files, any source files needed from the
+          repository are now fetched in a batch up-front (see
+          :py:func:`prefetch_original_files`).
+
     Version Changed:
         6.0:
         * Made all arguments other than ``files`` keyword-only.
@@ -1411,19 +1742,49 @@ def populate_diff_chunks(
 
             Version Added:
                 5.0.2
-    """
-    from reviewboard.diffviewer.chunk_generator import get_diff_chunk_generator
 
-    for diff_file in files:
-        chunk_generator = get_diff_chunk_generator(
-            request=request,
-            filediff=diff_file['filediff'],
-            interfilediff=diff_file['interfilediff'],
-            force_interdiff=diff_file['force_interdiff'],
-            base_filediff=diff_file.get('base_filediff'),
-            diff_settings=diff_settings)
-        chunks = list(chunk_generator.get_chunks())
+        max_workers (int, optional):
+            The maximum number of files to generate chunks for at once.
+            This defaults to
+            :py:attr:`DiffSettings.chunk_generation_workers
+            <reviewboard.diffviewer.settings.DiffSettings
+            .chunk_generation_workers>`. A value of 0 or 1 will generate
+            chunks for one file at a time.
 
+            Version Added:
+                7.0
+    """
+    if max_workers is None:
+        max_workers = diff_settings.chunk_generation_workers or 0
+
+    if len(files) > 1:
+        prefetch_original_files(files,
+                                request=request,
+                                diff_settings=diff_settings)
+
+    if max_workers > 1 and len(files) > 1:
+        # Worker threads don't inherit the active language, which is used
+        # in the chunk cache keys and for any text in the chunks.
+        language = get_language()
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files)),
+                                thread_name_prefix='diff-chunks') as executor:
+            results = list(executor.map(
+                lambda diff_file: _generate_diff_file_chunks_in_thread(
+                    diff_file=diff_file,
+                    request=request,
+                    diff_settings=diff_settings,
+                    language=language),
+                files))
+    else:
+        results = (
+            _generate_diff_file_chunks(diff_file=diff_file,
+                                       request=request,
+                                       diff_settings=diff_settings)
+            for diff_file in files
+        )
+
+    for diff_file, (chunks, code_safety_results) in zip(files, results):
         diff_file.update({
             'chunks': chunks,
             'num_chunks': len(chunks),
@@ -1431,9 +1792,8 @@ def populate_diff_chunks(
             'whitespace_only': len(chunks) > 0,
         })
 
-        if chunk_generator.all_code_safety_results:
-            diff_file['code_safety_results'] = \
-                chunk_generator.all_code_safety_results
+        if code_safety_results:
+            diff_file['code_safety_results'] = code_safety_results
 
         for j, chunk in enumerate(chunks):
             chunk['index'] = j
@@ -1451,6 +1811,207 @@ def populate_diff_chunks(
         })
 
 
+def _generate_diff_file_chunks(
+    diff_file: dict[str, Any],
+    *,
+    request: Optional[HttpRequest],
+    diff_settings: DiffSettings,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Generate the chunks for a diff file.
+
+    Version Added:
+        7.0
+
+    Args:
+        diff_file (dict):
+            The diff file information, as returned by
+            :py:func:`get_diff_files`.
+
+        request (django.http.HttpRequest):
+            The HTTP request from the client.
+
+        diff_settings (reviewboard.diffviewer.settings.DiffSettings):
+            The settings used to control the display of diffs.
+
+    Returns:
+        tuple:
+        A 2-tuple of:
+
+        Tuple:
+            0 (list of dict):
+                The list of chunks.
+
+            1 (dict):
+                The code safety results for the file.
+    """
+    chunk_generator = _get_diff_file_chunk_generator(
+        diff_file=diff_file,
+        request=request,
+        diff_settings=diff_settings)
+    chunks = list(chunk_generator.get_chunks())
+
+    return chunks, chunk_generator.all_code_safety_results
+
+
+def _generate_diff_file_chunks_in_thread(
+    diff_file: dict[str, Any],
+    *,
+    request: Optional[HttpRequest],
+    diff_settings: DiffSettings,
+    language: Optional[str],
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Generate the chunks for a diff file in a worker thread.
+
+    This wraps :py:func:`_generate_diff_file_chunks`, activating the
+    caller's language and closing any database connections opened by the
+    thread once finished.
+
+    Version Added:
+        7.0
+
+    Args:
+        diff_file (dict):
+            The diff file information, as returned by
+            :py:func:`get_diff_files`.
+
+        request (django.http.HttpRequest):
+            The HTTP request from the client.
+
+        diff_settings (reviewboard.diffviewer.settings.DiffSettings):
+            The settings used to control the display of diffs.
+
+        language (str):
+            The language active in the calling thread.
+
+    Returns:
+        tuple:
+        A 2-tuple of the list of chunks and the code safety results for the
+        file.
+    """
+    try:
+        with translation.override(language):
+            return _generate_diff_file_chunks(diff_file=diff_file,
+                                              request=request,
+                                              diff_settings=diff_settings)
+    finally:
+        connections.close_all()
+
+
+def _get_diff_file_chunk_generator(
+    diff_file: dict[str, Any],
+    *,
+    request: Optional[HttpRequest],
+    diff_settings: DiffSettings,
+) -> DiffChunkGenerator:
+    """Return a chunk generator for a diff file.
+
+    Version Added:
+        7.0
+
+    Args:
+        diff_file (dict):
+            The diff file information, as returned by
+            :py:func:`get_diff_files`.
+
+        request (django.http.HttpRequest):
+            The HTTP request from the client.
+
+        diff_settings (reviewboard.diffviewer.settings.DiffSettings):
+            The settings used to control the display of diffs.
+
+    Returns:
+        reviewboard.diffviewer.chunk_generator.DiffChunkGenerator:
+        The chunk generator for the file.
+    """
+    from reviewboard.diffviewer.chunk_generator import get_diff_chunk_generator
+
+    return get_diff_chunk_generator(
+        request=request,
+        filediff=diff_file['filediff'],
+        interfilediff=diff_file['interfilediff'],
+        force_interdiff=diff_file['force_interdiff'],
+        base_filediff=diff_file.get('base_filediff'),
+        diff_settings=diff_settings)
+
+
+def _get_file_chunk_generator_from_filediff(
+    context: dict[str, Any],
+    filediff: FileDiff,
+    interfilediff: Optional[FileDiff],
+    *,
+    diff_settings: DiffSettings,
+    base_filediff: Optional[FileDiff] = None,
+    base_commit: Optional[DiffCommit] = None,
+    tip_commit: Optional[DiffCommit] = None,
+) -> tuple[Optional[dict[str, Any]], Optional[DiffChunkGenerator]]:
+    """Return the diff file and a chunk generator for a filediff.
+
+    If chunks for the file have already been populated in the context, those
+    will be used instead of a chunk generator. Otherwise, a chunk generator
+    will be returned, which can be used to load only the chunks needed from
+    cache, rather than populating every chunk in the file.
+
+    See :py:func:`get_file_from_filediff` for details on the arguments.
+
+    Version Added:
+        7.0
+
+    Args:
+        context (dict):
+            Template context being used to render the diff.
+
+        filediff (reviewboard.diffviewer.models.filediff.FileDiff):
+            The filediff being rendered.
+
+        interfilediff (reviewboard.diffviewer.models.filediff.FileDiff,
+                       optional):
+            The optional filediff being used to render an interdiff.
+
+        diff_settings (reviewboard.diffviewer.settings.DiffSettings):
+            The settings used to control the display of diffs.
+
+        base_filediff (reviewbaord.diffviewer.models.filediff.FileDiff,
+                       optional):
+            The base FileDiff to use.
+
+        base_commit (reviewboard.diffviewer.models.diffcommit.DiffCommit,
+                     optional):
+            An optional base commit.
+
+        tip_commit (reviewboard.diffviewer.models.diffcommit.DiffCommit,
+                    optional):
+            An optional tip commit.
+
+    Returns:
+        tuple:
+        A 2-tuple of:
+
+        Tuple:
+            0 (dict):
+                The diff file information, or ``None`` if not found.
+
+            1 (reviewboard.diffviewer.chunk_generator.DiffChunkGenerator):
+                The chunk generator for the file, or ``None`` if the chunks
+                are already populated in the diff file.
+    """
+    diff_file = get_file_from_filediff(context=context,
+                                       filediff=filediff,
+                                       interfilediff=interfilediff,
+                                       diff_settings=diff_settings,
+                                       base_filediff=base_filediff,
+                                       base_commit=base_commit,
+                                       tip_commit=tip_commit,
+                                       populate_chunks=False)
+
+    if diff_file is None or 'chunks' in diff_file:
+        return diff_file, None
+
+    return diff_file, _get_diff_file_chunk_generator(
+        diff_file=diff_file,
+        request=context.get('request'),
+        diff_settings=diff_settings)
+
+
 def get_file_from_filediff(
     context: dict[str, Any],
     filediff: FileDiff,
@@ -1460,6 +2021,7 @@ def get_file_from_filediff(
     base_filediff: Optional[FileDiff] = None,
     base_commit: Optional[DiffCommit] = None,
     tip_commit: Optional[DiffCommit] = None,
+    populate_chunks: bool = True,
 ) -> Optional[dict[str, Any]]:
     """Return the files that corresponds to the filediff/interfilediff.
 
@@ -1474,6 +2036,7 @@ def get_file_from_filediff(
         7.0:
         * Added ``base_filediff`, ``base_commit`` and ``tip_commit``
           arguments.
+        * Added the ``populate_chunks`` argument.
 
     Version Changed:
         6.0:
@@ -1538,6 +2101,15 @@ def get_file_from_filediff(
             Version Added:
                 7.0
 
+        populate_chunks (bool, optional):
+            Whether to populate the chunks for the file.
+
+            If ``False``, the returned file will only contain chunks if they
+            were already populated in the context.
+
+            Version Added:
+                7.0
+
     Returns:
         dict:
         The diff file information. If not found, this will return ``None``.
@@ -1553,8 +2125,14 @@ def get_file_from_filediff(
         key += "_%s" % interfilediff.id
         interdiffset = interfilediff.diffset
 
+    # Files without populated chunks are stored separately, so that callers
+    # needing chunks never receive them.
+    unpopulated_key = '%s_unpopulated' % key
+
     if key in context:
         files = context[key]
+    elif not populate_chunks and unpopulated_key in context:
+        files = context[unpopulated_key]
     else:
         assert 'user' in context
 
@@ -1569,10 +2147,13 @@ def get_file_from_filediff(
             base_commit=base_commit,
             tip_commit=tip_commit)
 
-        populate_diff_chunks(files=files,
-                             request=request,
-                             diff_settings=diff_settings)
-        context[key] = files
+        if populate_chunks:
+            populate_diff_chunks(files=files,
+                                 request=request,
+                                 diff_settings=diff_settings)
+            context[key] = files
+        else:
+            context[unpopulated_key] = files
 
     if files:
         assert len(files) == 1
@@ -1664,14 +2245,18 @@ def get_last_line_number_in_diff(
         int:
         The last virtual line number.
     """
-    diff_file = get_file_from_filediff(context=context,
-                                       filediff=filediff,
-                                       interfilediff=interfilediff,
-                                       diff_settings=diff_settings,
-                                       base_commit=base_commit,
-                                       tip_commit=tip_commit)
+    diff_file, chunk_generator = _get_file_chunk_generator_from_filediff(
+        context=context,
+        filediff=filediff,
+        interfilediff=interfilediff,
+        diff_settings=diff_settings,
+        base_commit=base_commit,
+        tip_commit=tip_commit)
     assert diff_file is not None
 
+    if chunk_generator is not None:
+        return chunk_generator.get_chunks_index()['last_line']
+
     last_chunk = diff_file['chunks'][-1]
     last_line = last_chunk['lines'][-1]
 
@@ -1852,7 +2437,7 @@ def get_last_header_before_line(
         Information on any headers found. See
         :py:class:`DiffSideBySideHeadersInfo` for details.
     """
-    diff_file = get_file_from_filediff(
+    diff_file, chunk_generator = _get_file_chunk_generator_from_filediff(
         context=context,
         filediff=filediff,
         interfilediff=interfilediff,
@@ -1862,7 +2447,14 @@ def get_last_header_before_line(
         tip_commit=tip_commit)
     assert diff_file is not None
 
-    return _get_last_header_in_chunks_before_line(chunks=diff_file['chunks'],
+    if chunk_generator is None:
+        chunks = diff_file['chunks']
+    else:
+        # The index contains a condensed version of every chunk containing
+        # headers, which is all that's needed to look up the header.
+        chunks = chunk_generator.get_chunks_index()['header_chunks']
+
+    return _get_last_header_in_chunks_before_line(chunks=chunks,
                                                   target_line=target_line)
 
 
@@ -1961,15 +2553,21 @@ def get_file_chunks_in_range(
         DiffChunk:
         Each chunk in the range.
     """
-    diff_file = get_file_from_filediff(context=context,
-                                       filediff=filediff,
-                                       interfilediff=interfilediff,
-                                       diff_settings=diff_settings,
-                                       base_filediff=base_filediff,
-                                       base_commit=base_commit,
-                                       tip_commit=tip_commit)
+    diff_file, chunk_generator = _get_file_chunk_generator_from_filediff(
+        context=context,
+        filediff=filediff,
+        interfilediff=interfilediff,
+        diff_settings=diff_settings,
+        base_filediff=base_filediff,
+        base_commit=base_commit,
+        tip_commit=tip_commit)
 
-    if diff_file:
+    if chunk_generator is not None:
+        # Only the cached segments of chunks covering the range will be
+        # loaded.
+        yield from chunk_generator.get_chunks_in_range(first_line=first_line,
+                                                       num_lines=num_lines)
+    elif diff_file:
         yield from get_chunks_in_range(chunks=diff_file['chunks'],
                                        first_line=first_line,
                                        num_lines=num_lines)
@@ -2315,6 +2913,211 @@ def get_displayed_diff_line_ranges(chunks, first_vlinenum, last_vlinenum):
     return orig_range_info, patched_range_info
 
 
+class DiffChunksInfoCollector:
+    """Collects information on each chunk in a diff, line by line.
+
+    This allows diff parsers to collect the information returned by
+    :py:func:`get_diff_data_chunks_info` while parsing, rather than scanning
+    the diff again afterward.
+
+    Version Added:
+        7.0
+    """
+
+    ######################
+    # Instance variables #
+    ######################
+
+    #: The information collected on each chunk.
+    #:
+    #: This is in the format returned by :py:func:`get_diff_data_chunks_info`,
+    #: and is only complete once :py:meth:`finish` has been called.
+    chunks_info: list[dict[str, dict[str, int]]]
+
+    def __init__(self) -> None:
+        """Initialize the collector."""
+        self.chunks_info = []
+
+        self._cur_orig: Optional[dict[str, int]] = None
+        self._cur_modified: Optional[dict[str, int]] = None
+        self._orig_unchanged_lines = 0
+        self._modified_unchanged_lines = 0
+        self._process_orig_changes = False
+        self._process_modified_changes = False
+        self._finished = False
+
+    def add_lines(
+        self,
+        lines: Iterable[bytes],
+    ) -> None:
+        """Add lines from the diff.
+
+        Args:
+            lines (iterable of bytes):
+                The lines to add, without line endings.
+        """
+        assert not self._finished
+
+        cur_orig = self._cur_orig
+        cur_modified = self._cur_modified
+        orig_unchanged_lines = self._orig_unchanged_lines
+        modified_unchanged_lines = self._modified_unchanged_lines
+        process_orig_changes = self._process_orig_changes
+        process_modified_changes = self._process_modified_changes
+
+        # Look through the chunks of the diff, trying to find the amount
+        # of context shown at the beginning of each chunk. Though this
+        # will usually be 3 lines, it may be fewer or more, depending
+        # on file length and diff generation settings.
+        for line in lines:
+            if line.startswith(b'-'):
+                if process_orig_changes:
+                    # We've found the first change in the original side of
+                    # the chunk. We now know how many lines of context we
+                    # have here.
+                    cur_orig['pre_lines_of_context'] = orig_unchanged_lines
+                    cur_orig['changes_start'] += orig_unchanged_lines
+                    cur_orig['changes_len'] -= orig_unchanged_lines
+                    process_orig_changes = False
+
+                orig_unchanged_lines = 0
+            elif line.startswith(b'+'):
+                if process_modified_changes:
+                    # We've found the first change in the modified side of
+                    # the chunk. We now know how many lines of context we
+                    # have here.
+                    cur_modified['pre_lines_of_context'] = \
+                        modified_unchanged_lines
+                    cur_modified['changes_start'] += modified_unchanged_lines
+                    cur_modified['changes_len'] -= modified_unchanged_lines
+                    process_modified_changes = False
+
+                modified_unchanged_lines = 0
+            elif line.startswith(b' '):
+                # We might be before a group of changes, inside a group of
+                # changes, or after a group of changes. Either way, we want
+                # to track these values.
+                orig_unchanged_lines += 1
+                modified_unchanged_lines += 1
+            else:
+                # This was not a change within a chunk, or we weren't
+                # processing, so check to see if this is a chunk header
+                # instead.
+                m = CHUNK_RANGE_RE.match(line)
+
+                if m:
+                    # It is a chunk header. Start by updating the previous
+                    # range to factor in the lines of trailing context.
+                    self._finalize_chunk(cur_orig, cur_modified,
+                                         orig_unchanged_lines,
+                                         modified_unchanged_lines)
+
+                    # Next, reset the state for the next range, and pull the
+                    # line numbers and lengths from the header. We'll also
+                    # normalize the starting locations to be 0-based, since
+                    # the chunk ranges in diffs start at 1.
+                    orig_start = int(m.group('orig_start')) - 1
+                    orig_len = int(m.group('orig_len') or '1')
+                    modified_start = int(m.group('modified_start')) - 1
+                    modified_len = int(m.group('modified_len') or '1')
+
+                    cur_orig = {
+                        'pre_lines_of_context': 0,
+                        'post_lines_of_context': 0,
+                        'chunk_start': orig_start,
+                        'chunk_len': orig_len,
+                        'changes_start': orig_start,
+                        'changes_len': orig_len,
+                    }
+                    cur_modified = {
+                        'pre_lines_of_context': 0,
+                        'post_lines_of_context': 0,
+                        'chunk_start': modified_start,
+                        'chunk_len': modified_len,
+                        'changes_start': modified_start,
+                        'changes_len': modified_len,
+                    }
+                    self.chunks_info.append({
+                        'orig': cur_orig,
+                        'modified': cur_modified,
+                    })
+
+                    process_orig_changes = True
+                    process_modified_changes = True
+                    orig_unchanged_lines = 0
+                    modified_unchanged_lines = 0
+
+        self._cur_orig = cur_orig
+        self._cur_modified = cur_modified
+        self._orig_unchanged_lines = orig_unchanged_lines
+        self._modified_unchanged_lines = modified_unchanged_lines
+        self._process_orig_changes = process_orig_changes
+        self._process_modified_changes = process_modified_changes
+
+    def finish(self) -> list[dict[str, dict[str, int]]]:
+        """Finish collecting information and return the results.
+
+        Returns:
+            list of dict:
+            The information on each chunk. See
+            :py:func:`get_diff_data_chunks_info` for details.
+        """
+        if not self._finished:
+            # We need to adjust the last range, if we're still processing
+            # trailing context.
+            self._finalize_chunk(self._cur_orig,
+                                 self._cur_modified,
+                                 self._orig_unchanged_lines,
+                                 self._modified_unchanged_lines)
+            self._finished = True
+
+        return self.chunks_info
+
+    def _finalize_chunk(
+        self,
+        cur_orig: Optional[dict[str, int]],
+        cur_modified: Optional[dict[str, int]],
+        orig_unchanged_lines: int,
+        modified_unchanged_lines: int,
+    ) -> None:
+        """Factor the lines of trailing context into the current chunk.
+
+        Args:
+            cur_orig (dict):
+                The information on the original side of the current chunk,
+                if any.
+
+            cur_modified (dict):
+                The information on the modified side of the current chunk,
+                if any.
+
+            orig_unchanged_lines (int):
+                The number of unchanged lines since the last change on the
+                original side.
+
+            modified_unchanged_lines (int):
+                The number of unchanged lines since the last change on the
+                modified side.
+        """
+        if cur_orig is None:
+            return
+
+        for result_dict, unchanged_lines in ((cur_orig,
+                                              orig_unchanged_lines),
+                                             (cur_modified,
+                                              modified_unchanged_lines)):
+            result_dict['changes_len'] -= unchanged_lines
+
+            # A side without any changes has only leading context. Diffs
+            # with miscounted lines may not end up with a change length of
+            # 0 here, and are treated as having trailing context instead.
+            if (result_dict['changes_len'] == 0 and
+                result_dict['pre_lines_of_context'] == 0):
+                result_dict['pre_lines_of_context'] = unchanged_lines
+            else:
+                result_dict['post_lines_of_context'] = unchanged_lines
+
+
 def get_diff_data_chunks_info(diff):
     """Return information on each chunk in a diff.
 
@@ -2361,123 +3164,15 @@ def get_diff_data_chunks_info(diff):
         ``post_lines_of_context`` (``int``):
             The number of lines of context after any changes in a chunk. If
             the chunk doesn't have any changes, this will be 0.
-    """
-    def _finalize_result():
-        if not cur_result:
-            return
-
-        for result_dict, unchanged_lines in ((cur_result_orig,
-                                              orig_unchanged_lines),
-                                             (cur_result_modified,
-                                              modified_unchanged_lines)):
-            result_dict['changes_len'] -= unchanged_lines
 
-            if result_dict['changes_len'] == 0:
-                assert result_dict['pre_lines_of_context'] == 0
-                result_dict['pre_lines_of_context'] = unchanged_lines
-            else:
-                result_dict['post_lines_of_context'] = unchanged_lines
-
-    process_orig_changes = False
-    process_modified_changes = False
-
-    results = []
-    cur_result = None
-    cur_result_orig = None
-    cur_result_modified = None
-
-    orig_unchanged_lines = 0
-    modified_unchanged_lines = 0
-
-    # Look through the chunks of the diff, trying to find the amount
-    # of context shown at the beginning of each chunk. Though this
-    # will usually be 3 lines, it may be fewer or more, depending
-    # on file length and diff generation settings.
-    for i, line in enumerate(split_line_endings(diff.strip())):
-        if line.startswith(b'-'):
-            if process_orig_changes:
-                # We've found the first change in the original side of the
-                # chunk. We now know how many lines of context we have here.
-                #
-                # We reduce the indexes by 1 because the chunk ranges
-                # in diffs start at 1, and we want a 0-based index.
-                cur_result_orig['pre_lines_of_context'] = orig_unchanged_lines
-                cur_result_orig['changes_start'] += orig_unchanged_lines
-                cur_result_orig['changes_len'] -= orig_unchanged_lines
-                process_orig_changes = False
-
-            orig_unchanged_lines = 0
-        elif line.startswith(b'+'):
-            if process_modified_changes:
-                # We've found the first change in the modified side of the
-                # chunk. We now know how many lines of context we have here.
-                #
-                # We reduce the indexes by 1 because the chunk ranges
-                # in diffs start at 1, and we want a 0-based index.
-                cur_result_modified['pre_lines_of_context'] = \
-                    modified_unchanged_lines
-                cur_result_modified['changes_start'] += \
-                    modified_unchanged_lines
-                cur_result_modified['changes_len'] -= modified_unchanged_lines
-                process_modified_changes = False
-
-            modified_unchanged_lines = 0
-        elif line.startswith(b' '):
-            # We might be before a group of changes, inside a group of changes,
-            # or after a group of changes. Either way, we want to track these
-            # values.
-            orig_unchanged_lines += 1
-            modified_unchanged_lines += 1
-        else:
-            # This was not a change within a chunk, or we weren't processing,
-            # so check to see if this is a chunk header instead.
-            m = CHUNK_RANGE_RE.match(line)
-
-            if m:
-                # It is a chunk header. Start by updating the previous range
-                # to factor in the lines of trailing context.
-                _finalize_result()
-
-                # Next, reset the state for the next range, and pull the line
-                # numbers and lengths from the header. We'll also normalize
-                # the starting locations to be 0-based.
-                orig_start = int(m.group('orig_start')) - 1
-                orig_len = int(m.group('orig_len') or '1')
-                modified_start = int(m.group('modified_start')) - 1
-                modified_len = int(m.group('modified_len') or '1')
-
-                cur_result_orig = {
-                    'pre_lines_of_context': 0,
-                    'post_lines_of_context': 0,
-                    'chunk_start': orig_start,
-                    'chunk_len': orig_len,
-                    'changes_start': orig_start,
-                    'changes_len': orig_len,
-                }
-                cur_result_modified = {
-                    'pre_lines_of_context': 0,
-                    'post_lines_of_context': 0,
-                    'chunk_start': modified_start,
-                    'chunk_len': modified_len,
-                    'changes_start': modified_start,
-                    'changes_len': modified_len,
-                }
-                cur_result = {
-                    'orig': cur_result_orig,
-                    'modified': cur_result_modified,
-                }
-                results.append(cur_result)
-
-                process_orig_changes = True
-                process_modified_changes = True
-                orig_unchanged_lines = 0
-                modified_unchanged_lines = 0
-
-    # We need to adjust the last range, if we're still processing
-    # trailing context.
-    _finalize_result()
+    See Also:
+        :py:class:`DiffChunksInfoCollector`:
+            Used to collect this information while parsing a diff.
+    """
+    collector = DiffChunksInfoCollector()
+    collector.add_lines(split_line_endings(diff.strip()))
 
-    return results
+    return collector.finish()
 
 
 def check_diff_size(diff_file, parent_diff_file=None):
@@ -84,7 +84,8 @@ def create_filediffs(diff_file_contents, parent_diff_file_contents,
 
         If ``validate_only`` is ``True``, the returned list will be empty.
     """
-    from reviewboard.diffviewer.diffutils import convert_to_unicode
+    from reviewboard.diffviewer.diffutils import (convert_to_unicode,
+                                                  get_diff_data_chunks_info)
     from reviewboard.diffviewer.models import FileDiff
 
     diff_info = _prepare_diff_info(
@@ -265,6 +266,16 @@ def create_filediffs(diff_file_contents, parent_diff_file_contents,
             filediff.set_line_counts(raw_insert_count=f.insert_count,
                                      raw_delete_count=f.delete_count)
 
+            # Store the ranges of each chunk now, so that interdiffs don't
+            # need to scan the diff again. Parsers normally collect these
+            # while parsing.
+            diff_chunks_info = f.diff_chunks_info
+
+            if diff_chunks_info is None:
+                diff_chunks_info = get_diff_data_chunks_info(f.data)
+
+            filediff.set_diff_chunks_info(diff_chunks_info)
+
         filediffs.append(filediff)
 
     if not validate_only:
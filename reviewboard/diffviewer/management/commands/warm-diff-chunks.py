@@ -0,0 +1,143 @@
+"""Management command to inspect or process the diff chunk warm-up queue.
+
+Version Added:
+    7.0
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Optional
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext as _
+
+from reviewboard.diffviewer.chunk_warmup import (ChunkWarmUpState,
+                                                 ChunkWarmUpStatus,
+                                                 chunk_warmup_queue)
+
+
+class Command(BaseCommand):
+    """Management command to inspect or process the chunk warm-up queue.
+
+    By default, this lists the diffsets queued for warm-up, along with their
+    status. It can also process everything in the queue, or warm up specific
+    diffsets.
+
+    Version Added:
+        7.0
+    """
+
+    help = _(
+        'Inspect or process the queue of diffs waiting to be generated and '
+        'cached after upload.'
+    )
+
+    def add_arguments(
+        self,
+        parser: argparse.ArgumentParser,
+    ) -> None:
+        """Add arguments to the command.
+
+        Args:
+            parser (argparse.ArgumentParser):
+                The argument parser for the command.
+        """
+        parser.add_argument(
+            '--drain',
+            action='store_true',
+            default=False,
+            help=_(
+                'Generate and cache the diffs for all queued diffsets.'
+            ))
+        parser.add_argument(
+            'diffset_ids',
+            metavar='DIFFSET_ID',
+            nargs='*',
+            type=int,
+            help=_(
+                'Specific diffset IDs to generate and cache diffs for, '
+                'whether or not they are queued.'
+            ))
+
+    def handle(
+        self,
+        **options,
+    ) -> None:
+        """Handle the command.
+
+        Args:
+            **options (dict):
+                Options parsed on the command line.
+
+        Raises:
+            django.core.management.CommandError:
+                One or more diffsets could not be warmed up.
+        """
+        diffset_ids = options['diffset_ids']
+
+        if options['drain']:
+            diffset_ids = diffset_ids + [
+                diffset_id
+                for diffset_id in chunk_warmup_queue.get_pending()
+                if diffset_id not in diffset_ids
+            ]
+
+        if not diffset_ids:
+            self._list_pending()
+            return
+
+        failed = False
+
+        for diffset_id in diffset_ids:
+            status = chunk_warmup_queue.warm_up(diffset_id)
+            self._write_status(diffset_id, status)
+
+            if status['state'] != ChunkWarmUpState.DONE:
+                failed = True
+
+        if failed:
+            raise CommandError(_(
+                'One or more diffsets could not be fully generated. See '
+                'the Review Board log for details.'
+            ))
+
+    def _list_pending(self) -> None:
+        """List the queued diffsets and their status."""
+        pending = chunk_warmup_queue.get_pending()
+
+        if not pending:
+            self.stdout.write(_('No diffsets are queued.'))
+            return
+
+        for diffset_id in pending:
+            self._write_status(diffset_id,
+                               chunk_warmup_queue.get_status(diffset_id))
+
+    def _write_status(
+        self,
+        diffset_id: int,
+        status: Optional[ChunkWarmUpStatus],
+    ) -> None:
+        """Write the status of a diffset.
+
+        Args:
+            diffset_id (int):
+                The ID of the diffset.
+
+            status (reviewboard.diffviewer.chunk_warmup.ChunkWarmUpStatus):
+                The status of the diffset. This may be ``None``.
+        """
+        if status is None:
+            self.stdout.write(_('DiffSet %s: unknown') % diffset_id)
+        else:
+            self.stdout.write(
+                _('DiffSet %(id)s: %(state)s (%(num_warmed)s/%(num_files)s '
+                  'files, updated %(timestamp)s)')
+                % {
+                    'id': diffset_id,
+                    'num_files': status['num_files'],
+                    'num_warmed': status['num_files_warmed'],
+                    'state': status['state'],
+                    'timestamp': status['timestamp'],
+                })
@@ -49,6 +49,25 @@ class FileDiff(models.Model):
 
     _IS_PARENT_EMPTY_KEY = '__parent_diff_empty'
 
+    #: The key in extra_data for the stored information on chunks in the diff.
+    #:
+    #: Version Added:
+    #:     7.0
+    _DIFF_CHUNKS_INFO_KEY = '__diff_chunks_info'
+
+    #: The order of the fields stored for each side of a chunk.
+    #:
+    #: Version Added:
+    #:     7.0
+    _DIFF_CHUNKS_INFO_FIELDS = (
+        'chunk_start',
+        'chunk_len',
+        'changes_start',
+        'changes_len',
+        'pre_lines_of_context',
+        'post_lines_of_context',
+    )
+
     diffset = models.ForeignKey('DiffSet',
                                 on_delete=models.CASCADE,
                                 related_name='files',
@@ -669,6 +688,81 @@ class FileDiff(models.Model):
         if updated and self.pk:
             self.save(update_fields=['extra_data'])
 
+    def get_diff_chunks_info(self):
+        """Return information on each chunk in the diff.
+
+        This information is normally computed when the diff is uploaded and
+        stored in :py:attr:`extra_data`, so that the diff doesn't need to be
+        scanned again. For older FileDiffs, it will be computed from the diff
+        and stored the first time this is called.
+
+        Version Added:
+            7.0
+
+        Returns:
+            list of dict:
+            A list of chunk information dictionaries. See
+            :py:func:`~reviewboard.diffviewer.diffutils
+            .get_diff_data_chunks_info` for details.
+        """
+        stored_chunks_info = None
+
+        if self.extra_data:
+            stored_chunks_info = self.extra_data.get(
+                self._DIFF_CHUNKS_INFO_KEY)
+
+        if stored_chunks_info is None:
+            from reviewboard.diffviewer.diffutils import \
+                get_diff_data_chunks_info
+
+            chunks_info = get_diff_data_chunks_info(self.diff)
+            self.set_diff_chunks_info(chunks_info)
+
+            if self.pk:
+                self.save(update_fields=['extra_data'])
+
+            return chunks_info
+
+        fields = self._DIFF_CHUNKS_INFO_FIELDS
+        num_fields = len(fields)
+
+        return [
+            {
+                'orig': dict(zip(fields, entry[:num_fields])),
+                'modified': dict(zip(fields, entry[num_fields:])),
+            }
+            for entry in stored_chunks_info
+        ]
+
+    def set_diff_chunks_info(self, chunks_info):
+        """Store information on each chunk in the diff.
+
+        This is stored compactly in :py:attr:`extra_data`, as a list of
+        integers per chunk. The caller is responsible for saving the FileDiff.
+
+        Version Added:
+            7.0
+
+        Args:
+            chunks_info (list of dict):
+                A list of chunk information dictionaries, as returned by
+                :py:func:`~reviewboard.diffviewer.diffutils
+                .get_diff_data_chunks_info`.
+        """
+        fields = self._DIFF_CHUNKS_INFO_FIELDS
+
+        if self.extra_data is None:
+            self.extra_data = {}
+
+        self.extra_data[self._DIFF_CHUNKS_INFO_KEY] = [
+            [
+                chunk_info[side][field]
+                for side in ('orig', 'modified')
+                for field in fields
+            ]
+            for chunk_info in chunks_info
+        ]
+
     def get_ancestors(self, minimal, filediffs=None, update=True):
         """Return the ancestors of this FileDiff.
 
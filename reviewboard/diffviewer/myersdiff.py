@@ -1,3 +1,6 @@
+import sys
+from array import array
+
 from reviewboard.diffviewer.differ import Differ, DiffCompatVersion
 
 
@@ -706,3 +709,439 @@ class MyersDiffer(Differ):
             result *= 2
 
         return result
+
+
+#: The number of leading or trailing lines compared one at a time when
+#: following a snake, before switching to bulk comparisons.
+#:
+#: Most snakes are very short, and single comparisons are cheaper than
+#: packing lines for those.
+_SNAKE_SCAN_LINES = 4
+
+#: The initial number of lines compared at once when following a long snake.
+#:
+#: This doubles after each window of matching lines.
+_SNAKE_WINDOW_LINES = 16
+
+
+def _pack_codes(codes):
+    """Pack a list of line codes into big-endian 32-bit integers.
+
+    Args:
+        codes (list of int):
+            The line codes to pack.
+
+    Returns:
+        bytes:
+        The packed codes.
+    """
+    packed = array('I', codes)
+
+    if sys.byteorder == 'little':
+        packed.byteswap()
+
+    return packed.tobytes()
+
+
+def _count_equal_bytes(a, b, from_end):
+    """Return the number of equal leading or trailing bytes in two strings.
+
+    The strings are converted to integers and XORed together, which allows
+    the first difference to be located without a Python-level loop.
+
+    Args:
+        a (bytes):
+            The first string.
+
+        b (bytes):
+            The second string, of the same length as ``a``.
+
+        from_end (bool):
+            Whether to count trailing bytes instead of leading bytes.
+
+    Returns:
+        int:
+        The number of equal bytes.
+    """
+    byteorder = from_end and 'little' or 'big'
+    diff = (int.from_bytes(a, byteorder) ^
+            int.from_bytes(b, byteorder))
+
+    return (len(a) * 8 - diff.bit_length()) // 8
+
+
+class AcceleratedMyersDiffer(MyersDiffer):
+    """A Myers differ using accelerated snake searches.
+
+    This produces opcodes identical to :py:class:`MyersDiffer`, but follows
+    snakes (runs of equal lines) through the hashed line codes in bulk,
+    rather than comparing one line at a time. Line codes are packed into
+    byte strings, which are compared a window at a time, with the first
+    differing line in a window found through integer operations implemented
+    in C. All diagonals for each edit cost are computed at once from slices
+    of the diagonal vectors, rather than through per-diagonal bookkeeping.
+
+    This is most effective for large files with long runs of equal lines
+    between changes, and for large replaced blocks.
+
+    Version Added:
+        7.0
+    """
+
+    def _discard_confusing_lines(self):
+        """Discard lines that are unlikely to match, and pack line codes.
+
+        After the lines are discarded, the remaining codes are packed into
+        byte strings for the snake searches.
+        """
+        super()._discard_confusing_lines()
+
+        self._a_packed = _pack_codes(self.a_data.undiscarded)
+        self._b_packed = _pack_codes(self.b_data.undiscarded)
+
+    def _follow_snake_forward(self, x, y, x_upper, y_upper):
+        """Follow a snake forward from a point.
+
+        Args:
+            x (int):
+                The starting index in the original lines.
+
+            y (int):
+                The starting index in the modified lines.
+
+            x_upper (int):
+                The upper bound for ``x``.
+
+            y_upper (int):
+                The upper bound for ``y``.
+
+        Returns:
+            int:
+            The new value for ``x`` at the end of the snake.
+        """
+        a = self.a_data.undiscarded
+        b = self.b_data.undiscarded
+        n = min(x_upper - x, y_upper - y)
+        i = 0
+
+        while i < n and i < _SNAKE_SCAN_LINES:
+            if a[x + i] != b[y + i]:
+                return x + i
+
+            i += 1
+
+        a_packed = self._a_packed
+        b_packed = self._b_packed
+        window = _SNAKE_WINDOW_LINES
+
+        while i < n:
+            count = min(window, n - i)
+            a_bytes = a_packed[(x + i) * 4:(x + i + count) * 4]
+            b_bytes = b_packed[(y + i) * 4:(y + i + count) * 4]
+
+            if a_bytes != b_bytes:
+                return x + i + _count_equal_bytes(a_bytes, b_bytes,
+                                                  from_end=False) // 4
+
+            i += count
+            window *= 2
+
+        return x + n
+
+    def _follow_snake_backward(self, x, y, x_lower, y_lower):
+        """Follow a snake backward from a point.
+
+        Args:
+            x (int):
+                The starting index (exclusive) in the original lines.
+
+            y (int):
+                The starting index (exclusive) in the modified lines.
+
+            x_lower (int):
+                The lower bound for ``x``.
+
+            y_lower (int):
+                The lower bound for ``y``.
+
+        Returns:
+            int:
+            The new value for ``x`` at the start of the snake.
+        """
+        a = self.a_data.undiscarded
+        b = self.b_data.undiscarded
+        n = min(x - x_lower, y - y_lower)
+        i = 0
+
+        while i < n and i < _SNAKE_SCAN_LINES:
+            if a[x - i - 1] != b[y - i - 1]:
+                return x - i
+
+            i += 1
+
+        a_packed = self._a_packed
+        b_packed = self._b_packed
+        window = _SNAKE_WINDOW_LINES
+
+        while i < n:
+            count = min(window, n - i)
+            a_bytes = a_packed[(x - i - count) * 4:(x - i) * 4]
+            b_bytes = b_packed[(y - i - count) * 4:(y - i) * 4]
+
+            if a_bytes != b_bytes:
+                return x - i - _count_equal_bytes(a_bytes, b_bytes,
+                                                  from_end=True) // 4
+
+            i += count
+            window *= 2
+
+        return x - n
+
+    def _find_sms(self, a_lower, a_upper, b_lower, b_upper, find_minimal):
+        """Find the Shortest Middle Snake.
+
+        This is equivalent to :py:meth:`MyersDiffer._find_sms`.
+        """
+        down_vector = self.fdiag
+        up_vector = self.bdiag
+        downoff = self.downoff
+        upoff = self.upoff
+        max_lines = self.max_lines
+        snake_limit = self.SNAKE_LIMIT
+        a = self.a_data.undiscarded
+        b = self.b_data.undiscarded
+        follow_forward = self._follow_snake_forward
+        follow_backward = self._follow_snake_backward
+
+        down_k = a_lower - b_lower
+        up_k = a_upper - b_upper
+        odd_delta = (down_k - up_k) % 2 != 0
+
+        down_vector[downoff + down_k] = a_lower
+        up_vector[upoff + up_k] = a_upper
+
+        dmin = a_lower - b_upper
+        dmax = a_upper - b_lower
+
+        down_min = down_max = down_k
+        up_min = up_max = up_k
+
+        cost = 0
+
+        try:
+            max_cost = self._max_cost
+        except AttributeError:
+            # This only depends on the number of lines, so only compute it
+            # once per diff.
+            max_cost = max(256, self._very_approx_sqrt(max_lines * 4))
+            self._max_cost = max_cost
+
+        while True:
+            cost += 1
+
+            if down_min > dmin:
+                down_min -= 1
+                down_vector[downoff + down_min - 1] = -1
+            else:
+                down_min += 1
+
+            if down_max < dmax:
+                down_max += 1
+                down_vector[downoff + down_max + 1] = -1
+            else:
+                down_max -= 1
+
+            # Extend the forward path.
+            #
+            # Each diagonal only depends on the neighboring diagonals from
+            # the previous cost, so all diagonals are computed at once,
+            # working on slices of the vector.
+            lo = downoff + down_min
+            hi = downoff + down_max
+            ks = range(down_min, down_max + 1, 2)
+            down_old_xs = [
+                tlo + 1 if tlo >= thi else thi
+                for tlo, thi in zip(down_vector[lo - 1:hi:2],
+                                    down_vector[lo + 1:hi + 2:2])
+            ]
+            down_xs = [
+                follow_forward(x + 1, x - k + 1, a_upper, b_upper)
+                if x < a_upper and x - k < b_upper and a[x] == b[x - k]
+                else x
+                for x, k in zip(down_old_xs, ks)
+            ]
+            down_vector[lo:hi + 1:2] = down_xs
+
+            if odd_delta:
+                # Check for an overlap with the reverse path, starting from
+                # the highest diagonal.
+                for k in range(min(down_max, up_max - (up_max - down_max) % 2),
+                               max(down_min, up_min) - 1,
+                               -2):
+                    x = down_xs[(k - down_min) // 2]
+
+                    if up_vector[upoff + k] <= x:
+                        return x, x - k, True, True
+
+            # Extend the reverse path
+            if up_min > dmin:
+                up_min -= 1
+                up_vector[upoff + up_min - 1] = max_lines
+            else:
+                up_min += 1
+
+            if up_max < dmax:
+                up_max += 1
+                up_vector[upoff + up_max + 1] = max_lines
+            else:
+                up_max -= 1
+
+            lo = upoff + up_min
+            hi = upoff + up_max
+            ks = range(up_min, up_max + 1, 2)
+            up_old_xs = [
+                tlo if tlo < thi else thi - 1
+                for tlo, thi in zip(up_vector[lo - 1:hi:2],
+                                    up_vector[lo + 1:hi + 2:2])
+            ]
+            up_xs = [
+                follow_backward(x - 1, x - k - 1, a_lower, b_lower)
+                if x > a_lower and x - k > b_lower and a[x - 1] == b[x - k - 1]
+                else x
+                for x, k in zip(up_old_xs, ks)
+            ]
+            up_vector[lo:hi + 1:2] = up_xs
+
+            if not odd_delta:
+                # Check for an overlap with the forward path, starting from
+                # the highest diagonal.
+                for k in range(min(up_max, down_max - (down_max - up_max) % 2),
+                               max(up_min, down_min) - 1,
+                               -2):
+                    x = up_xs[(k - up_min) // 2]
+
+                    if x <= down_vector[downoff + k]:
+                        return x, x - k, True, True
+
+            if find_minimal:
+                continue
+
+            if cost > 200 and (
+                any(x - old_x > snake_limit
+                    for x, old_x in zip(down_xs, down_old_xs)) or
+                any(old_x - x > snake_limit
+                    for x, old_x in zip(up_xs, up_old_xs))):
+                ret_x, ret_y, best = self._find_diagonal(
+                    down_min, down_max, down_k, 0,
+                    downoff, down_vector,
+                    lambda x: x - a_lower,
+                    lambda x: a_lower + snake_limit <= x < a_upper,
+                    lambda y: b_lower + snake_limit <= y < b_upper,
+                    lambda i, k: i - k,
+                    1, cost)
+
+                if best > 0:
+                    return ret_x, ret_y, True, False
+
+                ret_x, ret_y, best = self._find_diagonal(
+                    up_min, up_max, up_k, best, upoff,
+                    up_vector,
+                    lambda x: a_upper - x,
+                    lambda x: a_lower < x <= a_upper - snake_limit,
+                    lambda y: b_lower < y <= b_upper - snake_limit,
+                    lambda i, k: i + k,
+                    0, cost)
+
+                if best > 0:
+                    return ret_x, ret_y, False, True
+
+            if (cost >= max_cost and
+                self.compat_version >= DiffCompatVersion.MYERS_SMS_COST_BAIL):
+                return self._bail_sms(a_lower, a_upper, b_lower, b_upper,
+                                      down_min, down_max, up_min, up_max)
+
+    def _bail_sms(self, a_lower, a_upper, b_lower, b_upper,
+                  down_min, down_max, up_min, up_max):
+        """Return the best halfway point after reaching the max SMS cost.
+
+        This is equivalent to the cost bailing in
+        :py:meth:`MyersDiffer._find_sms`.
+        """
+        down_vector = self.fdiag
+        up_vector = self.bdiag
+        fx_best = bx_best = 0
+
+        # Find the forward diagonal that maximized x + y
+        fxy_best = -1
+
+        for d in range(down_max, down_min - 1, -2):
+            x = min(down_vector[self.downoff + d], a_upper)
+            y = x - d
+
+            if b_upper < y:
+                x = b_upper + d
+                y = b_upper
+
+            if fxy_best < x + y:
+                fxy_best = x + y
+                fx_best = x
+
+        # Find the backward diagonal that minimizes x + y
+        bxy_best = self.max_lines
+
+        for d in range(up_max, up_min - 1, -2):
+            x = max(a_lower, up_vector[self.upoff + d])
+            y = x - d
+
+            if y < b_lower:
+                x = b_lower + d
+                y = b_lower
+
+            if x + y < bxy_best:
+                bxy_best = x + y
+                bx_best = x
+
+        # Use the better of the two diagonals
+        if a_upper + b_upper - bxy_best < fxy_best - (a_lower + b_lower):
+            return fx_best, fxy_best - fx_best, True, False
+        else:
+            return bx_best, bxy_best - bx_best, False, True
+
+    def _lcs(self, a_lower, a_upper, b_lower, b_upper, find_minimal):
+        """Compute the Longest Common Subsequence.
+
+        This is equivalent to :py:meth:`MyersDiffer._lcs`.
+        """
+        # Fast walkthrough equal lines at the start and end.
+        new_a_lower = self._follow_snake_forward(a_lower, b_lower,
+                                                 a_upper, b_upper)
+        b_lower += new_a_lower - a_lower
+        a_lower = new_a_lower
+
+        new_a_upper = self._follow_snake_backward(a_upper, b_upper,
+                                                  a_lower, b_lower)
+        b_upper -= a_upper - new_a_upper
+        a_upper = new_a_upper
+
+        if a_lower == a_upper:
+            # Inserted lines.
+            modified = self.b_data.modified
+            real_indexes = self.b_data.real_indexes
+
+            for i in range(b_lower, b_upper):
+                modified[real_indexes[i]] = True
+        elif b_lower == b_upper:
+            # Deleted lines
+            modified = self.a_data.modified
+            real_indexes = self.a_data.real_indexes
+
+            for i in range(a_lower, a_upper):
+                modified[real_indexes[i]] = True
+        else:
+            # Find the middle snake and length of an optimal path for A and B
+            x, y, low_minimal, high_minimal = \
+                self._find_sms(a_lower, a_upper, b_lower, b_upper,
+                               find_minimal)
+
+            self._lcs(a_lower, x, b_lower, y, low_minimal)
+            self._lcs(x, a_upper, y, b_upper, high_minimal)
@@ -1,10 +1,15 @@
+import logging
 import os
 import re
+from bisect import bisect_left
 
 from reviewboard.diffviewer.processors import (filter_interdiff_opcodes,
                                                post_process_filtered_equals)
 
 
+logger = logging.getLogger(__name__)
+
+
 class MoveRange(object):
     """Stores information on a move range.
 
@@ -21,13 +26,50 @@ class MoveRange(object):
         return self.groups[-1]
 
     def add_group(self, group, group_index):
-        if self.groups[-1] != group:
+        if self.groups[-1][1] != group_index:
             self.groups.append((group, group_index))
 
     def __repr__(self):
         return '<MoveRange(%d, %d, %r)>' % (self.start, self.end, self.groups)
 
 
+class _RemoveBlock(object):
+    """Removed lines with the same content within a delete/replace group.
+
+    These are used to index removed lines for move detection.
+
+    Version Added:
+        7.0
+    """
+
+    __slots__ = ('group', 'group_index', 'indexes', 'move_key')
+
+    def __init__(self, group, group_index):
+        """Initialize the block.
+
+        Args:
+            group (tuple):
+                The opcode group containing the removed lines.
+
+            group_index (int):
+                The index of the group.
+        """
+        self.group = group
+        self.group_index = group_index
+        self.move_key = '%s-%s-%s-%s' % group[1:5]
+
+        # The sorted 0-based line indexes not yet used in a move.
+        self.indexes = []
+
+
+class _MoveDetectionBudgetExceeded(Exception):
+    """Move detection exceeded its work budget.
+
+    Version Added:
+        7.0
+    """
+
+
 class DiffOpcodeGenerator(object):
     ALPHANUM_RE = re.compile(r'\w')
     WHITESPACE_RE = re.compile(r'\s')
@@ -35,12 +77,32 @@ class DiffOpcodeGenerator(object):
     MOVE_PREFERRED_MIN_LINES = 2
     MOVE_MIN_LINE_LENGTH = 20
 
+    #: The maximum amount of work to spend on move detection for a file.
+    #:
+    #: Each unit of work roughly corresponds to checking one inserted line
+    #: against one group of matching removed lines. If detection exceeds
+    #: this, it's abandoned and the file is shown without any moves, rather
+    #: than tying up the process on a pathological file.
+    #:
+    #: This can be set to ``None`` to disable the limit. It's used when a
+    #: budget isn't passed when constructing the generator.
+    #:
+    #: Version Added:
+    #:     7.0
+    MOVE_DETECTION_WORK_BUDGET = 1_000_000
+
     TAB_SIZE = 8
 
     def __init__(self, differ, diff=None, interdiff=None, request=None,
-                 **kwargs):
+                 diff_chunks_info=None, interdiff_chunks_info=None,
+                 move_detection_work_budget=None, **kwargs):
         """Initialize the opcode generator.
 
+        Version Changed:
+            7.0:
+            Added the ``diff_chunks_info``, ``interdiff_chunks_info``, and
+            ``move_detection_work_budget`` parameters.
+
         Version Changed:
             3.0.18:
             Added the ``request`` and ``**kwargs`` parameters.
@@ -59,6 +121,30 @@ class DiffOpcodeGenerator(object):
             request (django.http.HttpRequest):
                 The HTTP request from the client.
 
+            diff_chunks_info (list of dict, optional):
+                Pre-computed information on the chunks in ``diff``, used
+                when filtering interdiffs. See
+                :py:func:`~reviewboard.diffviewer.diffutils.
+                get_diff_data_chunks_info`.
+
+                Version Added:
+                    7.0
+
+            interdiff_chunks_info (list of dict, optional):
+                Pre-computed information on the chunks in ``interdiff``,
+                used when filtering interdiffs.
+
+                Version Added:
+                    7.0
+
+            move_detection_work_budget (int, optional):
+                The maximum amount of work to spend on move detection. A
+                value of 0 disables the limit. If not provided,
+                :py:attr:`MOVE_DETECTION_WORK_BUDGET` will be used.
+
+                Version Added:
+                    7.0
+
             **kwargs (dict):
                 Additional keyword arguments, for future expansion.
         """
@@ -66,6 +152,9 @@ class DiffOpcodeGenerator(object):
         self.diff = diff
         self.interdiff = interdiff
         self.request = request
+        self.diff_chunks_info = diff_chunks_info
+        self.interdiff_chunks_info = interdiff_chunks_info
+        self.move_detection_work_budget = move_detection_work_budget
 
     def __iter__(self):
         """Returns opcodes from the differ with extra metadata.
@@ -114,7 +203,9 @@ class DiffOpcodeGenerator(object):
                 opcodes=opcodes,
                 filediff_data=self.diff,
                 interfilediff_data=self.interdiff,
-                request=self.request)
+                request=self.request,
+                filediff_chunks_info=self.diff_chunks_info,
+                interfilediff_chunks_info=self.interdiff_chunks_info)
 
         for opcode in opcodes:
             yield opcode
@@ -408,11 +499,210 @@ class DiffOpcodeGenerator(object):
         #
         # The algorithm will be documented as we go in the code.
         #
-        # We start by looping through all the inserted groups.
+        # We start by indexing the removed lines, grouping the lines with
+        # the same content in each removed group together.
+        self._build_remove_index()
+
+        work_budget = self.move_detection_work_budget
+
+        if work_budget is None:
+            work_budget = self.MOVE_DETECTION_WORK_BUDGET
+        elif work_budget <= 0:
+            work_budget = None
+
+        self._move_work_remaining = work_budget
+
+        # Moves are only applied to the metadata once all have been computed,
+        # so that nothing is applied if we give up part way through.
+        self._pending_moves = []
+
+        # Now loop through all the inserted groups.
         r_move_indexes_used = set()
 
-        for insert in self.inserts:
-            self._compute_move_for_insert(r_move_indexes_used, *insert)
+        try:
+            for insert in self.inserts:
+                self._compute_move_for_insert(r_move_indexes_used, *insert)
+        except _MoveDetectionBudgetExceeded:
+            logger.warning('Move detection exceeded the work budget of %s '
+                           'for a diff with %s inserted groups. Moves will '
+                           'not be shown.',
+                           work_budget,
+                           len(self.inserts),
+                           extra={'request': self.request})
+            return
+
+        for r_move_groups, moved_to_ranges, imeta, moved_from_ranges in \
+                self._pending_moves:
+            for group, group_index in r_move_groups:
+                rmeta = group[-1]
+                rmeta.setdefault('moved-to', {}).update(moved_to_ranges)
+
+            imeta.setdefault('moved-from', {}).update(moved_from_ranges)
+
+    def _build_remove_index(self):
+        """Build the index of removed lines used for move detection.
+
+        This maps each stripped removed line to a list of
+        :py:class:`_RemoveBlock`, one for each group containing the line,
+        and maps each removed line index to its block.
+
+        Version Added:
+            7.0
+        """
+        remove_index = {}
+        remove_blocks_by_line_num = {}
+
+        for line, entries in self.removes.items():
+            blocks = []
+            block = None
+
+            for i, group, group_index in entries:
+                if block is None or block.group_index != group_index:
+                    block = _RemoveBlock(group, group_index)
+                    blocks.append(block)
+
+                block.indexes.append(i)
+                remove_blocks_by_line_num[i] = block
+
+            remove_index[line] = blocks
+
+        self._remove_index = remove_index
+        self._remove_blocks_by_line_num = remove_blocks_by_line_num
+
+    def _consume_move_work(self, amount=1):
+        """Consume part of the work budget for move detection.
+
+        Version Added:
+            7.0
+
+        Args:
+            amount (int, optional):
+                The amount of work being performed.
+
+        Raises:
+            _MoveDetectionBudgetExceeded:
+                The work budget has been exceeded.
+        """
+        if self._move_work_remaining is not None:
+            self._move_work_remaining -= amount
+
+            if self._move_work_remaining < 0:
+                raise _MoveDetectionBudgetExceeded()
+
+    def _update_move_ranges_for_line(self, iline, move_key, r_move_ranges,
+                                     disallowed_ri):
+        """Update move ranges for an inserted line.
+
+        This looks for the first removed line matching the inserted line
+        that either continues an existing move range or can start a new one,
+        following the order of removed lines in the file.
+
+        Rather than checking each matching removed line individually, this
+        works on a group at a time. Within a group, a line can only continue
+        that group's range (which is found through a binary search) or start
+        a new range (which can be done by the first allowed line).
+
+        Version Added:
+            7.0
+
+        Args:
+            iline (str):
+                The stripped inserted line.
+
+            move_key (str):
+                The key for the move range being worked on, if any.
+
+            r_move_ranges (dict):
+                The move ranges being computed, which will be updated.
+
+            disallowed_ri (int):
+                The index of a removed line that cannot start a new range,
+                since it's the line being replaced by the inserted line. This
+                may be ``None``.
+
+        Returns:
+            tuple:
+            A 2-tuple of:
+
+            Tuple:
+                0 (bool):
+                    Whether a move range was updated or added.
+
+                1 (str):
+                    The resulting key for the move range being worked on.
+        """
+        for block in self._remove_index[iline]:
+            self._consume_move_work()
+
+            indexes = block.indexes
+
+            if not indexes:
+                # All lines in this block have been used in moves.
+                continue
+
+            first_ri = indexes[0]
+            r_move_range = r_move_ranges.get(move_key)
+
+            if r_move_range and first_ri == r_move_range.end + 1:
+                # This is part of the current range, so update the end of
+                # the range to include it.
+                r_move_range.end = first_ri
+                r_move_range.add_group(block.group, block.group_index)
+
+                return True, move_key
+
+            # Any further lines will be checked against this group's range.
+            move_key = block.move_key
+            r_move_range = r_move_ranges.get(move_key)
+
+            if r_move_range:
+                # Only a line immediately following the group's range can
+                # update it.
+                next_ri = r_move_range.end + 1
+                i = bisect_left(indexes, next_ri)
+
+                if i < len(indexes) and indexes[i] == next_ri:
+                    r_move_range.end = next_ri
+                    r_move_range.add_group(block.group, block.group_index)
+
+                    return True, move_key
+            else:
+                # We don't have any move ranges for this group yet, so build
+                # one based on the first line that isn't a replace line
+                # "replacing" itself (which would happen if it's just
+                # changing whitespace).
+                for ri in indexes[:2]:
+                    if ri != disallowed_ri:
+                        r_move_ranges[move_key] = MoveRange(
+                            ri, ri, [(block.group, block.group_index)])
+
+                        return True, move_key
+
+        return False, move_key
+
+    def _mark_move_lines_used(self, r_move_indexes_used, r_indexes):
+        """Mark removed lines as used in a move.
+
+        Version Added:
+            7.0
+
+        Args:
+            r_move_indexes_used (set):
+                All remove indexes that have already been included in a move
+                range. This will be updated.
+
+            r_indexes (range):
+                The 0-based indexes of the removed lines to mark.
+        """
+        r_move_indexes_used.update(r_indexes)
+        remove_blocks_by_line_num = self._remove_blocks_by_line_num
+
+        for ri in r_indexes:
+            block = remove_blocks_by_line_num.pop(ri, None)
+
+            if block is not None:
+                indexes = block.indexes
+                del indexes[bisect_left(indexes, ri)]
 
     def _compute_move_for_insert(self, r_move_indexes_used, itag, ii1, ii2,
                                  ij1, ij2, imeta):
@@ -472,7 +762,9 @@ class DiffOpcodeGenerator(object):
 
             updated_range = False
 
-            if iline and iline in self.removes:
+            self._consume_move_work()
+
+            if iline and iline in self._remove_index:
                 # The inserted line at this location has a corresponding
                 # removed line.
                 #
@@ -488,48 +780,20 @@ class DiffOpcodeGenerator(object):
                 #
                 # If there isn't any move information for this line, we'll
                 # simply add it to the move ranges.
-                for ri, rgroup, rgroup_index in self.removes[iline]:
-                    # Ignore any lines that have already been processed as
-                    # part of a move, so we don't end up with incorrect blocks
-                    # of lines being matched.
-                    if ri in r_move_indexes_used:
-                        continue
-
-                    r_move_range = r_move_ranges.get(move_key)
-
-                    if not r_move_range or ri != r_move_range.end + 1:
-                        # We either didn't have a previous range, or this
-                        # group didn't immediately follow it, so we need
-                        # to start a new one.
-                        move_key = '%s-%s-%s-%s' % rgroup[1:5]
-                        r_move_range = r_move_ranges.get(move_key)
-
-                    if r_move_range:
-                        # If the remove information for the line is next in
-                        # the sequence for this calculated move range...
-                        if ri == r_move_range.end + 1:
-                            # This is part of the current range, so update
-                            # the end of the range to include it.
-                            r_move_range.end = ri
-                            r_move_range.add_group(rgroup, rgroup_index)
-                            updated_range = True
-                    else:
-                        # Check that this isn't a replace line that's just
-                        # "replacing" itself (which would happen if it's just
-                        # changing whitespace).
-                        if not is_replace or i_move_cur - ij1 != ri - ii1:
-                            # We don't have any move ranges yet, or we're done
-                            # with the existing range, so it's time to build
-                            # one based on any removed lines we find that
-                            # match the inserted line.
-                            r_move_ranges[move_key] = \
-                                MoveRange(ri, ri, [(rgroup, rgroup_index)])
-                            updated_range = True
-
-                    if updated_range:
-                        # We found a range we were able to update. Don't
-                        # attempt any more matches for removed lines.
-                        break
+                #
+                # Lines that have already been processed as part of a move
+                # are no longer in the index, so we don't end up with
+                # incorrect blocks of lines being matched.
+                if is_replace:
+                    disallowed_ri = ii1 + i_move_cur - ij1
+                else:
+                    disallowed_ri = None
+
+                updated_range, move_key = self._update_move_ranges_for_line(
+                    iline=iline,
+                    move_key=move_key,
+                    r_move_ranges=r_move_ranges,
+                    disallowed_ri=disallowed_ri)
 
                 if not updated_range and r_move_ranges:
                     # We didn't find a move range that this line is a part
@@ -592,6 +856,7 @@ class DiffOpcodeGenerator(object):
                 # We've reached the very end of the insert group. See if
                 # we have anything that looks like a move.
                 if r_move_ranges:
+                    self._consume_move_work(len(r_move_ranges))
                     r_move_range = self._find_longest_move_range(r_move_ranges)
 
                     # If we have a move range, see if it's one we want to
@@ -623,15 +888,13 @@ class DiffOpcodeGenerator(object):
                         r_range = range(r_move_range.start + 1,
                                         r_move_range.end + 2)
 
-                        moved_to_ranges = dict(zip(r_range, i_range))
-
-                        for group, group_index in r_move_range.groups:
-                            rmeta = group[-1]
-                            rmeta.setdefault('moved-to', {}).update(
-                                moved_to_ranges)
-
-                        imeta.setdefault('moved-from', {}).update(
-                            dict(zip(i_range, r_range)))
+                        self._consume_move_work(len(r_range))
+                        self._pending_moves.append((
+                            r_move_range.groups,
+                            dict(zip(r_range, i_range)),
+                            imeta,
+                            dict(zip(i_range, r_range)),
+                        ))
 
                         # Record each of the positions in the removed range
                         # as used, so that they're not factored in again when
@@ -639,7 +902,9 @@ class DiffOpcodeGenerator(object):
                         #
                         # We'll use the r_range above, but normalize back to
                         # 0-based indexes.
-                        r_move_indexes_used.update(r - 1 for r in r_range)
+                        self._mark_move_lines_used(
+                            r_move_indexes_used,
+                            range(r_move_range.start, r_move_range.end + 1))
 
                 # Reset the state for the next range.
                 move_key = None
@@ -6,8 +6,10 @@ import io
 import logging
 import re
 import weakref
+from array import array
+from bisect import bisect_left
 from copy import deepcopy
-from typing import Optional, Union
+from typing import Optional, Sequence, TYPE_CHECKING, Union, overload
 
 from django.utils.translation import gettext as _
 from djblets.util.properties import TypedProperty
@@ -18,6 +20,9 @@ from typing_extensions import TypeAlias
 from reviewboard.diffviewer.errors import DiffParserError
 from reviewboard.scmtools.core import HEAD, PRE_CREATION, Revision, UNKNOWN
 
+if TYPE_CHECKING:
+    from reviewboard.diffviewer.diffutils import DiffChunksInfoCollector
+
 
 logger = logging.getLogger(__name__)
 
@@ -211,6 +216,17 @@ class ParsedDiffFile(object):
         delete_count (int):
             The number of delete (``-``) lines found in the file.
 
+        diff_chunks_info (list of dict):
+            Information on each chunk in the file's diff, in the format
+            returned by :py:func:`~reviewboard.diffviewer.diffutils.
+            get_diff_data_chunks_info`. This is collected by
+            :py:class:`DiffParser` while parsing, and is available once
+            :py:meth:`finalize` has been called. It will be ``None`` if the
+            parser didn't collect it.
+
+            Version Added:
+                7.0
+
         insert_count (int):
             The number of insert (``+``) lines found in the file.
 
@@ -345,9 +361,12 @@ class ParsedDiffFile(object):
         self.is_symlink = False
         self.insert_count = 0
         self.delete_count = 0
+        self.diff_chunks_info = None
         self.skip = False
         self.extra_data = {}
 
+        self._diff_chunks_info_collector = None
+
         self._data_io = io.BytesIO()
         self._data = None
 
@@ -397,10 +416,18 @@ class ParsedDiffFile(object):
 
         This makes the diff data available to consumers and closes the buffer
         for writing.
+
+        Version Changed:
+            7.0:
+            This now sets :py:attr:`diff_chunks_info`, if collected by the
+            parser.
         """
         self._data = self._data_io.getvalue()
         self._data_io.close()
 
+        if self._diff_chunks_info_collector is not None:
+            self.diff_chunks_info = self._diff_chunks_info_collector.finish()
+
     def prepend_data(self, data):
         """Prepend data to the buffer.
 
@@ -561,6 +588,268 @@ class BaseDiffParser(object):
             return filename
 
 
+class DiffLines(Sequence[bytes]):
+    """The lines in a diff, indexed by their offsets in the diff data.
+
+    This behaves like a read-only list of lines, split the same way as
+    :py:func:`~reviewboard.diffviewer.diffutils.split_line_endings`.
+    Rather than splitting the diff into a separate byte string per line
+    up-front, this stores the start and end offsets of each line, and only
+    builds byte strings for lines as they're accessed.
+
+    It also provides helpers for working with ranges of lines at once, which
+    :py:class:`DiffParser` uses to locate file headers using bulk searches
+    and to copy file contents without going line-by-line.
+
+    Version Added:
+        7.0
+    """
+
+    ######################
+    # Instance variables #
+    ######################
+
+    #: The diff content.
+    data: bytes
+
+    #: Whether all lines in the diff end with a ``\\n``.
+    #:
+    #: If ``False``, the diff contains at least one ``\\r``, and range-based
+    #: operations will fall back to working on individual lines.
+    lf_only: bool
+
+    def __init__(
+        self,
+        data: bytes,
+    ) -> None:
+        """Initialize the lines.
+
+        Args:
+            data (bytes):
+                The diff content to index.
+        """
+        from reviewboard.diffviewer.diffutils import NEWLINE_BYTES_RE
+
+        self.data = data
+        self.lf_only = b'\r' not in data
+
+        if self.lf_only:
+            newline_re = re.compile(b'\n')
+        else:
+            newline_re = NEWLINE_BYTES_RE
+
+        # Build the offsets without creating any intermediary objects for
+        # each line.
+        starts = array('q', [0])
+        starts.extend(map(re.Match.end, newline_re.finditer(data)))
+
+        ends = array('q', map(re.Match.start, newline_re.finditer(data)))
+        ends.append(len(data))
+
+        # Like split_line_endings(), don't include an empty line after a
+        # trailing newline.
+        if starts[-1] == len(data):
+            starts.pop()
+            ends.pop()
+
+        self._starts = starts
+        self._ends = ends
+        self._view = memoryview(data)
+        self._prefix_search_cache: dict[bytes, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of lines.
+
+        Returns:
+            int:
+            The number of lines.
+        """
+        return len(self._starts)
+
+    @overload
+    def __getitem__(self, index: int) -> bytes:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[bytes]:
+        ...
+
+    def __getitem__(
+        self,
+        index: Union[int, slice],
+    ) -> Union[bytes, list[bytes]]:
+        """Return a line or list of lines.
+
+        Args:
+            index (int or slice):
+                The index of the line, or a slice of lines.
+
+        Returns:
+            bytes or list of bytes:
+            The line (without a line ending), or a list of lines for a slice.
+
+        Raises:
+            IndexError:
+                The line index was out of range.
+        """
+        if isinstance(index, slice):
+            return [
+                self[i]
+                for i in range(*index.indices(len(self._starts)))
+            ]
+
+        if index < 0:
+            index += len(self._starts)
+
+        if index < 0 or index >= len(self._starts):
+            raise IndexError('list index out of range')
+
+        return self.data[self._starts[index]:self._ends[index]]
+
+    def get_range_data(
+        self,
+        start: int,
+        end: int,
+    ) -> Union[bytes, memoryview]:
+        """Return the content of a range of lines, separated by newlines.
+
+        The result is equivalent to ``b'\\n'.join(lines[start:end])``. When
+        all lines in the diff end with a ``\\n``, this will be a view into
+        the diff data, rather than a copy.
+
+        Args:
+            start (int):
+                The index of the first line.
+
+            end (int):
+                The index after the last line. This must be greater than
+                ``start``.
+
+        Returns:
+            bytes or memoryview:
+            The content of the lines.
+        """
+        if self.lf_only:
+            return self._view[self._starts[start]:self._ends[end - 1]]
+        else:
+            return b'\n'.join(self[start:end])
+
+    def count_range_prefix(
+        self,
+        prefix: bytes,
+        start: int,
+        end: int,
+    ) -> int:
+        """Return the number of lines in a range starting with a prefix.
+
+        Args:
+            prefix (bytes):
+                The prefix to look for.
+
+            start (int):
+                The index of the first line.
+
+            end (int):
+                The index after the last line. This must be greater than
+                ``start``.
+
+        Returns:
+            int:
+            The number of matching lines.
+        """
+        if self.lf_only:
+            data = self.data
+            range_start = self._starts[start]
+            range_end = self._ends[end - 1]
+
+            return (int(data.startswith(prefix, range_start, range_end)) +
+                    data.count(b'\n' + prefix, range_start, range_end))
+        else:
+            return sum(
+                1
+                for line in self[start:end]
+                if line.startswith(prefix)
+            )
+
+    def find_prefix(
+        self,
+        prefixes: tuple[bytes, ...],
+        start: int = 0,
+    ) -> int:
+        """Return the index of the next line starting with any prefix.
+
+        When all lines in the diff end with a ``\\n``, this searches the
+        diff data directly for each prefix, remembering results between
+        calls so that a prefix that is rarely or never present doesn't cause
+        the rest of the diff to be searched again on every call.
+
+        Args:
+            prefixes (tuple of bytes):
+                The prefixes to look for.
+
+            start (int, optional):
+                The index of the first line to check.
+
+        Returns:
+            int:
+            The index of the first matching line at or after ``start``, or
+            the number of lines if there are no matches.
+        """
+        num_lines = len(self._starts)
+
+        if start >= num_lines:
+            return num_lines
+
+        data = self.data
+        starts = self._starts
+
+        if not self.lf_only:
+            ends = self._ends
+
+            for i in range(start, num_lines):
+                if data.startswith(prefixes, starts[i], ends[i]):
+                    return i
+
+            return num_lines
+
+        offset = starts[start]
+
+        if data.startswith(prefixes, offset):
+            return start
+
+        # Each cached result is a tuple of the offset the search began at
+        # and the offset of the matching line (or the end of the data, if
+        # not found). It can be reused for any search starting between the
+        # two.
+        cache = self._prefix_search_cache
+        not_found = len(data)
+        match_offset = not_found
+
+        for prefix in prefixes:
+            cached = cache.get(prefix)
+
+            if (cached is not None and
+                cached[0] <= offset <= cached[1]):
+                found = cached[1]
+            else:
+                found = data.find(b'\n' + prefix, offset)
+
+                if found == -1:
+                    found = not_found
+                else:
+                    found += 1
+
+                cache[prefix] = (offset, found)
+
+            if found < match_offset:
+                match_offset = found
+
+        if match_offset == not_found:
+            return num_lines
+
+        return bisect_left(starts, match_offset)
+
+
 class DiffParser(BaseDiffParser):
     """Parses diff files, allowing subclasses to specialize parsing behavior.
 
@@ -588,6 +877,40 @@ class DiffParser(BaseDiffParser):
     #: Its presence and location is not guaranteed.
     INDEX_SEP = b'=' * 67
 
+    #: Prefixes for any line that may begin a file's headers.
+    #:
+    #: If set, :py:meth:`parse` will only try parsing file headers at lines
+    #: starting with one of these prefixes, copying all other lines in bulk
+    #: to the current file (or preamble). This must cover every line that
+    #: :py:meth:`parse_special_header` or :py:meth:`parse_diff_header` may
+    #: act upon. If ``None``, parsing of headers is attempted at every line.
+    #:
+    #: This only applies to the class that sets it. Subclasses that override
+    #: :py:meth:`parse_change_header`, :py:meth:`parse_special_header`,
+    #: :py:meth:`parse_diff_header`, :py:meth:`parse_after_headers`, or
+    #: :py:meth:`parse_diff_line` must set this themselves in order to opt
+    #: into this behavior.
+    #:
+    #: Version Added:
+    #:     7.0
+    FILE_HEADER_PREFIXES: Optional[tuple[bytes, ...]] = (
+        b'Index: ',
+        b'--- ',
+        b'*** ',
+    )
+
+    #: Methods that affect whether a line begins a new file.
+    #:
+    #: Overriding any of these disables :py:attr:`FILE_HEADER_PREFIXES`
+    #: unless also set by the overriding class.
+    _FILE_HEADER_METHODS = (
+        'parse_after_headers',
+        'parse_change_header',
+        'parse_diff_header',
+        'parse_diff_line',
+        'parse_special_header',
+    )
+
     ######################
     # Instance variables #
     ######################
@@ -596,7 +919,11 @@ class DiffParser(BaseDiffParser):
     base_commit_id: Optional[str]
 
     #: The diff content, split into lines.
-    lines: list[bytes]
+    #:
+    #: Version Changed:
+    #:     7.0:
+    #:     This is now a :py:class:`DiffLines`, rather than a list.
+    lines: DiffLines
 
     #: The new commit ID, if available.
     new_commit_id: Optional[str]
@@ -632,13 +959,16 @@ class DiffParser(BaseDiffParser):
             TypeError:
                 The provided ``data`` argument was not a ``bytes`` type.
         """
-        from reviewboard.diffviewer.diffutils import split_line_endings
-
         super().__init__(data, **kwargs)
 
         self.base_commit_id = None
         self.new_commit_id = None
-        self.lines = split_line_endings(data)
+        self.lines = DiffLines(data)
+
+        # Chunk information can only be collected if every line of changes
+        # goes through our implementation of parse_diff_line().
+        self._collect_diff_chunks_info = (
+            type(self).parse_diff_line is DiffParser.parse_diff_line)
 
         self.parsed_diff = ParsedDiff(
             parser=self,
@@ -715,8 +1045,28 @@ class DiffParser(BaseDiffParser):
         parsed_file = None
         i = 0
 
+        lines = self.lines
+        header_prefixes = self._get_file_header_prefixes()
+
         # Go through each line in the diff, looking for diff headers.
-        while i < len(self.lines):
+        while i < len(lines):
+            if header_prefixes is not None:
+                header_linenum = lines.find_prefix(header_prefixes, i)
+
+                if header_linenum > i:
+                    # None of the lines up to the next possible header can
+                    # start a new file, so take them all at once.
+                    if parsed_file:
+                        self._append_diff_lines(i, header_linenum,
+                                                parsed_file)
+                    else:
+                        preamble.write(lines.get_range_data(i,
+                                                            header_linenum))
+                        preamble.write(b'\n')
+
+                    i = header_linenum
+                    continue
+
             next_linenum, new_file = self.parse_change_header(i)
 
             if new_file:
@@ -751,6 +1101,103 @@ class DiffParser(BaseDiffParser):
 
         return self.files
 
+    def _get_file_header_prefixes(self) -> Optional[tuple[bytes, ...]]:
+        """Return the prefixes for lines that may begin a file's headers.
+
+        This will return :py:attr:`FILE_HEADER_PREFIXES` if it was set by
+        the class (or a parent class) overriding the header parsing methods.
+
+        Version Added:
+            7.0
+
+        Returns:
+            tuple of bytes:
+            The prefixes, or ``None`` if every line must be checked for
+            headers.
+        """
+        if not isinstance(self.lines, DiffLines):
+            return None
+
+        for cls in type(self).__mro__:
+            cls_attrs = vars(cls)
+
+            if 'FILE_HEADER_PREFIXES' in cls_attrs:
+                return cls_attrs['FILE_HEADER_PREFIXES']
+
+            if any(name in cls_attrs
+                   for name in self._FILE_HEADER_METHODS):
+                return None
+
+        return None
+
+    def _append_diff_lines(
+        self,
+        start: int,
+        end: int,
+        parsed_file: ParsedDiffFile,
+    ) -> None:
+        """Append a range of lines of data to a parsed file.
+
+        This is equivalent to calling :py:meth:`parse_diff_line` for each
+        line in the range, but works on the whole range at once.
+
+        Version Added:
+            7.0
+
+        Args:
+            start (int):
+                The 0-based line number of the first line.
+
+            end (int):
+                The 0-based line number after the last line.
+
+            parsed_file (ParsedDiffFile):
+                The current parsed diff file info.
+        """
+        lines = self.lines
+
+        if (parsed_file.orig_filename is not None and
+            parsed_file.modified_filename is not None):
+            parsed_file.delete_count += \
+                lines.count_range_prefix(b'-', start, end)
+            parsed_file.insert_count += \
+                lines.count_range_prefix(b'+', start, end)
+
+        if self._collect_diff_chunks_info:
+            self._get_diff_chunks_info_collector(parsed_file).add_lines(
+                lines[start:end])
+
+        parsed_file.append_data(lines.get_range_data(start, end))
+        parsed_file.append_data(b'\n')
+
+    def _get_diff_chunks_info_collector(
+        self,
+        parsed_file: ParsedDiffFile,
+    ) -> DiffChunksInfoCollector:
+        """Return the collector for information on a file's chunks.
+
+        Version Added:
+            7.0
+
+        Args:
+            parsed_file (ParsedDiffFile):
+                The current parsed diff file info.
+
+        Returns:
+            reviewboard.diffviewer.diffutils.DiffChunksInfoCollector:
+            The collector for the file.
+        """
+        collector = parsed_file._diff_chunks_info_collector
+
+        if collector is None:
+            from reviewboard.diffviewer.diffutils import \
+                DiffChunksInfoCollector
+
+            collector = DiffChunksInfoCollector()
+            parsed_file._diff_chunks_info_collector = collector
+
+        return collector
+
     def parse_diff_line(self, linenum, parsed_file):
         """Parse a line of data in a diff.
 
@@ -758,6 +1205,12 @@ class DiffParser(BaseDiffParser):
         content represents active changes to a file, its insert/delete counts
         will be updated to reflect them.
 
+        Version Changed:
+            7.0:
+            This now collects information on the file's chunks for
+            :py:attr:`ParsedDiffFile.diff_chunks_info`, unless overridden by
+            a subclass.
+
         Args:
             linenum (int):
                 The 0-based line number.
@@ -778,6 +1231,10 @@ class DiffParser(BaseDiffParser):
             elif line.startswith(b'+'):
                 parsed_file.insert_count += 1
 
+        if self._collect_diff_chunks_info:
+            self._get_diff_chunks_info_collector(parsed_file).add_lines(
+                (line,))
+
         parsed_file.append_data(line)
         parsed_file.append_data(b'\n')
 
@@ -0,0 +1,358 @@
+"""An in-process applier for unified diffs.
+
+Applying a diff through :program:`patch` requires writing the original file
+to a temporary directory, spawning a process, and reading the result back.
+For the common case, where every hunk in a diff applies exactly at the
+location it names, this is a lot of overhead for something that can be done
+cheaply in memory.
+
+This module implements a strict subset of :program:`patch`: unified diffs
+for a single file, where every hunk's context and deleted lines match the
+original file exactly at the stated line numbers. That's the first location
+GNU patch tries for every hunk, so for any diff this module accepts, the
+result is identical to what :program:`patch` would produce.
+
+Anything outside of that subset (offsets, fuzz, unknown headers, multiple
+files, malformed hunks, etc.) results in a :py:class:`InProcessPatchError`,
+and callers are expected to fall back on :program:`patch`, which will
+either apply the diff or produce the reject information for the error.
+
+Version Added:
+    7.0
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Optional
+
+
+#: A regex for matching a unified diff hunk header.
+_HUNK_HEADER_RE = re.compile(
+    br'^@@ -(?P<orig_start>\d+)(?:,(?P<orig_len>\d+))? '
+    br'\+(?P<modified_start>\d+)(?:,(?P<modified_len>\d+))? @@')
+
+#: A regex for matching lines that are safe to skip before the file headers.
+#:
+#: These are the headers that Git, Subversion, Mercurial, CVS, and other
+#: tools commonly place before the ``---``/``+++`` lines, and which
+#: :program:`patch` ignores. Anything else may be interpreted by
+#: :program:`patch` in some way (such as ``Prereq:``), so we won't handle it.
+_PREAMBLE_LINE_RE = re.compile(
+    br'^(?:'
+    br'diff |index |Index: |={3,}|'
+    br'(?:new|deleted) file mode |old mode |new mode |'
+    br'(?:dis)?similarity index |rename (?:from|to) |copy (?:from|to) |'
+    br'RCS file: |retrieving revision |'
+    br'# |'
+    br'$)')
+
+#: A regex for matching lines after hunks that may start a new diff.
+_DIFF_START_RE = re.compile(
+    br'^(?:---|\+\+\+|\*\*\*|@@|diff |Index: |Prereq: |'
+    br'\d+(?:,\d+)?[acd]\d+)')
+
+_NO_NEWLINE_MARKER = b'\\'
+_DEV_NULL = b'/dev/null'
+
+
+class InProcessPatchError(Exception):
+    """The diff could not be applied in-process.
+
+    This is not a user-facing error. It indicates that the diff falls
+    outside of what :py:func:`apply_patch` can apply with a guarantee of
+    matching :program:`patch`, and that the caller should fall back on
+    :program:`patch`.
+
+    Version Added:
+        7.0
+    """
+
+
+class _Hunk:
+    """A parsed hunk from a unified diff.
+
+    Version Added:
+        7.0
+    """
+
+    __slots__ = ('orig_start', 'orig_len', 'old_lines', 'new_lines',
+                 'leading_context', 'trailing_context')
+
+    def __init__(
+        self,
+        orig_start: int,
+        orig_len: int,
+    ) -> None:
+        """Initialize the hunk.
+
+        Args:
+            orig_start (int):
+                The 1-based starting line in the original file.
+
+            orig_len (int):
+                The number of lines from the original file in the hunk.
+        """
+        self.orig_start = orig_start
+        self.orig_len = orig_len
+        self.old_lines: List[bytes] = []
+        self.new_lines: List[bytes] = []
+        self.leading_context = 0
+        self.trailing_context = 0
+
+
+def _strip_newline(
+    lines: List[bytes],
+) -> None:
+    """Strip the trailing newline from the last line in a list.
+
+    This is used to process ``\\ No newline at end of file`` markers.
+
+    Args:
+        lines (list of bytes):
+            The list of lines to modify.
+
+    Raises:
+        InProcessPatchError:
+            There was no line to strip.
+    """
+    if not lines or not lines[-1].endswith(b'\n'):
+        raise InProcessPatchError('Unexpected "No newline" marker')
+
+    lines[-1] = lines[-1][:-1]
+
+
+def _parse_hunks(
+    diff_lines: List[bytes],
+) -> tuple[List[_Hunk], Optional[bytes], Optional[bytes]]:
+    """Parse the hunks out of a single-file unified diff.
+
+    Args:
+        diff_lines (list of bytes):
+            The lines of the diff, with newlines intact.
+
+    Returns:
+        tuple:
+        A 3-tuple of:
+
+        Tuple:
+            0 (list of _Hunk):
+                The parsed hunks.
+
+            1 (bytes):
+                The original filename from the ``---`` header.
+
+            2 (bytes):
+                The modified filename from the ``+++`` header.
+
+    Raises:
+        InProcessPatchError:
+            The diff can't be safely parsed.
+    """
+    num_lines = len(diff_lines)
+    i = 0
+
+    # Skip past any known preamble to find the file headers.
+    while i < num_lines:
+        line = diff_lines[i]
+
+        if line.startswith(b'--- '):
+            break
+
+        if not _PREAMBLE_LINE_RE.match(line):
+            raise InProcessPatchError('Unknown line in diff preamble')
+
+        i += 1
+
+    if i + 1 >= num_lines or not diff_lines[i + 1].startswith(b'+++ '):
+        raise InProcessPatchError('Missing unified diff file headers')
+
+    orig_filename = diff_lines[i][4:].split(b'\t', 1)[0].strip()
+    modified_filename = diff_lines[i + 1][4:].split(b'\t', 1)[0].strip()
+    i += 2
+
+    hunks: List[_Hunk] = []
+
+    while i < num_lines:
+        m = _HUNK_HEADER_RE.match(diff_lines[i])
+
+        if not m:
+            break
+
+        orig_len = m.group('orig_len')
+        modified_len = m.group('modified_len')
+
+        hunk = _Hunk(orig_start=int(m.group('orig_start')),
+                     orig_len=int(orig_len) if orig_len is not None else 1)
+        old_remaining = hunk.orig_len
+        new_remaining = (int(modified_len)
+                         if modified_len is not None
+                         else 1)
+        last_lines: List[List[bytes]] = []
+        seen_change = False
+        i += 1
+
+        while i < num_lines and (old_remaining > 0 or new_remaining > 0):
+            line = diff_lines[i]
+            prefix = line[:1]
+            content = line[1:]
+
+            if prefix == b' ':
+                hunk.old_lines.append(content)
+                hunk.new_lines.append(content)
+                old_remaining -= 1
+                new_remaining -= 1
+                last_lines = [hunk.old_lines, hunk.new_lines]
+
+                if seen_change:
+                    hunk.trailing_context += 1
+                else:
+                    hunk.leading_context += 1
+            elif prefix == b'-':
+                hunk.old_lines.append(content)
+                old_remaining -= 1
+                last_lines = [hunk.old_lines]
+                seen_change = True
+                hunk.trailing_context = 0
+            elif prefix == b'+':
+                hunk.new_lines.append(content)
+                new_remaining -= 1
+                last_lines = [hunk.new_lines]
+                seen_change = True
+                hunk.trailing_context = 0
+            elif prefix == _NO_NEWLINE_MARKER:
+                for lines in last_lines:
+                    _strip_newline(lines)
+
+                last_lines = []
+            else:
+                # This covers blank lines (which patch treats as context
+                # stripped of whitespace) and truncated hunks.
+                raise InProcessPatchError('Unexpected line in hunk')
+
+            i += 1
+
+        if old_remaining != 0 or new_remaining != 0:
+            raise InProcessPatchError('Hunk line counts do not match')
+
+        # A "No newline" marker may follow the last line of the hunk.
+        if (i < num_lines and
+            diff_lines[i].startswith(_NO_NEWLINE_MARKER)):
+            for lines in last_lines:
+                _strip_newline(lines)
+
+            i += 1
+
+        hunks.append(hunk)
+
+    if not hunks:
+        raise InProcessPatchError('No hunks found in diff')
+
+    # Anything left over must be trailing garbage that patch would ignore,
+    # and not the start of another diff.
+    for line in diff_lines[i:]:
+        if _DIFF_START_RE.match(line):
+            raise InProcessPatchError('Unexpected content after hunks')
+
+    return hunks, orig_filename, modified_filename
+
+
+def apply_patch(
+    diff: bytes,
+    orig_file: bytes,
+) -> bytes:
+    """Apply a single-file unified diff to a file in memory.
+
+    Both the diff and the file are expected to have already had their line
+    endings normalized (see
+    :py:func:`reviewboard.diffviewer.diffutils.convert_line_endings`).
+
+    Every hunk must apply exactly at the line it specifies. If any hunk
+    does not, or if the diff contains anything this function can't apply
+    with the same result as :program:`patch`, an
+    :py:class:`InProcessPatchError` will be raised.
+
+    Version Added:
+        7.0
+
+    Args:
+        diff (bytes):
+            The contents of the diff to apply.
+
+        orig_file (bytes):
+            The contents of the original file.
+
+    Returns:
+        bytes:
+        The contents of the patched file.
+
+    Raises:
+        InProcessPatchError:
+            The diff could not be applied in-process. The caller should fall
+            back on :program:`patch`.
+    """
+    if not isinstance(diff, bytes) or not isinstance(orig_file, bytes):
+        raise InProcessPatchError('The diff and file must be bytes')
+
+    if not diff.endswith(b'\n'):
+        # patch has its own rules for a truncated final line.
+        raise InProcessPatchError('The diff does not end with a newline')
+
+    hunks, orig_filename, modified_filename = \
+        _parse_hunks(diff.splitlines(True))
+
+    if orig_file and orig_filename == _DEV_NULL:
+        # patch will refuse to create a file that already exists.
+        raise InProcessPatchError('Diff creates a file that already exists')
+
+    orig_lines = orig_file.splitlines(True)
+    num_orig_lines = len(orig_lines)
+    result: List[bytes] = []
+    pos = 0
+
+    for hunk in hunks:
+        if hunk.orig_len == 0:
+            # Pure insertions are placed after the stated line.
+            if hunk.orig_start == 0 and orig_file:
+                raise InProcessPatchError(
+                    'Diff creates a file that already exists')
+
+            start = hunk.orig_start
+        else:
+            start = hunk.orig_start - 1
+
+        end = start + len(hunk.old_lines)
+
+        if (start < pos or
+            end > num_orig_lines or
+            orig_lines[start:end] != hunk.old_lines):
+            raise InProcessPatchError('Hunk does not apply cleanly')
+
+        # patch treats hunks with less context on one side as being
+        # anchored to the start or end of the file.
+        if ((hunk.leading_context < hunk.trailing_context and
+             start != 0) or
+            (hunk.trailing_context < hunk.leading_context and
+             end != num_orig_lines)):
+            raise InProcessPatchError('Hunk is not anchored to the file')
+
+        new_lines = hunk.new_lines
+
+        if (new_lines and
+            not new_lines[-1].endswith(b'\n') and
+            end != num_orig_lines):
+            raise InProcessPatchError(
+                'Missing newline before the end of the file')
+
+        result += orig_lines[pos:start]
+        result += new_lines
+        pos = end
+
+    result += orig_lines[pos:]
+    new_file = b''.join(result)
+
+    if new_file and modified_filename == _DEV_NULL:
+        # patch will warn and keep the file rather than deleting it.
+        raise InProcessPatchError('Diff deletes a file with remaining content')
+
+    return new_file
@@ -21,7 +21,8 @@ CHUNK_RANGE_RE = re.compile(
 
 
 def filter_interdiff_opcodes(opcodes, filediff_data, interfilediff_data,
-                             request=None):
+                             request=None, filediff_chunks_info=None,
+                             interfilediff_chunks_info=None):
     """Filter the opcodes for an interdiff to remove unnecessary lines.
 
     An interdiff may contain lines of code that have changed as the result of
@@ -32,6 +33,11 @@ def filter_interdiff_opcodes(opcodes, filediff_data, interfilediff_data,
     possible. It will only output non-"equal" opcodes if it falls into the
     ranges of lines dictated in the uploaded diff files.
 
+    Version Changed:
+        7.0:
+        Added the ``filediff_chunks_info`` and ``interfilediff_chunks_info``
+        arguments.
+
     Version Changed:
         3.0.18:
         Added the ``request`` argument, and added support for the version 2
@@ -51,14 +57,31 @@ def filter_interdiff_opcodes(opcodes, filediff_data, interfilediff_data,
         request (django.http.HttpRequest, optional):
             The HTTP request from the client.
 
+        filediff_chunks_info (list of dict, optional):
+            Pre-computed information on the chunks in ``filediff_data``, as
+            returned by :py:func:`~reviewboard.diffviewer.diffutils.
+            get_diff_data_chunks_info`. If not provided, this will be
+            computed from the diff.
+
+            Version Added:
+                7.0
+
+        interfilediff_chunks_info (list of dict, optional):
+            Pre-computed information on the chunks in
+            ``interfilediff_data``. If not provided, this will be computed
+            from the diff.
+
+            Version Added:
+                7.0
+
     Yields:
         tuple:
         An opcode to render for the diff.
     """
-    def _find_range_info_v1(diff):
+    def _find_range_info_v1(chunks_info):
         ranges = []
 
-        for range_info in get_diff_data_chunks_info(diff):
+        for range_info in chunks_info:
             orig_info = range_info['orig']
             modified_info = range_info['modified']
 
@@ -95,10 +118,10 @@ def filter_interdiff_opcodes(opcodes, filediff_data, interfilediff_data,
 
         return ranges
 
-    def _find_range_info_v2(diff):
+    def _find_range_info_v2(chunks_info):
         ranges = []
 
-        for range_info in get_diff_data_chunks_info(diff):
+        for range_info in chunks_info:
             orig_info = range_info['orig']
             modified_info = range_info['modified']
 
@@ -148,8 +171,15 @@ def filter_interdiff_opcodes(opcodes, filediff_data, interfilediff_data,
     else:
         _find_range_info = _find_range_info_v1
 
-    orig_ranges = _find_range_info(filediff_data)
-    new_ranges = _find_range_info(interfilediff_data)
+    if filediff_chunks_info is None:
+        filediff_chunks_info = get_diff_data_chunks_info(filediff_data)
+
+    if interfilediff_chunks_info is None:
+        interfilediff_chunks_info = \
+            get_diff_data_chunks_info(interfilediff_data)
+
+    orig_ranges = _find_range_info(filediff_chunks_info)
+    new_ranges = _find_range_info(interfilediff_chunks_info)
 
     orig_range_i = 0
     new_range_i = 0
@@ -20,6 +20,19 @@ from djblets.siteconfig.models import SiteConfiguration
 from reviewboard.site.models import LocalSite
 
 
+#: Names of settings that don't affect the resulting diffs.
+#:
+#: These are excluded from :py:attr:`DiffSettings.state_hash`, so that
+#: changing them doesn't invalidate cached diffs.
+#:
+#: Version Added:
+#:     7.0
+_STATE_HASH_EXCLUDED_FIELDS = {
+    'chunk_generation_workers',
+    'differ_backend',
+}
+
+
 @dataclass
 class DiffSettings:
     """Settings used to render a diff.
@@ -33,6 +46,17 @@ class DiffSettings:
         5.0.2
     """
 
+    #: The maximum number of files to generate chunks for concurrently.
+    #:
+    #: A value of 0 or 1 generates chunks for one file at a time.
+    #:
+    #: Version Added:
+    #:     7.0
+    #:
+    #: Type:
+    #:     int
+    chunk_generation_workers: int
+
     #: A mapping of code safety checker IDs to configurations.
     #:
     #: Type:
@@ -63,6 +87,34 @@ class DiffSettings:
     #:     list of str
     include_space_patterns: List[str]
 
+    #: The backend used to compute Myers diffs.
+    #:
+    #: This is one of the values in
+    #: :py:class:`~reviewboard.diffviewer.differ.DifferBackend`. All backends
+    #: produce identical results.
+    #:
+    #: Version Added:
+    #:     7.0
+    #:
+    #: Type:
+    #:     str
+    differ_backend: str
+
+    #: The maximum amount of work to spend on move detection for a file.
+    #:
+    #: If move detection exceeds this, the file is shown without any moves.
+    #: A value of 0 disables the limit. See
+    #: :py:attr:`DiffOpcodeGenerator.MOVE_DETECTION_WORK_BUDGET
+    #: <reviewboard.diffviewer.opcode_generator.DiffOpcodeGenerator.
+    #: MOVE_DETECTION_WORK_BUDGET>`.
+    #:
+    #: Version Added:
+    #:     7.0
+    #:
+    #: Type:
+    #:     int
+    move_detection_work_budget: int
+
     #: The number of files to include in each page of a diff.
     #:
     #: Type:
@@ -167,6 +219,9 @@ class DiffSettings:
             assert syntax_highlighting is not None
 
         return cls(
+            chunk_generation_workers=cast(
+                int,
+                siteconfig.get('diffviewer_chunk_generation_workers')),
             code_safety_configs=cast(
                 Dict,
                 siteconfig.get('code_safety_checkers')
@@ -177,9 +232,15 @@ class DiffSettings:
             custom_pygments_lexers=cast(
                 Dict[str, str],
                 siteconfig.get('diffviewer_custom_pygments_lexers')),
+            differ_backend=cast(
+                str,
+                siteconfig.get('diffviewer_differ_backend')),
             include_space_patterns=cast(
                 List[str],
                 siteconfig.get('diffviewer_include_space_patterns')),
+            move_detection_work_budget=cast(
+                int,
+                siteconfig.get('diffviewer_move_detection_work_budget')),
             paginate_by=cast(
                 int,
                 siteconfig.get('diffviewer_paginate_by')),
@@ -201,6 +262,14 @@ class DiffSettings:
         This is calculated only once per instance. It won't take into account
         any setting changes since the first access.
 
+        Settings that don't affect the resulting diffs, such as
+        :py:attr:`differ_backend` and :py:attr:`chunk_generation_workers`,
+        are not included.
+
+        Version Changed:
+            7.0:
+            Settings that don't affect the resulting diffs are now excluded.
+
         Type:
             str
         """
@@ -209,6 +278,7 @@ class DiffSettings:
                 {
                     field.name: getattr(self, field.name)
                     for field in dataclass_fields(self)
+                    if field.name not in _STATE_HASH_EXCLUDED_FIELDS
                 },
                 sort_keys=True)
             .encode('utf-8')
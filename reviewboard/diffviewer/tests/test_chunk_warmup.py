@@ -0,0 +1,205 @@
+"""Unit tests for reviewboard.diffviewer.chunk_warmup.
+
+Version Added:
+    7.0
+"""
+
+from __future__ import annotations
+
+import kgb
+
+from reviewboard.diffviewer import diffutils
+from reviewboard.diffviewer.chunk_warmup import (ChunkWarmUpQueue,
+                                                 ChunkWarmUpState,
+                                                 chunk_warmup_queue)
+from reviewboard.diffviewer.settings import DiffSettings
+from reviewboard.reviews.signals import review_request_diffset_uploaded
+from reviewboard.testing import TestCase
+
+
+class ChunkWarmUpQueueTests(kgb.SpyAgency, TestCase):
+    """Unit tests for ChunkWarmUpQueue."""
+
+    fixtures = ['test_users', 'test_scmtools']
+
+    def setUp(self):
+        super().setUp()
+
+        review_request = self.create_review_request(create_repository=True)
+        self.diffset = self.create_diffset(review_request)
+        self.filediff1 = self.create_filediff(self.diffset,
+                                              source_file='/file1',
+                                              dest_file='/file1')
+        self.filediff2 = self.create_filediff(self.diffset,
+                                              source_file='/file2',
+                                              dest_file='/file2')
+
+        self.queue = ChunkWarmUpQueue(run_in_background=False)
+
+    def test_enqueue(self):
+        """Testing ChunkWarmUpQueue.enqueue"""
+        self.assertTrue(self.queue.enqueue(self.diffset))
+
+        self.assertEqual(self.queue.get_pending(), [self.diffset.pk])
+
+        status = self.queue.get_status(self.diffset.pk)
+        self.assertEqual(status['state'], ChunkWarmUpState.QUEUED)
+        self.assertIsNone(status['num_files'])
+        self.assertEqual(status['num_files_warmed'], 0)
+
+    def test_enqueue_with_already_queued(self):
+        """Testing ChunkWarmUpQueue.enqueue with diffset already queued"""
+        self.assertTrue(self.queue.enqueue(self.diffset))
+        self.assertFalse(self.queue.enqueue(self.diffset))
+
+        self.assertEqual(self.queue.get_pending(), [self.diffset.pk])
+
+    def test_enqueue_with_already_warmed_up(self):
+        """Testing ChunkWarmUpQueue.enqueue with diffset already warmed up"""
+        self.spy_on(diffutils.populate_diff_chunks,
+                    call_original=False)
+
+        self.queue.enqueue(self.diffset)
+        self.queue.drain()
+
+        self.assertFalse(self.queue.enqueue(self.diffset))
+        self.assertEqual(self.queue.get_pending(), [])
+
+    def test_drain(self):
+        """Testing ChunkWarmUpQueue.drain"""
+        self.spy_on(diffutils.populate_diff_chunks,
+                    call_original=False)
+
+        self.queue.enqueue(self.diffset)
+
+        self.assertEqual(self.queue.drain(), [self.diffset.pk])
+        self.assertEqual(self.queue.get_pending(), [])
+        self.assertSpyCallCount(diffutils.populate_diff_chunks, 2)
+
+        status = self.queue.get_status(self.diffset.pk)
+        self.assertEqual(status['state'], ChunkWarmUpState.DONE)
+        self.assertEqual(status['num_files'], 2)
+        self.assertEqual(status['num_files_warmed'], 2)
+
+    def test_drain_with_other_process(self):
+        """Testing ChunkWarmUpQueue.drain with diffsets queued by another
+        process
+        """
+        self.spy_on(diffutils.populate_diff_chunks,
+                    call_original=False)
+
+        ChunkWarmUpQueue(run_in_background=False).enqueue(self.diffset)
+
+        self.assertEqual(self.queue.get_pending(), [self.diffset.pk])
+        self.assertEqual(self.queue.drain(), [self.diffset.pk])
+        self.assertEqual(self.queue.get_pending(), [])
+        self.assertEqual(self.queue.get_status(self.diffset.pk)['state'],
+                         ChunkWarmUpState.DONE)
+
+    def test_warm_up(self):
+        """Testing ChunkWarmUpQueue.warm_up caches chunks"""
+        self.spy_on(diffutils.get_original_file,
+                    op=kgb.SpyOpReturn(b'Hello, world!\n'))
+
+        status = self.queue.warm_up(self.diffset.pk)
+
+        self.assertEqual(status['state'], ChunkWarmUpState.DONE)
+        self.assertEqual(status['num_files_warmed'], 2)
+
+        # The chunks should now be in cache.
+        for diff_file in diffutils.get_diff_files(diffset=self.diffset):
+            chunk_generator = diffutils._get_diff_file_chunk_generator(
+                diff_file=diff_file,
+                request=None,
+                diff_settings=DiffSettings.create())
+            self.spy_on(chunk_generator.get_chunks_uncached)
+
+            self.assertTrue(list(chunk_generator.get_chunks()))
+            self.assertSpyNotCalled(chunk_generator.get_chunks_uncached)
+
+    def test_warm_up_prefetches_files(self):
+        """Testing ChunkWarmUpQueue.warm_up fetches source files in a batch"""
+        self.spy_on(diffutils.prefetch_original_files)
+        self.spy_on(diffutils.populate_diff_chunks,
+                    call_original=False)
+
+        self.queue.warm_up(self.diffset.pk)
+
+        self.assertSpyCallCount(diffutils.prefetch_original_files, 1)
+        self.assertEqual(
+            [
+                diff_file['filediff']
+                for diff_file in
+                diffutils.prefetch_original_files.last_call.args[0]
+            ],
+            [self.filediff1, self.filediff2])
+
+    def test_warm_up_with_error(self):
+        """Testing ChunkWarmUpQueue.warm_up with an error in one file"""
+        filediff1 = self.filediff1
+
+        def _populate_diff_chunks(*args, **kwargs):
+            if kwargs['files'][0]['filediff'] == filediff1:
+                raise Exception('Oh no')
+
+        self.spy_on(diffutils.populate_diff_chunks,
+                    call_fake=_populate_diff_chunks)
+
+        with self.assertLogs('reviewboard.diffviewer.chunk_warmup'):
+            status = self.queue.warm_up(self.diffset.pk)
+
+        self.assertEqual(status['state'], ChunkWarmUpState.FAILED)
+        self.assertEqual(status['num_files'], 2)
+        self.assertEqual(status['num_files_warmed'], 1)
+
+    def test_warm_up_with_missing_diffset(self):
+        """Testing ChunkWarmUpQueue.warm_up with a missing diffset"""
+        status = self.queue.warm_up(12345)
+
+        self.assertEqual(status['state'], ChunkWarmUpState.FAILED)
+        self.assertIsNone(status['num_files'])
+
+
+class ChunkWarmUpSignalTests(kgb.SpyAgency, TestCase):
+    """Unit tests for queuing chunk warm-up from signals."""
+
+    fixtures = ['test_users', 'test_scmtools']
+
+    def setUp(self):
+        super().setUp()
+
+        self.review_request = self.create_review_request(
+            create_repository=True)
+        self.diffset = self.create_diffset(self.review_request)
+        self.create_filediff(self.diffset)
+
+        self.spy_on(chunk_warmup_queue.enqueue,
+                    call_original=False)
+
+    def test_diffset_uploaded(self):
+        """Testing chunk warm-up on review_request_diffset_uploaded"""
+        with self.siteconfig_settings({'diffviewer_warm_up_chunks': True}):
+            review_request_diffset_uploaded.send(
+                sender=self.__class__,
+                diffset=self.diffset,
+                review_request_draft=None)
+
+        self.assertSpyCalledWith(chunk_warmup_queue.enqueue, self.diffset)
+
+    def test_diffset_uploaded_with_disabled(self):
+        """Testing chunk warm-up on review_request_diffset_uploaded with
+        warm-up disabled
+        """
+        review_request_diffset_uploaded.send(
+            sender=self.__class__,
+            diffset=self.diffset,
+            review_request_draft=None)
+
+        self.assertSpyNotCalled(chunk_warmup_queue.enqueue)
+
+    def test_review_request_published(self):
+        """Testing chunk warm-up on review_request_published"""
+        with self.siteconfig_settings({'diffviewer_warm_up_chunks': True}):
+            self.review_request.publish(self.review_request.submitter)
+
+        self.assertSpyCalledWith(chunk_warmup_queue.enqueue, self.diffset)
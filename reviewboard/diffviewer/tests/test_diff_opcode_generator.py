@@ -713,6 +713,156 @@ class MoveDetectionTests(TestCase):
             ]
         )
 
+    def test_move_detection_with_many_candidates(self):
+        """Testing DiffOpcodeGenerator move detection with a large replaced
+        block of repeated lines
+        """
+        a = [
+            'this is line %d, and it is sufficiently long' % (i % 10)
+            for i in range(2000)
+        ]
+        b = ['    %s' % line for line in reversed(a)]
+
+        opcodes = list(get_diff_opcode_generator(MyersDiffer(a, b)))
+
+        self.assertEqual(len(opcodes), 1)
+
+        meta = opcodes[0][-1]
+        self.assertEqual(len(meta['moved-from']), 2000)
+        self.assertEqual(len(meta['moved-to']), 2000)
+
+    def test_move_detection_with_work_budget_exceeded(self):
+        """Testing DiffOpcodeGenerator move detection with the work budget
+        exceeded
+        """
+        opcode_generator = get_diff_opcode_generator(MyersDiffer(
+            [
+                'this is line 1, and it is sufficiently long',
+                'this is line 2, and it is sufficiently long',
+                'this is line 3, and it is sufficiently long',
+                'this is line 4, and it is sufficiently long',
+            ],
+            [
+                'this is line 3, and it is sufficiently long',
+                'this is line 4, and it is sufficiently long',
+                'this is line 1, and it is sufficiently long',
+                'this is line 2, and it is sufficiently long',
+            ]))
+        opcode_generator.MOVE_DETECTION_WORK_BUDGET = 2
+
+        with self.assertLogs('reviewboard.diffviewer.opcode_generator',
+                             level='WARNING'):
+            opcodes = list(opcode_generator)
+
+        self.assertEqual(
+            opcodes,
+            [
+                ('delete', 0, 2, 0, 0, {
+                    'whitespace_chunk': False,
+                    'whitespace_lines': [],
+                }),
+                ('equal', 2, 4, 0, 2, {
+                    'whitespace_chunk': False,
+                    'whitespace_lines': [],
+                }),
+                ('insert', 4, 4, 2, 4, {
+                    'whitespace_chunk': False,
+                    'whitespace_lines': [],
+                }),
+            ])
+
+    def test_move_detection_with_work_budget_disabled(self):
+        """Testing DiffOpcodeGenerator move detection with the work budget
+        disabled
+        """
+        opcode_generator = get_diff_opcode_generator(MyersDiffer(
+            [
+                'this is line 1, and it is sufficiently long',
+                'this is line 2, and it is sufficiently long',
+                'this is line 3, and it is sufficiently long',
+                'this is line 4, and it is sufficiently long',
+            ],
+            [
+                'this is line 3, and it is sufficiently long',
+                'this is line 4, and it is sufficiently long',
+                'this is line 1, and it is sufficiently long',
+                'this is line 2, and it is sufficiently long',
+            ]))
+        opcode_generator.MOVE_DETECTION_WORK_BUDGET = None
+
+        self.assertEqual(
+            list(opcode_generator),
+            [
+                ('delete', 0, 2, 0, 0, {
+                    'whitespace_chunk': False,
+                    'whitespace_lines': [],
+                    'moved-to': {1: 3, 2: 4},
+                }),
+                ('equal', 2, 4, 0, 2, {
+                    'whitespace_chunk': False,
+                    'whitespace_lines': [],
+                }),
+                ('insert', 4, 4, 2, 4, {
+                    'whitespace_chunk': False,
+                    'whitespace_lines': [],
+                    'moved-from': {3: 1, 4: 2},
+                }),
+            ])
+
+    def test_move_detection_with_work_budget_argument(self):
+        """Testing DiffOpcodeGenerator move detection with
+        move_detection_work_budget= exceeded
+        """
+        opcode_generator = get_diff_opcode_generator(
+            MyersDiffer(
+                [
+                    'this is line 1, and it is sufficiently long',
+                    'this is line 2, and it is sufficiently long',
+                    'this is line 3, and it is sufficiently long',
+                    'this is line 4, and it is sufficiently long',
+                ],
+                [
+                    'this is line 3, and it is sufficiently long',
+                    'this is line 4, and it is sufficiently long',
+                    'this is line 1, and it is sufficiently long',
+                    'this is line 2, and it is sufficiently long',
+                ]),
+            move_detection_work_budget=2)
+
+        with self.assertLogs('reviewboard.diffviewer.opcode_generator',
+                             level='WARNING'):
+            opcodes = list(opcode_generator)
+
+        for opcode in opcodes:
+            self.assertNotIn('moved-from', opcode[-1])
+            self.assertNotIn('moved-to', opcode[-1])
+
+    def test_move_detection_with_work_budget_argument_0(self):
+        """Testing DiffOpcodeGenerator move detection with
+        move_detection_work_budget=0 disabling the limit
+        """
+        opcode_generator = get_diff_opcode_generator(
+            MyersDiffer(
+                [
+                    'this is line 1, and it is sufficiently long',
+                    'this is line 2, and it is sufficiently long',
+                    'this is line 3, and it is sufficiently long',
+                    'this is line 4, and it is sufficiently long',
+                ],
+                [
+                    'this is line 3, and it is sufficiently long',
+                    'this is line 4, and it is sufficiently long',
+                    'this is line 1, and it is sufficiently long',
+                    'this is line 2, and it is sufficiently long',
+                ]),
+            move_detection_work_budget=0)
+        opcode_generator.MOVE_DETECTION_WORK_BUDGET = 2
+
+        opcodes = list(opcode_generator)
+
+        self.assertEqual(opcodes[0][-1]['moved-to'], {1: 3, 2: 4})
+        self.assertEqual(opcodes[2][-1]['moved-from'], {3: 1, 4: 2})
+
     def _test_move_detection(self, a, b, expected_i_moves, expected_r_moves):
         differ = MyersDiffer(a, b)
         opcode_generator = get_diff_opcode_generator(differ)
@@ -1,9 +1,13 @@
 """Unit tests for reviewboard.diffviewer.parser."""
 
+import kgb
 from djblets.testing.decorators import add_fixtures
 
+from reviewboard.diffviewer.diffutils import (get_diff_data_chunks_info,
+                                              split_line_endings)
 from reviewboard.diffviewer.testing.mixins import DiffParserTestingMixin
 from reviewboard.diffviewer.parser import (BaseDiffParser,
+                                           DiffLines,
                                            DiffParser,
                                            ParsedDiff,
                                            ParsedDiffChange,
@@ -52,7 +56,83 @@ class ParsedDiffFileTests(TestCase):
                          parsed_diff_change)
 
 
-class DiffParserTest(DiffParserTestingMixin, TestCase):
+class DiffLinesTests(TestCase):
+    """Unit tests for reviewboard.diffviewer.parser.DiffLines."""
+
+    def test_getitem(self):
+        """Testing DiffLines.__getitem__ matches split_line_endings"""
+        for data in (b'',
+                     b'\n',
+                     b'line 1',
+                     b'line 1\nline 2\n',
+                     b'line 1\n\n\nline 2\n\n',
+                     b'line 1\r\nline 2\rline 3\r\r\nline 4\n\x0c\r',
+                     b'\r\n\r\n'):
+            lines = DiffLines(data)
+            expected = split_line_endings(data)
+
+            self.assertEqual(len(lines), len(expected))
+            self.assertEqual(list(lines), expected)
+            self.assertEqual(lines[1:-1], expected[1:-1])
+
+            if expected:
+                self.assertEqual(lines[-1], expected[-1])
+
+            with self.assertRaises(IndexError):
+                lines[len(expected)]
+
+    def test_find_prefix(self):
+        """Testing DiffLines.find_prefix"""
+        lines = DiffLines(
+            b'--- a\n'
+            b'+++ b\n'
+            b' --- c\n'
+            b'Index: d\n'
+            b'--- e\n'
+        )
+
+        self.assertEqual(lines.find_prefix((b'--- ', b'Index: ')), 0)
+        self.assertEqual(lines.find_prefix((b'--- ', b'Index: '), 1), 3)
+        self.assertEqual(lines.find_prefix((b'--- ',), 1), 4)
+        self.assertEqual(lines.find_prefix((b'--- ',), 2), 4)
+        self.assertEqual(lines.find_prefix((b'*** ',), 0), 5)
+
+    def test_find_prefix_with_crlf(self):
+        """Testing DiffLines.find_prefix with CRLF line endings"""
+        lines = DiffLines(
+            b'--- a\r\n'
+            b'+++ b\r\n'
+            b' --- c\r'
+            b'Index: d\r\n'
+        )
+
+        self.assertFalse(lines.lf_only)
+        self.assertEqual(lines.find_prefix((b'Index: ',), 0), 3)
+        self.assertEqual(lines.find_prefix((b'--- ',), 1), 4)
+
+    def test_get_range_data(self):
+        """Testing DiffLines.get_range_data"""
+        lines = DiffLines(b'a\nb\nc\nd')
+
+        self.assertEqual(bytes(lines.get_range_data(1, 4)), b'b\nc\nd')
+
+        lines = DiffLines(b'a\r\nb\rc\r\r\nd')
+
+        self.assertEqual(bytes(lines.get_range_data(1, 4)), b'b\nc\nd')
+
+    def test_count_range_prefix(self):
+        """Testing DiffLines.count_range_prefix"""
+        data = b'-a\n+b\n-c\n -d\n-e\n-f'
+
+        for line_data in (data, data.replace(b'\n', b'\r\n')):
+            lines = DiffLines(line_data)
+
+            self.assertEqual(lines.count_range_prefix(b'-', 0, 6), 4)
+            self.assertEqual(lines.count_range_prefix(b'-', 1, 5), 2)
+            self.assertEqual(lines.count_range_prefix(b'+', 0, 6), 1)
+
+
+class DiffParserTest(kgb.SpyAgency, DiffParserTestingMixin, TestCase):
     """Unit tests for reviewboard.diffviewer.parser.DiffParser."""
 
     def test_form_feed(self):
@@ -113,6 +193,230 @@ class DiffParserTest(DiffParserTestingMixin, TestCase):
             delete_count=4,
             data=diff)
 
+    def test_multiple_files(self):
+        """Testing DiffParser with multiple files only parses headers at
+        possible header lines
+        """
+        diff = (
+            b'Preamble\n'
+            b'--- README  123\n'
+            b'+++ README  (new)\n'
+            b'@@ -1,2 +1,2 @@\n'
+            b'-Line 1\n'
+            b'+Line one\n'
+            b' Line 2\n'
+            b'Index: foo\n'
+            b'%s\n'
+            b'--- foo  123\n'
+            b'+++ foo  (new)\n'
+            b'@@ -1,1 +1,2 @@\n'
+            b' Line 1\n'
+            b'+Line 2\n'
+            % DiffParser.INDEX_SEP
+        )
+
+        parser = DiffParser(diff)
+        self.spy_on(parser.parse_change_header)
+
+        parsed_files = parser.parse()
+        self.assertEqual(len(parsed_files), 2)
+
+        self.assertSpyCallCount(parser.parse_change_header, 2)
+
+        self.assert_parsed_diff_file(
+            parsed_files[0],
+            orig_filename=b'README',
+            orig_file_details=b'123',
+            modified_filename=b'README',
+            modified_file_details=b'(new)',
+            insert_count=1,
+            delete_count=1,
+            data=diff[:diff.index(b'Index: foo')])
+        self.assert_parsed_diff_file(
+            parsed_files[1],
+            orig_filename=b'foo',
+            orig_file_details=b'123',
+            modified_filename=b'foo',
+            modified_file_details=b'(new)',
+            index_header_value=b'foo',
+            insert_count=1,
+            data=diff[diff.index(b'Index: foo'):])
+
+    def test_multiple_files_with_crlf(self):
+        """Testing DiffParser with multiple files and CRLF line endings"""
+        diff = (
+            b'--- README  123\r\n'
+            b'+++ README  (new)\r\n'
+            b'@@ -1,2 +1,2 @@\r\n'
+            b'-Line 1\r\n'
+            b'+Line one\r\n'
+            b' Line 2\r\n'
+            b'--- foo  123\r\n'
+            b'+++ foo  (new)\r\n'
+            b'@@ -1,1 +1,2 @@\r\n'
+            b' Line 1\r\n'
+            b'+Line 2\r\n'
+        )
+
+        parsed_files = DiffParser(diff).parse()
+        self.assertEqual(len(parsed_files), 2)
+
+        self.assert_parsed_diff_file(
+            parsed_files[0],
+            orig_filename=b'README',
+            modified_filename=b'README',
+            insert_count=1,
+            delete_count=1,
+            data=(
+                b'--- README  123\n'
+                b'+++ README  (new)\n'
+                b'@@ -1,2 +1,2 @@\n'
+                b'-Line 1\n'
+                b'+Line one\n'
+                b' Line 2\n'
+            ))
+        self.assert_parsed_diff_file(
+            parsed_files[1],
+            orig_filename=b'foo',
+            modified_filename=b'foo',
+            insert_count=1,
+            data=(
+                b'--- foo  123\n'
+                b'+++ foo  (new)\n'
+                b'@@ -1,1 +1,2 @@\n'
+                b' Line 1\n'
+                b'+Line 2\n'
+            ))
+
+    def test_diff_chunks_info(self):
+        """Testing DiffParser collects ParsedDiffFile.diff_chunks_info"""
+        diff = (
+            b'--- README  123\n'
+            b'+++ README  (new)\n'
+            b'@@ -1,5 +1,5 @@\n'
+            b' Line 1\n'
+            b'-Line 2\n'
+            b'+Line two\n'
+            b' Line 3\n'
+            b' Line 4\n'
+            b' Line 5\n'
+            b'@@ -10,2 +10,3 @@\n'
+            b' Line 10\n'
+            b'+Line 10.5\n'
+            b' Line 11\n'
+            b'--- foo  123\n'
+            b'+++ foo  (new)\n'
+            b'@@ -1,1 +1,2 @@\n'
+            b' Line 1\n'
+            b'+Line 2\n'
+        )
+
+        self.spy_on(get_diff_data_chunks_info)
+
+        parsed_files = DiffParser(diff).parse()
+        self.assertEqual(len(parsed_files), 2)
+        self.assertSpyNotCalled(get_diff_data_chunks_info)
+
+        self.assertEqual(
+            parsed_files[0].diff_chunks_info,
+            [
+                {
+                    'orig': {
+                        'chunk_start': 0,
+                        'chunk_len': 5,
+                        'changes_start': 1,
+                        'changes_len': 1,
+                        'pre_lines_of_context': 1,
+                        'post_lines_of_context': 3,
+                    },
+                    'modified': {
+                        'chunk_start': 0,
+                        'chunk_len': 5,
+                        'changes_start': 1,
+                        'changes_len': 1,
+                        'pre_lines_of_context': 1,
+                        'post_lines_of_context': 3,
+                    },
+                },
+                {
+                    'orig': {
+                        'chunk_start': 9,
+                        'chunk_len': 2,
+                        'changes_start': 9,
+                        'changes_len': 0,
+                        'pre_lines_of_context': 2,
+                        'post_lines_of_context': 0,
+                    },
+                    'modified': {
+                        'chunk_start': 9,
+                        'chunk_len': 3,
+                        'changes_start': 10,
+                        'changes_len': 1,
+                        'pre_lines_of_context': 1,
+                        'post_lines_of_context': 1,
+                    },
+                },
+            ])
+
+        for parsed_file in parsed_files:
+            self.assertEqual(parsed_file.diff_chunks_info,
+                             get_diff_data_chunks_info(parsed_file.data))
+
+    def test_diff_chunks_info_with_custom_parse_diff_line(self):
+        """Testing DiffParser doesn't collect ParsedDiffFile.diff_chunks_info
+        when overriding parse_diff_line
+        """
+        class CustomParser(DiffParser):
+            def parse_diff_line(self, linenum, parsed_file):
+                return super().parse_diff_line(linenum, parsed_file)
+
+        diff = (
+            b'--- README  123\n'
+            b'+++ README  (new)\n'
+            b'@@ -1,1 +1,1 @@\n'
+            b'-Line 1\n'
+            b'+Line one\n'
+        )
+
+        parsed_files = CustomParser(diff).parse()
+        self.assertEqual(len(parsed_files), 1)
+        self.assertIsNone(parsed_files[0].diff_chunks_info)
+
+    def test_custom_header_without_prefixes(self):
+        """Testing custom DiffParser overriding parse_special_header without
+        setting FILE_HEADER_PREFIXES
+        """
+        class CustomParser(DiffParser):
+            def parse_special_header(self, linenum, parsed_file):
+                if self.lines[linenum].startswith(b'#file '):
+                    parsed_file.extra_data = {
+                        'name': self.lines[linenum][6:],
+                    }
+
+                    linenum += 1
+
+                return super().parse_special_header(linenum, parsed_file)
+
+        diff = (
+            b'#file README\n'
+            b'--- README  123\n'
+            b'+++ README  (new)\n'
+            b'@@ -1,1 +1,1 @@\n'
+            b'-Line 1\n'
+            b'+Line one\n'
+        )
+
+        parser = CustomParser(diff)
+        self.spy_on(parser.parse_change_header)
+
+        parsed_files = parser.parse()
+        self.assertEqual(len(parsed_files), 1)
+        self.assertEqual(parsed_files[0].extra_data, {'name': b'README'})
+
+        # The header can't be found using the default prefixes, so every
+        # line not part of a header must be checked.
+        self.assertSpyCallCount(parser.parse_change_header, 4)
+
     @add_fixtures(['test_scmtools'])
     def test_raw_diff_with_diffset(self):
         """Testing DiffParser.raw_diff with DiffSet"""
@@ -23,7 +23,10 @@ class DiffSettingsTests(TestCase):
             'diffviewer_custom_pygments_lexers': {
                 '.foo': 'SomeLexer',
             },
+            'diffviewer_chunk_generation_workers': 4,
+            'diffviewer_differ_backend': 'accelerated',
             'diffviewer_include_space_patterns': ['*.a', '*.b'],
+            'diffviewer_move_detection_work_budget': 5000,
             'diffviewer_paginate_by': 20,
             'diffviewer_paginate_orphans': 5,
             'diffviewer_syntax_highlighting': True,
@@ -42,8 +45,11 @@ class DiffSettingsTests(TestCase):
         self.assertEqual(diff_settings.custom_pygments_lexers, {
             '.foo': 'SomeLexer',
         })
+        self.assertEqual(diff_settings.chunk_generation_workers, 4)
+        self.assertEqual(diff_settings.differ_backend, 'accelerated')
         self.assertEqual(diff_settings.include_space_patterns,
                          ['*.a', '*.b'])
+        self.assertEqual(diff_settings.move_detection_work_budget, 5000)
         self.assertEqual(diff_settings.paginate_by, 20)
         self.assertEqual(diff_settings.paginate_orphans, 5)
         self.assertTrue(diff_settings.syntax_highlighting)
@@ -136,4 +142,4 @@ class DiffSettingsTests(TestCase):
 
         self.assertEqual(
             diff_settings.state_hash,
-            '178099a49bf920fd46866042e9013d90d8ad31edf986325cdd641d2e1de4e01f')
+            'ab79b1951ccc7bc74f2f0260e41fdf131539aa5bf7a66133a6ae92f31db234fc')
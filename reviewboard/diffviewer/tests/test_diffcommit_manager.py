@@ -243,6 +243,9 @@ class DiffCommitManagerTests(kgb.SpyAgency, TestCase):
 
         filediff = diffset.files.all()[0]
         self.assertEqual(filediff.extra_data, {
+            '__diff_chunks_info': [
+                [0, 1, 0, 1, 0, 0, 0, 1, 0, 1, 0, 0],
+            ],
             'is_symlink': False,
             'key3': 'value3',
             'raw_delete_count': 1,
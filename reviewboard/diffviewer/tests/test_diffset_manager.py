@@ -181,6 +181,9 @@ class DiffSetManagerTests(kgb.SpyAgency, TestCase):
 
         filediff = diffset.files.all()[0]
         self.assertEqual(filediff.extra_data, {
+            '__diff_chunks_info': [
+                [0, 1, 0, 1, 0, 0, 0, 1, 0, 1, 0, 0],
+            ],
             'is_symlink': False,
             'key3': 'value3',
             'raw_delete_count': 1,
@@ -272,6 +275,9 @@ class DiffSetManagerTests(kgb.SpyAgency, TestCase):
 
         filediff = diffset.files.all()[0]
         self.assertEqual(filediff.extra_data, {
+            '__diff_chunks_info': [
+                [0, 1, 0, 1, 0, 0, 0, 1, 0, 1, 0, 0],
+            ],
             '__parent_diff_empty': False,
             'is_symlink': False,
             'main_key3': 'value3',
@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 import kgb
+import tempfile
+import threading
 from itertools import zip_longest
 
 from django.contrib.auth.models import User
 from django.test.client import RequestFactory
+from django.utils import translation
 from djblets.testing.decorators import add_fixtures
 
+from reviewboard.diffviewer import diffutils
+from reviewboard.diffviewer.chunk_generator import (DiffChunkGenerator,
+                                                    RawDiffChunkGenerator)
 from reviewboard.diffviewer.diffutils import (
     convert_line_endings,
     convert_to_unicode,
@@ -26,13 +32,18 @@ from reviewboard.diffviewer.diffutils import (
     get_original_file_from_repo,
     get_sorted_filediffs,
     patch,
+    patched_ancestors_cache_stats,
+    populate_diff_chunks,
+    prefetch_original_files,
     split_line_endings,
     _PATCH_GARBAGE_INPUT,
     _get_last_header_in_chunks_before_line)
 from reviewboard.diffviewer.errors import PatchError
 from reviewboard.diffviewer.models import DiffCommit, FileDiff
+from reviewboard.diffviewer.patcher import InProcessPatchError, apply_patch
 from reviewboard.diffviewer.settings import DiffSettings
-from reviewboard.scmtools.core import PRE_CREATION
+from reviewboard.scmtools.core import FileLookup, PRE_CREATION
+from reviewboard.scmtools.models import Repository
 from reviewboard.testing.testcase import BaseFileDiffAncestorTests, TestCase
 
 
@@ -533,6 +544,41 @@ class GetDiffDataChunksInfoTests(TestCase):
                 },
             ])
 
+    def test_with_miscounted_lines(self):
+        """Testing get_diff_data_chunks_info with a chunk header that doesn't
+        match the lines in the chunk
+        """
+        self.assertEqual(
+            get_diff_data_chunks_info(
+                b'@@ -1,4 +1,5 @@\n'
+                b' a\n'
+                b' b\n'
+                b'-c\n'
+                b'+C\n'
+                b' d\n'
+                b' e\n'
+                b' f\n'),
+            [
+                {
+                    'orig': {
+                        'pre_lines_of_context': 2,
+                        'post_lines_of_context': 3,
+                        'chunk_start': 0,
+                        'chunk_len': 4,
+                        'changes_start': 2,
+                        'changes_len': -1,
+                    },
+                    'modified': {
+                        'pre_lines_of_context': 2,
+                        'post_lines_of_context': 3,
+                        'chunk_start': 0,
+                        'chunk_len': 5,
+                        'changes_start': 2,
+                        'changes_len': 0,
+                    },
+                },
+            ])
+
 
 class GetDiffFilesTests(BaseFileDiffAncestorTests):
     """Unit tests for get_diff_files."""
@@ -3050,9 +3096,14 @@ class DiffExpansionHeaderTests(TestCase):
                          lines[header['left']['line'] - 1][2])
 
 
-class PatchTests(TestCase):
+class PatchTests(kgb.SpyAgency, TestCase):
     """Unit tests for patch."""
 
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.spy_on(apply_patch)
+
     def test_patch(self):
         """Testing patch"""
         old = (b'int\n'
@@ -3292,6 +3343,64 @@ class PatchTests(TestCase):
         self.assertEqual(patched, new)
 
 
+    def test_patch_in_process(self):
+        """Testing patch applies clean diffs without running patch(1)"""
+        self.spy_on(tempfile.mkdtemp)
+
+        patched = patch(diff=(b'--- README\n'
+                              b'+++ README\n'
+                              b'@@ -1,2 +1,2 @@\n'
+                              b' Line 1\n'
+                              b'-Line 2\n'
+                              b'+Line two\n'),
+                        orig_file=b'Line 1\nLine 2\n',
+                        filename='README')
+
+        self.assertEqual(patched, b'Line 1\nLine two\n')
+        self.assertSpyCallCount(apply_patch, 1)
+        self.assertSpyNotCalled(tempfile.mkdtemp)
+
+    def test_patch_with_offset(self):
+        """Testing patch falls back on patch(1) for hunks at an offset"""
+        self.spy_on(tempfile.mkdtemp)
+
+        patched = patch(diff=(b'--- README\n'
+                              b'+++ README\n'
+                              b'@@ -1,3 +1,3 @@\n'
+                              b' Line 1\n'
+                              b'-Line 2\n'
+                              b'+Line two\n'
+                              b' Line 3\n'),
+                        orig_file=b'Line 0\nLine 1\nLine 2\nLine 3\n',
+                        filename='README')
+
+        self.assertEqual(patched, b'Line 0\nLine 1\nLine two\nLine 3\n')
+        self.assertSpyRaised(apply_patch, InProcessPatchError)
+        self.assertSpyCallCount(tempfile.mkdtemp, 1)
+
+    def test_patch_with_rejects(self):
+        """Testing patch reports rejects from patch(1) for hunks that fail
+        to apply
+        """
+        diff = (b'--- README\n'
+                b'+++ README\n'
+                b'@@ -1,2 +1,2 @@\n'
+                b' Line 1\n'
+                b'-Line 2\n'
+                b'+Line two\n')
+
+        with self.assertRaises(PatchError) as ctx:
+            patch(diff=diff,
+                  orig_file=b'Something else\n',
+                  filename='README')
+
+        e = ctx.exception
+        self.assertEqual(e.filename, 'README')
+        self.assertEqual(e.diff, diff)
+        self.assertIn(b'@@ -1,2 +1,2 @@', e.rejects)
+        self.assertIn('1 out of 1 hunk FAILED', e.error_output)
+
+
 class GetFileDiffEncodingsTests(TestCase):
     """Unit tests for get_filediff_encodings."""
 
@@ -3326,6 +3435,7 @@ class GetOriginalFileTests(BaseFileDiffAncestorTests):
         super(GetOriginalFileTests, self).setUp()
 
         self.spy_on(get_original_file_from_repo)
+        patched_ancestors_cache_stats.clear()
 
     def test_created_in_first_parent(self):
         """Test get_original_file with a file created in the parent diff of the
@@ -3374,6 +3484,48 @@ class GetOriginalFileTests(BaseFileDiffAncestorTests):
         self.assertEqual(get_original_file(filediff=filediff), b'foo\n')
         self.assertFalse(get_original_file_from_repo.called)
 
+    def test_with_ancestors_cached(self):
+        """Testing get_original_file caches the results of applying ancestors
+        """
+        self.set_up_filediffs()
+        self.spy_on(patch)
+
+        filediff = FileDiff.objects.get(dest_file='qux', dest_detail='03b37a0',
+                                        commit_id=3)
+
+        self.assertEqual(get_original_file(filediff=filediff), b'foo\n')
+        self.assertSpyCallCount(patch, 1)
+        self.assertEqual(patched_ancestors_cache_stats['hits'], 0)
+        self.assertEqual(patched_ancestors_cache_stats['misses'], 1)
+
+        self.assertEqual(get_original_file(filediff=filediff), b'foo\n')
+        self.assertSpyCallCount(patch, 1)
+        self.assertEqual(patched_ancestors_cache_stats['hits'], 1)
+        self.assertEqual(patched_ancestors_cache_stats['misses'], 1)
+
+    def test_with_ancestors_partially_cached(self):
+        """Testing get_original_file applies only uncached ancestors on top
+        of a cached ancestor result
+        """
+        self.set_up_filediffs()
+
+        # Computing the file for commit 3 caches the result of every
+        # ancestor up through commit 2.
+        filediff = FileDiff.objects.get(dest_file='qux', dest_detail='03b37a0',
+                                        commit_id=3)
+        self.assertEqual(get_original_file(filediff=filediff), b'foo\n')
+
+        patched_ancestors_cache_stats.clear()
+        self.spy_on(patch)
+
+        # Commit 2's file only has commit 1 as an ancestor, which is cached.
+        filediff = FileDiff.objects.get(dest_file='foo', dest_detail='257cc56',
+                                        commit_id=2)
+        self.assertEqual(get_original_file(filediff=filediff), b'')
+        self.assertSpyNotCalled(patch)
+        self.assertEqual(patched_ancestors_cache_stats['hits'], 1)
+        self.assertEqual(patched_ancestors_cache_stats['misses'], 0)
+
     def test_empty_parent_diff_old_patch(self):
         """Testing get_original_file with an empty parent diff with patch(1)
         that does not accept empty diffs
@@ -3659,6 +3811,280 @@ class GetOriginalFileTests(BaseFileDiffAncestorTests):
                          'filediff_value')
 
 
+class PrefetchOriginalFilesTests(kgb.SpyAgency, TestCase):
+    """Unit tests for
+    reviewboard.diffviewer.diffutils.prefetch_original_files.
+    """
+
+    fixtures = ['test_users', 'test_scmtools']
+
+    def setUp(self):
+        super().setUp()
+
+        self.repository = self.create_repository(tool_name='Git')
+        review_request = self.create_review_request(
+            repository=self.repository)
+        self.diffset = self.create_diffset(review_request)
+
+        self.spy_on(Repository.get_files,
+                    owner=Repository)
+
+    def test_prefetch_original_files(self):
+        """Testing prefetch_original_files"""
+        self.create_filediff(self.diffset,
+                             source_file='/readme',
+                             source_revision='e965047')
+        self.create_filediff(self.diffset,
+                             source_file='/new-file',
+                             source_revision=PRE_CREATION)
+        self.create_filediff(self.diffset,
+                             source_file='/other',
+                             source_revision='d6613f5')
+
+        num_files = prefetch_original_files(
+            get_diff_files(diffset=self.diffset),
+            diff_settings=DiffSettings.create())
+
+        self.assertEqual(num_files, 2)
+        self.assertSpyCallCount(Repository.get_files, 1)
+        self.assertEqual(
+            Repository.get_files.last_call.args[0],
+            [
+                FileLookup(path='/readme', revision='e965047'),
+                FileLookup(path='/other', revision='d6613f5'),
+            ])
+
+    def test_prefetch_original_files_with_parent_diff(self):
+        """Testing prefetch_original_files with a parent diff"""
+        self.create_filediff(
+            self.diffset,
+            source_file='/readme',
+            source_revision='abc123',
+            parent_diff=b'...',
+            extra_data={
+                'parent_source_filename': '/parent-readme',
+                'parent_source_revision': 'e965047',
+            })
+
+        prefetch_original_files(get_diff_files(diffset=self.diffset),
+                                diff_settings=DiffSettings.create())
+
+        self.assertSpyCallCount(Repository.get_files, 1)
+        self.assertEqual(
+            Repository.get_files.last_call.args[0],
+            [FileLookup(path='/parent-readme', revision='e965047')])
+
+    def test_prefetch_original_files_with_cached_chunks(self):
+        """Testing prefetch_original_files skips files with cached chunks"""
+        self.create_filediff(self.diffset,
+                             source_file='/readme',
+                             source_revision='e965047')
+
+        self.spy_on(diffutils.get_original_file,
+                    op=kgb.SpyOpReturn(b'Hello, world!\n'))
+
+        diff_settings = DiffSettings.create()
+        files = get_diff_files(diffset=self.diffset)
+        populate_diff_chunks(files,
+                             diff_settings=diff_settings)
+
+        self.spy_on(FileDiff.get_ancestors,
+                    owner=FileDiff)
+
+        self.assertEqual(
+            prefetch_original_files(files,
+                                    diff_settings=diff_settings),
+            0)
+        self.assertSpyNotCalled(Repository.get_files)
+        self.assertSpyNotCalled(FileDiff.get_ancestors)
+
+    def test_prefetch_original_files_with_some_cached_chunks(self):
+        """Testing prefetch_original_files only looks up files without
+        cached chunks, using one cache lookup
+        """
+        self.create_filediff(self.diffset,
+                             source_file='/readme',
+                             source_revision='e965047')
+        self.create_filediff(self.diffset,
+                             source_file='/other',
+                             source_revision='d6613f5')
+
+        self.spy_on(diffutils.get_original_file,
+                    op=kgb.SpyOpReturn(b'Hello, world!\n'))
+
+        diff_settings = DiffSettings.create()
+        files = get_diff_files(diffset=self.diffset)
+        cached_file = [
+            f
+            for f in files
+            if f['filediff'].source_file == '/readme'
+        ]
+        populate_diff_chunks(cached_file,
+                             diff_settings=diff_settings)
+
+        self.spy_on(DiffChunkGenerator.has_cached_chunks,
+                    owner=DiffChunkGenerator)
+
+        self.assertEqual(
+            prefetch_original_files(get_diff_files(diffset=self.diffset),
+                                    diff_settings=diff_settings),
+            1)
+        self.assertSpyNotCalled(DiffChunkGenerator.has_cached_chunks)
+        self.assertSpyCallCount(Repository.get_files, 1)
+        self.assertEqual(
+            Repository.get_files.last_call.args[0],
+            [FileLookup(path='/other', revision='d6613f5')])
+
+
+class PopulateDiffChunksTests(kgb.SpyAgency, TestCase):
+    """Unit tests for reviewboard.diffviewer.diffutils.populate_diff_chunks.
+    """
+
+    def test_populate_diff_chunks(self):
+        """Testing populate_diff_chunks"""
+        files = self._create_files()
+        thread_names = self._spy_on_chunk_generator()
+
+        populate_diff_chunks(files=files,
+                             diff_settings=DiffSettings.create())
+
+        self._check_files(files)
+        self.assertEqual(thread_names,
+                         {threading.current_thread().name})
+
+    def test_populate_diff_chunks_with_max_workers(self):
+        """Testing populate_diff_chunks with max_workers"""
+        files = self._create_files()
+
+        # Every file must be processed at the same time to get past this.
+        barrier = threading.Barrier(len(files), timeout=10)
+        thread_names = self._spy_on_chunk_generator(barrier=barrier)
+
+        populate_diff_chunks(files=files,
+                             diff_settings=DiffSettings.create(),
+                             max_workers=3)
+
+        self._check_files(files)
+        self.assertEqual(len(thread_names), 3)
+        self.assertNotIn(threading.current_thread().name, thread_names)
+
+    def test_populate_diff_chunks_with_chunk_generation_workers(self):
+        """Testing populate_diff_chunks with
+        DiffSettings.chunk_generation_workers
+        """
+        files = self._create_files()
+        barrier = threading.Barrier(len(files), timeout=10)
+        thread_names = self._spy_on_chunk_generator(barrier=barrier)
+
+        with self.siteconfig_settings({
+            'diffviewer_chunk_generation_workers': 4,
+        }):
+            diff_settings = DiffSettings.create()
+
+        populate_diff_chunks(files=files,
+                             diff_settings=diff_settings)
+
+        self._check_files(files)
+        self.assertEqual(len(thread_names), 3)
+
+    def test_populate_diff_chunks_with_max_workers_and_language(self):
+        """Testing populate_diff_chunks with max_workers generates chunks
+        using the active language
+        """
+        files = self._create_files()
+        barrier = threading.Barrier(len(files), timeout=10)
+        languages = []
+
+        @self.spy_for(RawDiffChunkGenerator.get_chunks,
+                      owner=RawDiffChunkGenerator)
+        def _get_chunks(_self, *args, **kwargs):
+            languages.append(translation.get_language())
+
+            yield from RawDiffChunkGenerator.get_chunks.call_original(
+                _self, *args, **kwargs)
+
+        thread_names = self._spy_on_chunk_generator(barrier=barrier)
+
+        with translation.override('es'):
+            populate_diff_chunks(files=files,
+                                 diff_settings=DiffSettings.create(),
+                                 max_workers=3)
+
+        self._check_files(files)
+        self.assertEqual(len(thread_names), 3)
+        self.assertNotIn(threading.current_thread().name, thread_names)
+        self.assertEqual(languages, ['es', 'es', 'es'])
+
+    def _create_files(self):
+        """Return diff file information for the tests.
+
+        Returns:
+            list of dict:
+            The diff file information.
+        """
+        return [
+            {
+                'old': b'line 1\nline 2\nline 3\n',
+                'new': b'line 1\nline 2\nline 3\n' + (b'new line\n' * i),
+            }
+            for i in range(3)
+        ]
+
+    def _spy_on_chunk_generator(self, barrier=None):
+        """Spy on chunk generator creation.
+
+        Args:
+            barrier (threading.Barrier, optional):
+                A barrier to wait on when creating each chunk generator.
+
+        Returns:
+            set of str:
+            The names of the threads that created chunk generators. This
+            will be populated as chunk generators are created.
+        """
+        thread_names = set()
+
+        def _get_chunk_generator(diff_file, **kwargs):
+            thread_names.add(threading.current_thread().name)
+
+            if barrier is not None:
+                barrier.wait()
+
+            return RawDiffChunkGenerator(old=diff_file['old'],
+                                         new=diff_file['new'],
+                                         orig_filename='foo.txt',
+                                         modified_filename='foo.txt',
+                                         diff_settings=kwargs['diff_settings'])
+
+        self.spy_on(diffutils._get_diff_file_chunk_generator,
+                    call_fake=_get_chunk_generator)
+
+        return thread_names
+
+    def _check_files(self, files):
+        """Check the populated diff file information.
+
+        Args:
+            files (list of dict):
+                The populated diff file information.
+        """
+        self.assertEqual(
+            [
+                (
+                    [chunk['change'] for chunk in diff_file['chunks']],
+                    diff_file['num_changes'],
+                    diff_file['chunks_loaded'],
+                )
+                for diff_file in files
+            ],
+            [
+                (['equal'], 0, True),
+                (['equal', 'insert'], 1, True),
+                (['equal', 'insert'], 1, True),
+            ])
+        self.assertEqual(len(files[2]['chunks'][1]['lines']), 2)
+
+
 class SplitLineEndingsTests(TestCase):
     """Unit tests for reviewboard.diffviewer.diffutils.split_line_endings."""
 
@@ -84,6 +84,69 @@ class FileDiffTests(TestCase):
         self.assertEqual(diff_hash.insert_count, 1)
         self.assertEqual(diff_hash.delete_count, 2)
 
+    def test_get_diff_chunks_info(self):
+        """Testing FileDiff.get_diff_chunks_info with stored information"""
+        chunks_info = [
+            {
+                'orig': {
+                    'chunk_start': 1,
+                    'chunk_len': 1,
+                    'changes_start': 1,
+                    'changes_len': 1,
+                    'pre_lines_of_context': 0,
+                    'post_lines_of_context': 0,
+                },
+                'modified': {
+                    'chunk_start': 1,
+                    'chunk_len': 2,
+                    'changes_start': 1,
+                    'changes_len': 2,
+                    'pre_lines_of_context': 0,
+                    'post_lines_of_context': 0,
+                },
+            },
+        ]
+
+        self.filediff.set_diff_chunks_info(chunks_info)
+
+        self.assertEqual(
+            self.filediff.extra_data[FileDiff._DIFF_CHUNKS_INFO_KEY],
+            [[1, 1, 1, 1, 0, 0, 1, 2, 1, 2, 0, 0]])
+        self.assertEqual(self.filediff.get_diff_chunks_info(), chunks_info)
+
+    def test_get_diff_chunks_info_without_stored(self):
+        """Testing FileDiff.get_diff_chunks_info without stored information
+        computes and stores it
+        """
+        self.filediff.save()
+
+        chunks_info = self.filediff.get_diff_chunks_info()
+
+        self.assertEqual(chunks_info, [
+            {
+                'orig': {
+                    'chunk_start': 1,
+                    'chunk_len': 1,
+                    'changes_start': 1,
+                    'changes_len': 1,
+                    'pre_lines_of_context': 0,
+                    'post_lines_of_context': 0,
+                },
+                'modified': {
+                    'chunk_start': 1,
+                    'chunk_len': 2,
+                    'changes_start': 1,
+                    'changes_len': 2,
+                    'pre_lines_of_context': 0,
+                    'post_lines_of_context': 0,
+                },
+            },
+        ])
+
+        filediff = FileDiff.objects.get(pk=self.filediff.pk)
+        self.assertIn(FileDiff._DIFF_CHUNKS_INFO_KEY, filediff.extra_data)
+        self.assertEqual(filediff.get_diff_chunks_info(), chunks_info)
+
     def test_long_filenames(self):
         """Testing FileDiff with long filenames (1024 characters)"""
         long_filename = 'x' * 1024
@@ -7,8 +7,10 @@ from typing import Union
 import kgb
 from django.utils.timezone import now
 
+from reviewboard.diffviewer import diffutils
+from reviewboard.diffviewer.diffutils import get_diff_data_chunks_info
 from reviewboard.diffviewer.filediff_creator import create_filediffs
-from reviewboard.diffviewer.models import DiffCommit, DiffSet
+from reviewboard.diffviewer.models import DiffCommit, DiffSet, FileDiff
 from reviewboard.scmtools.core import Revision
 from reviewboard.scmtools.git import GitTool
 from reviewboard.testing import TestCase
@@ -39,6 +41,38 @@ class FileDiffCreatorTests(kgb.SpyAgency, TestCase):
 
         self.assertEqual(diffset.files.count(), 1)
 
+    def test_create_filediffs_stores_chunks_info(self):
+        """Testing create_filediffs() stores line counts and chunks info"""
+        repository = self.create_repository()
+        diffset = self.create_diffset(repository=repository)
+
+        self.spy_on(diffutils.get_diff_data_chunks_info)
+
+        create_filediffs(
+            diff_file_contents=self.DEFAULT_GIT_FILEDIFF_DATA_DIFF,
+            parent_diff_file_contents=None,
+            repository=repository,
+            basedir='/',
+            base_commit_id='0' * 40,
+            diffset=diffset,
+            check_existence=False)
+
+        # The chunks info is collected by the parser, rather than by
+        # scanning the diff again.
+        self.assertSpyNotCalled(diffutils.get_diff_data_chunks_info)
+
+        filediff = diffset.files.get()
+
+        self.assertEqual(filediff.extra_data['raw_insert_count'], 1)
+        self.assertEqual(filediff.extra_data['raw_delete_count'], 1)
+        self.assertEqual(
+            filediff.extra_data[FileDiff._DIFF_CHUNKS_INFO_KEY],
+            [[1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 0, 0]])
+
+        self.assertEqual(filediff.get_diff_chunks_info(),
+                         get_diff_data_chunks_info(filediff.diff))
+        self.assertSpyCallCount(diffutils.get_diff_data_chunks_info, 1)
+
     def test_create_filediffs_commit_file_count(self):
         """Testing create_filediffs() with a DiffSet and a DiffCommit"""
         repository = self.create_repository()
@@ -523,6 +523,9 @@ class UploadDiffFormTests(SpyAgency, TestCase):
                          revisions[1].decode('utf-8'))
         self.assertEqual(filediff.dest_detail, revisions[2].decode('utf-8'))
         self.assertEqual(filediff.extra_data, {
+            '__diff_chunks_info': [
+                [0, 2, 0, 0, 2, 0, 0, 3, 2, 1, 2, 0],
+            ],
             '__parent_diff_empty': False,
             'is_symlink': False,
             'new_unix_mode': '100644',
@@ -653,6 +656,9 @@ class UploadDiffFormTests(SpyAgency, TestCase):
                          revisions[1].decode('utf-8'))
         self.assertEqual(filediff.dest_detail, revisions[2].decode('utf-8'))
         self.assertEqual(filediff.extra_data, {
+            '__diff_chunks_info': [
+                [0, 3, 0, 1, 0, 2, 0, 4, 2, 2, 2, 0],
+            ],
             '__parent_diff_empty': False,
             'is_symlink': False,
             'new_unix_mode': '100644',
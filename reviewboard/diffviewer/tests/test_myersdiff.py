@@ -1,4 +1,9 @@
-from reviewboard.diffviewer.myersdiff import MyersDiffer
+import random
+
+from reviewboard.diffviewer.differ import (DiffCompatVersion, DifferBackend,
+                                          get_differ)
+from reviewboard.diffviewer.myersdiff import (AcceleratedMyersDiffer,
+                                              MyersDiffer)
 from reviewboard.testing import TestCase
 
 
@@ -37,3 +42,67 @@ class MyersDifferTest(TestCase):
     def _test_diff(self, a, b, expected):
         opcodes = list(MyersDiffer(a, b).get_opcodes())
         self.assertEqual(opcodes, expected)
+
+
+class AcceleratedMyersDifferTests(TestCase):
+    """Unit tests for AcceleratedMyersDiffer."""
+
+    def test_get_opcodes_matches_myers_differ(self):
+        """Testing AcceleratedMyersDiffer.get_opcodes matches MyersDiffer"""
+        rand = random.Random(1234)
+
+        for i in range(200):
+            a = [
+                str(rand.randint(0, 8))
+                for j in range(rand.randint(0, 300))
+            ]
+            b = list(a)
+
+            # Apply some random edits, keeping long runs of equal lines.
+            for j in range(rand.randint(0, 10)):
+                pos = rand.randint(0, len(b))
+                num_lines = rand.randint(0, 20)
+                b[pos:pos + rand.randint(0, 20)] = [
+                    str(rand.randint(0, 8))
+                    for k in range(num_lines)
+                ]
+
+            self._test_same_opcodes(a, b)
+
+    def test_get_opcodes_with_replaced_block(self):
+        """Testing AcceleratedMyersDiffer.get_opcodes matches MyersDiffer
+        with a large replaced block
+        """
+        a = ['value = %d' % (i % 20) for i in range(400)]
+        b = ['value = %d' % ((i * 7) % 20) for i in range(400)]
+
+        self._test_same_opcodes(a, b)
+
+    def test_get_opcodes_with_long_snakes(self):
+        """Testing AcceleratedMyersDiffer.get_opcodes matches MyersDiffer
+        with long runs of equal lines
+        """
+        a = ['%d' % i for i in range(5000)]
+        b = list(a)
+        b[10:12] = ['x', 'y', 'z']
+        b[2500:2501] = []
+        b[4990:4990] = ['new']
+
+        self._test_same_opcodes(a, b)
+
+    def test_get_differ_with_backend(self):
+        """Testing get_differ with backend=DifferBackend.ACCELERATED"""
+        self.assertIsInstance(
+            get_differ(['a'], ['b'], backend=DifferBackend.ACCELERATED),
+            AcceleratedMyersDiffer)
+        self.assertIs(
+            type(get_differ(['a'], ['b'], backend=DifferBackend.PYTHON)),
+            MyersDiffer)
+
+    def _test_same_opcodes(self, a, b):
+        for compat_version in DiffCompatVersion.MYERS_VERSIONS:
+            self.assertEqual(
+                list(AcceleratedMyersDiffer(
+                    a, b, compat_version=compat_version).get_opcodes()),
+                list(MyersDiffer(
+                    a, b, compat_version=compat_version).get_opcodes()))
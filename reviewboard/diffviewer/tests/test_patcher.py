@@ -0,0 +1,264 @@
+"""Unit tests for reviewboard.diffviewer.patcher.
+
+Version Added:
+    7.0
+"""
+
+from __future__ import annotations
+
+from reviewboard.diffviewer.patcher import InProcessPatchError, apply_patch
+from reviewboard.testing import TestCase
+
+
+class ApplyPatchTests(TestCase):
+    """Unit tests for reviewboard.diffviewer.patcher.apply_patch."""
+
+    def test_with_modifications(self):
+        """Testing apply_patch with inserts, deletes, and replaces"""
+        self.assertEqual(
+            apply_patch(
+                diff=(
+                    b'--- foo.c\t2007-01-24 02:11:31.000000000 -0800\n'
+                    b'+++ foo.c\t2007-01-24 02:14:42.000000000 -0800\n'
+                    b'@@ -1,5 +1,8 @@\n'
+                    b'+#include <stdio.h>\n'
+                    b'+\n'
+                    b' int\n'
+                    b' main()\n'
+                    b' {\n'
+                    b'-\tprintf("foo\\n");\n'
+                    b'+\tprintf("foo bar\\n");\n'
+                    b'+\treturn 0;\n'
+                    b' }\n'
+                ),
+                orig_file=(
+                    b'int\n'
+                    b'main()\n'
+                    b'{\n'
+                    b'\tprintf("foo\\n");\n'
+                    b'}\n'
+                )),
+            b'#include <stdio.h>\n'
+            b'\n'
+            b'int\n'
+            b'main()\n'
+            b'{\n'
+            b'\tprintf("foo bar\\n");\n'
+            b'\treturn 0;\n'
+            b'}\n')
+
+    def test_with_multiple_hunks(self):
+        """Testing apply_patch with multiple hunks"""
+        orig_file = b''.join(
+            b'%d\n' % i
+            for i in range(1, 21)
+        )
+
+        self.assertEqual(
+            apply_patch(
+                diff=(
+                    b'--- a/numbers\n'
+                    b'+++ b/numbers\n'
+                    b'@@ -2,3 +2,3 @@\n'
+                    b' 2\n'
+                    b'-3\n'
+                    b'+three\n'
+                    b' 4\n'
+                    b'@@ -17,3 +17,2 @@\n'
+                    b' 17\n'
+                    b'-18\n'
+                    b' 19\n'
+                ),
+                orig_file=orig_file),
+            orig_file
+            .replace(b'3\n', b'three\n', 1)
+            .replace(b'18\n', b''))
+
+    def test_with_git_headers(self):
+        """Testing apply_patch with Git diff headers"""
+        self.assertEqual(
+            apply_patch(
+                diff=(
+                    b'diff --git a/README b/README\n'
+                    b'index 94bdd3e..197009f 100644\n'
+                    b'--- a/README\n'
+                    b'+++ b/README\n'
+                    b'@@ -1 +1 @@\n'
+                    b'-Hello\n'
+                    b'+Hello, world\n'
+                ),
+                orig_file=b'Hello\n'),
+            b'Hello, world\n')
+
+    def test_with_new_file(self):
+        """Testing apply_patch with a newly-created file"""
+        self.assertEqual(
+            apply_patch(
+                diff=(
+                    b'--- /dev/null\n'
+                    b'+++ b/README\n'
+                    b'@@ -0,0 +1,2 @@\n'
+                    b'+Line 1\n'
+                    b'+Line 2\n'
+                ),
+                orig_file=b''),
+            b'Line 1\n'
+            b'Line 2\n')
+
+    def test_with_deleted_file(self):
+        """Testing apply_patch with a deleted file"""
+        self.assertEqual(
+            apply_patch(
+                diff=(
+                    b'--- a/README\n'
+                    b'+++ /dev/null\n'
+                    b'@@ -1,2 +0,0 @@\n'
+                    b'-Line 1\n'
+                    b'-Line 2\n'
+                ),
+                orig_file=b'Line 1\nLine 2\n'),
+            b'')
+
+    def test_with_no_newline_original(self):
+        """Testing apply_patch with a missing newline in the original file"""
+        self.assertEqual(
+            apply_patch(
+                diff=(
+                    b'--- a/README\n'
+                    b'+++ b/README\n'
+                    b'@@ -1,2 +1,2 @@\n'
+                    b' Line 1\n'
+                    b'-Line 2\n'
+                    b'\\ No newline at end of file\n'
+                    b'+Line 2\n'
+                ),
+                orig_file=b'Line 1\nLine 2'),
+            b'Line 1\nLine 2\n')
+
+    def test_with_no_newline_modified(self):
+        """Testing apply_patch with a missing newline in the modified file"""
+        self.assertEqual(
+            apply_patch(
+                diff=(
+                    b'--- a/README\n'
+                    b'+++ b/README\n'
+                    b'@@ -1,2 +1,2 @@\n'
+                    b' Line 1\n'
+                    b'-Line 2\n'
+                    b'+Line 2\n'
+                    b'\\ No newline at end of file\n'
+                ),
+                orig_file=b'Line 1\nLine 2\n'),
+            b'Line 1\nLine 2')
+
+    def test_with_offset(self):
+        """Testing apply_patch with a hunk that only applies at an offset"""
+        message = 'Hunk does not apply cleanly'
+
+        with self.assertRaisesMessage(InProcessPatchError, message):
+            apply_patch(
+                diff=(
+                    b'--- a/README\n'
+                    b'+++ b/README\n'
+                    b'@@ -1,2 +1,2 @@\n'
+                    b' Line 1\n'
+                    b'-Line 2\n'
+                    b'+Line two\n'
+                ),
+                orig_file=b'Line 0\nLine 1\nLine 2\n')
+
+    def test_with_unanchored_hunk(self):
+        """Testing apply_patch with a hunk that patch would anchor to the
+        end of the file
+        """
+        message = 'Hunk is not anchored to the file'
+
+        with self.assertRaisesMessage(InProcessPatchError, message):
+            apply_patch(
+                diff=(
+                    b'--- a/README\n'
+                    b'+++ b/README\n'
+                    b'@@ -1,2 +1,1 @@\n'
+                    b' Line 1\n'
+                    b'-Line 2\n'
+                ),
+                orig_file=b'Line 1\nLine 2\nLine 3\n')
+
+    def test_with_existing_file_for_new_file(self):
+        """Testing apply_patch with a new file diff and existing content"""
+        message = 'Diff creates a file that already exists'
+
+        with self.assertRaisesMessage(InProcessPatchError, message):
+            apply_patch(
+                diff=(
+                    b'--- /dev/null\n'
+                    b'+++ b/README\n'
+                    b'@@ -0,0 +1 @@\n'
+                    b'+Line 1\n'
+                ),
+                orig_file=b'Existing\n')
+
+    def test_with_no_hunks(self):
+        """Testing apply_patch with no hunks"""
+        message = 'Missing unified diff file headers'
+
+        with self.assertRaisesMessage(InProcessPatchError, message):
+            apply_patch(
+                diff=(
+                    b'diff --git a/README b/README\n'
+                    b'new file mode 100644\n'
+                    b'index 0000000..e69de29\n'
+                ),
+                orig_file=b'')
+
+    def test_with_unknown_preamble(self):
+        """Testing apply_patch with an unknown line before the file headers
+        """
+        message = 'Unknown line in diff preamble'
+
+        with self.assertRaisesMessage(InProcessPatchError, message):
+            apply_patch(
+                diff=(
+                    b'Prereq: 1.2\n'
+                    b'--- a/README\n'
+                    b'+++ b/README\n'
+                    b'@@ -1 +1 @@\n'
+                    b'-Hello\n'
+                    b'+Hello, world\n'
+                ),
+                orig_file=b'Hello\n')
+
+    def test_with_multiple_files(self):
+        """Testing apply_patch with more than one file in the diff"""
+        message = 'Unexpected content after hunks'
+
+        with self.assertRaisesMessage(InProcessPatchError, message):
+            apply_patch(
+                diff=(
+                    b'--- a/README\n'
+                    b'+++ b/README\n'
+                    b'@@ -1 +1 @@\n'
+                    b'-Hello\n'
+                    b'+Hello, world\n'
+                    b'--- a/README2\n'
+                    b'+++ b/README2\n'
+                    b'@@ -1 +1 @@\n'
+                    b'-Hello\n'
+                    b'+Hello, world\n'
+                ),
+                orig_file=b'Hello\n')
+
+    def test_with_truncated_hunk(self):
+        """Testing apply_patch with a truncated hunk"""
+        message = 'Hunk line counts do not match'
+
+        with self.assertRaisesMessage(InProcessPatchError, message):
+            apply_patch(
+                diff=(
+                    b'--- a/README\n'
+                    b'+++ b/README\n'
+                    b'@@ -1,3 +1,3 @@\n'
+                    b'-Hello\n'
+                    b'+Hello, world\n'
+                ),
+                orig_file=b'Hello\n')
@@ -1,12 +1,15 @@
+import kgb
 from djblets.features.testing import override_feature_check
 
+from reviewboard.diffviewer import processors
+from reviewboard.diffviewer.diffutils import get_diff_data_chunks_info
 from reviewboard.diffviewer.features import filter_interdiffs_v2_feature
 from reviewboard.diffviewer.processors import (filter_interdiff_opcodes,
                                                post_process_filtered_equals)
 from reviewboard.testing import TestCase
 
 
-class FilterInterdiffOpcodesTests(TestCase):
+class FilterInterdiffOpcodesTests(kgb.SpyAgency, TestCase):
     """Unit tests for filter_interdiff_opcodes."""
 
     def test_filter_interdiff_opcodes(self):
@@ -361,6 +364,50 @@ class FilterInterdiffOpcodesTests(TestCase):
         ])
         self._sanity_check_opcodes(new_opcodes)
 
+    def test_filter_interdiff_opcodes_with_chunks_info(self):
+        """Testing filter_interdiff_opcodes with pre-computed chunks info"""
+        opcodes = [
+            ('insert', 0, 0, 0, 1),
+            ('equal', 0, 5, 1, 6),
+            ('delete', 5, 10, 6, 6),
+            ('equal', 10, 25, 6, 21),
+            ('replace', 25, 26, 21, 22),
+            ('equal', 26, 40, 22, 36),
+            ('insert', 40, 40, 36, 46),
+        ]
+        self._sanity_check_opcodes(opcodes)
+
+        orig_diff = self._build_dummy_diff_data(22, 10, 22, 10)
+        new_diff = b''.join([
+            self._build_dummy_diff_data(2, 14, 2, 9),
+            self._build_dummy_diff_data(22, 10, 22, 10),
+        ])
+
+        orig_chunks_info = get_diff_data_chunks_info(orig_diff)
+        new_chunks_info = get_diff_data_chunks_info(new_diff)
+
+        self.spy_on(processors.get_diff_data_chunks_info)
+
+        new_opcodes = list(filter_interdiff_opcodes(
+            opcodes,
+            orig_diff,
+            new_diff,
+            filediff_chunks_info=orig_chunks_info,
+            interfilediff_chunks_info=new_chunks_info))
+
+        self.assertEqual(new_opcodes, [
+            ('filtered-equal', 0, 0, 0, 1),
+            ('filtered-equal', 0, 5, 1, 6),
+            ('filtered-equal', 5, 10, 6, 6),
+            ('equal', 10, 25, 6, 21),
+            ('replace', 25, 26, 21, 22),
+            ('equal', 26, 28, 22, 24),
+            ('filtered-equal', 28, 40, 24, 36),
+            ('filtered-equal', 40, 40, 36, 46),
+        ])
+        self._sanity_check_opcodes(new_opcodes)
+        self.assertSpyNotCalled(processors.get_diff_data_chunks_info)
+
     def _sanity_check_opcodes(self, opcodes):
         prev_i2 = None
         prev_j2 = None
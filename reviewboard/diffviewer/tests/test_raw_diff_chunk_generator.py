@@ -1,9 +1,13 @@
+import kgb
+from django.core.cache import cache
+from djblets.cache.backend import make_cache_key
+
 from reviewboard.diffviewer.chunk_generator import RawDiffChunkGenerator
 from reviewboard.diffviewer.settings import DiffSettings
 from reviewboard.testing import TestCase
 
 
-class RawDiffChunkGeneratorTests(TestCase):
+class RawDiffChunkGeneratorTests(kgb.SpyAgency, TestCase):
     """Unit tests for RawDiffChunkGenerator."""
 
     @property
@@ -19,6 +23,38 @@ class RawDiffChunkGeneratorTests(TestCase):
                                      modified_filename='',
                                      diff_settings=DiffSettings.create())
 
+    def _create_segmented_generator(self):
+        """Return a generator that caches chunks in small segments.
+
+        The generated diff has 9 lines across 5 chunks, with segments
+        containing at least 3 lines.
+
+        Returns:
+            reviewboard.diffviewer.chunk_generator.RawDiffChunkGenerator:
+            The new generator.
+        """
+        generator = RawDiffChunkGenerator(
+            old=(
+                b'1\n2\n'
+                b'3\n'
+                b'4\n5\n6\n7\n'
+                b'8\n'
+                b'9\n'
+            ),
+            new=(
+                b'1\n2\n'
+                b'three\n'
+                b'4\n5\n6\n7\n'
+                b'eight\n'
+                b'9\n'
+            ),
+            orig_filename='numbers',
+            modified_filename='numbers',
+            diff_settings=DiffSettings.create())
+        generator.CACHE_SEGMENT_NUM_LINES = 3
+
+        return generator
+
     def test_get_chunks(self):
         """Testing RawDiffChunkGenerator.get_chunks"""
         old = (
@@ -144,6 +180,132 @@ class RawDiffChunkGeneratorTests(TestCase):
                 'numlines': 1,
             })
 
+    def test_get_opcode_generator_with_move_detection_work_budget(self):
+        """Testing RawDiffChunkGenerator.get_opcode_generator with
+        diffviewer_move_detection_work_budget set
+        """
+        with self.siteconfig_settings({
+            'diffviewer_move_detection_work_budget': 5000,
+        }):
+            generator = RawDiffChunkGenerator(
+                old=b'',
+                new=b'',
+                orig_filename='',
+                modified_filename='',
+                diff_settings=DiffSettings.create())
+
+        opcode_generator = generator.get_opcode_generator()
+        self.assertEqual(opcode_generator.move_detection_work_budget, 5000)
+
+    def test_get_chunks_with_cache_key(self):
+        """Testing RawDiffChunkGenerator.get_chunks with cache_key stores
+        and loads chunks in segments
+        """
+        generator = self._create_segmented_generator()
+        chunks = list(generator.get_chunks(cache_key='test-chunks'))
+
+        self.assertEqual(len(chunks), 5)
+
+        index = generator.get_chunks_index('test-chunks')
+        self.assertEqual(index['num_chunks'], 5)
+        self.assertEqual(index['last_line'], 9)
+        self.assertEqual(index['segments'], [(0, 2, 1, 3), (2, 1, 4, 7),
+                                             (3, 2, 8, 9)])
+
+        # A new generator should load everything from cache.
+        generator = self._create_segmented_generator()
+        self.spy_on(generator.get_chunks_uncached)
+
+        self.assertEqual(list(generator.get_chunks(cache_key='test-chunks')),
+                         chunks)
+        self.assertSpyNotCalled(generator.get_chunks_uncached)
+
+    def test_get_chunks_with_cache_key_and_evicted_segment(self):
+        """Testing RawDiffChunkGenerator.get_chunks with cache_key and a
+        segment evicted from cache
+        """
+        generator = self._create_segmented_generator()
+        chunks = list(generator.get_chunks(cache_key='test-chunks'))
+
+        cache.delete(make_cache_key('test-chunks-segment-1'))
+
+        generator = self._create_segmented_generator()
+        self.spy_on(generator.get_chunks_uncached)
+
+        self.assertEqual(list(generator.get_chunks(cache_key='test-chunks')),
+                         chunks)
+        self.assertSpyCallCount(generator.get_chunks_uncached, 1)
+
+        # The segment should be back in cache.
+        generator = self._create_segmented_generator()
+        self.spy_on(generator.get_chunks_uncached)
+
+        self.assertEqual(list(generator.get_chunks(cache_key='test-chunks')),
+                         chunks)
+        self.assertSpyNotCalled(generator.get_chunks_uncached)
+
+    def test_get_chunks_in_range_with_cache_key(self):
+        """Testing RawDiffChunkGenerator.get_chunks_in_range with cache_key
+        loads only the segments in range
+        """
+        generator = self._create_segmented_generator()
+        chunks = list(generator.get_chunks(cache_key='test-chunks'))
+
+        # Only the middle segment is needed, so removing the others
+        # shouldn't matter.
+        cache.delete(make_cache_key('test-chunks-segment-0'))
+        cache.delete(make_cache_key('test-chunks-segment-2'))
+
+        generator = self._create_segmented_generator()
+        self.spy_on(generator.get_chunks_uncached)
+
+        range_chunks = list(generator.get_chunks_in_range(
+            first_line=6,
+            num_lines=2,
+            cache_key='test-chunks'))
+
+        self.assertSpyNotCalled(generator.get_chunks_uncached)
+        self.assertEqual(len(range_chunks), 1)
+        self.assertEqual(range_chunks[0]['index'], 2)
+        self.assertEqual(range_chunks[0]['change'], 'equal')
+        self.assertEqual(range_chunks[0]['lines'], chunks[2]['lines'][2:4])
+        self.assertEqual(range_chunks[0]['numlines'], 2)
+
+    def test_get_chunks_index_with_headers(self):
+        """Testing RawDiffChunkGenerator.get_chunks_index with header
+        chunks
+        """
+        generator = RawDiffChunkGenerator(
+            old=(
+                b'class Foo:\n'
+                b'    pass\n'
+            ),
+            new=(
+                b'class Foo:\n'
+                b'    x = 1\n'
+            ),
+            orig_filename='foo.py',
+            modified_filename='foo.py',
+            diff_settings=DiffSettings.create())
+        chunks = list(generator.get_chunks(cache_key='test-chunks'))
+        index = generator.get_chunks_index('test-chunks')
+
+        self.assertEqual(
+            index['header_chunks'],
+            [
+                {
+                    'lines': [
+                        [1, 1, '', [], 1, '', [], False],
+                    ],
+                    'meta': {
+                        'left_headers': chunks[0]['meta']['left_headers'],
+                        'right_headers': chunks[0]['meta']['right_headers'],
+                    },
+                },
+            ])
+        self.assertEqual(chunks[0]['meta']['left_headers'],
+                         [(1, 'class Foo:')])
+
     def test_get_chunks_with_settings_syntax_highlighting_true(self):
         """Testing RawDiffChunkGenerator.get_chunks with
         DiffSettings.syntax_highlighting=True and syntax highlighting
@@ -503,6 +665,74 @@ class RawDiffChunkGeneratorTests(TestCase):
                                             filename='test.md'),
             ['This is <span class="gs">**bold**</span>'])
 
+    def test_apply_pygments_with_cached_lines(self):
+        """Testing RawDiffChunkGenerator._apply_pygments with highlighted
+        lines in cache
+        """
+        chunk_generator = RawDiffChunkGenerator(
+            old=[],
+            new=[],
+            orig_filename='file1',
+            modified_filename='file2',
+            diff_settings=DiffSettings.create())
+        self.spy_on(chunk_generator._highlight)
+
+        self.assertEqual(
+            chunk_generator._apply_pygments(data='This is **bold**\n',
+                                            filename='test.md'),
+            ['This is <span class="gs">**bold**</span>'])
+        self.assertSpyCallCount(chunk_generator._highlight, 1)
+
+        # A new generator, such as for an interdiff, should be able to use
+        # the cached lines for the same contents, even with another filename.
+        chunk_generator = RawDiffChunkGenerator(
+            old=[],
+            new=[],
+            orig_filename='file1',
+            modified_filename='file2',
+            diff_settings=DiffSettings.create())
+        self.spy_on(chunk_generator._highlight)
+
+        self.assertEqual(
+            chunk_generator._apply_pygments(data='This is **bold**\n',
+                                            filename='test2.md'),
+            ['This is <span class="gs">**bold**</span>'])
+        self.assertSpyNotCalled(chunk_generator._highlight)
+
+        # A different lexer should not use those lines.
+        self.assertEqual(
+            chunk_generator._apply_pygments(data='This is **bold**\n',
+                                            filename='test.py'),
+            ['<span class="n">This</span> <span class="ow">is</span> '
+             '<span class="o">**</span><span class="n">bold</span>'
+             '<span class="o">**</span>'])
+        self.assertSpyCallCount(chunk_generator._highlight, 1)
+
+    def test_apply_pygments_with_ambiguous_filename(self):
+        """Testing RawDiffChunkGenerator._apply_pygments with a filename
+        matching multiple lexers
+        """
+        chunk_generator = RawDiffChunkGenerator(
+            old=[],
+            new=[],
+            orig_filename='file1',
+            modified_filename='file2',
+            diff_settings=DiffSettings.create())
+
+        self.assertEqual(
+            chunk_generator._get_lexer_class(
+                data='#import <Foundation/Foundation.h>\n'
+                     '@interface Foo : NSObject\n'
+                     '@end\n',
+                filename='foo.h').__name__,
+            'ObjectiveCLexer')
+        self.assertEqual(
+            chunk_generator._get_lexer_class(
+                data='#include <stdio.h>\n'
+                     'int main();\n',
+                filename='foo.h').__name__,
+            'CLexer')
+
     def test_apply_pygments_without_lexer(self):
         """Testing RawDiffChunkGenerator._apply_pygments without valid lexer"""
         chunk_generator = RawDiffChunkGenerator(
@@ -14,13 +14,14 @@ import logging
 import ssl
 from email.generator import _make_boundary as generate_boundary
 from typing import Callable, Optional, TYPE_CHECKING, Tuple, Type, Union
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
 
 from cryptography import x509
 from cryptography.x509.oid import NameOID
 from cryptography.hazmat.backends import default_backend
 from django.utils.encoding import force_bytes, force_str
+from djblets.cache.backend import cache_memoize
 
 from reviewboard.deprecation import RemovedInReviewBoard70Warning
 from reviewboard.hostingsvcs.base.http import (HostingServiceHTTPRequest,
@@ -44,6 +45,17 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class _HTTPCacheMiss(Exception):
+    """A cached HTTP response was not found.
+
+    This is used internally by :py:class:`HostingServiceClient` to detect a
+    cache miss.
+
+    Version Added:
+        7.0
+    """
+
+
 class HostingServiceClient:
     """Client for communicating with a hosting service's API.
 
@@ -100,6 +112,24 @@ class HostingServiceClient:
     #:     4.0
     use_http_digest_auth: bool = False
 
+    #: Whether to make conditional requests for cacheable GET requests.
+    #:
+    #: When enabled, responses to GET requests that include an ``ETag`` or
+    #: ``Last-Modified`` header are cached. Later requests for the same URL
+    #: with the same credentials send ``If-None-Match`` or
+    #: ``If-Modified-Since``, and a ``304 Not Modified`` response is served
+    #: from the cache. Many services don't count these against rate limits.
+    #:
+    #: Version Added:
+    #:     7.0
+    use_http_conditional_requests: bool = True
+
+    #: The number of seconds to cache responses for conditional requests.
+    #:
+    #: Version Added:
+    #:     7.0
+    http_conditional_cache_expiration: int = 24 * 60 * 60
+
     ######################
     # Instance variables #
     ######################
@@ -465,6 +495,15 @@ class HostingServiceClient:
 
         See those methods for more information.
 
+        If :py:attr:`use_http_conditional_requests` is set, GET requests
+        will be made as conditional requests when a previous response is
+        cached, and ``304 Not Modified`` responses will be returned from the
+        cache.
+
+        Version Changed:
+            7.0:
+            Added support for conditional requests.
+
         Version Changed:
             4.0:
             This now returns a :py:class:`reviewboard.hostingsvcs.base.http.
@@ -511,14 +550,155 @@ class HostingServiceClient:
                                           credentials=credentials,
                                           **kwargs)
 
+        cache_key: Optional[str] = None
+        cached: Optional[dict] = None
+
+        if (self.use_http_conditional_requests and
+            request.method == 'GET' and
+            request.get_header('If-None-Match') is None and
+            request.get_header('If-Modified-Since') is None):
+            cache_key = self._make_http_cache_key(request)
+            cached = self._get_cached_http_response(cache_key)
+
+            if cached is not None:
+                if cached['etag']:
+                    request.add_header('If-None-Match', cached['etag'])
+
+                if cached['last_modified']:
+                    request.add_header('If-Modified-Since',
+                                       cached['last_modified'])
+
         try:
-            return self.process_http_response(self.open_http_request(request))
+            try:
+                response = self.open_http_request(request)
+            except HTTPError as e:
+                if e.code != 304 or cached is None:
+                    raise
+
+                headers = dict(cached['headers'])
+
+                if e.headers:
+                    headers.update(e.headers.items())
+
+                response = self.http_response_cls(
+                    request=request,
+                    url=cached['url'],
+                    data=cached['data'],
+                    headers=headers,
+                    status_code=cached['status_code'])
+
+            response = self.process_http_response(response)
         except URLError as e:
             # This will either raise, or it will return and we'll raise.
             self.process_http_error(request, e)
 
             raise
 
+        if cache_key is not None and response.status_code == 200:
+            self._store_http_response(cache_key, response)
+
+        return response
+
+    def _make_http_cache_key(
+        self,
+        request: HostingServiceHTTPRequest,
+    ) -> str:
+        """Return a cache key for conditional requests.
+
+        The key covers the URL and the request headers, which include any
+        authentication headers, so responses are never shared between
+        accounts or credentials.
+
+        Version Added:
+            7.0
+
+        Args:
+            request (reviewboard.hostingsvcs.base.http.
+                     HostingServiceHTTPRequest):
+                The HTTP request.
+
+        Returns:
+            str:
+            The cache key.
+        """
+        account = self.hosting_service.account
+        key_data = json.dumps([
+            account.pk,
+            account.username,
+            request.url,
+            sorted(request.headers.items()),
+        ])
+
+        return 'hostingsvc-http-response:%s' % hashlib.sha256(
+            key_data.encode('utf-8')).hexdigest()
+
+    def _get_cached_http_response(
+        self,
+        cache_key: str,
+    ) -> Optional[dict]:
+        """Return a cached response for a conditional request.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the request.
+
+        Returns:
+            dict:
+            The cached response information, or ``None`` if not cached.
+        """
+        def _on_miss():
+            raise _HTTPCacheMiss()
+
+        try:
+            return cache_memoize(cache_key, _on_miss, large_data=True)
+        except _HTTPCacheMiss:
+            return None
+
+    def _store_http_response(
+        self,
+        cache_key: str,
+        response: HostingServiceHTTPResponse,
+    ) -> None:
+        """Cache a response for later conditional requests.
+
+        Responses without an ``ETag`` or ``Last-Modified`` header can't be
+        validated, and won't be cached.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (str):
+                The cache key for the request.
+
+            response (reviewboard.hostingsvcs.base.http.
+                      HostingServiceHTTPResponse):
+                The response to cache.
+        """
+        etag = response.get_header('ETag')
+        last_modified = response.get_header('Last-Modified')
+
+        if not etag and not last_modified:
+            return
+
+        cached = {
+            'data': response.data,
+            'etag': etag,
+            'headers': response.headers,
+            'last_modified': last_modified,
+            'status_code': response.status_code,
+            'url': response.url,
+        }
+
+        cache_memoize(cache_key,
+                      lambda: cached,
+                      expiration=self.http_conditional_cache_expiration,
+                      large_data=True,
+                      force_overwrite=True)
+
     def get_http_credentials(
         self,
         account: HostingServiceAccount,
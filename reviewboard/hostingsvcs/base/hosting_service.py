@@ -30,7 +30,8 @@ if TYPE_CHECKING:
     from reviewboard.hostingsvcs.base.paginator import APIPaginator
     from reviewboard.hostingsvcs.models import HostingServiceAccount
     from reviewboard.hostingsvcs.repository import RemoteRepository
-    from reviewboard.scmtools.core import Branch, Commit, SCMTool
+    from reviewboard.scmtools.core import (Branch, Commit, FileLookup,
+                                           FileLookupResult, SCMTool)
     from reviewboard.scmtools.models import Repository
 
 
@@ -636,6 +637,66 @@ class BaseHostingService:
 
         return repository.get_scmtool().get_file(path, revision, **kwargs)
 
+    def get_files(
+        self,
+        repository: Repository,
+        lookups: Sequence[FileLookup],
+        **kwargs,
+    ) -> List[FileLookupResult]:
+        """Return several requested files.
+
+        If the hosting service doesn't override :py:meth:`get_file`, this
+        will pass the lookups on to the SCMTool's
+        :py:meth:`~reviewboard.scmtools.core.SCMTool.get_files`. Otherwise,
+        this will call :py:meth:`get_file` for each file. Subclasses that
+        can fetch several files in fewer API requests should override this.
+
+        Version Added:
+            7.0
+
+        Args:
+            repository (reviewboard.scmtools.models.Repository):
+                The repository to retrieve the files from.
+
+            lookups (list of reviewboard.scmtools.core.FileLookup):
+                The files to retrieve.
+
+            **kwargs (dict):
+                Additional keyword arguments. This is not currently used, but
+                is available for future expansion.
+
+        Returns:
+            list:
+            The contents of each file (as bytes) or the exception raised when
+            fetching it, in the same order as ``lookups``.
+
+        Raises:
+            NotImplementedError:
+                If this hosting service does not support repositories.
+        """
+        if not self.supports_repositories:
+            raise NotImplementedError
+
+        if type(self).get_file is BaseHostingService.get_file:
+            return repository.get_scmtool().get_files(lookups)
+
+        results: List[FileLookupResult] = []
+
+        for lookup in lookups:
+            context = lookup.context
+
+            try:
+                results.append(self.get_file(
+                    repository,
+                    lookup.path,
+                    lookup.revision,
+                    base_commit_id=context.base_commit_id,
+                    context=context))
+            except Exception as e:
+                results.append(e)
+
+        return results
+
     def get_file_exists(
         self,
         repository: Repository,
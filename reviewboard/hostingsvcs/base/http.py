@@ -9,19 +9,30 @@ Version Added:
 from __future__ import annotations
 
 import base64
+import hashlib
+import io
 import json
 import logging
+import os
 import ssl
+import threading
+import time
 from collections import OrderedDict
-from typing import Any, Dict, List, NoReturn, Optional, TYPE_CHECKING, Union
+from http.client import (BadStatusLine, HTTPConnection, HTTPException,
+                         HTTPSConnection)
+from typing import (Any, Dict, Hashable, List, NoReturn, Optional,
+                    TYPE_CHECKING, Tuple, Type, Union)
+from urllib.error import URLError
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 from urllib.request import (
     Request as BaseURLRequest,
     HTTPBasicAuthHandler,
     HTTPDigestAuthHandler,
+    HTTPHandler,
     HTTPPasswordMgrWithDefaultRealm,
     HTTPSHandler,
     build_opener)
+from urllib.response import addinfourl
 
 from django.utils.encoding import force_str
 from djblets.util.decorators import cached_property
@@ -124,6 +135,420 @@ def _log_and_raise(
     raise TypeError(msg)
 
 
+class HTTPConnectionPool:
+    """A pool of persistent HTTP(S) connections.
+
+    Connections are kept open after a request completes (if the server
+    allows it), and reused for later requests to the same host. This avoids
+    a new TCP connection and TLS handshake for every request to a hosting
+    service's API.
+
+    Connections are only reused within the process that opened them.
+
+    Version Added:
+        7.0
+    """
+
+    #: The default maximum number of idle connections to keep per host.
+    DEFAULT_MAX_IDLE_PER_HOST = 4
+
+    #: The default number of seconds an idle connection can be reused.
+    #:
+    #: Servers commonly close idle connections after somewhere between 5
+    #: and 120 seconds, so this errs on the low side.
+    DEFAULT_IDLE_TIMEOUT = 30
+
+    ######################
+    # Instance variables #
+    ######################
+
+    #: The number of seconds an idle connection can be reused.
+    idle_timeout: float
+
+    #: The maximum number of idle connections to keep per host.
+    max_idle_per_host: int
+
+    def __init__(
+        self,
+        max_idle_per_host: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_idle_per_host (int, optional):
+                The maximum number of idle connections to keep per host.
+                Defaults to :py:attr:`DEFAULT_MAX_IDLE_PER_HOST`.
+
+            idle_timeout (float, optional):
+                The number of seconds an idle connection can be reused.
+                Defaults to :py:attr:`DEFAULT_IDLE_TIMEOUT`.
+        """
+        if max_idle_per_host is None:
+            max_idle_per_host = self.DEFAULT_MAX_IDLE_PER_HOST
+
+        if idle_timeout is None:
+            idle_timeout = self.DEFAULT_IDLE_TIMEOUT
+
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        self._idle: Dict[Hashable, List[Tuple[HTTPConnection, float]]] = {}
+        self._pid = os.getpid()
+
+    def acquire(
+        self,
+        key: Hashable,
+    ) -> Optional[HTTPConnection]:
+        """Return an idle connection for a host, if available.
+
+        Args:
+            key (object):
+                The key identifying the host and connection settings.
+
+        Returns:
+            http.client.HTTPConnection:
+            The connection, or ``None`` if a new one must be opened.
+        """
+        expired: List[HTTPConnection] = []
+        result: Optional[HTTPConnection] = None
+
+        with self._lock:
+            self._check_pid()
+
+            connections = self._idle.get(key)
+            cutoff = time.monotonic() - self.idle_timeout
+
+            while connections:
+                connection, released = connections.pop()
+
+                if released > cutoff and connection.sock is not None:
+                    result = connection
+                    break
+
+                expired.append(connection)
+
+        for connection in expired:
+            connection.close()
+
+        return result
+
+    def release(
+        self,
+        key: Hashable,
+        connection: HTTPConnection,
+    ) -> None:
+        """Return a connection to the pool after a request.
+
+        Args:
+            key (object):
+                The key identifying the host and connection settings.
+
+            connection (http.client.HTTPConnection):
+                The connection to return.
+        """
+        with self._lock:
+            self._check_pid()
+
+            connections = self._idle.setdefault(key, [])
+
+            if len(connections) < self.max_idle_per_host:
+                connections.append((connection, time.monotonic()))
+                return
+
+        connection.close()
+
+    def close_all(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+
+        for connections in idle.values():
+            for connection, released in connections:
+                connection.close()
+
+    def _check_pid(self) -> None:
+        """Discard connections inherited from a parent process.
+
+        This must be called with the lock held.
+        """
+        pid = os.getpid()
+
+        if self._pid != pid:
+            # Sockets shared with the parent process can't be used safely.
+            # Drop them without closing, which would affect the parent.
+            self._idle = {}
+            self._pid = pid
+
+
+#: The shared pool of persistent connections for hosting service requests.
+#:
+#: Version Added:
+#:     7.0
+http_connection_pool = HTTPConnectionPool()
+
+
+#: HTTP methods that can safely be sent again if a request fails.
+#:
+#: Version Added:
+#:     7.0
+_IDEMPOTENT_METHODS = {'DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'}
+
+
+class _KeepAliveHandlerMixin:
+    """Mixin for urllib handlers that reuse pooled persistent connections.
+
+    Version Added:
+        7.0
+    """
+
+    def _open_keep_alive(
+        self,
+        http_class: Type[HTTPConnection],
+        req: BaseURLRequest,
+        **connection_kwargs,
+    ) -> addinfourl:
+        """Perform a request over a persistent connection.
+
+        This mirrors :py:meth:`urllib.request.AbstractHTTPHandler.do_open`,
+        but asks the server to keep the connection open, and returns it to
+        :py:data:`http_connection_pool` once the response has been read.
+
+        If a reused connection turns out to have been closed by the server
+        while idle, the request may be retried on a new connection. See
+        :py:meth:`_can_retry` for the cases where this is done.
+
+        Args:
+            http_class (type):
+                The connection class to use.
+
+            req (urllib.request.Request):
+                The request to perform.
+
+            **connection_kwargs (dict):
+                Additional keyword arguments for new connections.
+
+        Returns:
+            urllib.response.addinfourl:
+            The response, with the payload already read.
+
+        Raises:
+            urllib.error.URLError:
+                The request could not be performed.
+        """
+        host = req.host
+
+        if not host:
+            raise URLError('no host given')
+
+        tunnel_host = getattr(req, '_tunnel_host', None)
+        key = (http_class, host, tunnel_host, req.timeout,
+               id(connection_kwargs.get('context')))
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update(
+            (name, value)
+            for name, value in req.headers.items()
+            if name not in headers
+        )
+        headers['Connection'] = 'keep-alive'
+        headers = {
+            name.title(): value
+            for name, value in headers.items()
+        }
+
+        tunnel_headers = {}
+
+        if tunnel_host and 'Proxy-Authorization' in headers:
+            tunnel_headers['Proxy-Authorization'] = \
+                headers.pop('Proxy-Authorization')
+
+        method = req.get_method()
+
+        while True:
+            connection = http_connection_pool.acquire(key)
+            reused = connection is not None
+
+            if connection is None:
+                connection = http_class(host,
+                                        timeout=req.timeout,
+                                        **connection_kwargs)
+
+                if tunnel_host:
+                    connection.set_tunnel(tunnel_host,
+                                          headers=tunnel_headers)
+
+            sent = False
+
+            try:
+                connection.request(
+                    method,
+                    req.selector,
+                    req.data,
+                    headers,
+                    encode_chunked=req.has_header('Transfer-encoding'))
+                sent = True
+                response = connection.getresponse()
+            except (OSError, HTTPException) as e:
+                connection.close()
+
+                if reused and self._can_retry(e, method=method, sent=sent):
+                    # The server likely closed the idle connection. Try
+                    # again with a new one.
+                    continue
+
+                raise URLError(e)
+
+            # Once a response has begun, the request is never retried.
+            try:
+                data = response.read()
+            except (OSError, HTTPException) as e:
+                connection.close()
+
+                raise URLError(e)
+
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            http_connection_pool.release(key, connection)
+
+        result = addinfourl(io.BytesIO(data), response.msg,
+                            req.get_full_url(), response.status)
+        result.msg = response.reason  # type: ignore
+
+        return result
+
+    def _can_retry(
+        self,
+        error: Exception,
+        *,
+        method: str,
+        sent: bool,
+    ) -> bool:
+        """Return whether a failed request on a reused connection can retry.
+
+        Only errors indicating that the server closed the connection before
+        responding are retried. If the request could not be sent, it's
+        always safe to retry. Otherwise, the server may have already acted
+        on it, so only idempotent methods are retried.
+
+        Timeouts and other errors are never retried.
+
+        Args:
+            error (Exception):
+                The error raised when sending the request or reading the
+                start of the response.
+
+            method (str):
+                The HTTP method of the request.
+
+            sent (bool):
+                Whether the request was sent before the error occurred.
+
+        Returns:
+            bool:
+            ``True`` if the request can be retried on a new connection.
+        """
+        # Note that RemoteDisconnected is a subclass of both BadStatusLine
+        # and ConnectionResetError.
+        if not isinstance(error, (BadStatusLine, BrokenPipeError,
+                                  ConnectionResetError)):
+            return False
+
+        return not sent or method in _IDEMPOTENT_METHODS
+
+
+class KeepAliveHTTPHandler(_KeepAliveHandlerMixin, HTTPHandler):
+    """A urllib handler for HTTP requests using persistent connections.
+
+    Version Added:
+        7.0
+    """
+
+    def http_open(
+        self,
+        req: BaseURLRequest,
+    ) -> addinfourl:
+        """Perform an HTTP request.
+
+        Args:
+            req (urllib.request.Request):
+                The request to perform.
+
+        Returns:
+            urllib.response.addinfourl:
+            The response.
+        """
+        return self._open_keep_alive(HTTPConnection, req)
+
+
+class KeepAliveHTTPSHandler(_KeepAliveHandlerMixin, HTTPSHandler):
+    """A urllib handler for HTTPS requests using persistent connections.
+
+    Version Added:
+        7.0
+    """
+
+    def https_open(
+        self,
+        req: BaseURLRequest,
+    ) -> addinfourl:
+        """Perform an HTTPS request.
+
+        Args:
+            req (urllib.request.Request):
+                The request to perform.
+
+        Returns:
+            urllib.response.addinfourl:
+            The response.
+        """
+        return self._open_keep_alive(HTTPSConnection, req,
+                                     context=self._context)
+
+
+_ssl_contexts: Dict[str, ssl.SSLContext] = {}
+_ssl_contexts_lock = threading.Lock()
+
+
+def _get_ssl_context(
+    cert_data: str,
+) -> ssl.SSLContext:
+    """Return an SSL context trusting a certificate.
+
+    Contexts are shared for the same certificate, so that connections made
+    with them can be pooled.
+
+    Version Added:
+        7.0
+
+    Args:
+        cert_data (str):
+            The PEM-encoded certificate to trust.
+
+    Returns:
+        ssl.SSLContext:
+        The SSL context.
+    """
+    key = hashlib.sha256(cert_data.encode('utf-8')).hexdigest()
+
+    with _ssl_contexts_lock:
+        try:
+            return _ssl_contexts[key]
+        except KeyError:
+            context = ssl.create_default_context()
+            context.load_verify_locations(cadata=cert_data)
+            context.check_hostname = False
+
+            _ssl_contexts[key] = context
+
+            return context
+
+
 class HostingServiceHTTPRequest:
     """A request that can use any HTTP method.
 
@@ -401,6 +826,12 @@ class HostingServiceHTTPRequest:
     def open(self) -> HostingServiceHTTPResponse:
         """Open the request to the server, returning the response.
 
+        Version Changed:
+            7.0:
+            Requests are now made over persistent connections shared
+            through :py:data:`http_connection_pool`, unless custom HTTP or
+            HTTPS handlers have been added.
+
         Returns:
             HostingServiceHTTPResponse:
             The response information from the server.
@@ -416,21 +847,21 @@ class HostingServiceHTTPRequest:
                                  method=self.method)
 
         hosting_service = self.hosting_service
+        handlers = list(self._urlopen_handlers)
 
         if hosting_service and 'ssl_cert' in hosting_service.account.data:
-            # create_default_context only exists in Python 2.7.9+. Using it
-            # here should be fine, however, because accepting invalid or
-            # self-signed certificates is only possible when running
-            # against versions that have this (see the check for
-            # create_default_context below).
-            context = ssl.create_default_context()
-            context.load_verify_locations(
-                cadata=hosting_service.account.data['ssl_cert'])
-            context.check_hostname = False
+            handlers.append(KeepAliveHTTPSHandler(context=_get_ssl_context(
+                hosting_service.account.data['ssl_cert'])))
+
+        if not any(isinstance(handler, HTTPSHandler)
+                   for handler in handlers):
+            handlers.append(KeepAliveHTTPSHandler())
 
-            self._urlopen_handlers.append(HTTPSHandler(context=context))
+        if not any(isinstance(handler, HTTPHandler)
+                   for handler in handlers):
+            handlers.append(KeepAliveHTTPHandler())
 
-        opener = build_opener(*self._urlopen_handlers)
+        opener = build_opener(*handlers)
         response = opener.open(request)
 
         if hosting_service:
@@ -8,9 +8,16 @@ Version Added:
 
 from __future__ import annotations
 
-from typing import (Any, Callable, Generic, Iterator, Optional, Sequence,
-                    TYPE_CHECKING, TypeVar)
-
+import math
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (Any, Callable, Deque, Generic, Iterator, List, Optional,
+                    Sequence, TYPE_CHECKING, Tuple, TypeVar)
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+from django.db import connections
 from typing_extensions import NotRequired, TypeAlias, TypedDict
 
 if TYPE_CHECKING:
@@ -326,6 +333,17 @@ class APIPaginator(BasePaginator[_PageDataItemT, _PageDataT]):
     through the :py:attr:`client` member of the paginator in order to perform
     requests against the hosting service.
 
+    Pages can optionally be prefetched in background threads while the
+    caller works through :py:meth:`iter_pages` or :py:meth:`iter_items`, by
+    setting :py:attr:`prefetch_pages`. If the total number of pages is known
+    (see :py:meth:`get_remaining_page_urls`), the pages are fetched in
+    parallel. Otherwise, each following page is fetched as soon as the
+    previous one provides its URL, ahead of the caller.
+
+    Version Changed:
+        7.0:
+        Added support for prefetching pages.
+
     Version Changed:
         6.0:
         * Moved from :py:mod:`reviewboard.hostingsvcs.utils.paginator` to
@@ -334,6 +352,21 @@ class APIPaginator(BasePaginator[_PageDataItemT, _PageDataT]):
         * This is now a generic, supporting typing for page data and items.
     """
 
+    #: The default number of pages to fetch ahead of the caller.
+    #:
+    #: This applies to :py:meth:`iter_pages` and :py:meth:`iter_items`. At
+    #: most this many pages will be fetched and held in memory ahead of the
+    #: page being processed. A value of 0 disables prefetching.
+    #:
+    #: This can be overridden when constructing the paginator.
+    #:
+    #: Version Added:
+    #:     7.0
+    #:
+    #: Type:
+    #:     int
+    prefetch_pages: int = 0
+
     #: Query parameter name for the start page in a request.
     #:
     #: This is optional. Clients can specify this to provide this as part
@@ -392,12 +425,17 @@ class APIPaginator(BasePaginator[_PageDataItemT, _PageDataT]):
         url: str,
         query_params: QueryArgs = {},
         *args,
+        prefetch_pages: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Initialize the paginator.
 
         Once initialized, the first page will be fetched automatically.
 
+        Version Changed:
+            7.0:
+            Added the ``prefetch_pages`` argument.
+
         Args:
             client (reviewboard.hostingsvcs.base.client.HostingServiceClient):
                 The hosting service client used to make requests.
@@ -414,11 +452,18 @@ class APIPaginator(BasePaginator[_PageDataItemT, _PageDataT]):
             *args (tuple):
                 Positional arguments for the parent constructor.
 
+            prefetch_pages (int, optional):
+                The number of pages to fetch ahead of the caller when
+                iterating. Defaults to :py:attr:`prefetch_pages`.
+
             **kwargs (dict):
                 Keyword arguments for the parent constructor.
         """
         super().__init__(*args, **kwargs)
 
+        if prefetch_pages is not None:
+            self.prefetch_pages = prefetch_pages
+
         self.client = client
         self.url = url
         self.prev_url = None
@@ -496,6 +541,120 @@ class APIPaginator(BasePaginator[_PageDataItemT, _PageDataT]):
         self.url = self.next_url
         return self._fetch_page()
 
+    def iter_pages(
+        self,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Optional[_PageDataT]]:
+        """Iterate through pages of results.
+
+        This will repeatedly fetch pages, providing each parsed page payload
+        to the caller.
+
+        If :py:attr:`prefetch_pages` is set, pages will be fetched in
+        background threads ahead of the caller. Prefetching stops once the
+        caller stops iterating.
+
+        Version Changed:
+            7.0:
+            Added support for prefetching pages.
+
+        Args:
+            max_pages (int, optional):
+                The maximum number of pages to iterate through.
+
+        Yields:
+            object:
+            The parsed payload for each page.
+        """
+        if self.prefetch_pages <= 0:
+            yield from super().iter_pages(max_pages=max_pages)
+            return
+
+        if max_pages is not None and max_pages <= 0:
+            return
+
+        yield self.page_data
+
+        num_pages = 1
+        page_urls = self.get_remaining_page_urls()
+
+        if page_urls is None:
+            pages = self._iter_chained_pages(max_pages=max_pages)
+        else:
+            if max_pages is not None:
+                page_urls = page_urls[:max_pages - 1]
+
+            pages = self._iter_parallel_pages(page_urls)
+
+        try:
+            for url, page_info in pages:
+                self.url = url
+                self._apply_page_info(page_info)
+                num_pages += 1
+
+                yield self.page_data
+
+                if self.next_url is None:
+                    return
+        finally:
+            pages.close()
+
+        # If there are more pages than were listed (for instance, if new
+        # items were added while fetching), finish up one page at a time.
+        while (self.has_next and
+               (max_pages is None or num_pages < max_pages)):
+            self.next()
+            num_pages += 1
+
+            yield self.page_data
+
+    def get_remaining_page_urls(self) -> Optional[List[str]]:
+        """Return the URLs for all pages after the current page.
+
+        This is used to fetch pages in parallel when prefetching. By default,
+        this requires a total count, a number of items per page,
+        :py:attr:`start_query_param`, and a next page URL containing that
+        query parameter. Page numbers are assumed to be 1-based.
+
+        Subclasses can override this for other pagination schemes.
+
+        Version Added:
+            7.0
+
+        Returns:
+            list of str:
+            The URLs for the remaining pages, or ``None`` if they can't be
+            determined.
+        """
+        start_query_param = self.start_query_param
+        next_url = self.next_url
+        total_count = self.total_count
+        per_page = self.per_page
+
+        if (not start_query_param or
+            not next_url or
+            total_count is None or
+            not per_page):
+            return None
+
+        parsed_url = urlparse(next_url)
+        query = parse_qs(parsed_url.query, keep_blank_values=True)
+
+        try:
+            next_page = int(query[start_query_param][0])
+        except (KeyError, IndexError, ValueError):
+            return None
+
+        last_page = math.ceil(total_count / per_page)
+        page_urls: List[str] = []
+
+        for page in range(next_page, last_page + 1):
+            query[start_query_param] = [str(page)]
+            page_urls.append(urlunparse(parsed_url._replace(
+                query=urlencode(query, doseq=True))))
+
+        return page_urls
+
     def fetch_url(
         self,
         url: str,
@@ -504,6 +663,9 @@ class APIPaginator(BasePaginator[_PageDataItemT, _PageDataT]):
 
         This must be implemented by subclasses.
 
+        If prefetching is enabled, this will be called from other threads,
+        and must not modify the state of the paginator.
+
         Args:
             url (str):
                 The URL to fetch.
@@ -527,8 +689,29 @@ class APIPaginator(BasePaginator[_PageDataItemT, _PageDataT]):
             implementation-dependent.
         """
         assert self.url is not None
-        page_info = self.fetch_url(self.url)
 
+        return self._apply_page_info(self.fetch_url(self.url))
+
+    def _apply_page_info(
+        self,
+        page_info: APIPaginatorPageData,
+    ) -> Optional[_PageDataT]:
+        """Store the information from a fetched page.
+
+        Version Added:
+            7.0
+
+        Args:
+            page_info (dict):
+                The page information returned from :py:meth:`fetch_url`.
+
+        Returns:
+            object:
+            The resulting page data.
+
+            This will usually be a :py:class:`list`, but is
+            implementation-dependent.
+        """
         self.prev_url = page_info.get('prev_url')
         self.next_url = page_info.get('next_url')
         self.per_page = page_info.get('per_page', self.per_page)
@@ -563,6 +746,163 @@ class APIPaginator(BasePaginator[_PageDataItemT, _PageDataT]):
 
         return self.page_data
 
+    def _fetch_url_in_thread(
+        self,
+        url: str,
+    ) -> APIPaginatorPageData:
+        """Fetch a page in a worker thread.
+
+        This wraps :py:meth:`fetch_url`, closing any database connections
+        opened by the thread once finished.
+
+        Version Added:
+            7.0
+
+        Args:
+            url (str):
+                The URL to fetch.
+
+        Returns:
+            dict:
+            The page information.
+        """
+        try:
+            return self.fetch_url(url)
+        finally:
+            connections.close_all()
+
+    def _iter_parallel_pages(
+        self,
+        page_urls: List[str],
+    ) -> Iterator[Tuple[str, APIPaginatorPageData]]:
+        """Fetch a list of pages in parallel, in order.
+
+        At most :py:attr:`prefetch_pages` pages are fetched or held ahead of
+        the page being yielded. Pending fetches are cancelled once the caller
+        stops iterating.
+
+        Version Added:
+            7.0
+
+        Args:
+            page_urls (list of str):
+                The URLs of the pages to fetch.
+
+        Yields:
+            tuple:
+            A 2-tuple of each page's URL and page information.
+        """
+        if not page_urls:
+            return
+
+        urls = iter(page_urls)
+        pending: Deque[Tuple[str, Future]] = deque()
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.prefetch_pages, len(page_urls)),
+            thread_name_prefix='api-paginator')
+
+        def _submit_next() -> None:
+            url = next(urls, None)
+
+            if url is not None:
+                pending.append(
+                    (url, executor.submit(self._fetch_url_in_thread, url)))
+
+        try:
+            for i in range(self.prefetch_pages):
+                _submit_next()
+
+            while pending:
+                url, future = pending.popleft()
+                page_info = future.result()
+                _submit_next()
+
+                yield url, page_info
+        finally:
+            for url, future in pending:
+                future.cancel()
+
+            executor.shutdown(wait=False)
+
+    def _iter_chained_pages(
+        self,
+        max_pages: Optional[int],
+    ) -> Iterator[Tuple[str, APIPaginatorPageData]]:
+        """Fetch the following pages ahead of the caller, in order.
+
+        A worker thread follows the next page URLs, holding at most
+        :py:attr:`prefetch_pages` fetched pages until the caller is ready for
+        them. The worker stops once the caller stops iterating.
+
+        Version Added:
+            7.0
+
+        Args:
+            max_pages (int):
+                The maximum number of pages to iterate through, including the
+                current page.
+
+        Yields:
+            tuple:
+            A 2-tuple of each page's URL and page information.
+        """
+        if self.next_url is None:
+            return
+
+        results: queue.Queue = queue.Queue(maxsize=self.prefetch_pages)
+        stopped = threading.Event()
+
+        def _put(item: Tuple[Optional[str], Any, Optional[Exception]]) -> bool:
+            while not stopped.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+
+                    return True
+                except queue.Full:
+                    pass
+
+            return False
+
+        def _run(url: Optional[str]) -> None:
+            num_pages = 1
+
+            while (url is not None and
+                   (max_pages is None or num_pages < max_pages) and
+                   not stopped.is_set()):
+                try:
+                    page_info = self._fetch_url_in_thread(url)
+                except Exception as e:
+                    _put((url, None, e))
+                    return
+
+                if not _put((url, page_info, None)):
+                    return
+
+                url = page_info.get('next_url')
+                num_pages += 1
+
+            _put((None, None, None))
+
+        thread = threading.Thread(target=_run,
+                                  args=(self.next_url,),
+                                  name='api-paginator',
+                                  daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                url, page_info, error = results.get()
+
+                if error is not None:
+                    raise error
+
+                if url is None:
+                    break
+
+                yield url, page_info
+        finally:
+            stopped.set()
+
 
 _ProxiedPaginatorT = TypeVar('_ProxiedPaginatorT', bound=BasePaginator)
 
@@ -695,6 +1035,29 @@ class ProxyPaginator(BasePaginator[_PageDataItemT, _PageDataT]):
         """
         return self._process_page(self.paginator.next())
 
+    def iter_pages(
+        self,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Optional[_PageDataT]]:
+        """Iterate through pages of results.
+
+        This iterates through the proxied paginator's pages, normalizing
+        each, so that any prefetching done by that paginator is preserved.
+
+        Version Added:
+            7.0
+
+        Args:
+            max_pages (int, optional):
+                The maximum number of pages to iterate through.
+
+        Yields:
+            object:
+            The normalized payload for each page.
+        """
+        for page_data in self.paginator.iter_pages(max_pages=max_pages):
+            yield self._process_page(page_data)
+
     def normalize_page_data(
         self,
         data: Optional[Any],
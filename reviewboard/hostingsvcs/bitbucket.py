@@ -182,6 +182,8 @@ class BitbucketHookViews(object):
                          extra={'request': request})
             return HttpResponseBadRequest('Invalid payload format')
 
+        repository.invalidate_commit_caches()
+
         server_url = get_server_url(request=request)
 
         try:
@@ -527,6 +527,8 @@ class GitHubHookViews(object):
             logger.error('The payload is not in JSON format: %s', e)
             return HttpResponseBadRequest('Invalid payload format')
 
+        repository.invalidate_commit_caches()
+
         server_url = get_server_url(request=request)
         review_request_id_to_commits = \
             GitHubHookViews._get_review_request_id_to_commits_map(
@@ -45,6 +45,28 @@ class DummyMultiPageAPIPaginator(APIPaginator):
             raise AssertionError('Unexpected URL %s' % url)
 
 
+class DummyNumberedAPIPaginator(APIPaginator):
+    start_query_param = 'page'
+
+    def fetch_url(self, url):
+        page = int(url.split('page=')[1]) if 'page=' in url else 1
+
+        if page > 5:
+            raise AssertionError('Unexpected URL %s' % url)
+
+        if page < 5:
+            next_url = 'http://example.com/?page=%s' % (page + 1)
+        else:
+            next_url = None
+
+        return {
+            'data': [page * 10, page * 10 + 1],
+            'per_page': 2,
+            'total_count': 10,
+            'next_url': next_url,
+        }
+
+
 class BasePaginatorTests(SpyAgency, TestCase):
     """Unit tests for BasePaginator."""
 
@@ -210,6 +232,127 @@ class APIPaginatorTests(TestCase):
         self.assertEqual(paginator.url, url)
 
 
+class APIPaginatorPrefetchTests(SpyAgency, TestCase):
+    """Unit tests for prefetching pages in APIPaginator."""
+
+    def test_iter_pages_with_prefetch(self):
+        """Testing APIPaginator.iter_pages with prefetch_pages"""
+        paginator = DummyMultiPageAPIPaginator(client=None,
+                                               url='http://example.com/',
+                                               prefetch_pages=2)
+
+        self.assertEqual(
+            list(paginator.iter_pages()),
+            [['a', 'b', 'c'], ['d', 'e', 'f'], ['g', 'h']])
+        self.assertEqual(paginator.url, 'http://example.com/?page=3')
+        self.assertEqual(paginator.page_data, ['g', 'h'])
+        self.assertEqual(paginator.prev_url, 'http://example.com/?page=2')
+        self.assertFalse(paginator.has_next)
+
+    def test_iter_pages_with_prefetch_and_max_pages(self):
+        """Testing APIPaginator.iter_pages with prefetch_pages and
+        max_pages
+        """
+        self.spy_on(DummyMultiPageAPIPaginator.fetch_url)
+
+        paginator = DummyMultiPageAPIPaginator(client=None,
+                                               url='http://example.com/',
+                                               prefetch_pages=2)
+
+        self.assertEqual(list(paginator.iter_items(max_pages=2)),
+                         ['a', 'b', 'c', 'd', 'e', 'f'])
+        self.assertSpyCallCount(DummyMultiPageAPIPaginator.fetch_url, 2)
+
+    def test_iter_pages_with_prefetch_and_total_count(self):
+        """Testing APIPaginator.iter_pages with prefetch_pages and a known
+        number of pages
+        """
+        self.spy_on(DummyNumberedAPIPaginator.fetch_url)
+
+        paginator = DummyNumberedAPIPaginator(client=None,
+                                              url='http://example.com/',
+                                              prefetch_pages=3)
+
+        self.assertEqual(
+            paginator.get_remaining_page_urls(),
+            [
+                'http://example.com/?page=2',
+                'http://example.com/?page=3',
+                'http://example.com/?page=4',
+                'http://example.com/?page=5',
+            ])
+        self.assertEqual(list(paginator.iter_items()),
+                         [10, 11, 20, 21, 30, 31, 40, 41, 50, 51])
+        self.assertEqual(paginator.url, 'http://example.com/?page=5')
+        self.assertSpyCallCount(DummyNumberedAPIPaginator.fetch_url, 5)
+
+    def test_iter_pages_with_prefetch_and_stop(self):
+        """Testing APIPaginator.iter_pages with prefetch_pages stops fetching
+        when iteration stops
+        """
+        self.spy_on(DummyNumberedAPIPaginator.fetch_url)
+
+        paginator = DummyNumberedAPIPaginator(client=None,
+                                              url='http://example.com/',
+                                              prefetch_pages=1)
+        pages = paginator.iter_pages()
+
+        self.assertEqual(next(pages), [10, 11])
+        self.assertEqual(next(pages), [20, 21])
+        pages.close()
+
+        # The first page, the second page, and at most one prefetched page.
+        self.assertLessEqual(
+            len(DummyNumberedAPIPaginator.fetch_url.calls), 3)
+        self.assertEqual(paginator.url, 'http://example.com/?page=2')
+
+    def test_iter_pages_with_prefetch_and_error(self):
+        """Testing APIPaginator.iter_pages with prefetch_pages and an error
+        fetching a page
+        """
+        class ErrorAPIPaginator(DummyMultiPageAPIPaginator):
+            def fetch_url(self, url):
+                if url == 'http://example.com/?page=3':
+                    raise ValueError('oh no')
+
+                return super().fetch_url(url)
+
+        paginator = ErrorAPIPaginator(client=None,
+                                      url='http://example.com/',
+                                      prefetch_pages=2)
+        pages = paginator.iter_pages()
+
+        self.assertEqual(next(pages), ['a', 'b', 'c'])
+        self.assertEqual(next(pages), ['d', 'e', 'f'])
+
+        with self.assertRaisesMessage(ValueError, 'oh no'):
+            next(pages)
+
+    def test_get_remaining_page_urls_without_total_count(self):
+        """Testing APIPaginator.get_remaining_page_urls without a total
+        count
+        """
+        paginator = DummyMultiPageAPIPaginator(
+            client=None,
+            url='http://example.com/?page=2')
+        paginator.total_count = None
+
+        self.assertIsNone(paginator.get_remaining_page_urls())
+
+    def test_proxy_iter_pages_with_prefetch(self):
+        """Testing ProxyPaginator.iter_pages with a prefetching paginator"""
+        paginator = DummyMultiPageAPIPaginator(client=None,
+                                               url='http://example.com/',
+                                               prefetch_pages=2)
+        proxy = ProxyPaginator(
+            paginator,
+            normalize_page_data_func=lambda data: list(reversed(data)))
+
+        self.assertEqual(list(proxy.iter_items()),
+                         ['c', 'b', 'a', 'f', 'e', 'd', 'h', 'g'])
+        self.assertEqual(proxy.page_data, ['h', 'g'])
+
+
 class ProxyPaginatorTests(TestCase):
     """Tests for ProxyPaginator."""
 
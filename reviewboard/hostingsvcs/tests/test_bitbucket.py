@@ -1347,6 +1347,9 @@ class CloseSubmittedHookTests(BitbucketTestCase):
             post_url=url,
             review_request_url=review_request.get_absolute_url())
 
+        # The push should have invalidated the cached commits.
+        self.assertIsNotNone(repository._get_commits_invalidated_time())
+
         review_request = ReviewRequest.objects.get(pk=review_request.pk)
         self.assertTrue(review_request.public)
         self.assertEqual(review_request.status, review_request.SUBMITTED)
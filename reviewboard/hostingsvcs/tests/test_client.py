@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import threading
+from email.message import Message
+from http.client import HTTPConnection, RemoteDisconnected
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from typing import List
+from urllib.error import HTTPError, URLError
 
+import kgb
 from djblets.testing.testcases import ExpectedWarning
 from kgb import SpyAgency
 
@@ -11,6 +17,7 @@ from reviewboard.deprecation import RemovedInReviewBoard70Warning
 from reviewboard.hostingsvcs.base import (HostingServiceClient,
                                           HostingServiceHTTPRequest,
                                           HostingServiceHTTPResponse)
+from reviewboard.hostingsvcs.base.http import http_connection_pool
 from reviewboard.hostingsvcs.models import HostingServiceAccount
 from reviewboard.testing.hosting_services import TestService
 from reviewboard.testing.testcase import TestCase
@@ -155,6 +162,187 @@ class HostingServiceHTTPRequestTests(TestCase):
         self.assertEqual(request.get_header('content-length'), '123')
 
 
+class KeepAliveHTTPHandlerTests(SpyAgency, TestCase):
+    """Unit tests for persistent connections in HostingServiceHTTPRequest.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        connections = []
+        requests = []
+
+        class _RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                connections.append(self.client_address)
+
+            def do_GET(self):
+                self._respond()
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                self._respond()
+
+            def log_message(self, *args, **kwargs):
+                pass
+
+            def _respond(self):
+                requests.append((self.command, self.path))
+                data = b'{"path": "%s"}' % self.path.encode('utf-8')
+
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+                if self.path == '/close':
+                    # Close the connection without telling the client,
+                    # as a server would after an idle timeout.
+                    self.close_connection = True
+
+        self.connections = connections
+        self.requests = requests
+        self.server = HTTPServer(('127.0.0.1', 0), _RequestHandler)
+        self.server.daemon_threads = True
+
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        http_connection_pool.close_all()
+
+    def tearDown(self):
+        http_connection_pool.close_all()
+        self.server.shutdown()
+        self.server.server_close()
+
+        super().tearDown()
+
+    def test_open_reuses_connection(self):
+        """Testing HostingServiceHTTPRequest.open reuses connections"""
+        url = 'http://127.0.0.1:%s' % self.server.server_address[1]
+
+        response1 = HostingServiceHTTPRequest(url='%s/a' % url).open()
+        response2 = HostingServiceHTTPRequest(url='%s/b' % url).open()
+
+        self.assertEqual(response1.status_code, 200)
+        self.assertEqual(response1.data, b'{"path": "/a"}')
+        self.assertEqual(response2.data, b'{"path": "/b"}')
+        self.assertEqual(len(self.connections), 1)
+
+    def test_open_with_closed_connection(self):
+        """Testing HostingServiceHTTPRequest.open with a pooled connection
+        closed by the server
+        """
+        url = 'http://127.0.0.1:%s' % self.server.server_address[1]
+
+        HostingServiceHTTPRequest(url='%s/close' % url).open()
+        response = HostingServiceHTTPRequest(url='%s/b' % url).open()
+
+        self.assertEqual(response.data, b'{"path": "/b"}')
+        self.assertEqual(len(self.connections), 2)
+        self.assertEqual(self.requests, [
+            ('GET', '/close'),
+            ('GET', '/b'),
+        ])
+
+    def test_open_with_closed_connection_and_post(self):
+        """Testing HostingServiceHTTPRequest.open with a pooled connection
+        closed by the server after sending a POST request
+        """
+        url = 'http://127.0.0.1:%s' % self.server.server_address[1]
+
+        self.spy_on(
+            HTTPConnection.getresponse,
+            owner=HTTPConnection,
+            op=kgb.SpyOpMatchInOrder([
+                {
+                    'call_original': True,
+                },
+                {
+                    'op': kgb.SpyOpRaise(RemoteDisconnected(
+                        'Remote end closed connection without response')),
+                },
+            ]))
+
+        HostingServiceHTTPRequest(url='%s/a' % url,
+                                  method='POST',
+                                  body=b'a').open()
+
+        # The request may have been acted upon by the server, so it must
+        # not be sent again.
+        with self.assertRaises(URLError):
+            HostingServiceHTTPRequest(url='%s/b' % url,
+                                      method='POST',
+                                      body=b'b').open()
+
+        self.assertSpyCallCount(HTTPConnection.getresponse, 2)
+        self.assertEqual(len(self.connections), 1)
+
+    def test_open_with_send_error_and_post(self):
+        """Testing HostingServiceHTTPRequest.open with a pooled connection
+        reset while sending a POST request
+        """
+        url = 'http://127.0.0.1:%s' % self.server.server_address[1]
+
+        self.spy_on(
+            HTTPConnection.request,
+            owner=HTTPConnection,
+            op=kgb.SpyOpMatchInOrder([
+                {
+                    'call_original': True,
+                },
+                {
+                    'op': kgb.SpyOpRaise(ConnectionResetError()),
+                },
+                {
+                    'call_original': True,
+                },
+            ]))
+
+        HostingServiceHTTPRequest(url='%s/a' % url,
+                                  method='POST',
+                                  body=b'a').open()
+        response = HostingServiceHTTPRequest(url='%s/b' % url,
+                                             method='POST',
+                                             body=b'b').open()
+
+        self.assertEqual(response.data, b'{"path": "/b"}')
+        self.assertEqual(len(self.connections), 2)
+        self.assertEqual(self.requests, [
+            ('POST', '/a'),
+            ('POST', '/b'),
+        ])
+
+    def test_open_with_timeout(self):
+        """Testing HostingServiceHTTPRequest.open with a pooled connection
+        timing out
+        """
+        url = 'http://127.0.0.1:%s' % self.server.server_address[1]
+
+        self.spy_on(
+            HTTPConnection.getresponse,
+            owner=HTTPConnection,
+            op=kgb.SpyOpMatchInOrder([
+                {
+                    'call_original': True,
+                },
+                {
+                    'op': kgb.SpyOpRaise(TimeoutError('timed out')),
+                },
+            ]))
+
+        HostingServiceHTTPRequest(url='%s/a' % url).open()
+
+        with self.assertRaises(URLError):
+            HostingServiceHTTPRequest(url='%s/b' % url).open()
+
+        self.assertSpyCallCount(HTTPConnection.getresponse, 2)
+
+
 class HostingServiceHTTPResponseTests(TestCase):
     """Unit tests for HostingServiceHTTPResponse."""
 
@@ -1037,3 +1225,117 @@ class HostingServiceClientTests(SpyAgency, TestCase):
                 'Content-length': '12',
                 'Foo': 'bar',
             })
+
+    def test_http_get_with_conditional_request(self):
+        """Testing HostingServiceClient.http_get with a cached response and
+        304 Not Modified
+        """
+        def _open_http_request(_self, request):
+            if request.get_header('If-None-Match') == '"abc123"':
+                headers = Message()
+                headers['X-RateLimit-Remaining'] = '100'
+
+                raise HTTPError(request.url, 304, 'Not Modified', headers,
+                                None)
+
+            return HostingServiceHTTPResponse(
+                request=request,
+                url=request.url,
+                data=b'{"key": "test response"}',
+                headers={
+                    'ETag': '"abc123"',
+                    'Last-Modified': 'Sat, 17 Oct 2026 10:00:00 GMT',
+                },
+                status_code=200)
+
+        client = self.client
+        self.spy_on(client.open_http_request,
+                    call_fake=_open_http_request)
+
+        response1 = client.http_get(url='http://example.com',
+                                    username='username',
+                                    password='password')
+        self.assertIsNone(
+            client.open_http_request.last_call.args[0]
+            .get_header('If-None-Match'))
+
+        response2 = client.http_get(url='http://example.com',
+                                    username='username',
+                                    password='password')
+
+        request = client.open_http_request.last_call.args[0]
+        self.assertEqual(request.get_header('If-None-Match'), '"abc123"')
+        self.assertEqual(request.get_header('If-Modified-Since'),
+                         'Sat, 17 Oct 2026 10:00:00 GMT')
+
+        self.assertIs(response2.request, request)
+        self.assertEqual(response2.data, response1.data)
+        self.assertEqual(response2.status_code, 200)
+        self.assertEqual(response2.get_header('ETag'), '"abc123"')
+        self.assertEqual(response2.get_header('X-RateLimit-Remaining'),
+                         '100')
+
+    def test_http_get_with_conditional_request_other_credentials(self):
+        """Testing HostingServiceClient.http_get doesn't share cached
+        responses between credentials
+        """
+        client = self.client
+        self.spy_on(
+            client.open_http_request,
+            call_fake=lambda _self, request: HostingServiceHTTPResponse(
+                request=request,
+                url=request.url,
+                data=b'{}',
+                headers={
+                    'ETag': '"abc123"',
+                },
+                status_code=200))
+
+        client.http_get(url='http://example.com',
+                        username='username',
+                        password='password')
+        client.http_get(url='http://example.com',
+                        username='username',
+                        password='other-password')
+
+        self.assertIsNone(
+            client.open_http_request.last_call.args[0]
+            .get_header('If-None-Match'))
+
+    def test_http_get_with_conditional_request_without_validators(self):
+        """Testing HostingServiceClient.http_get doesn't cache responses
+        without ETag or Last-Modified
+        """
+        client = self.client
+        self.spy_on(client.open_http_request)
+
+        client.http_get(url='http://example.com')
+        client.http_get(url='http://example.com')
+
+        self.assertIsNone(
+            client.open_http_request.last_call.args[0]
+            .get_header('If-None-Match'))
+
+    def test_http_get_with_conditional_requests_disabled(self):
+        """Testing HostingServiceClient.http_get with
+        use_http_conditional_requests=False
+        """
+        client = self.client
+        client.use_http_conditional_requests = False
+        self.spy_on(
+            client.open_http_request,
+            call_fake=lambda _self, request: HostingServiceHTTPResponse(
+                request=request,
+                url=request.url,
+                data=b'{}',
+                headers={
+                    'ETag': '"abc123"',
+                },
+                status_code=200))
+
+        client.http_get(url='http://example.com')
+        client.http_get(url='http://example.com')
+
+        self.assertIsNone(
+            client.open_http_request.last_call.args[0]
+            .get_header('If-None-Match'))
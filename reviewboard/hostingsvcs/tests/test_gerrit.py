@@ -11,7 +11,7 @@ from reviewboard.hostingsvcs.errors import (AuthorizationError,
                                             RepositoryError)
 from reviewboard.hostingsvcs.gerrit import Gerrit, GerritForm
 from reviewboard.hostingsvcs.testing import HostingServiceTestCase
-from reviewboard.scmtools.core import Branch, Commit
+from reviewboard.scmtools.core import Branch, Commit, FileLookup
 from reviewboard.scmtools.crypto_utils import encrypt_password
 from reviewboard.scmtools.errors import FileNotFoundError
 
@@ -343,6 +343,33 @@ class GerritTests(GerritTestCase):
                  'content/'
                  % blob_id))
 
+    def test_get_files(self):
+        """Testing Gerrit.get_files"""
+        blob_id1 = 'a' * 40
+        blob_id2 = 'b' * 40
+
+        paths = {
+            '/a/projects/Project/blobs/%s/content/' % blob_id1: {
+                'payload': base64.b64encode(b'Hello, world!'),
+            },
+            '/a/projects/Project/blobs/%s/content/' % blob_id2: {
+                'status_code': 404,
+            },
+        }
+
+        with self.setup_http_test(self.make_handler_for_paths(paths),
+                                  expected_http_calls=2) as ctx:
+            results = ctx.service.get_files(
+                repository=ctx.create_repository(),
+                lookups=[
+                    FileLookup(path='/foo', revision=blob_id1),
+                    FileLookup(path='/bar', revision=blob_id2),
+                ])
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], b'Hello, world!')
+        self.assertIsInstance(results[1], FileNotFoundError)
+
     def test_get_file_with_404(self):
         """Testing Gerrit.get_file with a non-existent blob ID"""
         def _http_request(client, *args, **kwargs):
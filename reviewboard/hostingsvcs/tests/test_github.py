@@ -1448,6 +1448,7 @@ class CloseSubmittedHookTests(GitHubTestCase):
             review_request_url=review_request.get_absolute_url,
             secret='bad-secret')
         self.assertEqual(response.status_code, 400)
+        self.assertIsNone(repository._get_commits_invalidated_time())
 
         review_request = ReviewRequest.objects.get(pk=review_request.pk)
         self.assertTrue(review_request.public)
@@ -1526,6 +1527,9 @@ class CloseSubmittedHookTests(GitHubTestCase):
             secret=repository.get_or_create_hooks_uuid())
         self.assertEqual(response.status_code, 200)
 
+        # The push should have invalidated the cached commits.
+        self.assertIsNotNone(repository._get_commits_invalidated_time())
+
         review_request = ReviewRequest.objects.get(pk=review_request.pk)
         self.assertTrue(review_request.public)
         self.assertEqual(review_request.status, review_request.SUBMITTED)
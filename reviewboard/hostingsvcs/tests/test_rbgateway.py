@@ -693,6 +693,9 @@ class CloseSubmittedHookTests(ReviewBoardGatewayTestCase):
             **kwargs)
         self.assertEqual(response.status_code, 200)
 
+        # The push should have invalidated the cached commits.
+        self.assertIsNotNone(repository._get_commits_invalidated_time())
+
         review_request = ReviewRequest.objects.get(pk=review_request.pk)
         self.assertTrue(review_request.public)
         self.assertEqual(review_request.status, review_request.SUBMITTED)
@@ -5,29 +5,39 @@ import logging
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from itertools import chain
-from typing import Optional
-
-from django.db.models import Q
-from django.utils.translation import gettext as _
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.db.models.functions import Coalesce
+from django.utils.safestring import mark_safe
+from django.utils.timezone import get_current_timezone_name
+from django.utils.translation import gettext as _, get_language
+from djblets.cache.backend import cache_memoize
 from djblets.registries.registry import (ALREADY_REGISTERED,
                                          ATTRIBUTE_REGISTERED,
                                          NOT_REGISTERED)
 from django.template.loader import render_to_string
+from djblets.siteconfig.models import SiteConfiguration
 from djblets.util.dates import get_latest_timestamp
 from djblets.util.decorators import cached_property
 
+from reviewboard.admin.read_only import is_site_read_only_for
 from reviewboard.diffviewer.models import DiffCommit
+from reviewboard.extensions.base import get_extension_manager
 from reviewboard.registries.registry import OrderedRegistry
 from reviewboard.reviews.builtin_fields import (CommitListField,
                                                 ReviewRequestPageDataMixin)
 from reviewboard.reviews.features import status_updates_feature
 from reviewboard.reviews.fields import get_review_request_fieldsets
+from reviewboard.reviews.markdown_utils import is_rich_text_default_for_user
 from reviewboard.reviews.models import (BaseComment,
                                         Comment,
                                         FileAttachmentComment,
                                         GeneralComment,
                                         Review,
                                         ReviewRequest,
+                                        ReviewRequestIssue,
                                         ScreenshotComment,
                                         StatusUpdate)
 
@@ -35,6 +45,17 @@ from reviewboard.reviews.models import (BaseComment,
 logger = logging.getLogger(__name__)
 
 
+class _RenderedEntryCacheMiss(Exception):
+    """Rendered HTML for an entry was not found in cache.
+
+    This is used internally by :py:class:`BaseReviewRequestPageEntry` to
+    detect a cache miss without rendering the entry.
+
+    Version Added:
+        7.0
+    """
+
+
 class ReviewRequestPageData(object):
     """Data for the review request page.
 
@@ -181,20 +202,135 @@ class ReviewRequestPageData(object):
             status updates on the review request.
     """
 
+    #: The comment types loaded for the page.
+    #:
+    #: Each item is a tuple of the comment model, the name of the field on
+    #: :py:class:`~reviewboard.reviews.models.Review` for the comments, the
+    #: key used for the comment type on entries, and the ordering of the
+    #: comments.
+    #:
+    #: Version Added:
+    #:     7.0
+    COMMENT_TYPES = [
+        (GeneralComment,
+         'general_comments',
+         'general_comments',
+         ('generalcomment__timestamp',)),
+        (ScreenshotComment,
+         'screenshot_comments',
+         'screenshot_comments',
+         ('screenshotcomment__timestamp',)),
+        (FileAttachmentComment,
+         'file_attachment_comments',
+         'file_attachment_comments',
+         ('fileattachmentcomment__timestamp',)),
+        (Comment,
+         'comments',
+         'diff_comments',
+         ('comment__filediff',
+          'comment__first_line',
+          'comment__timestamp')),
+    ]
+
     ######################
     # Instance variables #
     ######################
 
+    #: Only main entries last active before this timestamp will be loaded.
+    #:
+    #: Version Added:
+    #:     7.0
+    before: Optional[datetime]
+
+    #: The last main entry already loaded at :py:attr:`before`.
+    #:
+    #: This is a 2-tuple of the entry type ID and the entry's database ID.
+    #: If set, main entries last active at :py:attr:`before` that come
+    #: after this entry in the page's ordering will also be loaded.
+    #:
+    #: Version Added:
+    #:     7.0
+    before_entry: Optional[Tuple[str, int]]
+
+    #: The specific main entries to load, if limiting the page data.
+    #:
+    #: This is a dictionary mapping entry type IDs to sets of entry IDs.
+    #:
+    #: Version Added:
+    #:     7.0
+    entry_ids: Optional[Dict[str, Set[str]]]
+
+    #: Whether there are main entries older than those that were loaded.
+    #:
+    #: This is only set when loading a limited number of entries.
+    #:
+    #: Version Added:
+    #:     7.0
+    has_older_entries: bool
+
+    #: Whether only some of the main entries are being loaded.
+    #:
+    #: This is set when any of :py:attr:`entry_ids`,
+    #: :py:attr:`max_entries`, or :py:attr:`before` are set.
+    #:
+    #: Version Added:
+    #:     7.0
+    incremental: bool
+
     #: The timestamp of the most recent comment, for the issue summary table.
     #:
     #: Version Added:
     #:     6.0
     latest_issue_timestamp: Optional[datetime]
 
+    #: The maximum number of main entries to load, if limited.
+    #:
+    #: Version Added:
+    #:     7.0
+    max_entries: Optional[int]
+
+    #: The value used to load the main entries older than those loaded.
+    #:
+    #: This is in the form of ``<timestamp>,<entry type ID>:<entry ID>``,
+    #: and can be passed as ``?before=`` to the review request updates view
+    #: when loading the next set of entries.
+    #:
+    #: Version Added:
+    #:     7.0
+    older_entries_before: Optional[str]
+
+    #: The last main entry loaded, if there are older entries.
+    #:
+    #: This can be passed as ``before_entry`` when loading the next set of
+    #: entries.
+    #:
+    #: Version Added:
+    #:     7.0
+    older_entries_entry: Optional[Tuple[str, int]]
+
+    #: The timestamp used to load the main entries older than those loaded.
+    #:
+    #: This can be passed as ``before`` when loading the next set of entries.
+    #:
+    #: Version Added:
+    #:     7.0
+    older_entries_timestamp: Optional[datetime]
+
     def __init__(self, review_request, request, last_visited=None,
-                 entry_classes=None):
+                 entry_classes=None, entry_ids=None, max_entries=None,
+                 before=None, before_entry=None):
         """Initialize the data object.
 
+        By default, all entries on the review request will be loaded. On
+        review requests with a long history, this can be limited to the
+        most recently active entries, or to specific entries. In this case,
+        the issue summary table will still contain all issues.
+
+        Version Changed:
+            7.0:
+            Added the ``entry_ids``, ``max_entries``, ``before``, and
+            ``before_entry`` arguments.
+
         Args:
             review_request (reviewboard.reviews.models.ReviewRequest):
                 The review request.
@@ -209,11 +345,41 @@ class ReviewRequestPageData(object):
                 The list of entry classes that should be used for data
                 generation. If not provided, all registered entry classes
                 will be used.
+
+            entry_ids (dict, optional):
+                A dictionary mapping entry type IDs to sets of entry IDs.
+                If provided, only these reviews and change descriptions will
+                be loaded.
+
+            max_entries (int, optional):
+                The maximum number of reviews and change descriptions to
+                load. The most recently active ones will be loaded.
+
+            before (datetime.datetime, optional):
+                If provided, only reviews and change descriptions last
+                active before this time will be loaded.
+
+            before_entry (tuple, optional):
+                The entry type ID and database ID of the last entry already
+                loaded at ``before``. If provided, entries last active at
+                ``before`` that are older than this entry will be loaded as
+                well. This requires ``before``.
         """
         self.review_request = review_request
         self.request = request
         self.last_visited = last_visited
         self.entry_classes = entry_classes or list(entry_registry)
+        self.entry_ids = entry_ids
+        self.max_entries = max_entries
+        self.before = before
+        self.before_entry = before_entry
+        self.incremental = (entry_ids is not None or
+                            max_entries is not None or
+                            before is not None)
+        self.has_older_entries = False
+        self.older_entries_before = None
+        self.older_entries_entry = None
+        self.older_entries_timestamp = None
 
         # These are populated in query_data_pre_etag().
         self.reviews = []
@@ -295,27 +461,36 @@ class ReviewRequestPageData(object):
         if self.request.user.is_authenticated:
             reviews_query |= Q(user_id=self.request.user.pk)
 
-        if self._needs_reviews or self._needs_status_updates:
-            self.reviews = list(
-                self.review_request.reviews
-                .filter(reviews_query)
-                .order_by('-timestamp')
-                .select_related('user', 'user__profile')
-            )
-
-        if len(self.reviews) == 0:
-            self.latest_review_timestamp = \
-                datetime.fromtimestamp(0, timezone.utc)
+        if self.incremental:
+            self._query_incremental_data_pre_etag(reviews_query)
         else:
-            self.latest_review_timestamp = self.reviews[0].timestamp
+            if self._needs_reviews or self._needs_status_updates:
+                self.reviews = list(
+                    self.review_request.reviews
+                    .filter(reviews_query)
+                    .order_by('-timestamp')
+                    .select_related('user', 'user__profile')
+                )
 
-        # Get all the public ChangeDescriptions.
-        if self._needs_changedescs:
-            self.changedescs = list(
-                self.review_request.changedescs.filter(public=True))
+            if len(self.reviews) == 0:
+                self.latest_review_timestamp = \
+                    datetime.fromtimestamp(0, timezone.utc)
+            else:
+                self.latest_review_timestamp = self.reviews[0].timestamp
 
-        if self.changedescs:
-            self.latest_changedesc_timestamp = self.changedescs[0].timestamp
+            # Get all the public ChangeDescriptions.
+            if self._needs_changedescs:
+                self.changedescs = list(
+                    self.review_request.changedescs.filter(public=True))
+
+            if self.changedescs:
+                self.latest_changedesc_timestamp = \
+                    self.changedescs[0].timestamp
+
+            # Get all status updates.
+            if self.status_updates_enabled and self._needs_status_updates:
+                self.all_status_updates = list(
+                    self.review_request.status_updates.order_by('summary'))
 
         # Get the active draft (if any).
         if (self._needs_draft and
@@ -327,11 +502,6 @@ class ReviewRequestPageData(object):
             self.diffsets = self.review_request.get_diffsets()
             self.diffsets_by_id = self._build_id_map(self.diffsets)
 
-        # Get all status updates.
-        if self.status_updates_enabled and self._needs_status_updates:
-            self.all_status_updates = list(
-                self.review_request.status_updates.order_by('summary'))
-
     def query_data_post_etag(self):
         """Perform remaining queries for the page.
 
@@ -439,25 +609,8 @@ class ReviewRequestPageData(object):
         if self.reviews:
             review_ids = list(self.reviews_by_id.keys())
 
-            for model, review_field_name, key, ordering in (
-                (GeneralComment,
-                 'general_comments',
-                 'general_comments',
-                 ('generalcomment__timestamp',)),
-                (ScreenshotComment,
-                 'screenshot_comments',
-                 'screenshot_comments',
-                 ('screenshotcomment__timestamp',)),
-                (FileAttachmentComment,
-                 'file_attachment_comments',
-                 'file_attachment_comments',
-                 ('fileattachmentcomment__timestamp',)),
-                (Comment,
-                 'comments',
-                 'diff_comments',
-                 ('comment__filediff',
-                  'comment__first_line',
-                  'comment__timestamp'))):
+            for model, review_field_name, key, ordering in \
+                    self.COMMENT_TYPES:
                 # Due to mistakes in how we initially made the schema, we have
                 # a ManyToManyField in between comments and reviews, instead of
                 # comments having a ForeignKey to the review. This makes it
@@ -541,24 +694,20 @@ class ReviewRequestPageData(object):
                             self.review_comments.setdefault(
                                 review.pk, []).append(comment)
 
-                    if review.public and comment.issue_opened:
-                        status_key = comment.issue_status_to_string(
-                            comment.issue_status)
-
-                        # Both "verifying" states get lumped together in the
-                        # same section in the issue summary table.
-                        if status_key in ('verifying-resolved',
-                                          'verifying-dropped'):
-                            status_key = 'verifying'
+                    if (not self.incremental and
+                        review.public and
+                        comment.issue_opened):
+                        self._add_issue(comment)
 
-                        self.issue_counts[status_key] += 1
-                        self.issue_counts['total'] += 1
-                        self.issues.append(comment)
+        if self.incremental and self._needs_reviews:
+            # Only some of the comments were loaded, so issues elsewhere on
+            # the review request need to be queried separately.
+            self._query_issues()
 
-        if self.all_comments:
+        if self.all_comments or self.issues:
             self.latest_issue_timestamp = max(
                 comment.timestamp
-                for comment in self.all_comments)
+                for comment in chain(self.all_comments, self.issues))
         else:
             self.latest_issue_timestamp = \
                 datetime.fromtimestamp(0, timezone.utc)
@@ -617,6 +766,359 @@ class ReviewRequestPageData(object):
             'main': main_entries,
         }
 
+    def _query_incremental_data_pre_etag(self, reviews_query):
+        """Perform initial queries for a subset of the entries on the page.
+
+        This will load only the reviews and change descriptions for the
+        requested main entries, along with any replies and status updates
+        shown within them. The timestamps used for the ETag are queried
+        separately, so that they cover the whole review request.
+
+        Version Added:
+            7.0
+
+        Args:
+            reviews_query (django.db.models.Q):
+                The query for the reviews visible to the user.
+        """
+        review_request = self.review_request
+        review_ids, changedesc_ids = self._get_main_entry_ids()
+
+        if self._needs_changedescs:
+            self.changedescs = list(
+                review_request.changedescs
+                .filter(public=True,
+                        pk__in=changedesc_ids))
+            self.latest_changedesc_timestamp = (
+                review_request.changedescs
+                .filter(public=True)
+                .aggregate(latest=Max('timestamp'))
+            )['latest']
+
+        # Status updates are shown either in their own entry (for the initial
+        # publish) or in the change description they're associated with.
+        thread_ids = set(review_ids)
+
+        if self.status_updates_enabled and self._needs_status_updates:
+            self.all_status_updates = list(
+                review_request.status_updates
+                .filter(Q(change_description__isnull=True) |
+                        Q(change_description__in=changedesc_ids))
+                .order_by('summary'))
+
+            thread_ids.update(
+                status_update.review_id
+                for status_update in self.all_status_updates
+                if status_update.review_id is not None
+            )
+
+        latest_review_timestamp = None
+
+        if self._needs_reviews or self._needs_status_updates:
+            if thread_ids:
+                self.reviews = list(
+                    review_request.reviews
+                    .filter(reviews_query)
+                    .filter(Q(pk__in=thread_ids) |
+                            Q(base_reply_to__in=thread_ids))
+                    .order_by('-timestamp')
+                    .select_related('user', 'user__profile')
+                )
+
+            latest_review_timestamp = (
+                review_request.reviews
+                .filter(reviews_query)
+                .aggregate(latest=Max('timestamp'))
+            )['latest']
+
+        self.latest_review_timestamp = (
+            latest_review_timestamp or
+            datetime.fromtimestamp(0, timezone.utc))
+
+    def _get_main_entry_ids(self):
+        """Return the IDs of the reviews and change descriptions to load.
+
+        If specific entries were requested, their IDs will be returned.
+        Otherwise, this will find the most recently active reviews and
+        change descriptions (up to :py:attr:`max_entries`) before
+        :py:attr:`before` (and :py:attr:`before_entry`). A review is active
+        when it's published or replied to.
+
+        Entries are ordered by their activity timestamp, entry type ID, and
+        database ID, so that entries sharing a timestamp are never skipped
+        between pages.
+
+        This will also set :py:attr:`has_older_entries`,
+        :py:attr:`older_entries_before`, :py:attr:`older_entries_entry`,
+        and :py:attr:`older_entries_timestamp`.
+
+        Version Added:
+            7.0
+
+        Returns:
+            tuple:
+            A 2-tuple of:
+
+            Tuple:
+                0 (list of int):
+                    The IDs of the top-level reviews.
+
+                1 (list of int):
+                    The IDs of the change descriptions.
+        """
+        if self.entry_ids is not None:
+            return (
+                self._get_requested_entry_pks(ReviewEntry.entry_type_id),
+                self._get_requested_entry_pks(ChangeEntry.entry_type_id),
+            )
+
+        review_request = self.review_request
+        before = self.before
+        max_entries = self.max_entries
+        candidates: List[Tuple[datetime, str, int]] = []
+
+        if max_entries is not None:
+            # Fetch one extra entry, to determine if there are older ones.
+            limit = max_entries + 1
+        else:
+            limit = None
+
+        if self._needs_reviews:
+            reviews = (
+                review_request.reviews
+                .filter(public=True,
+                        base_reply_to__isnull=True)
+                .annotate(last_activity=Coalesce(
+                    Max('replies__timestamp',
+                        filter=Q(replies__public=True)),
+                    'timestamp'))
+            )
+
+            if self.status_updates_enabled:
+                # Reviews for status updates are shown in other entries.
+                reviews = reviews.filter(status_update__isnull=True)
+
+            if before is not None:
+                reviews = reviews.filter(self._get_older_entries_q(
+                    timestamp_field='last_activity',
+                    entry_type_id=ReviewEntry.entry_type_id))
+
+            candidates += (
+                (timestamp, ReviewEntry.entry_type_id, pk)
+                for pk, timestamp in (
+                    reviews
+                    .order_by('-last_activity', '-pk')
+                    .values_list('pk', 'last_activity')[:limit]
+                )
+            )
+
+        if self._needs_changedescs:
+            changedescs = review_request.changedescs.filter(public=True)
+
+            if before is not None:
+                changedescs = changedescs.filter(self._get_older_entries_q(
+                    timestamp_field='timestamp',
+                    entry_type_id=ChangeEntry.entry_type_id))
+
+            candidates += (
+                (timestamp, ChangeEntry.entry_type_id, pk)
+                for pk, timestamp in (
+                    changedescs
+                    .order_by('-timestamp', '-pk')
+                    .values_list('pk', 'timestamp')[:limit]
+                )
+            )
+
+        candidates.sort(reverse=True)
+
+        if max_entries is not None and len(candidates) > max_entries:
+            candidates = candidates[:max_entries]
+            self.has_older_entries = True
+
+            if candidates:
+                timestamp, entry_type_id, pk = candidates[-1]
+                self.older_entries_timestamp = timestamp
+                self.older_entries_entry = (entry_type_id, pk)
+            else:
+                self.older_entries_timestamp = before
+                self.older_entries_entry = self.before_entry
+
+            if self.older_entries_timestamp is not None:
+                # The timestamp is serialized with full precision, and the
+                # last entry is included so that entries sharing its
+                # timestamp aren't skipped.
+                older_entries_before = self.older_entries_timestamp.isoformat()
+
+                if self.older_entries_entry is not None:
+                    older_entries_before += (',%s:%s'
+                                             % self.older_entries_entry)
+
+                self.older_entries_before = older_entries_before
+
+        return (
+            [
+                pk
+                for timestamp, entry_type_id, pk in candidates
+                if entry_type_id == ReviewEntry.entry_type_id
+            ],
+            [
+                pk
+                for timestamp, entry_type_id, pk in candidates
+                if entry_type_id == ChangeEntry.entry_type_id
+            ],
+        )
+
+    def _get_older_entries_q(self, timestamp_field, entry_type_id):
+        """Return a query for main entries older than the requested ones.
+
+        This matches entries last active before :py:attr:`before`, along
+        with entries last active at :py:attr:`before` that sort after
+        :py:attr:`before_entry`.
+
+        Version Added:
+            7.0
+
+        Args:
+            timestamp_field (str):
+                The name of the field containing the entry's activity
+                timestamp.
+
+            entry_type_id (str):
+                The ID of the entry type being queried.
+
+        Returns:
+            django.db.models.Q:
+            The query for the older entries.
+        """
+        before = self.before
+        q = Q(**{'%s__lt' % timestamp_field: before})
+
+        if self.before_entry is not None:
+            before_entry_type_id, before_pk = self.before_entry
+
+            if entry_type_id < before_entry_type_id:
+                q |= Q(**{timestamp_field: before})
+            elif entry_type_id == before_entry_type_id:
+                q |= Q(**{timestamp_field: before}) & Q(pk__lt=before_pk)
+
+        return q
+
+    def _get_requested_entry_pks(self, entry_type_id):
+        """Return the database IDs of the requested entries of a given type.
+
+        Version Added:
+            7.0
+
+        Args:
+            entry_type_id (str):
+                The ID of the entry type.
+
+        Returns:
+            list of int:
+            The database IDs of the requested entries.
+        """
+        assert self.entry_ids is not None
+
+        return [
+            int(entry_id)
+            for entry_id in self.entry_ids.get(entry_type_id, [])
+            if entry_id.isdigit()
+        ]
+
+    def _query_issues(self):
+        """Query all the issues on the review request.
+
+        This is used when only some of the entries are loaded, so that the
+        issue summary table will still contain every issue. The issues are
+        looked up in the issue index for the review request, and issues in
+        comments that were already loaded will reuse those comments.
+
+        Version Added:
+            7.0
+        """
+        review_request = self.review_request
+        ReviewRequestIssue.objects.ensure_indexed(review_request)
+
+        loaded_comments = {
+            (comment._type, comment.pk): comment
+            for comment in self.all_comments
+        }
+        issue_reviews = defaultdict(dict)
+
+        indexed_issues = (
+            ReviewRequestIssue.objects
+            .filter(review_request=review_request)
+            .select_related('review__user')
+        )
+
+        for indexed_issue in indexed_issues:
+            issue_reviews[indexed_issue.comment_type][
+                indexed_issue.comment_id] = indexed_issue.review
+
+        for model, review_field_name, key, ordering in self.COMMENT_TYPES:
+            reviews_by_comment_id = issue_reviews.get(model.comment_type)
+
+            if not reviews_by_comment_id:
+                continue
+
+            comments = (
+                model.objects
+                .filter(pk__in=reviews_by_comment_id.keys())
+                .order_by(*(
+                    field.split('__', 1)[1]
+                    for field in ordering
+                ))
+            )
+
+            for comment in comments:
+                try:
+                    comment = loaded_comments[(key, comment.pk)]
+                except KeyError:
+                    review = reviews_by_comment_id[comment.pk]
+
+                    comment._type = key
+                    comment.review_obj = review
+                    comment._review = review
+                    comment._review_request = review_request
+
+                    # Attach any associated objects that we've already
+                    # fetched, to prevent future queries.
+                    if isinstance(comment, FileAttachmentComment):
+                        attachment_id = comment.file_attachment_id
+
+                        if attachment_id in self.file_attachments_by_id:
+                            comment.file_attachment = \
+                                self.file_attachments_by_id[attachment_id]
+                    elif isinstance(comment, ScreenshotComment):
+                        screenshot_id = comment.screenshot_id
+
+                        if screenshot_id in self.screenshots_by_id:
+                            comment.screenshot = \
+                                self.screenshots_by_id[screenshot_id]
+
+                self._add_issue(comment)
+
+    def _add_issue(self, comment):
+        """Add a comment to the issues shown in the issue summary table.
+
+        Version Added:
+            7.0
+
+        Args:
+            comment (reviewboard.reviews.models.BaseComment):
+                The comment containing the issue.
+        """
+        status_key = comment.issue_status_to_string(comment.issue_status)
+
+        # Both "verifying" states get lumped together in the same section in
+        # the issue summary table.
+        if status_key in ('verifying-resolved', 'verifying-dropped'):
+            status_key = 'verifying'
+
+        self.issue_counts[status_key] += 1
+        self.issue_counts['total'] += 1
+        self.issues.append(comment)
+
     def _build_id_map(self, objects):
         """Return an ID map from a list of objects.
 
@@ -749,6 +1251,23 @@ class BaseReviewRequestPageEntry(object):
     #: the entry, or disabled altogether.
     has_content = True
 
+    #: Whether the rendered HTML for the entry can be cached.
+    #:
+    #: If set, the HTML from :py:meth:`render_to_string` will be cached,
+    #: keyed off of the entry's ETag data, :py:meth:`build_render_cache_data`,
+    #: and state for the user viewing the page. Subclasses setting this must
+    #: make sure that any state shown in the entry is reflected in that data.
+    #:
+    #: Version Added:
+    #:     7.0
+    cache_rendered_html = False
+
+    #: The amount of time rendered HTML for the entry is cached, in seconds.
+    #:
+    #: Version Added:
+    #:     7.0
+    rendered_html_cache_expiration = 60 * 60 * 24  # 1 day
+
     @classmethod
     def build_entries(cls, data):
         """Generate entry instances from review request page data.
@@ -792,6 +1311,26 @@ class BaseReviewRequestPageEntry(object):
         """
         return ''
 
+    def build_render_cache_data(self):
+        """Build data representing the rendered content of the entry.
+
+        This is used along with the entry's ETag data to key the cached HTML
+        for the entry, when :py:attr:`cache_rendered_html` is set. If the
+        result changes, the entry will be rendered again.
+
+        By default, this contains the timestamp of the last update to the
+        entry. Subclasses should include any other state that can change
+        without updating that timestamp.
+
+        Version Added:
+            7.0
+
+        Returns:
+            str:
+            The data representing the rendered content.
+        """
+        return str(self.updated_timestamp)
+
     def __init__(self, data, entry_id, added_timestamp,
                  updated_timestamp=None, avatar_user=None):
         """Initialize the entry.
@@ -966,6 +1505,14 @@ class BaseReviewRequestPageEntry(object):
         any content (as determined by :py:attr:`has_content`), then this
         will return an empty string.
 
+        If :py:attr:`cache_rendered_html` is set, previously-rendered HTML
+        will be returned from cache when the entry and the state for the
+        user viewing it haven't changed.
+
+        Version Changed:
+            7.0:
+            Added caching of the rendered HTML.
+
         Args:
             request (django.http.HttpRequest):
                 The HTTP request from the client.
@@ -982,17 +1529,35 @@ class BaseReviewRequestPageEntry(object):
 
         user = request.user
         last_visited = context.get('last_visited')
-
-        new_context = context.flatten()
+        cache_key = None
 
         try:
+            entry_is_new = (
+                user.is_authenticated and
+                last_visited is not None and
+                self.is_entry_new(last_visited=last_visited,
+                                  user=user))
+
+            if self.cache_rendered_html:
+                cache_key = self._make_render_cache_key(
+                    request=request,
+                    last_visited=last_visited,
+                    entry_is_new=entry_is_new)
+
+                def _on_miss():
+                    raise _RenderedEntryCacheMiss()
+
+                try:
+                    return mark_safe(
+                        cache_memoize(cache_key, _on_miss,
+                                      large_data=True).decode('utf-8'))
+                except _RenderedEntryCacheMiss:
+                    pass
+
+            new_context = context.flatten()
             new_context.update({
                 'entry': self,
-                'entry_is_new': (
-                    user.is_authenticated and
-                    last_visited is not None and
-                    self.is_entry_new(last_visited=last_visited,
-                                      user=user)),
+                'entry_is_new': entry_is_new,
                 'show_entry_statuses_area': (
                     self.entry_pos !=
                     BaseReviewRequestPageEntry.ENTRY_POS_INITIAL),
@@ -1006,7 +1571,7 @@ class BaseReviewRequestPageEntry(object):
             return ''
 
         try:
-            return render_to_string(template_name=self.template_name,
+            html = render_to_string(template_name=self.template_name,
                                     context=new_context,
                                     request=request)
         except Exception as e:
@@ -1015,10 +1580,81 @@ class BaseReviewRequestPageEntry(object):
                              extra={'request': request})
             return ''
 
+        if cache_key is not None:
+            # The HTML is stored as bytes, since SafeString can't be pickled
+            # for the cache.
+            cache_memoize(cache_key,
+                          lambda: html.encode('utf-8'),
+                          expiration=self.rendered_html_cache_expiration,
+                          large_data=True,
+                          force_overwrite=True)
+
+        return html
+
     def finalize(self):
         """Perform final computations after all comments have been added."""
         pass
 
+    def _make_render_cache_key(self, request, last_visited, entry_is_new):
+        """Return the cache key for the rendered HTML of the entry.
+
+        Version Added:
+            7.0
+
+        Args:
+            request (django.http.HttpRequest):
+                The HTTP request from the client.
+
+            last_visited (datetime.datetime):
+                The last time the user visited the page, if known.
+
+            entry_is_new (bool):
+                Whether the entry will be shown as new.
+
+        Returns:
+            str:
+            The cache key.
+        """
+        data = self.data
+        user = request.user
+
+        if (last_visited is not None and
+            self.updated_timestamp is not None and
+            last_visited < self.updated_timestamp):
+            # Replies within the entry may be shown as new, depending on the
+            # exact time of the last visit.
+            new_since = last_visited.isoformat()
+        else:
+            new_since = ''
+
+        siteconfig = SiteConfiguration.objects.get_current()
+        extension_ids = sorted(
+            extension.id
+            for extension in get_extension_manager().get_enabled_extensions()
+        )
+
+        key_data = ':'.join(str(value) for value in (
+            self.build_etag_data(data, entry=self),
+            self.build_render_cache_data(),
+            user.pk,
+            entry_is_new,
+            self.collapsed,
+            new_since,
+            is_rich_text_default_for_user(user),
+            is_site_read_only_for(user),
+            get_language(),
+            get_current_timezone_name(),
+            siteconfig.get('avatars_enabled'),
+            extension_ids,
+            settings.AJAX_SERIAL,
+        ))
+
+        return 'review-request-page-entry:%s:%s:%s:%s' % (
+            data.review_request.pk,
+            self.entry_type_id,
+            self.entry_id,
+            hashlib.sha256(key_data.encode('utf-8')).hexdigest())
+
 
 class ReviewEntryMixin(object):
     """Mixin to provide functionality for entries containing reviews."""
@@ -1072,6 +1708,35 @@ class ReviewEntryMixin(object):
             )
         )
 
+    def build_review_render_cache_data(self, review):
+        """Build data representing the rendered content of a review.
+
+        This covers state of the review and its comments that can change
+        after the review is published, such as Ship It revocations and
+        issue statuses.
+
+        Version Added:
+            7.0
+
+        Args:
+            review (reviewboard.reviews.models.Review):
+                The review shown in the entry.
+
+        Returns:
+            str:
+            The data representing the rendered content.
+        """
+        data = self.data
+
+        return '%s:%s:%s:%s' % (
+            review.pk,
+            review.ship_it,
+            data.latest_timestamps_by_review_id.get(review.pk),
+            ','.join(
+                '%s%s:%s' % (comment._type, comment.pk, comment.issue_status)
+                for comment in data.review_comments.get(review.pk, [])
+            ))
+
     def serialize_review_js_model_data(self, review):
         """Serialize information on a review for JavaScript models.
 
@@ -1294,6 +1959,26 @@ class StatusUpdatesEntryMixin(DiffCommentsSerializerMixin, ReviewEntryMixin):
                 'url_text': update.url_text,
             })
 
+    def build_render_cache_data(self):
+        """Build data representing the rendered content of the entry.
+
+        This includes the state of any reviews on the status updates.
+
+        Version Added:
+            7.0
+
+        Returns:
+            str:
+            The data representing the rendered content.
+        """
+        return '%s:%s' % (
+            super(StatusUpdatesEntryMixin, self).build_render_cache_data(),
+            ':'.join(
+                self.build_review_render_cache_data(status_update.review)
+                for status_update in getattr(self, 'status_updates', [])
+                if status_update.review_id is not None
+            ))
+
     def populate_status_updates(self, status_updates):
         """Populate the list of status updates for the entry.
 
@@ -1461,6 +2146,7 @@ class InitialStatusUpdatesEntry(StatusUpdatesEntryMixin,
     entry_pos = BaseReviewRequestPageEntry.ENTRY_POS_INITIAL
 
     template_name = 'reviews/entries/initial_status_updates.html'
+    cache_rendered_html = True
     js_model_class = 'RB.ReviewRequestPage.StatusUpdatesEntry'
     js_view_class = 'RB.ReviewRequestPage.InitialStatusUpdatesEntryView'
 
@@ -1562,7 +2248,8 @@ class InitialStatusUpdatesEntry(StatusUpdatesEntryMixin,
         return (
             # Don't collapse if the user has not seen this page before (or
             # are anonymous) and there aren't any change descriptions yet.
-            (data.last_visited or len(data.changedescs) > 0) and
+            (data.last_visited or
+             data.latest_changedesc_timestamp is not None) and
 
             # Don't collapse if there are status updates containing reviews
             # that should not be collapsed.
@@ -1594,6 +2281,7 @@ class ReviewEntry(ReviewEntryMixin, DiffCommentsSerializerMixin,
     needs_reviews = True
 
     template_name = 'reviews/entries/review.html'
+    cache_rendered_html = True
     js_model_class = 'RB.ReviewRequestPage.ReviewEntry'
     js_view_class = 'RB.ReviewRequestPage.ReviewEntryView'
 
@@ -1654,6 +2342,22 @@ class ReviewEntry(ReviewEntryMixin, DiffCommentsSerializerMixin,
                                           updated_timestamp=updated_timestamp,
                                           avatar_user=review.user)
 
+    def build_render_cache_data(self):
+        """Build data representing the rendered content of the entry.
+
+        This includes the state of the review and its comments.
+
+        Version Added:
+            7.0
+
+        Returns:
+            str:
+            The data representing the rendered content.
+        """
+        return '%s:%s' % (
+            super(ReviewEntry, self).build_render_cache_data(),
+            self.build_review_render_cache_data(self.review))
+
     @property
     def can_revoke_ship_it(self):
         """Whether the Ship It can be revoked by the current user."""
@@ -1763,6 +2467,7 @@ class ChangeEntry(StatusUpdatesEntryMixin, BaseReviewRequestPageEntry):
     needs_screenshots = True
 
     template_name = 'reviews/entries/change.html'
+    cache_rendered_html = True
     js_model_class = 'RB.ReviewRequestPage.ChangeEntry'
     js_view_class = 'RB.ReviewRequestPage.ChangeEntryView'
 
@@ -35,4 +35,5 @@ SEQUENCE = [
     'comment_issue_verification',
     'review_request_screenshot_attachment_counters',
     'manytomanyfield_rm_null',
+    'review_request_issues_indexed',
 ]
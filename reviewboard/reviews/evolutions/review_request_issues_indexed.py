@@ -0,0 +1,14 @@
+"""Add ReviewRequest.issues_indexed.
+
+Version Added:
+    7.0
+"""
+
+from django_evolution.mutations import AddField
+from django.db import models
+
+
+MUTATIONS = [
+    AddField('ReviewRequest', 'issues_indexed', models.BooleanField,
+             initial=False),
+]
@@ -4,19 +4,47 @@ from django.core.management.base import BaseCommand
 from django.utils.translation import gettext as _
 
 from reviewboard.accounts.admin import fix_review_counts
+from reviewboard.accounts.models import LocalSiteProfile
+from reviewboard.reviews.models import Group
 
 
 class Command(BaseCommand):
-    """Management command to reset review request counters on accounts."""
+    """Management command to reset review request counters on accounts.
+
+    Version Changed:
+        7.0:
+        Added the ``--recalculate`` option.
+    """
 
     help = _('Resets all review request-related counters on accounts.')
 
+    def add_arguments(self, parser):
+        """Add arguments to the command.
+
+        Version Added:
+            7.0
+
+        Args:
+            parser (argparse.ArgumentParser):
+                The argument parser for the command.
+        """
+        parser.add_argument(
+            '--recalculate',
+            action='store_true',
+            default=False,
+            dest='recalculate',
+            help=_('Recalculates the counters in bulk, rather than '
+                   'resetting them to be recalculated when next used.'))
+
     def handle(self, **options):
         """Handle the command.
 
         Args:
-            **options (dict, unused):
-                Options parsed on the command line. For this command, no
-                options are available.
+            **options (dict):
+                Options parsed on the command line.
         """
-        fix_review_counts()
+        if options['recalculate']:
+            LocalSiteProfile.objects.recalculate_review_request_counts()
+            Group.objects.recalculate_incoming_request_counts()
+        else:
+            fix_review_counts()
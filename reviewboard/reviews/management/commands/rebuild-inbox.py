@@ -0,0 +1,50 @@
+"""Management command to rebuild the dashboard inboxes.
+
+Version Added:
+    7.0
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext as _
+
+from reviewboard.reviews.models import ReviewRequestInboxEntry
+
+
+class Command(BaseCommand):
+    """Management command to rebuild the dashboard inboxes.
+
+    This must be run after enabling :setting:`DASHBOARD_INBOX_ENABLED`, and
+    can be run at any time to repair the inboxes.
+
+    Version Added:
+        7.0
+    """
+
+    help = _('Rebuilds the dashboard inboxes for all users.')
+
+    def handle(self, *args, **options):
+        """Handle the command.
+
+        Args:
+            *args (tuple, unused):
+                Positional arguments passed to the command.
+
+            **options (dict, unused):
+                Options parsed on the command line. For this command, no
+                options are available.
+
+        Raises:
+            django.core.management.base.CommandError:
+                The dashboard inbox is not enabled.
+        """
+        if not ReviewRequestInboxEntry.objects.is_enabled():
+            raise CommandError(
+                _('DASHBOARD_INBOX_ENABLED must be set in settings_local.py '
+                  'before rebuilding the dashboard inboxes.'))
+
+        count = ReviewRequestInboxEntry.objects.rebuild()
+
+        self.stdout.write(
+            _('Rebuilt the dashboard inboxes for %d open review '
+              'request(s).')
+            % count)
@@ -5,11 +5,16 @@ import logging
 from django.core.management.base import BaseCommand, CommandError
 from django.utils.translation import gettext as _
 
-from reviewboard.reviews.models import ReviewRequest
+from reviewboard.reviews.models import ReviewRequest, ReviewRequestIssue
 
 
 class Command(BaseCommand):
-    """Management command to reset issue counters."""
+    """Management command to reset issue counters.
+
+    Version Changed:
+        7.0:
+        This now rebuilds the issue index for the review requests as well.
+    """
 
     help = 'Resets all calculated issue counts for review requests.'
 
@@ -79,6 +84,10 @@ class Command(BaseCommand):
 
             q = ReviewRequest.objects.filter(pk__in=pks)
 
+        # Rebuild the issue index that the counts are calculated from.
+        for review_request in q.iterator():
+            ReviewRequestIssue.objects.rebuild(review_request)
+
         q.update(issue_open_count=None,
                  issue_resolved_count=None,
                  issue_dropped_count=None,
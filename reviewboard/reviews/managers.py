@@ -3,17 +3,23 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Optional, TYPE_CHECKING, Union
+from collections import defaultdict
+from typing import (Dict, Iterable, Optional, Sequence, Set, TYPE_CHECKING,
+                    Tuple, Type, Union)
 
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser, User
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import connections, router, transaction, IntegrityError
-from django.db.models import Exists, Manager, OuterRef, Q
+from django.db.models import (Count, Exists, F, Func, IntegerField,
+                              Manager, OuterRef, Q, Subquery)
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
 from django.utils.text import slugify
 from djblets.db.managers import ConcurrencyManager
 from housekeeping.functions import deprecate_non_keyword_only_args
 
+from reviewboard.accounts.managers import update_locked
 from reviewboard.deprecation import RemovedInReviewBoard70Warning
 from reviewboard.diffviewer.models import DiffSetHistory
 from reviewboard.reviews.signals import review_request_diffset_uploaded
@@ -25,7 +31,10 @@ if TYPE_CHECKING:
     from reviewboard.changedescs.models import ChangeDescription
     from reviewboard.integrations.base import Integration
     from reviewboard.integrations.models import IntegrationConfig
-    from reviewboard.reviews.models import Review, ReviewRequest, StatusUpdate
+    from reviewboard.reviews.models import (BaseComment,
+                                            Review,
+                                            ReviewRequest,
+                                            StatusUpdate)
     from reviewboard.site.models import AnyOrAllLocalSites
 
 
@@ -401,6 +410,68 @@ class ReviewGroupManager(Manager):
         return (user.is_superuser or
                 (local_site and local_site.is_mutable_by(user)))
 
+    def update_incoming_request_counts(self, group_ids, delta):
+        """Update the incoming review request counters for review groups.
+
+        The review groups are locked in primary key order before they're
+        updated (see :py:func:`~reviewboard.accounts.managers.
+        update_locked`), so that concurrent calls for overlapping sets of
+        review groups can't deadlock each other.
+
+        Version Added:
+            7.0
+
+        Args:
+            group_ids (list of int):
+                The IDs of the review groups to update.
+
+            delta (int):
+                The value to add to each counter.
+        """
+        if not group_ids:
+            return
+
+        update_locked(self.filter(pk__in=group_ids), {
+            'incoming_request_count': F('incoming_request_count') + delta,
+        })
+
+    def recalculate_incoming_request_counts(self):
+        """Recalculate the incoming review request counters for all groups.
+
+        The counters are computed by the database with a single UPDATE for
+        each kind of Local Site, rather than with a query for each review
+        group.
+
+        Version Added:
+            7.0
+        """
+        from reviewboard.reviews.models import ReviewRequest
+
+        with transaction.atomic():
+            for local_site_q, review_requests in (
+                (Q(local_site__isnull=True),
+                 ReviewRequest.objects.filter(local_site__isnull=True)),
+                (Q(local_site__isnull=False),
+                 ReviewRequest.objects.filter(
+                     local_site=OuterRef('local_site'))),
+            ):
+                review_requests = (
+                    review_requests
+                    .filter(public=True,
+                            status=ReviewRequest.PENDING_REVIEW,
+                            submitter__is_active=True,
+                            target_groups=OuterRef('pk'))
+                    .order_by()
+                    .annotate(count=Func(F('pk'), function='COUNT'))
+                    .values('count')
+                )
+
+                self.filter(local_site_q).update(
+                    incoming_request_count=Coalesce(
+                        Subquery(review_requests,
+                                 output_field=IntegerField()),
+                        0))
+
 
 class ReviewRequestQuerySet(QuerySet):
     def with_counts(self, user):
@@ -680,17 +751,45 @@ class ReviewRequestManager(ConcurrencyManager):
                 allow_all=False)
         )
 
-    def get_to_user_groups_query(self, user_or_username):
+    def get_to_user_groups_query(
+        self,
+        user_or_username,
+        *,
+        status=None,
+        include_archived=True,
+    ):
         """Return a Q() query object targeting groups joined by a user.
 
         This is meant to be passed as an ``extra_query`` argument to
         :py:meth:`public`.
 
+        Version Changed:
+            7.0:
+            Added the ``status`` and ``include_archived`` arguments. When
+            :setting:`DASHBOARD_INBOX_ENABLED` is set and ``status`` is
+            :py:attr:`ReviewRequest.PENDING_REVIEW
+            <reviewboard.reviews.models.review_request.ReviewRequest.
+            PENDING_REVIEW>`, this will query the user's dashboard inbox.
+
         Args:
             user_or_username (django.contrib.auth.models.User or str):
                 The User instance or username that all review requests must
                 be assigned to indirectly.
 
+            status (str, optional):
+                The status of the review requests being queried for, if
+                limited to a single status.
+
+                Version Added:
+                    7.0
+
+            include_archived (bool, optional):
+                Whether to include review requests the user has archived or
+                muted.
+
+                Version Added:
+                    7.0
+
         Returns:
             django.db.models.Q:
             The query object.
@@ -699,12 +798,33 @@ class ReviewRequestManager(ConcurrencyManager):
             django.contrib.auth.models.User.DoesNotExist:
                 A username was provided, and that user does not exist.
         """
+        from reviewboard.reviews.models import ReviewRequestInboxEntry
+
         query_user = self._get_query_user(user_or_username)
-        groups = list(query_user.review_groups.values_list('pk', flat=True))
+        q = self._get_inbox_query(query_user,
+                                  reasons=[
+                                      ReviewRequestInboxEntry.TARGET_GROUP,
+                                  ],
+                                  status=status,
+                                  include_archived=include_archived)
+
+        if q is None:
+            groups = list(query_user.review_groups.values_list('pk',
+                                                               flat=True))
+            q = Q(target_groups__in=groups)
+
+            if not include_archived:
+                q &= self._get_not_archived_query(query_user)
 
-        return Q(target_groups__in=groups)
+        return q
 
-    def get_to_user_directly_query(self, user_or_username):
+    def get_to_user_directly_query(
+        self,
+        user_or_username,
+        *,
+        status=None,
+        include_archived=True,
+    ):
         """Returns the query targeting a user directly.
 
         This will include review requests where the user has been listed
@@ -713,11 +833,33 @@ class ReviewRequestManager(ConcurrencyManager):
         This is meant to be passed as an ``extra_query`` argument to
         :py:meth:`public`.
 
+        Version Changed:
+            7.0:
+            Added the ``status`` and ``include_archived`` arguments. When
+            :setting:`DASHBOARD_INBOX_ENABLED` is set and ``status`` is
+            :py:attr:`ReviewRequest.PENDING_REVIEW
+            <reviewboard.reviews.models.review_request.ReviewRequest.
+            PENDING_REVIEW>`, this will query the user's dashboard inbox.
+
         Args:
             user_or_username (django.contrib.auth.models.User or str):
                 The User instance or username that all review requests must
                 be assigned to directly.
 
+            status (str, optional):
+                The status of the review requests being queried for, if
+                limited to a single status.
+
+                Version Added:
+                    7.0
+
+            include_archived (bool, optional):
+                Whether to include review requests the user has archived or
+                muted.
+
+                Version Added:
+                    7.0
+
         Returns:
             django.db.models.Q:
             The query object.
@@ -726,7 +868,19 @@ class ReviewRequestManager(ConcurrencyManager):
             django.contrib.auth.models.User.DoesNotExist:
                 A username was provided, and that user does not exist.
         """
+        from reviewboard.reviews.models import ReviewRequestInboxEntry
+
         query_user = self._get_query_user(user_or_username)
+        q = self._get_inbox_query(query_user,
+                                  reasons=[
+                                      ReviewRequestInboxEntry.TARGET_PERSON,
+                                      ReviewRequestInboxEntry.STARRED,
+                                  ],
+                                  status=status,
+                                  include_archived=include_archived)
+
+        if q is not None:
+            return q
 
         q = Q(Exists(
             self.model.target_people.through.objects
@@ -744,9 +898,18 @@ class ReviewRequestManager(ConcurrencyManager):
         except ObjectDoesNotExist:
             pass
 
+        if not include_archived:
+            q &= self._get_not_archived_query(query_user)
+
         return q
 
-    def get_to_user_query(self, user_or_username):
+    def get_to_user_query(
+        self,
+        user_or_username,
+        *,
+        status=None,
+        include_archived=True,
+    ):
         """Return a Q() query object targeting a user indirectly.
 
         This will include review requests where the user has been listed
@@ -756,11 +919,33 @@ class ReviewRequestManager(ConcurrencyManager):
         This is meant to be passed as an ``extra_query`` argument to
         :py:meth:`public`.
 
+        Version Changed:
+            7.0:
+            Added the ``status`` and ``include_archived`` arguments. When
+            :setting:`DASHBOARD_INBOX_ENABLED` is set and ``status`` is
+            :py:attr:`ReviewRequest.PENDING_REVIEW
+            <reviewboard.reviews.models.review_request.ReviewRequest.
+            PENDING_REVIEW>`, this will query the user's dashboard inbox.
+
         Args:
             user_or_username (django.contrib.auth.models.User or str):
                 The User instance or username that all review requests must
                 be assigned to (directly to indirectly).
 
+            status (str, optional):
+                The status of the review requests being queried for, if
+                limited to a single status.
+
+                Version Added:
+                    7.0
+
+            include_archived (bool, optional):
+                Whether to include review requests the user has archived or
+                muted.
+
+                Version Added:
+                    7.0
+
         Returns:
             django.db.models.Q:
             The query object.
@@ -769,7 +954,21 @@ class ReviewRequestManager(ConcurrencyManager):
             django.contrib.auth.models.User.DoesNotExist:
                 A username was provided, and that user does not exist.
         """
+        from reviewboard.reviews.models import ReviewRequestInboxEntry
+
         query_user = self._get_query_user(user_or_username)
+        q = self._get_inbox_query(query_user,
+                                  reasons=[
+                                      ReviewRequestInboxEntry.TARGET_PERSON,
+                                      ReviewRequestInboxEntry.TARGET_GROUP,
+                                      ReviewRequestInboxEntry.STARRED,
+                                  ],
+                                  status=status,
+                                  include_archived=include_archived)
+
+        if q is not None:
+            return q
+
         groups = list(query_user.review_groups.values_list('pk', flat=True))
 
         q = Q(Exists(
@@ -792,6 +991,9 @@ class ReviewRequestManager(ConcurrencyManager):
         except ObjectDoesNotExist:
             pass
 
+        if not include_archived:
+            q &= self._get_not_archived_query(query_user)
+
         return q
 
     def get_from_user_query(self, user_or_username):
@@ -814,17 +1016,45 @@ class ReviewRequestManager(ConcurrencyManager):
         else:
             return Q(submitter__username=user_or_username)
 
-    def get_to_or_from_user_query(self, user_or_username):
+    def get_to_or_from_user_query(
+        self,
+        user_or_username,
+        *,
+        status=None,
+        include_archived=True,
+    ):
         """Return a Q() query object for review requests involving a user.
 
         This is meant to be passed as an ``extra_query`` argument to
         :py:meth:`public`.
 
+        Version Changed:
+            7.0:
+            Added the ``status`` and ``include_archived`` arguments. When
+            :setting:`DASHBOARD_INBOX_ENABLED` is set and ``status`` is
+            :py:attr:`ReviewRequest.PENDING_REVIEW
+            <reviewboard.reviews.models.review_request.ReviewRequest.
+            PENDING_REVIEW>`, this will query the user's dashboard inbox.
+
         Args:
             user_or_username (django.contrib.auth.models.User or unicode):
                 The User instance or username that all review requests must
                 either be owned by or assigned to (directly to indirectly).
 
+            status (str, optional):
+                The status of the review requests being queried for, if
+                limited to a single status.
+
+                Version Added:
+                    7.0
+
+            include_archived (bool, optional):
+                Whether to include review requests the user has archived or
+                muted.
+
+                Version Added:
+                    7.0
+
         Returns:
             django.db.models.Q:
             The query object.
@@ -833,8 +1063,27 @@ class ReviewRequestManager(ConcurrencyManager):
             django.contrib.auth.models.User.DoesNotExist:
                 A username was provided, and that user does not exist.
         """
-        return (self.get_to_user_query(user_or_username) |
-                self.get_from_user_query(user_or_username))
+        from reviewboard.reviews.models import ReviewRequestInboxEntry
+
+        query_user = self._get_query_user(user_or_username)
+        q = self._get_inbox_query(query_user,
+                                  reasons=[
+                                      ReviewRequestInboxEntry.SUBMITTER,
+                                      ReviewRequestInboxEntry.TARGET_PERSON,
+                                      ReviewRequestInboxEntry.TARGET_GROUP,
+                                      ReviewRequestInboxEntry.STARRED,
+                                  ],
+                                  status=status,
+                                  include_archived=include_archived)
+
+        if q is None:
+            q = (self.get_to_user_query(query_user) |
+                 self.get_from_user_query(user_or_username))
+
+            if not include_archived:
+                q &= self._get_not_archived_query(query_user)
+
+        return q
 
     def public(self, filter_private=True, *args, **kwargs):
         """Query public review requests, filtered by given criteria.
@@ -905,7 +1154,13 @@ class ReviewRequestManager(ConcurrencyManager):
             local_site=local_site,
             *args, **kwargs)
 
-    def to_or_from_user(self, user_or_username, *args, **kwargs):
+    def to_or_from_user(
+        self,
+        user_or_username,
+        *args,
+        include_archived=True,
+        **kwargs,
+    ):
         """Query review requests a user is involved in.
 
         The result will be review requests from a user, assigned to the user,
@@ -916,6 +1171,12 @@ class ReviewRequestManager(ConcurrencyManager):
         invite-only review group ACLs). To filter based on access, pass
         ``filter_private=True``.
 
+        Version Changed:
+            7.0:
+            Added the ``include_archived`` argument. When
+            :setting:`DASHBOARD_INBOX_ENABLED` is set, pending review
+            requests will be queried from the user's dashboard inbox.
+
         Args:
             user_or_username (django.contrib.auth.models.User or unicode):
                 The User instance or username that all review requests must
@@ -925,6 +1186,13 @@ class ReviewRequestManager(ConcurrencyManager):
                 Additional positional arguments to pass to the common
                 :py:meth:`_query` function.
 
+            include_archived (bool, optional):
+                Whether to include review requests the user has archived or
+                muted.
+
+                Version Added:
+                    7.0
+
             **kwargs (dict):
                 Additional keyword arguments to pass to the common
                 :py:meth:`_query` function.
@@ -940,10 +1208,19 @@ class ReviewRequestManager(ConcurrencyManager):
                 A username was provided, and that user does not exist.
         """
         return self._query(
-            extra_query=self.get_to_or_from_user_query(user_or_username),
+            extra_query=self.get_to_or_from_user_query(
+                user_or_username,
+                status=self._get_query_status(args, kwargs),
+                include_archived=include_archived),
             *args, **kwargs)
 
-    def to_user_groups(self, username, *args, **kwargs):
+    def to_user_groups(
+        self,
+        username,
+        *args,
+        include_archived=True,
+        **kwargs,
+    ):
         """Query review requests made to a user's review groups.
 
         The result will be review requests assigned to a group the user is in.
@@ -953,10 +1230,23 @@ class ReviewRequestManager(ConcurrencyManager):
         invite-only review group ACLs). To filter based on access, pass
         ``filter_private=True``.
 
+        Version Changed:
+            7.0:
+            Added the ``include_archived`` argument. When
+            :setting:`DASHBOARD_INBOX_ENABLED` is set, pending review
+            requests will be queried from the user's dashboard inbox.
+
         Args:
             username (django.contrib.auth.models.User or str):
                 The User instance or username.
 
+            include_archived (bool, optional):
+                Whether to include review requests the user has archived or
+                muted.
+
+                Version Added:
+                    7.0
+
         Returns:
             django.db.models.query.QuerySet:
             A queryset of all review requests the users is involved in as
@@ -968,10 +1258,19 @@ class ReviewRequestManager(ConcurrencyManager):
                 A username was provided, and that user does not exist.
         """
         return self._query(
-            extra_query=self.get_to_user_groups_query(username),
+            extra_query=self.get_to_user_groups_query(
+                username,
+                status=self._get_query_status(args, kwargs),
+                include_archived=include_archived),
             *args, **kwargs)
 
-    def to_user_directly(self, user_or_username, *args, **kwargs):
+    def to_user_directly(
+        self,
+        user_or_username,
+        *args,
+        include_archived=True,
+        **kwargs,
+    ):
         """Query review requests assigned directly to a user.
 
         The result will be review requests assigned to the user.
@@ -981,6 +1280,12 @@ class ReviewRequestManager(ConcurrencyManager):
         invite-only review group ACLs). To filter based on access, pass
         ``filter_private=True``.
 
+        Version Changed:
+            7.0:
+            Added the ``include_archived`` argument. When
+            :setting:`DASHBOARD_INBOX_ENABLED` is set, pending review
+            requests will be queried from the user's dashboard inbox.
+
         Args:
             user_or_username (django.contrib.auth.models.User or unicode):
                 The user object or username to query for.
@@ -989,6 +1294,13 @@ class ReviewRequestManager(ConcurrencyManager):
                 Additional positional arguments to pass to the common
                 :py:meth:`_query` function.
 
+            include_archived (bool, optional):
+                Whether to include review requests the user has archived or
+                muted.
+
+                Version Added:
+                    7.0
+
             **kwargs (dict):
                 Additional keyword arguments to pass to the common
                 :py:meth:`_query` function.
@@ -1002,10 +1314,19 @@ class ReviewRequestManager(ConcurrencyManager):
                 A username was provided, and that user does not exist.
         """
         return self._query(
-            extra_query=self.get_to_user_directly_query(user_or_username),
+            extra_query=self.get_to_user_directly_query(
+                user_or_username,
+                status=self._get_query_status(args, kwargs),
+                include_archived=include_archived),
             *args, **kwargs)
 
-    def to_user(self, user_or_username, *args, **kwargs):
+    def to_user(
+        self,
+        user_or_username,
+        *args,
+        include_archived=True,
+        **kwargs,
+    ):
         """Query review requests assigned directly or indirectly to a user.
 
         The result will be review requests assigned to the user or to a group
@@ -1016,6 +1337,12 @@ class ReviewRequestManager(ConcurrencyManager):
         invite-only review group ACLs). To filter based on access, pass
         ``filter_private=True``.
 
+        Version Changed:
+            7.0:
+            Added the ``include_archived`` argument. When
+            :setting:`DASHBOARD_INBOX_ENABLED` is set, pending review
+            requests will be queried from the user's dashboard inbox.
+
         Args:
             user_or_username (django.contrib.auth.models.User or unicode):
                 The user object or username to query for.
@@ -1024,6 +1351,13 @@ class ReviewRequestManager(ConcurrencyManager):
                 Additional positional arguments to pass to the common
                 :py:meth:`_query` function.
 
+            include_archived (bool, optional):
+                Whether to include review requests the user has archived or
+                muted.
+
+                Version Added:
+                    7.0
+
             **kwargs (dict):
                 Additional keyword arguments to pass to the common
                 :py:meth:`_query` function.
@@ -1037,7 +1371,10 @@ class ReviewRequestManager(ConcurrencyManager):
                 A username was provided, and that user does not exist.
         """
         return self._query(
-            extra_query=self.get_to_user_query(user_or_username),
+            extra_query=self.get_to_user_query(
+                user_or_username,
+                status=self._get_query_status(args, kwargs),
+                include_archived=include_archived),
             *args, **kwargs)
 
     def from_user(self, user_or_username, *args, **kwargs):
@@ -1328,6 +1665,94 @@ class ReviewRequestManager(ConcurrencyManager):
 
         return queryset
 
+    def _get_query_status(self, args, kwargs):
+        """Return the status passed to :py:meth:`_query`.
+
+        Version Added:
+            7.0
+
+        Args:
+            args (tuple):
+                The positional arguments for :py:meth:`_query`.
+
+            kwargs (dict):
+                The keyword arguments for :py:meth:`_query`.
+
+        Returns:
+            str:
+            The status to filter by, or ``None``.
+        """
+        if len(args) > 1:
+            return args[1]
+
+        return kwargs.get('status', self.model.PENDING_REVIEW)
+
+    def _get_inbox_query(self, user, reasons, status, include_archived):
+        """Return a Q() query object for review requests in a user's inbox.
+
+        The inbox only contains pending review requests, so this can only be
+        used when querying for those.
+
+        Version Added:
+            7.0
+
+        Args:
+            user (django.contrib.auth.models.User):
+                The user owning the inbox.
+
+            reasons (list of str):
+                The reasons for review requests to be in the inbox.
+
+            status (str):
+                The status of the review requests being queried for.
+
+            include_archived (bool):
+                Whether to include review requests the user has archived or
+                muted.
+
+        Returns:
+            django.db.models.Q:
+            The query object, or ``None`` if the inbox can't be used.
+        """
+        from reviewboard.reviews.models import ReviewRequestInboxEntry
+
+        inbox_entries = ReviewRequestInboxEntry.objects
+
+        if (status != self.model.PENDING_REVIEW or
+            not inbox_entries.is_enabled()):
+            return None
+
+        return Q(pk__in=inbox_entries.get_review_request_ids(
+            user,
+            reasons=reasons,
+            include_archived=include_archived))
+
+    def _get_not_archived_query(self, user):
+        """Return a Q() query object excluding archived review requests.
+
+        Version Added:
+            7.0
+
+        Args:
+            user (django.contrib.auth.models.User):
+                The user who may have archived or muted review requests.
+
+        Returns:
+            django.db.models.Q:
+            The query object.
+        """
+        from reviewboard.accounts.models import ReviewRequestVisit
+
+        # This may produce a large number of archived review requests.
+        # Rather than work with a large number of IDs, we'll use a
+        # subquery here.
+        return ~Q(pk__in=(
+            ReviewRequestVisit.objects
+            .filter(user=user)
+            .exclude(visibility=ReviewRequestVisit.VISIBLE)
+            .values_list('review_request_id', flat=True)
+        ))
+
     def _get_query_user(self, user_or_username):
         """Return a User object, given a possible User or username.
 
@@ -1906,3 +2331,569 @@ class StatusUpdateManager(Manager):
         status_update.save()
 
         return status_update
+
+
+class ReviewRequestIssueManager(Manager):
+    """A manager for ReviewRequestIssue models.
+
+    This maintains the issue index for review requests, and computes issue
+    counts from it.
+
+    Version Added:
+        7.0
+    """
+
+    def ensure_indexed(
+        self,
+        review_request: ReviewRequest,
+    ) -> None:
+        """Ensure that the issues on a review request have been indexed.
+
+        Review requests with issues opened before the index was introduced
+        will be indexed the first time this is called.
+
+        Args:
+            review_request (reviewboard.reviews.models.review_request.
+                            ReviewRequest):
+                The review request to index.
+        """
+        if not review_request.issues_indexed:
+            self.rebuild(review_request)
+
+    def rebuild(
+        self,
+        review_request: ReviewRequest,
+    ) -> None:
+        """Rebuild the issue index for a review request from its comments.
+
+        This will also mark the review request as indexed. Only that field
+        is updated in the database, so this is safe to call while reading
+        a review request that may be out of date.
+
+        Args:
+            review_request (reviewboard.reviews.models.review_request.
+                            ReviewRequest):
+                The review request to index.
+        """
+        from reviewboard.reviews.models import ReviewRequest
+
+        issues = []
+
+        for comment_model in self._get_comment_models().values():
+            comments = (
+                comment_model.objects
+                .filter(review__review_request=review_request,
+                        review__public=True,
+                        review__base_reply_to__isnull=True,
+                        issue_opened=True,
+                        issue_status__isnull=False)
+                .values_list('pk', 'review', 'issue_status', 'timestamp')
+            )
+
+            issues += [
+                self.model(review_request=review_request,
+                           review_id=review_id,
+                           comment_type=comment_model.comment_type,
+                           comment_id=comment_id,
+                           issue_status=issue_status,
+                           timestamp=timestamp)
+                for comment_id, review_id, issue_status, timestamp in comments
+            ]
+
+        with transaction.atomic():
+            self.filter(review_request=review_request).delete()
+            self.bulk_create(issues, ignore_conflicts=True)
+
+            (
+                ReviewRequest.objects
+                .filter(pk=review_request.pk)
+                .update(issues_indexed=True)
+            )
+
+        review_request.issues_indexed = True
+
+    def add_for_review(
+        self,
+        review: Review,
+    ) -> None:
+        """Index the issues opened in a published review.
+
+        This is called when the review is published, and when comments are
+        added to an already-published review. Issues that are already in
+        the index are left alone.
+
+        Args:
+            review (reviewboard.reviews.models.review.Review):
+                The published review.
+        """
+        issues = []
+
+        for comment_model in self._get_comment_models().values():
+            comments = (
+                comment_model.objects
+                .filter(review=review,
+                        issue_opened=True,
+                        issue_status__isnull=False)
+                .values_list('pk', 'issue_status', 'timestamp')
+            )
+
+            issues += [
+                self.model(review_request_id=review.review_request_id,
+                           review=review,
+                           comment_type=comment_model.comment_type,
+                           comment_id=comment_id,
+                           issue_status=issue_status,
+                           timestamp=timestamp)
+                for comment_id, issue_status, timestamp in comments
+            ]
+
+        if issues:
+            self.bulk_create(issues, ignore_conflicts=True)
+
+    def update_for_comment(
+        self,
+        comment: BaseComment,
+        review: Review,
+    ) -> None:
+        """Update the index for a change to a comment's issue.
+
+        The comment's entry will be added or updated if the comment has an
+        issue opened, and removed otherwise.
+
+        Args:
+            comment (reviewboard.reviews.models.base_comment.BaseComment):
+                The comment that changed.
+
+            review (reviewboard.reviews.models.review.Review):
+                The published review containing the comment.
+        """
+        if comment.issue_opened and comment.issue_status:
+            self.update_or_create(
+                comment_type=comment.comment_type,
+                comment_id=comment.pk,
+                defaults={
+                    'review_request_id': review.review_request_id,
+                    'review': review,
+                    'issue_status': comment.issue_status,
+                    'timestamp': comment.timestamp,
+                })
+        else:
+            self.remove_for_comment(comment)
+
+    def remove_for_comment(
+        self,
+        comment: BaseComment,
+    ) -> None:
+        """Remove a comment's issue from the index.
+
+        Args:
+            comment (reviewboard.reviews.models.base_comment.BaseComment):
+                The comment being removed.
+        """
+        self.filter(comment_type=comment.comment_type,
+                    comment_id=comment.pk).delete()
+
+    def get_issue_counts(
+        self,
+        review_request: ReviewRequest,
+        reviews: Optional[QuerySet] = None,
+    ) -> Dict[str, int]:
+        """Return the number of issues in each status on a review request.
+
+        Args:
+            review_request (reviewboard.reviews.models.review_request.
+                            ReviewRequest):
+                The review request to count issues for.
+
+            reviews (django.db.models.query.QuerySet, optional):
+                A queryset limiting the reviews to count issues for.
+
+        Returns:
+            dict:
+            A dictionary mapping issue statuses to counts. Statuses without
+            any issues will not be present.
+        """
+        self.ensure_indexed(review_request)
+
+        queryset = self.filter(review_request=review_request)
+
+        if reviews is not None:
+            queryset = queryset.filter(review__in=reviews)
+
+        return dict(
+            queryset
+            .values_list('issue_status')
+            .annotate(count=Count('pk'))
+            .order_by()
+        )
+
+    def _get_comment_models(self) -> Dict[str, Type[BaseComment]]:
+        """Return the comment models that can open issues.
+
+        Returns:
+            dict:
+            A dictionary mapping comment types to comment models.
+        """
+        from reviewboard.reviews.models import (Comment,
+                                                FileAttachmentComment,
+                                                GeneralComment,
+                                                ScreenshotComment)
+
+        return {
+            comment_model.comment_type: comment_model
+            for comment_model in (Comment,
+                                  FileAttachmentComment,
+                                  GeneralComment,
+                                  ScreenshotComment)
+        }
+
+
+class ReviewRequestInboxEntryManager(Manager):
+    """A manager for ReviewRequestInboxEntry models.
+
+    This maintains the dashboard inbox for users, and queries review
+    requests from it.
+
+    Version Added:
+        7.0
+    """
+
+    def is_enabled(self) -> bool:
+        """Return whether the dashboard inbox is enabled.
+
+        Returns:
+            bool:
+            ``True`` if :setting:`DASHBOARD_INBOX_ENABLED` is set.
+        """
+        return bool(getattr(settings, 'DASHBOARD_INBOX_ENABLED', False))
+
+    def get_review_request_ids(
+        self,
+        user: User,
+        reasons: Sequence[str],
+        include_archived: bool = True,
+    ) -> QuerySet:
+        """Return the IDs of review requests in a user's inbox.
+
+        Args:
+            user (django.contrib.auth.models.User):
+                The user owning the inbox.
+
+            reasons (list of str):
+                The reasons for review requests to be in the inbox.
+
+            include_archived (bool, optional):
+                Whether to include review requests the user has archived or
+                muted.
+
+        Returns:
+            django.db.models.query.QuerySet:
+            A queryset of review request IDs, suitable for use as a
+            subquery.
+        """
+        queryset = self.filter(user=user, reason__in=reasons)
+
+        if not include_archived:
+            queryset = queryset.filter(archived=False)
+
+        return queryset.values('review_request_id')
+
+    def sync_review_request(
+        self,
+        review_request: ReviewRequest,
+    ) -> None:
+        """Update the inbox entries for a review request.
+
+        Open review requests will be added to the inboxes of their owner,
+        reviewers, members of their review groups, and users who starred
+        them. Closed review requests will be removed from all inboxes.
+
+        Args:
+            review_request (reviewboard.reviews.models.review_request.
+                            ReviewRequest):
+                The review request to update.
+        """
+        from reviewboard.accounts.models import Profile
+        from reviewboard.reviews.models import Group
+
+        model = self.model
+        review_request_id = review_request.pk
+        entries = set()
+
+        if review_request.status == review_request.PENDING_REVIEW:
+            entries.add((review_request.submitter_id, review_request_id,
+                         model.SUBMITTER))
+
+            for reason, user_ids in (
+                (model.TARGET_PERSON,
+                 review_request.target_people.values_list('pk', flat=True)),
+                (model.TARGET_GROUP,
+                 Group.users.through.objects
+                 .filter(group__in=review_request.target_groups.all())
+                 .values_list('user_id', flat=True)),
+                (model.STARRED,
+                 Profile.starred_review_requests.through.objects
+                 .filter(reviewrequest=review_request_id)
+                 .values_list('profile__user_id', flat=True)),
+            ):
+                entries.update(
+                    (user_id, review_request_id, reason)
+                    for user_id in user_ids
+                )
+
+        self._apply_entries(
+            existing=set(
+                self.filter(review_request=review_request_id)
+                .values_list('user_id', 'review_request_id', 'reason')
+            ),
+            entries=entries)
+
+    def sync_user(
+        self,
+        user: User,
+    ) -> None:
+        """Update the inbox entries for a user.
+
+        This is used when the user's review group memberships change.
+
+        Args:
+            user (django.contrib.auth.models.User):
+                The user to update.
+        """
+        from reviewboard.accounts.models import Profile
+        from reviewboard.reviews.models import ReviewRequest
+
+        model = self.model
+        user_id = user.pk
+        pending = ReviewRequest.PENDING_REVIEW
+        target_people = ReviewRequest.target_people.through.objects
+        target_groups = ReviewRequest.target_groups.through.objects
+        starred = Profile.starred_review_requests.through.objects
+        entries = set()
+
+        for reason, review_request_ids in (
+            (model.SUBMITTER,
+             ReviewRequest.objects
+             .filter(submitter=user_id,
+                     status=pending)
+             .values_list('pk', flat=True)),
+            (model.TARGET_PERSON,
+             target_people
+             .filter(user=user_id,
+                     reviewrequest__status=pending)
+             .values_list('reviewrequest_id', flat=True)),
+            (model.TARGET_GROUP,
+             target_groups
+             .filter(group__users=user_id,
+                     reviewrequest__status=pending)
+             .values_list('reviewrequest_id', flat=True)),
+            (model.STARRED,
+             starred
+             .filter(profile__user=user_id,
+                     reviewrequest__status=pending)
+             .values_list('reviewrequest_id', flat=True)),
+        ):
+            entries.update(
+                (user_id, review_request_id, reason)
+                for review_request_id in review_request_ids
+            )
+
+        self._apply_entries(
+            existing=set(
+                self.filter(user=user_id)
+                .values_list('user_id', 'review_request_id', 'reason')
+            ),
+            entries=entries)
+
+    def add_starred(
+        self,
+        user: User,
+        review_request_ids: Iterable[int],
+    ) -> None:
+        """Add starred review requests to a user's inbox.
+
+        Args:
+            user (django.contrib.auth.models.User):
+                The user who starred the review requests.
+
+            review_request_ids (list of int):
+                The IDs of the starred review requests. Any that aren't
+                open will be skipped.
+        """
+        from reviewboard.reviews.models import ReviewRequest
+
+        self._apply_entries(
+            existing=set(),
+            entries={
+                (user.pk, review_request_id, self.model.STARRED)
+                for review_request_id in (
+                    ReviewRequest.objects
+                    .filter(pk__in=review_request_ids,
+                            status=ReviewRequest.PENDING_REVIEW)
+                    .values_list('pk', flat=True)
+                )
+            })
+
+    def remove_starred(
+        self,
+        user: User,
+        review_request_ids: Optional[Iterable[int]] = None,
+    ) -> None:
+        """Remove starred review requests from a user's inbox.
+
+        Args:
+            user (django.contrib.auth.models.User):
+                The user who unstarred the review requests.
+
+            review_request_ids (list of int, optional):
+                The IDs of the unstarred review requests. If not provided,
+                all starred review requests will be removed.
+        """
+        queryset = self.filter(user=user, reason=self.model.STARRED)
+
+        if review_request_ids is not None:
+            queryset = queryset.filter(review_request__in=review_request_ids)
+
+        queryset.delete()
+
+    def set_archived(
+        self,
+        user: User,
+        review_request: ReviewRequest,
+        archived: bool,
+    ) -> None:
+        """Set whether a review request is archived in a user's inbox.
+
+        Args:
+            user (django.contrib.auth.models.User):
+                The user owning the inbox.
+
+            review_request (reviewboard.reviews.models.review_request.
+                            ReviewRequest):
+                The review request that was archived, muted, or unarchived.
+
+            archived (bool):
+                Whether the review request is archived or muted.
+        """
+        (
+            self.filter(user=user, review_request=review_request)
+            .exclude(archived=archived)
+            .update(archived=archived)
+        )
+
+    def unarchive_all(
+        self,
+        review_request: Union[ReviewRequest, int],
+    ) -> None:
+        """Unarchive a review request in all inboxes.
+
+        This mirrors :py:meth:`ReviewRequestVisitManager.unarchive_all()
+        <reviewboard.accounts.managers.ReviewRequestVisitManager.
+        unarchive_all>`, which is called when there's new activity on a
+        review request. Users who muted the review request will continue to
+        have it hidden.
+
+        Args:
+            review_request (reviewboard.reviews.models.review_request.
+                            ReviewRequest or int):
+                The review request, or its ID, to unarchive.
+        """
+        from reviewboard.accounts.models import ReviewRequestVisit
+
+        (
+            self.filter(review_request=review_request,
+                        archived=True)
+            .exclude(Exists(
+                ReviewRequestVisit.objects
+                .filter(user=OuterRef('user'),
+                        review_request=OuterRef('review_request'),
+                        visibility=ReviewRequestVisit.MUTED)
+            ))
+            .update(archived=False)
+        )
+
+    def rebuild(self) -> int:
+        """Rebuild all inboxes.
+
+        Returns:
+            int:
+            The number of open review requests added to inboxes.
+        """
+        from reviewboard.reviews.models import ReviewRequest
+
+        pending = ReviewRequest.PENDING_REVIEW
+        self.exclude(review_request__status=pending).delete()
+
+        review_requests = ReviewRequest.objects.filter(status=pending)
+
+        for review_request in review_requests.iterator():
+            self.sync_review_request(review_request)
+
+        return review_requests.count()
+
+    def _apply_entries(
+        self,
+        existing: Set[Tuple[int, int, str]],
+        entries: Set[Tuple[int, int, str]],
+    ) -> None:
+        """Add and remove entries to match the expected set of entries.
+
+        Args:
+            existing (set of tuple):
+                The existing entries, as 3-tuples of user ID, review request
+                ID, and reason.
+
+            entries (set of tuple):
+                The expected entries, as 3-tuples of user ID, review request
+                ID, and reason.
+        """
+        from reviewboard.accounts.models import ReviewRequestVisit
+
+        removed = existing - entries
+        added = entries - existing
+
+        if removed:
+            # Delete in as few queries as possible, grouping entries by
+            # whichever of the user or review request has fewer values.
+            by_user = defaultdict(list)
+            by_review_request = defaultdict(list)
+
+            for user_id, review_request_id, reason in removed:
+                by_user[(user_id, reason)].append(review_request_id)
+                by_review_request[(review_request_id, reason)].append(user_id)
+
+            if len(by_user) <= len(by_review_request):
+                for (user_id, reason), ids in by_user.items():
+                    self.filter(user=user_id,
+                                reason=reason,
+                                review_request__in=ids).delete()
+            else:
+                for (review_request_id, reason), ids in \
+                        by_review_request.items():
+                    self.filter(review_request=review_request_id,
+                                reason=reason,
+                                user__in=ids).delete()
+
+        if added:
+            user_ids = {entry[0] for entry in added}
+            review_request_ids = {entry[1] for entry in added}
+
+            hidden = set(
+                ReviewRequestVisit.objects
+                .filter(user__in=user_ids,
+                        review_request__in=review_request_ids)
+                .exclude(visibility=ReviewRequestVisit.VISIBLE)
+                .values_list('user_id', 'review_request_id')
+            )
+
+            self.bulk_create(
+                [
+                    self.model(
+                        user_id=user_id,
+                        review_request_id=review_request_id,
+                        reason=reason,
+                        archived=(user_id, review_request_id) in hidden)
+                    for user_id, review_request_id, reason in added
+                ],
+                batch_size=1000,
+                ignore_conflicts=True)
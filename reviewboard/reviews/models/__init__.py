@@ -8,6 +8,10 @@ from reviewboard.reviews.models.group import Group
 from reviewboard.reviews.models.review import Review
 from reviewboard.reviews.models.review_request import ReviewRequest
 from reviewboard.reviews.models.review_request_draft import ReviewRequestDraft
+from reviewboard.reviews.models.review_request_inbox_entry import \
+    ReviewRequestInboxEntry
+from reviewboard.reviews.models.review_request_issue import \
+    ReviewRequestIssue
 from reviewboard.reviews.models.screenshot import Screenshot
 from reviewboard.reviews.models.screenshot_comment import ScreenshotComment
 from reviewboard.reviews.models.status_update import StatusUpdate
@@ -23,6 +27,8 @@ __all__ = [
     'Review',
     'ReviewRequest',
     'ReviewRequestDraft',
+    'ReviewRequestInboxEntry',
+    'ReviewRequestIssue',
     'Screenshot',
     'ScreenshotComment',
     'StatusUpdate',
@@ -283,6 +283,8 @@ class BaseComment(models.Model):
                 Keyword arguments passed to the method (unused).
         """
         from reviewboard.reviews.models.review_request import ReviewRequest
+        from reviewboard.reviews.models.review_request_issue import \
+            ReviewRequestIssue
 
         self.timestamp = timezone.now()
 
@@ -298,6 +300,11 @@ class BaseComment(models.Model):
                 review.timestamp = self.timestamp
                 review.save()
             else:
+                if (not self.is_reply() and
+                    self._loaded_issue_status != self.issue_status):
+                    ReviewRequestIssue.objects.update_for_comment(self,
+                                                                  review)
+
                 if (not self.is_reply() and
                     self.issue_opened and
                     self._loaded_issue_status != self.issue_status):
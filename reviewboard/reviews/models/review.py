@@ -24,6 +24,8 @@ from reviewboard.reviews.models.file_attachment_comment import \
 from reviewboard.reviews.models.general_comment import GeneralComment
 from reviewboard.reviews.models.review_request import (ReviewRequest,
                                                        fetch_issue_counts)
+from reviewboard.reviews.models.review_request_issue import \
+    ReviewRequestIssue
 from reviewboard.reviews.models.screenshot_comment import ScreenshotComment
 from reviewboard.reviews.signals import (reply_publishing, reply_published,
                                          review_publishing, review_published,
@@ -495,6 +497,7 @@ class Review(models.Model):
             reply_published.send(sender=self.__class__,
                                  user=user, reply=self, trivial=trivial)
         else:
+            ReviewRequestIssue.objects.add_for_review(self)
             issue_counts = fetch_issue_counts(self.review_request,
                                               Q(pk=self.pk))
 
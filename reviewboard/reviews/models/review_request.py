@@ -11,7 +11,6 @@ from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
-from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from djblets.cache.backend import cache_memoize, make_cache_key
@@ -34,6 +33,8 @@ from reviewboard.reviews.models.base_comment import BaseComment
 from reviewboard.reviews.models.base_review_request_details import \
     BaseReviewRequestDetails
 from reviewboard.reviews.models.group import Group
+from reviewboard.reviews.models.review_request_issue import \
+    ReviewRequestIssue
 from reviewboard.reviews.models.screenshot import Screenshot
 from reviewboard.reviews.signals import (review_request_closed,
                                          review_request_closing,
@@ -172,6 +173,13 @@ def fetch_issue_counts(review_request, extra_query=None):
 
     This queries all opened issues across all public comments on a
     review request and returns them.
+
+    Version Changed:
+        7.0:
+        Issue counts are now read from the issue index for the review
+        request (:py:class:`~reviewboard.reviews.models.review_request_issue.
+        ReviewRequestIssue`), rather than computed from every comment on
+        the review request.
     """
     issue_counts = {
         BaseComment.OPEN: 0,
@@ -181,50 +189,18 @@ def fetch_issue_counts(review_request, extra_query=None):
         BaseComment.VERIFYING_DROPPED: 0,
     }
 
-    q = Q(public=True) & Q(base_reply_to__isnull=True)
-
     if extra_query:
-        q = q & extra_query
-
-    issue_statuses = review_request.reviews.filter(q).values(
-        'comments__pk',
-        'comments__issue_opened',
-        'comments__issue_status',
-        'file_attachment_comments__pk',
-        'file_attachment_comments__issue_opened',
-        'file_attachment_comments__issue_status',
-        'general_comments__pk',
-        'general_comments__issue_opened',
-        'general_comments__issue_status',
-        'screenshot_comments__pk',
-        'screenshot_comments__issue_opened',
-        'screenshot_comments__issue_status')
-
-    if issue_statuses:
-        comment_fields = {
-            'comments': set(),
-            'file_attachment_comments': set(),
-            'general_comments': set(),
-            'screenshot_comments': set(),
-        }
-
-        for issue_fields in issue_statuses:
-            for key, comments in comment_fields.items():
-                issue_opened = issue_fields[key + '__issue_opened']
-                comment_pk = issue_fields[key + '__pk']
+        reviews = review_request.reviews.filter(extra_query)
+    else:
+        reviews = None
 
-                if issue_opened and comment_pk not in comments:
-                    comments.add(comment_pk)
-                    issue_status = issue_fields[key + '__issue_status']
+    issue_counts.update(ReviewRequestIssue.objects.get_issue_counts(
+        review_request,
+        reviews=reviews))
 
-                    if issue_status:
-                        issue_counts[issue_status] += 1
-
-        logger.debug('Calculated issue counts for review request ID %s '
-                     'across %s review(s): Resulting counts = %r; '
-                     'DB values = %r; Field IDs = %r',
-                     review_request.pk, len(issue_statuses), issue_counts,
-                     issue_statuses, comment_fields)
+    logger.debug('Calculated issue counts for review request ID %s: '
+                 'Resulting counts = %r',
+                 review_request.pk, issue_counts)
 
     return issue_counts
 
@@ -405,6 +381,16 @@ class ReviewRequest(BaseReviewRequestDetails):
         _('verifying issue count'),
         initializer=_initialize_issue_counts)
 
+    #: Whether the issues on the review request have been indexed.
+    #:
+    #: New review requests start out indexed. Review requests created
+    #: before the issue index existed are indexed the first time their
+    #: issues are counted.
+    #:
+    #: Version Added:
+    #:     7.0
+    issues_indexed = models.BooleanField(_('issues indexed'), default=True)
+
     screenshots_count = RelationCounterField(
         'screenshots',
         verbose_name=_('screenshots count'))
@@ -1590,6 +1576,12 @@ class ReviewRequest(BaseReviewRequestDetails):
         This is also careful to manage the outgoing counts for both old and
         new owners of a review request, if ownership has changed.
 
+        Version Changed:
+            7.0:
+            The outgoing counters for each owner are now updated together
+            in a single UPDATE, and the incoming counters for all reviewers
+            are updated in one UPDATE per table.
+
         Args:
             old_submitter (django.contrib.auth.models.User):
                 The old submitter of a review request. This is impacted by
@@ -1605,13 +1597,20 @@ class ReviewRequest(BaseReviewRequestDetails):
         local_site = self.local_site
         site_profile = self.submitter.get_site_profile(local_site)
 
+        # The changes to the owner's outgoing counters, which will be
+        # applied together once we know all of them.
+        outgoing_counts = {
+            'pending_outgoing_request_count': 0,
+            'total_outgoing_request_count': 0,
+        }
+
         if self.pk is None:
             # This is brand-new review request that hasn't yet been saved.
             # We won't have an existing review request to look up for the old
             # values (so we'll hard-code them), and we know the owner hasn't
             # changed. We can safely bump the outgoing review request count
             # for the owner.
-            site_profile.increment_total_outgoing_request_count()
+            outgoing_counts['total_outgoing_request_count'] += 1
             old_status = None
             old_public = False
         else:
@@ -1632,19 +1631,21 @@ class ReviewRequest(BaseReviewRequestDetails):
                 # change. The old user is no longer responsible for this
                 # review request and should never see it added to their count
                 # again.
-                site_profile.increment_total_outgoing_request_count()
+                outgoing_counts['total_outgoing_request_count'] += 1
 
                 if self.status == self.PENDING_REVIEW:
-                    site_profile.increment_pending_outgoing_request_count()
+                    outgoing_counts['pending_outgoing_request_count'] += 1
 
                 try:
                     old_profile = old_submitter.get_site_profile(
                         local_site,
                         create_if_missing=False)
-                    old_profile.decrement_total_outgoing_request_count()
 
-                    if old_status == self.PENDING_REVIEW:
-                        old_profile.decrement_pending_outgoing_request_count()
+                    CounterField.decrement_many(old_profile, {
+                        'pending_outgoing_request_count':
+                            int(old_status == self.PENDING_REVIEW),
+                        'total_outgoing_request_count': 1,
+                    })
                 except LocalSiteProfile.DoesNotExist:
                     # The old user didn't have a profile (they may no longer
                     # be on a Local Site, or the data may have been deleted).
@@ -1658,7 +1659,7 @@ class ReviewRequest(BaseReviewRequestDetails):
                 # The status of the review request has changed to Pending
                 # Review, and we know we didn't take care of the value as
                 # part of an ownership change. Increment the counter now.
-                site_profile.increment_pending_outgoing_request_count()
+                outgoing_counts['pending_outgoing_request_count'] += 1
 
             if self.public and self.id is not None:
                 # This was either the first publish, or it's been reopened.
@@ -1671,37 +1672,22 @@ class ReviewRequest(BaseReviewRequestDetails):
                 # Review (in other words, it's been closed), and we know we
                 # didn't take care of the value as part of an ownership
                 # change. Decrement the counter now.
-                site_profile.decrement_pending_outgoing_request_count()
+                outgoing_counts['pending_outgoing_request_count'] -= 1
 
             if old_public:
                 # We went from open to closed. Decrement the counters for
                 # reviewers, so it's not showing up in their dashboards.
                 self._decrement_reviewer_counts()
 
+        CounterField.increment_many(site_profile, outgoing_counts)
+
     def _increment_reviewer_counts(self):
         """Increment the counters for all reviewers.
 
         This will increment counters for all review groups and users that
         are marked as reviewers (directly or indirectly).
         """
-        from reviewboard.accounts.models import LocalSiteProfile
-
-        groups = list(self.target_groups.values_list('pk', flat=True))
-        people = list(self.target_people.values_list('pk', flat=True))
-
-        Group.incoming_request_count.increment(self.target_groups.all())
-        LocalSiteProfile.direct_incoming_request_count.increment(
-            LocalSiteProfile.objects.filter(user__in=people,
-                                            local_site=self.local_site))
-        LocalSiteProfile.total_incoming_request_count.increment(
-            LocalSiteProfile.objects.filter(
-                Q(local_site=self.local_site) &
-                Q(Q(user__review_groups__in=groups) |
-                  Q(user__in=people))))
-        LocalSiteProfile.starred_public_request_count.increment(
-            LocalSiteProfile.objects.filter(
-                profile__starred_review_requests=self,
-                local_site=self.local_site))
+        self._update_reviewer_counts(1)
 
     def _decrement_reviewer_counts(self):
         """Decrement the counters for all reviewers.
@@ -1709,25 +1695,41 @@ class ReviewRequest(BaseReviewRequestDetails):
         This will decrement counters for all review groups and users that
         are marked as reviewers (directly or indirectly).
         """
+        self._update_reviewer_counts(-1)
+
+    def _update_reviewer_counts(self, delta):
+        """Update the counters for all reviewers.
+
+        The counters for all review groups are updated in one UPDATE, and
+        the counters for all reviewers' profiles in another, no matter how
+        many members the review groups have. Review groups are always
+        updated before profiles, and the rows in each update are locked in
+        primary key order where supported.
+
+        This only prevents deadlocks between concurrent reviewer updates.
+        The owner's outgoing counters are updated separately by
+        :py:meth:`_update_counts`, outside of this order. That's only safe
+        as long as each update commits on its own, rather than in a
+        transaction held open by the caller.
+
+        Version Added:
+            7.0
+
+        Args:
+            delta (int):
+                The value to add to each counter.
+        """
         from reviewboard.accounts.models import LocalSiteProfile
 
         groups = list(self.target_groups.values_list('pk', flat=True))
         people = list(self.target_people.values_list('pk', flat=True))
 
-        Group.incoming_request_count.decrement(self.target_groups.all())
-        LocalSiteProfile.direct_incoming_request_count.decrement(
-            LocalSiteProfile.objects.filter(
-                user__in=people,
-                local_site=self.local_site))
-        LocalSiteProfile.total_incoming_request_count.decrement(
-            LocalSiteProfile.objects.filter(
-                Q(local_site=self.local_site) &
-                Q(Q(user__review_groups__in=groups) |
-                  Q(user__in=people))))
-        LocalSiteProfile.starred_public_request_count.decrement(
-            LocalSiteProfile.objects.filter(
-                profile__starred_review_requests=self,
-                local_site=self.local_site))
+        Group.objects.update_incoming_request_counts(groups, delta)
+        LocalSiteProfile.objects.update_incoming_request_counts(
+            review_request=self,
+            user_ids=people,
+            group_ids=groups,
+            delta=delta)
 
     def _calculate_approval(self):
         """Calculates the approval information for the review request."""
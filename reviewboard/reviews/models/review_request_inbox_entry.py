@@ -0,0 +1,94 @@
+"""Definitions for the ReviewRequestInboxEntry model."""
+
+from __future__ import annotations
+
+from typing import ClassVar
+
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from reviewboard.reviews.managers import ReviewRequestInboxEntryManager
+
+
+class ReviewRequestInboxEntry(models.Model):
+    """An entry in a user's dashboard inbox.
+
+    There is one entry for every reason an open review request is relevant
+    to a user. This is a denormalized copy of the review request's owner,
+    reviewers, review group memberships, and stars, which allows the
+    dashboard to list a user's review requests from a single indexed table,
+    rather than by checking the reviewers of every review request.
+
+    Entries are only maintained when :setting:`DASHBOARD_INBOX_ENABLED` is
+    set. They're kept up-to-date when review requests are created,
+    published, closed, and reopened, when review group memberships and
+    stars change, and when review requests are archived or muted.
+
+    Version Added:
+        7.0
+    """
+
+    #: The user owns the review request.
+    SUBMITTER = 'S'
+
+    #: The user is listed as a reviewer on the review request.
+    TARGET_PERSON = 'P'
+
+    #: The user is in a review group listed on the review request.
+    TARGET_GROUP = 'G'
+
+    #: The user has starred the review request.
+    STARRED = 'T'
+
+    REASONS = (
+        (SUBMITTER, _('Owner')),
+        (TARGET_PERSON, _('Reviewer')),
+        (TARGET_GROUP, _('Review group member')),
+        (STARRED, _('Starred')),
+    )
+
+    #: The user whose inbox contains the review request.
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='review_request_inbox_entries',
+        verbose_name=_('User'))
+
+    #: The review request in the inbox.
+    review_request = models.ForeignKey(
+        'reviews.ReviewRequest',
+        on_delete=models.CASCADE,
+        related_name='inbox_entries',
+        verbose_name=_('Review Request'))
+
+    #: Why the review request is in the user's inbox.
+    reason = models.CharField(_('Reason'),
+                              max_length=1,
+                              choices=REASONS)
+
+    #: Whether the user has archived or muted the review request.
+    archived = models.BooleanField(_('Archived'), default=False)
+
+    objects: ClassVar[ReviewRequestInboxEntryManager] = \
+        ReviewRequestInboxEntryManager()
+
+    def __str__(self) -> str:
+        """Return a string representation of the entry.
+
+        Returns:
+            str:
+            A string representation of the entry.
+        """
+        return 'Review request %s for user %s (%s)' % (
+            self.review_request_id,
+            self.user_id,
+            self.get_reason_display())
+
+    class Meta:
+        app_label = 'reviews'
+        db_table = 'reviews_reviewrequestinboxentry'
+        index_together = [('user', 'reason', 'archived')]
+        unique_together = [('user', 'review_request', 'reason')]
+        verbose_name = _('Review Request Inbox Entry')
+        verbose_name_plural = _('Review Request Inbox Entries')
@@ -0,0 +1,86 @@
+"""Definitions for the ReviewRequestIssue model."""
+
+from __future__ import annotations
+
+from typing import ClassVar
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from reviewboard.reviews.managers import ReviewRequestIssueManager
+from reviewboard.reviews.models.base_comment import BaseComment
+
+
+class ReviewRequestIssue(models.Model):
+    """An entry in the issue index for a review request.
+
+    There is one entry for every comment that has opened an issue in a
+    published review on a review request. This is a denormalized copy of
+    the issue state stored on the comments themselves, which allows issue
+    counts and issue summaries to be computed from a single indexed table,
+    rather than by scanning every comment on the review request.
+
+    Entries are kept up-to-date when reviews are published, when issue
+    statuses change, and when comments are deleted. Review requests with
+    issues opened before the index existed are indexed the first time their
+    issues are counted, and the :command:`reset-issue-counts` management
+    command rebuilds the index from the comments.
+
+    Version Added:
+        7.0
+    """
+
+    #: The review request containing the issue.
+    review_request = models.ForeignKey(
+        'reviews.ReviewRequest',
+        on_delete=models.CASCADE,
+        related_name='indexed_issues',
+        verbose_name=_('Review Request'))
+
+    #: The review containing the comment that opened the issue.
+    review = models.ForeignKey(
+        'reviews.Review',
+        on_delete=models.CASCADE,
+        related_name='indexed_issues',
+        verbose_name=_('Review'))
+
+    #: The type of the comment that opened the issue.
+    #:
+    #: This corresponds to :py:attr:`BaseComment.comment_type
+    #: <reviewboard.reviews.models.base_comment.BaseComment.comment_type>`.
+    comment_type = models.CharField(_('Comment Type'), max_length=16)
+
+    #: The ID of the comment that opened the issue.
+    comment_id = models.PositiveIntegerField(_('Comment ID'))
+
+    #: The current status of the issue.
+    issue_status = models.CharField(_('Issue Status'),
+                                    max_length=1,
+                                    choices=BaseComment.ISSUE_STATUSES)
+
+    #: The timestamp of the last update to the comment.
+    timestamp = models.DateTimeField(_('Timestamp'), default=timezone.now)
+
+    objects: ClassVar[ReviewRequestIssueManager] = \
+        ReviewRequestIssueManager()
+
+    def __str__(self) -> str:
+        """Return a string representation of the issue.
+
+        Returns:
+            str:
+            A string representation of the issue.
+        """
+        return '%s comment %s (%s)' % (
+            self.comment_type,
+            self.comment_id,
+            BaseComment.issue_status_to_string(self.issue_status))
+
+    class Meta:
+        app_label = 'reviews'
+        db_table = 'reviews_reviewrequestissue'
+        index_together = [('review_request', 'issue_status')]
+        unique_together = [('comment_type', 'comment_id')]
+        verbose_name = _('Review Request Issue')
+        verbose_name_plural = _('Review Request Issues')
@@ -18,6 +18,8 @@ from reviewboard.reviews.managers import StatusUpdateManager
 from reviewboard.reviews.models.base_comment import BaseComment
 from reviewboard.reviews.models.review import Review
 from reviewboard.reviews.models.review_request import ReviewRequest
+from reviewboard.reviews.models.review_request_issue import \
+    ReviewRequestIssue
 from reviewboard.reviews.signals import status_update_request_run
 from reviewboard.site.models import LocalSite
 
@@ -339,6 +341,12 @@ class StatusUpdate(models.Model):
                 review_updated = True
 
         if review_updated:
+            ReviewRequestIssue.objects.filter(
+                review=self.review,
+                issue_status=BaseComment.OPEN,
+            ).update(issue_status=BaseComment.DROPPED,
+                     timestamp=now)
+
             self.review_request.last_review_activity_timestamp = now
             self.review_request.save(
                 update_fields=['last_review_activity_timestamp'])
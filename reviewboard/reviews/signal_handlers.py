@@ -6,12 +6,38 @@ Version Added:
 
 from __future__ import annotations
 
-from typing import Type
+from typing import Type, TYPE_CHECKING
 
-from django.db.models.signals import pre_delete
+from django.contrib.auth.models import User
+from django.core.signals import setting_changed
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
 
-from reviewboard.reviews.models import ReviewRequestDraft
+from reviewboard.accounts.models import Profile, ReviewRequestVisit
+
+from reviewboard.diffviewer.chunk_warmup import (chunk_warmup_queue,
+                                                 is_chunk_warmup_enabled)
+from reviewboard.reviews.models import (BaseComment,
+                                        Comment,
+                                        FileAttachmentComment,
+                                        GeneralComment,
+                                        Group,
+                                        Review,
+                                        ReviewRequest,
+                                        ReviewRequestDraft,
+                                        ReviewRequestInboxEntry,
+                                        ReviewRequestIssue,
+                                        ScreenshotComment)
 from reviewboard.reviews.models.review_request import FileAttachmentState
+from reviewboard.reviews.signals import (reply_published,
+                                         review_published,
+                                         review_request_closed,
+                                         review_request_diffset_uploaded,
+                                         review_request_published,
+                                         review_request_reopened)
+
+if TYPE_CHECKING:
+    from reviewboard.diffviewer.models import DiffSet
 
 
 def _on_review_request_draft_deleted(
@@ -60,6 +86,542 @@ def _on_review_request_draft_deleted(
         del review_request._file_attachments_data
 
 
+def _on_review_request_diffset_uploaded(
+    sender: Type,
+    diffset: DiffSet,
+    **kwargs,
+) -> None:
+    """Queue warm-up of diff chunks for a newly-uploaded diffset.
+
+    This only takes effect if chunk warm-up is enabled for the site.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The sender of the signal.
+
+        diffset (reviewboard.diffviewer.models.DiffSet):
+            The diffset that was uploaded.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    if is_chunk_warmup_enabled():
+        chunk_warmup_queue.enqueue(diffset)
+
+
+def _on_review_request_published(
+    sender: Type[ReviewRequest],
+    review_request: ReviewRequest,
+    **kwargs,
+) -> None:
+    """Queue warm-up of diff chunks for a published review request.
+
+    This will queue the latest diffset, if not already warmed up. This only
+    takes effect if chunk warm-up is enabled for the site.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The sender of the signal.
+
+        review_request (reviewboard.reviews.models.ReviewRequest):
+            The review request that was published.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    if is_chunk_warmup_enabled():
+        diffset = review_request.get_latest_diffset()
+
+        if diffset is not None:
+            chunk_warmup_queue.enqueue(diffset)
+
+
+def _on_comment_deleted(
+    sender: Type[BaseComment],
+    instance: BaseComment,
+    **kwargs,
+) -> None:
+    """Remove a deleted comment's issue from the issue index.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The sender of the signal.
+
+        instance (reviewboard.reviews.models.base_comment.BaseComment):
+            The comment that was deleted.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    if instance.issue_opened:
+        ReviewRequestIssue.objects.remove_for_comment(instance)
+
+
+def _on_review_comments_changed(
+    sender: Type,
+    instance: Review,
+    action: str,
+    reverse: bool,
+    **kwargs,
+) -> None:
+    """Index issues in comments added to a published review.
+
+    Comments are normally added to draft reviews, which are indexed when
+    published. This handles comments added after the review was published.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The intermediary model for the review's comments.
+
+        instance (reviewboard.reviews.models.review.Review):
+            The review the comments were added to.
+
+        action (str):
+            The type of change made to the relation.
+
+        reverse (bool):
+            Whether the relation was changed from the comment's side.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    if (action == 'post_add' and
+        not reverse and
+        instance.public and
+        not instance.is_reply()):
+        ReviewRequestIssue.objects.add_for_review(instance)
+
+
+def _on_review_request_created(
+    sender: Type[ReviewRequest],
+    instance: ReviewRequest,
+    created: bool,
+    **kwargs,
+) -> None:
+    """Add a new review request to its owner's dashboard inbox.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The sender of the signal.
+
+        instance (reviewboard.reviews.models.ReviewRequest):
+            The review request that was saved.
+
+        created (bool):
+            Whether the review request was newly-created.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    if created:
+        ReviewRequestInboxEntry.objects.sync_review_request(instance)
+
+
+def _on_review_request_changed(
+    sender: Type[ReviewRequest],
+    review_request: ReviewRequest,
+    **kwargs,
+) -> None:
+    """Update the dashboard inboxes for a review request.
+
+    This is called when a review request is published, closed, or reopened,
+    any of which may change which inboxes it belongs in.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The sender of the signal.
+
+        review_request (reviewboard.reviews.models.ReviewRequest):
+            The review request that changed.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    ReviewRequestInboxEntry.objects.sync_review_request(review_request)
+
+
+def _on_review_request_targets_changed(
+    sender: Type,
+    instance: ReviewRequest | Group | User,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs,
+) -> None:
+    """Update dashboard inboxes when a review request's reviewers change.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The intermediary model for the review request's reviewers.
+
+        instance (reviewboard.reviews.models.ReviewRequest or
+                  reviewboard.reviews.models.Group or
+                  django.contrib.auth.models.User):
+            The review request, or the review group or user, whose
+            relations changed.
+
+        action (str):
+            The type of change made to the relation.
+
+        reverse (bool):
+            Whether the relation was changed from the reviewer's side.
+
+        pk_set (set of int):
+            The IDs of the reviewers or review requests added or removed.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    inbox_entries = ReviewRequestInboxEntry.objects
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        inbox_entries.sync_review_request(instance)
+    elif action == 'post_clear':
+        # The review requests are no longer known, so rebuild the inboxes
+        # from the reviewer's side.
+        if isinstance(instance, User):
+            inbox_entries.sync_user(instance)
+        else:
+            for user in instance.users.all():
+                inbox_entries.sync_user(user)
+    else:
+        for review_request in ReviewRequest.objects.filter(pk__in=pk_set):
+            inbox_entries.sync_review_request(review_request)
+
+
+def _on_group_users_changed(
+    sender: Type,
+    instance: Group | User,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs,
+) -> None:
+    """Update dashboard inboxes when review group memberships change.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The intermediary model for the group's users.
+
+        instance (reviewboard.reviews.models.Group or
+                  django.contrib.auth.models.User):
+            The group or user whose memberships changed.
+
+        action (str):
+            The type of change made to the relation.
+
+        reverse (bool):
+            Whether the relation was changed from the user's side.
+
+        pk_set (set of int):
+            The IDs of the users or groups added or removed.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    inbox_entries = ReviewRequestInboxEntry.objects
+
+    if reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            inbox_entries.sync_user(instance)
+    elif action == 'pre_clear':
+        # The members won't be known once they're removed, so store them
+        # for post_clear.
+        instance._inbox_user_ids = list(
+            instance.users.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if action == 'post_clear':
+            pk_set = getattr(instance, '_inbox_user_ids', [])
+
+        for user in User.objects.filter(pk__in=pk_set):
+            inbox_entries.sync_user(user)
+
+
+def _on_group_deleting(
+    sender: Type[Group],
+    instance: Group,
+    **kwargs,
+) -> None:
+    """Store the members of a review group being deleted.
+
+    This is used to update their dashboard inboxes once the group has been
+    deleted.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The sender of the signal.
+
+        instance (reviewboard.reviews.models.Group):
+            The review group being deleted.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    instance._inbox_user_ids = list(
+        instance.users.values_list('pk', flat=True))
+
+
+def _on_group_deleted(
+    sender: Type[Group],
+    instance: Group,
+    **kwargs,
+) -> None:
+    """Update dashboard inboxes for the members of a deleted review group.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The sender of the signal.
+
+        instance (reviewboard.reviews.models.Group):
+            The review group that was deleted.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    user_ids = getattr(instance, '_inbox_user_ids', None)
+
+    if user_ids:
+        for user in User.objects.filter(pk__in=user_ids):
+            ReviewRequestInboxEntry.objects.sync_user(user)
+
+
+def _on_starred_review_requests_changed(
+    sender: Type,
+    instance: Profile | ReviewRequest,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs,
+) -> None:
+    """Update dashboard inboxes when review requests are starred.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The intermediary model for the starred review requests.
+
+        instance (reviewboard.accounts.models.Profile or
+                  reviewboard.reviews.models.ReviewRequest):
+            The profile or review request whose stars changed.
+
+        action (str):
+            The type of change made to the relation.
+
+        reverse (bool):
+            Whether the relation was changed from the review request's side.
+
+        pk_set (set of int):
+            The IDs of the review requests or profiles added or removed.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    inbox_entries = ReviewRequestInboxEntry.objects
+
+    if reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            inbox_entries.sync_review_request(instance)
+    elif action == 'post_add':
+        inbox_entries.add_starred(instance.user, pk_set)
+    elif action == 'post_remove':
+        inbox_entries.remove_starred(instance.user, pk_set)
+    elif action == 'post_clear':
+        inbox_entries.remove_starred(instance.user)
+
+
+def _on_review_request_visit_saved(
+    sender: Type[ReviewRequestVisit],
+    instance: ReviewRequestVisit,
+    created: bool,
+    update_fields: set[str] | None,
+    **kwargs,
+) -> None:
+    """Update a dashboard inbox when a review request is archived or muted.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The sender of the signal.
+
+        instance (reviewboard.accounts.models.ReviewRequestVisit):
+            The visit that was saved.
+
+        created (bool):
+            Whether the visit was newly-created.
+
+        update_fields (set of str):
+            The fields that were saved, if limited.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    archived = (instance.visibility != ReviewRequestVisit.VISIBLE)
+
+    if ((update_fields is None or 'visibility' in update_fields) and
+        (archived or not created)):
+        ReviewRequestInboxEntry.objects.set_archived(
+            user=instance.user_id,
+            review_request=instance.review_request_id,
+            archived=archived)
+
+
+def _on_review_request_activity(
+    sender: Type,
+    review_request: ReviewRequest | None = None,
+    review: Review | None = None,
+    reply: Review | None = None,
+    **kwargs,
+) -> None:
+    """Unarchive a review request in dashboard inboxes after new activity.
+
+    This is called when a review request, review, or reply is published.
+    These unarchive the review request for all users (see
+    :py:meth:`ReviewRequestVisitManager.unarchive_all()
+    <reviewboard.accounts.managers.ReviewRequestVisitManager.
+    unarchive_all>`) without saving each visit, so the inbox entries must
+    be updated separately.
+
+    Version Added:
+        7.0
+
+    Args:
+        sender (type, unused):
+            The sender of the signal.
+
+        review_request (reviewboard.reviews.models.ReviewRequest, optional):
+            The review request that was published.
+
+        review (reviewboard.reviews.models.Review, optional):
+            The review that was published.
+
+        reply (reviewboard.reviews.models.Review, optional):
+            The reply that was published.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    if review_request is not None:
+        review_request_id = review_request.pk
+    elif review is not None:
+        review_request_id = review.review_request_id
+    else:
+        assert reply is not None
+        review_request_id = reply.review_request_id
+
+    ReviewRequestInboxEntry.objects.unarchive_all(review_request_id)
+
+
+def _on_setting_changed(
+    setting: str,
+    value: object,
+    **kwargs,
+) -> None:
+    """Connect or disconnect the dashboard inbox signal handlers.
+
+    This allows :setting:`DASHBOARD_INBOX_ENABLED` to be toggled by unit
+    tests.
+
+    Version Added:
+        7.0
+
+    Args:
+        setting (str):
+            The name of the setting that changed.
+
+        value (object):
+            The new value of the setting.
+
+        **kwargs (dict, unused):
+            Unused additional keyword arguments.
+    """
+    if setting == 'DASHBOARD_INBOX_ENABLED':
+        _connect_inbox_signal_handlers(bool(value))
+
+
+def _connect_inbox_signal_handlers(
+    enabled: bool,
+) -> None:
+    """Connect or disconnect the dashboard inbox signal handlers.
+
+    The handlers are only connected when the dashboard inbox is enabled.
+    Django can't skip querying for existing relations when adding to a
+    many-to-many relation that has listeners, so this avoids those extra
+    queries when the inbox is disabled.
+
+    Version Added:
+        7.0
+
+    Args:
+        enabled (bool):
+            Whether the dashboard inbox is enabled.
+    """
+    handlers = [
+        (post_save, _on_review_request_created, ReviewRequest),
+        (review_request_published, _on_review_request_changed,
+         ReviewRequest),
+        (review_request_closed, _on_review_request_changed, ReviewRequest),
+        (review_request_reopened, _on_review_request_changed,
+         ReviewRequest),
+        (m2m_changed, _on_review_request_targets_changed,
+         ReviewRequest.target_people.through),
+        (m2m_changed, _on_review_request_targets_changed,
+         ReviewRequest.target_groups.through),
+        (m2m_changed, _on_group_users_changed, Group.users.through),
+        (pre_delete, _on_group_deleting, Group),
+        (post_delete, _on_group_deleted, Group),
+        (m2m_changed, _on_starred_review_requests_changed,
+         Profile.starred_review_requests.through),
+        (post_save, _on_review_request_visit_saved, ReviewRequestVisit),
+        (review_request_published, _on_review_request_activity,
+         ReviewRequest),
+        (review_published, _on_review_request_activity, Review),
+        (reply_published, _on_review_request_activity, Review),
+    ]
+
+    for signal, handler, sender in handlers:
+        if enabled:
+            signal.connect(handler, sender=sender)
+        else:
+            signal.disconnect(handler, sender=sender)
+
+
 def connect_signal_handlers() -> None:
     """Connect review and review request related signal handlers.
 
@@ -68,3 +630,25 @@ def connect_signal_handlers() -> None:
     """
     pre_delete.connect(_on_review_request_draft_deleted,
                        sender=ReviewRequestDraft)
+    review_request_diffset_uploaded.connect(
+        _on_review_request_diffset_uploaded)
+    review_request_published.connect(_on_review_request_published,
+                                     sender=ReviewRequest)
+
+    for comment_model in (Comment,
+                          FileAttachmentComment,
+                          GeneralComment,
+                          ScreenshotComment):
+        post_delete.connect(_on_comment_deleted,
+                            sender=comment_model)
+
+    for through in (Review.comments.through,
+                    Review.file_attachment_comments.through,
+                    Review.general_comments.through,
+                    Review.screenshot_comments.through):
+        m2m_changed.connect(_on_review_comments_changed,
+                            sender=through)
+
+    setting_changed.connect(_on_setting_changed)
+    _connect_inbox_signal_handlers(
+        ReviewRequestInboxEntry.objects.is_enabled())
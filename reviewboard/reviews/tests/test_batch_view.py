@@ -430,13 +430,13 @@ class BatchOperationViewTests(kgb.SpyAgency, EmailTestHelper, TestCase):
 
         rr1, rr2, rr3 = self.create_many_review_requests(3, public=True)
 
-        # 39 queries:
+        # 37 queries:
         #
         #   1-7. Review request list queries
         #     8. Fetch user
         #     9. Fetch user
-        # 10-25. Close first review request
-        # 26-39. Close second review request
+        # 10-23. Close first review request
+        # 24-37. Close second review request
         queries = (  # noqa
             self._get_review_request_list_queries(user, [rr1, rr2]) +
             [
@@ -460,8 +460,8 @@ class BatchOperationViewTests(kgb.SpyAgency, EmailTestHelper, TestCase):
 
         # We can't currently use this because QuerySet.update() is adding a
         # subquery that we can't test against.
-        # with self.assertQueries(queries, num_statements=39):
-        with self.assertNumQueries(39):
+        # with self.assertQueries(queries, num_statements=37):
+        with self.assertNumQueries(37):
             response = self.client.post(self.url, data={
                 'batch': json.dumps({
                     'op': 'close',
@@ -579,13 +579,13 @@ class BatchOperationViewTests(kgb.SpyAgency, EmailTestHelper, TestCase):
 
         rr1, rr2, rr3 = self.create_many_review_requests(3, public=True)
 
-        # 39 queries:
+        # 37 queries:
         #
         #   1-7. Review request list queries
         #     8. Fetch user
         #     9. Fetch user
-        # 10-25. Close first review request
-        # 26-39. Close second review request
+        # 10-23. Close first review request
+        # 24-37. Close second review request
         queries = (  # noqa
             self._get_review_request_list_queries(user, [rr1, rr2]) +
             [
@@ -609,8 +609,8 @@ class BatchOperationViewTests(kgb.SpyAgency, EmailTestHelper, TestCase):
 
         # We can't currently use this because QuerySet.update() is adding a
         # subquery that we can't test against.
-        # with self.assertQueries(queries, num_statements=39):
-        with self.assertNumQueries(39):
+        # with self.assertQueries(queries, num_statements=37):
+        with self.assertNumQueries(37):
             response = self.client.post(self.url, data={
                 'batch': json.dumps({
                     'op': 'discard',
@@ -1292,7 +1292,7 @@ class BatchOperationViewTests(kgb.SpyAgency, EmailTestHelper, TestCase):
             list:
             A list of query info appropriate for assertQueries.
         """
-        # 15 queries
+        # 14 queries
         #
         #  1. Fetch review request draft
         #  2. Create ChangeDescription
@@ -1304,11 +1304,10 @@ class BatchOperationViewTests(kgb.SpyAgency, EmailTestHelper, TestCase):
         #  8. Refresh local site profile
         #  9. Fetch target groups
         # 10. Fetch target users
-        # 11. Update group counters
-        # 12. Update LocalSiteProfile counters
-        # 13. Fetch ReviewRequestVisit
-        # 14. Update ReviewRequestVisit
-        # 15. Fetch WebHook targets
+        # 11. Update LocalSiteProfile counters
+        # 12. Fetch ReviewRequestVisit
+        # 13. Update ReviewRequestVisit
+        # 14. Fetch WebHook targets
         return [
             {
                 'model': ReviewRequestDraft,
@@ -1366,21 +1365,10 @@ class BatchOperationViewTests(kgb.SpyAgency, EmailTestHelper, TestCase):
                 'where': Q(directed_review_requests__id=review_request.pk),
                 'values_select': ('pk',),
             },
-            {
-                'model': Group,
-                'num_joins': 1,
-                'tables': {
-                    'reviews_reviewrequest_target_groups',
-                    'reviews_group',
-                },
-                'type': 'UPDATE',
-            },
             {
                 'model': LocalSiteProfile,
                 'type': 'UPDATE',
-                'num_joins': 2,
                 'tables': {
-                    'accounts_profile',
                     'accounts_localsiteprofile',
                     'accounts_profile_starred_review_requests',
                 },
@@ -1,4 +1,7 @@
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from kgb import SpyAgency
 
 from reviewboard.accounts.models import LocalSiteProfile
@@ -493,6 +496,77 @@ class ReviewRequestCounterTests(SpyAgency, TestCase):
                              starred_public=1,
                              group_incoming=1)
 
+    def test_recalculate_counters(self):
+        """Testing counters when recalculated in bulk"""
+        # The review request was already created
+        draft = ReviewRequestDraft.create(self.review_request)
+        draft.target_groups.add(self.group)
+        draft.target_people.add(self.user)
+        self.review_request.publish(self.user)
+
+        self.create_review_request(submitter=self.user,
+                                   target_people=[self.user],
+                                   publish=True,
+                                   status=ReviewRequest.SUBMITTED)
+
+        LocalSiteProfile.objects.update(
+            direct_incoming_request_count=10,
+            total_incoming_request_count=10,
+            pending_outgoing_request_count=10,
+            total_outgoing_request_count=10,
+            starred_public_request_count=10)
+        Group.objects.update(incoming_request_count=10)
+
+        call_command('fixreviewcounts', recalculate=True)
+
+        self._check_counters(total_outgoing=2,
+                             pending_outgoing=1,
+                             total_incoming=1,
+                             direct_incoming=1,
+                             starred_public=1,
+                             group_incoming=1)
+
+    def test_publish_with_group_members(self):
+        """Testing counters when publishing to a review group updates all
+        members at once
+        """
+        users = [
+            self.create_user(username='member%s' % i)
+            for i in range(5)
+        ]
+        self.group.users.add(*users)
+
+        site_profiles = [
+            user.get_site_profile(local_site=None)
+            for user in users
+        ]
+
+        draft = ReviewRequestDraft.create(self.review_request)
+        draft.target_groups.add(self.group)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.review_request.publish(self.user)
+
+        self.assertEqual(
+            len([
+                query
+                for query in ctx.captured_queries
+                if query['sql'].startswith(
+                    'UPDATE "accounts_localsiteprofile"')
+            ]),
+            1)
+
+        self._check_counters(total_outgoing=1,
+                             pending_outgoing=1,
+                             total_incoming=1,
+                             starred_public=1,
+                             group_incoming=1)
+
+        for site_profile in site_profiles:
+            site_profile.refresh_from_db()
+            self._check_counters_on_profile(site_profile,
+                                            total_incoming=1)
+
     def test_populate_counters_after_change(self):
         """Testing counter inc/dec on uninitialized counter fields"""
         # The review request was already created
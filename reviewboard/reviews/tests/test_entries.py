@@ -3,8 +3,9 @@
 from datetime import datetime, timedelta, timezone
 
 from django.contrib.auth.models import AnonymousUser, User
-from django.template import RequestContext
+from django.template import RequestContext, loader
 from django.test.client import RequestFactory
+from django.utils import translation
 from django.utils.timezone import now
 from djblets.testing.decorators import add_fixtures
 from kgb import SpyAgency
@@ -150,6 +151,43 @@ class BaseReviewRequestPageEntryTests(SpyAgency, TestCase):
             'class="review-request-page-entry new-review-request-page-entry"',
             html)
 
+    def test_render_to_string_with_cache_rendered_html(self):
+        """Testing BaseReviewRequestPageEntry.render_to_string with
+        cache_rendered_html=True
+        """
+        def _render(entry_id='test'):
+            entry = BaseReviewRequestPageEntry(
+                data=self.data,
+                entry_id=entry_id,
+                added_timestamp=datetime(2017, 9, 7, 17, 0, 0,
+                                         tzinfo=timezone.utc))
+            entry.template_name = 'reviews/entries/base.html'
+            entry.cache_rendered_html = True
+
+            return entry.render_to_string(
+                self.request,
+                RequestContext(self.request, {
+                    'last_visited': now(),
+                }))
+
+        self.spy_on(loader.render_to_string)
+
+        html = _render()
+        self.assertNotEqual(html, '')
+        self.assertSpyCallCount(loader.render_to_string, 1)
+
+        self.assertEqual(_render(), html)
+        self.assertSpyCallCount(loader.render_to_string, 1)
+
+        # Other entries and locales should be rendered separately.
+        self.assertNotEqual(_render(entry_id='test2'), html)
+        self.assertSpyCallCount(loader.render_to_string, 2)
+
+        with translation.override('de'):
+            _render()
+
+        self.assertSpyCallCount(loader.render_to_string, 3)
+
     def test_render_to_string_with_no_template(self):
         """Testing BaseReviewRequestPageEntry.render_to_string with
         template_name=None
@@ -3,6 +3,7 @@
 from datetime import timedelta
 
 from django.contrib.auth.models import User
+from django.template import loader
 from django.test.html import parse_html
 from djblets.extensions.hooks import TemplateHook
 from djblets.extensions.models import RegisteredExtension
@@ -379,6 +380,81 @@ class ReviewRequestDetailViewTests(SpyAgency, TestCase):
         # Make sure they're not equal
         self.assertNotEqual(etag1, etag2)
 
+    def test_get_with_cached_entries(self):
+        """Testing ReviewRequestDetailView.get re-renders only changed
+        entries
+        """
+        self.client.login(username='doc', password='doc')
+
+        review_request = self.create_review_request(publish=True)
+
+        review1 = self.create_review(review_request, publish=True)
+        comment = self.create_general_comment(review1, issue_opened=True)
+        review2 = self.create_review(review_request, publish=True)
+
+        self.spy_on(loader.render_to_string)
+
+        response = self.client.get(review_request.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._get_rendered_review_ids(), [review1.pk,
+                                                           review2.pk])
+        html = response.content
+
+        # Loading the page again should use the cached entries.
+        loader.render_to_string.reset_calls()
+
+        response = self.client.get(review_request.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._get_rendered_review_ids(), [])
+        self.assertEqual(response.content, html)
+
+        # Only the entry with the changed issue should be rendered again.
+        comment.issue_status = GeneralComment.RESOLVED
+        comment.save()
+        loader.render_to_string.reset_calls()
+
+        response = self.client.get(review_request.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._get_rendered_review_ids(), [review1.pk])
+
+        # Other users should get their own rendered entries.
+        self.client.login(username='dopey', password='dopey')
+        loader.render_to_string.reset_calls()
+
+        response = self.client.get(review_request.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._get_rendered_review_ids(), [review1.pk,
+                                                           review2.pk])
+
+    def test_get_with_max_entries(self):
+        """Testing ReviewRequestDetailView.get with
+        settings.REVIEW_REQUEST_PAGE_MAX_ENTRIES
+        """
+        review_request = self.create_review_request(publish=True)
+
+        review1 = self.create_review(review_request, publish=True)
+        comment = self.create_general_comment(review1, issue_opened=True)
+        review2 = self.create_review(review_request, publish=True)
+
+        with self.settings(REVIEW_REQUEST_PAGE_MAX_ENTRIES=1):
+            response = self.client.get(review_request.get_absolute_url())
+
+        self.assertEqual(response.status_code, 200)
+
+        entries = response.context['entries']
+        self.assertEqual(len(entries['main']), 1)
+        self.assertEqual(entries['main'][0].review, review2)
+
+        # Issues on older entries should still be shown.
+        self.assertEqual(response.context['issues'], [comment])
+        self.assertTrue(response.context['has_older_entries'])
+        self.assertEqual(response.context['older_entries_timestamp'],
+                         review2.timestamp)
+        self.assertEqual(response.context['older_entries_before'],
+                         '%s,review:%s' % (review2.timestamp.isoformat(),
+                                           review2.pk))
+        self.assertIn(b'id="show-older-entries"', response.content)
+
     def test_review_request_box_template_hooks(self):
         """Testing ReviewRequestDetailView template hooks for the review
         request box
@@ -460,3 +536,16 @@ class ReviewRequestDetailViewTests(SpyAgency, TestCase):
             '</div>[after-review-request-extra-panes here]\n'
             '</div>',
             parsed_html)
+
+    def _get_rendered_review_ids(self):
+        """Return the IDs of reviews rendered in review entries.
+
+        Returns:
+            list of int:
+            The IDs of the reviews.
+        """
+        return [
+            call.kwargs['context']['entry'].review.pk
+            for call in loader.render_to_string.calls
+            if call.args[0] == 'reviews/entries/review.html'
+        ]
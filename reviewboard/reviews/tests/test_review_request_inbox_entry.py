@@ -0,0 +1,287 @@
+"""Unit tests for reviewboard.reviews.models.ReviewRequestInboxEntry."""
+
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from reviewboard.accounts.models import ReviewRequestVisit
+from reviewboard.reviews.models import ReviewRequest, ReviewRequestInboxEntry
+from reviewboard.testing import TestCase
+
+
+@override_settings(DASHBOARD_INBOX_ENABLED=True)
+class ReviewRequestInboxEntryTests(TestCase):
+    """Unit tests for maintaining the dashboard inbox."""
+
+    fixtures = ['test_users']
+
+    def setUp(self):
+        super().setUp()
+
+        self.user = User.objects.get(username='grumpy')
+        self.group = self.create_review_group(name='group1')
+        self.group.users.add(User.objects.get(username='dopey'))
+
+    def test_publish(self):
+        """Testing ReviewRequestInboxEntry entries added when publishing a
+        review request
+        """
+        review_request = self.create_review_request(
+            target_people=[self.user],
+            target_groups=[self.group],
+            publish=True)
+
+        self.assertEqual(
+            self._get_entries(),
+            {
+                ('doc', ReviewRequestInboxEntry.SUBMITTER),
+                ('dopey', ReviewRequestInboxEntry.TARGET_GROUP),
+                ('grumpy', ReviewRequestInboxEntry.TARGET_PERSON),
+            })
+
+        draft = self.create_review_request_draft(review_request)
+        draft.target_people.clear()
+        draft.publish()
+
+        self.assertEqual(
+            self._get_entries(),
+            {
+                ('doc', ReviewRequestInboxEntry.SUBMITTER),
+                ('dopey', ReviewRequestInboxEntry.TARGET_GROUP),
+            })
+
+    def test_close_and_reopen(self):
+        """Testing ReviewRequestInboxEntry entries removed when closing a
+        review request and added when reopening it
+        """
+        review_request = self.create_review_request(
+            target_people=[self.user],
+            publish=True)
+
+        review_request.close(ReviewRequest.SUBMITTED)
+        self.assertEqual(self._get_entries(), set())
+
+        review_request.reopen()
+        self.assertEqual(
+            self._get_entries(),
+            {
+                ('doc', ReviewRequestInboxEntry.SUBMITTER),
+                ('grumpy', ReviewRequestInboxEntry.TARGET_PERSON),
+            })
+
+    def test_group_membership(self):
+        """Testing ReviewRequestInboxEntry entries updated when review group
+        memberships change
+        """
+        self.create_review_request(target_groups=[self.group],
+                                   publish=True)
+
+        self.group.users.add(self.user)
+        self.assertIn(('grumpy', ReviewRequestInboxEntry.TARGET_GROUP),
+                      self._get_entries())
+
+        self.user.review_groups.remove(self.group)
+        self.assertNotIn(('grumpy', ReviewRequestInboxEntry.TARGET_GROUP),
+                         self._get_entries())
+
+        self.group.users.clear()
+        self.assertEqual(self._get_entries(),
+                         {('doc', ReviewRequestInboxEntry.SUBMITTER)})
+
+    def test_group_delete(self):
+        """Testing ReviewRequestInboxEntry entries removed when deleting a
+        review group
+        """
+        self.create_review_request(target_groups=[self.group],
+                                   publish=True)
+
+        self.group.delete()
+
+        self.assertEqual(self._get_entries(),
+                         {('doc', ReviewRequestInboxEntry.SUBMITTER)})
+
+    def test_star(self):
+        """Testing ReviewRequestInboxEntry entries updated when starring
+        review requests
+        """
+        review_request = self.create_review_request(publish=True)
+        profile = self.user.get_profile()
+
+        profile.star_review_request(review_request)
+        self.assertIn(('grumpy', ReviewRequestInboxEntry.STARRED),
+                      self._get_entries())
+
+        profile.unstar_review_request(review_request)
+        self.assertNotIn(('grumpy', ReviewRequestInboxEntry.STARRED),
+                         self._get_entries())
+
+    def test_archive(self):
+        """Testing ReviewRequestInboxEntry entries updated when archiving
+        review requests
+        """
+        review_request = self.create_review_request(
+            target_people=[self.user],
+            publish=True)
+
+        visit = ReviewRequestVisit.objects.create(
+            user=self.user,
+            review_request=review_request,
+            visibility=ReviewRequestVisit.ARCHIVED)
+
+        entry = ReviewRequestInboxEntry.objects.get(user=self.user)
+        self.assertTrue(entry.archived)
+
+        visit.visibility = ReviewRequestVisit.VISIBLE
+        visit.save(update_fields=('visibility',))
+
+        entry = ReviewRequestInboxEntry.objects.get(user=self.user)
+        self.assertFalse(entry.archived)
+
+    def test_unarchive_on_review_published(self):
+        """Testing ReviewRequestInboxEntry entries unarchived when a review
+        is published
+        """
+        review_request = self.create_review_request(
+            target_people=[self.user],
+            publish=True)
+
+        ReviewRequestVisit.objects.update_visibility(
+            review_request, self.user, ReviewRequestVisit.ARCHIVED)
+
+        self.assertEqual(
+            list(ReviewRequest.objects.to_user(self.user,
+                                               include_archived=False)),
+            [])
+
+        self.create_review(review_request,
+                           user=User.objects.get(username='dopey'),
+                           publish=True)
+
+        self.assertEqual(
+            list(ReviewRequest.objects.to_user(self.user,
+                                               include_archived=False)),
+            [review_request])
+
+    def test_unarchive_on_reply_published_with_muted(self):
+        """Testing ReviewRequestInboxEntry entries stay hidden for muted
+        review requests when a reply is published
+        """
+        review_request = self.create_review_request(
+            target_people=[self.user],
+            publish=True)
+        review = self.create_review(review_request, publish=True)
+
+        ReviewRequestVisit.objects.update_visibility(
+            review_request, self.user, ReviewRequestVisit.MUTED)
+
+        self.create_reply(review,
+                          user=User.objects.get(username='dopey'),
+                          publish=True)
+
+        self.assertEqual(
+            list(ReviewRequest.objects.to_user(self.user,
+                                               include_archived=False)),
+            [])
+
+    def test_to_user(self):
+        """Testing ReviewRequest.objects.to_user with the dashboard inbox"""
+        review_request1 = self.create_review_request(
+            summary='Test 1',
+            target_people=[self.user],
+            publish=True)
+        review_request2 = self.create_review_request(
+            summary='Test 2',
+            target_groups=[self.group],
+            publish=True)
+        self.create_review_request(summary='Test 3',
+                                   publish=True)
+        self.create_review_request(summary='Test 4',
+                                   target_people=[self.user],
+                                   publish=True,
+                                   status=ReviewRequest.SUBMITTED)
+
+        self.group.users.add(self.user)
+
+        self.assertEqual(
+            list(ReviewRequest.objects.to_user(self.user).order_by('pk')),
+            [review_request1, review_request2])
+
+        ReviewRequestVisit.objects.create(
+            user=self.user,
+            review_request=review_request1,
+            visibility=ReviewRequestVisit.MUTED)
+
+        self.assertEqual(
+            list(ReviewRequest.objects.to_user(self.user,
+                                               include_archived=False)),
+            [review_request2])
+
+    def test_dashboard(self):
+        """Testing dashboard view with the dashboard inbox"""
+        self.create_review_request(summary='Test 1',
+                                   target_people=[self.user],
+                                   publish=True)
+        archived = self.create_review_request(summary='Test 2',
+                                              target_people=[self.user],
+                                              publish=True)
+        self.create_review_request(summary='Test 3',
+                                   publish=True)
+
+        ReviewRequestVisit.objects.create(
+            user=self.user,
+            review_request=archived,
+            visibility=ReviewRequestVisit.ARCHIVED)
+
+        self.client.login(username='grumpy', password='grumpy')
+
+        for show_archived, summaries in (('1', ['Test 2', 'Test 1']),
+                                         ('0', ['Test 1'])):
+            response = self.client.get(
+                reverse('dashboard'),
+                {
+                    'show-archived': show_archived,
+                    'view': 'incoming',
+                })
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [
+                    row['object'].summary
+                    for row in response.context['datagrid'].rows
+                ],
+                summaries)
+
+    def test_rebuild_inbox(self):
+        """Testing rebuild-inbox management command"""
+        review_request = self.create_review_request(
+            target_people=[self.user],
+            publish=True)
+        self.create_review_request(publish=True,
+                                   status=ReviewRequest.DISCARDED)
+
+        ReviewRequestInboxEntry.objects.all().delete()
+
+        call_command('rebuild-inbox', stdout=StringIO())
+
+        self.assertEqual(
+            set(ReviewRequestInboxEntry.objects.values_list(
+                'review_request', 'user__username', 'reason')),
+            {
+                (review_request.pk, 'doc',
+                 ReviewRequestInboxEntry.SUBMITTER),
+                (review_request.pk, 'grumpy',
+                 ReviewRequestInboxEntry.TARGET_PERSON),
+            })
+
+    def _get_entries(self):
+        """Return the inbox entries as a set of usernames and reasons.
+
+        Returns:
+            set of tuple:
+            The usernames and reasons for each inbox entry.
+        """
+        return set(ReviewRequestInboxEntry.objects.values_list(
+            'user__username', 'reason'))
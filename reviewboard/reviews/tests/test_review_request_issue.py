@@ -0,0 +1,183 @@
+"""Unit tests for reviewboard.reviews.models.ReviewRequestIssue."""
+
+from kgb import SpyAgency
+
+from reviewboard.reviews.models import (BaseComment,
+                                        ReviewRequest,
+                                        ReviewRequestIssue)
+from reviewboard.reviews.models.review_request import fetch_issue_counts
+from reviewboard.testing import TestCase
+
+
+class ReviewRequestIssueTests(SpyAgency, TestCase):
+    """Unit tests for maintaining the review request issue index."""
+
+    fixtures = ['test_users']
+
+    def setUp(self):
+        super().setUp()
+
+        self.review_request = self.create_review_request(publish=True)
+
+    def test_review_publish(self):
+        """Testing ReviewRequestIssue entries added when publishing a review
+        """
+        review = self.create_review(self.review_request)
+        comment1 = self.create_general_comment(review, issue_opened=True)
+        self.create_general_comment(review)
+        comment2 = self.create_general_comment(review, issue_opened=True)
+
+        self.assertFalse(ReviewRequestIssue.objects.exists())
+
+        review.publish()
+
+        self.assertQuerysetEqual(
+            ReviewRequestIssue.objects.order_by('comment_id'),
+            [
+                ('general', comment1.pk, review.pk, BaseComment.OPEN),
+                ('general', comment2.pk, review.pk, BaseComment.OPEN),
+            ],
+            transform=lambda issue: (issue.comment_type,
+                                     issue.comment_id,
+                                     issue.review_id,
+                                     issue.issue_status))
+
+    def test_reply_publish(self):
+        """Testing ReviewRequestIssue entries not added when publishing a
+        reply
+        """
+        review = self.create_review(self.review_request, publish=True)
+        comment = self.create_general_comment(review, issue_opened=True)
+
+        reply = self.create_reply(review)
+        self.create_general_comment(reply, reply_to=comment,
+                                    issue_opened=True)
+        reply.publish()
+
+        self.assertQuerysetEqual(
+            ReviewRequestIssue.objects.all(),
+            [comment.pk],
+            transform=lambda issue: issue.comment_id)
+
+    def test_issue_status_change(self):
+        """Testing ReviewRequestIssue entries updated when changing an issue
+        status
+        """
+        review = self.create_review(self.review_request)
+        comment = self.create_general_comment(review, issue_opened=True)
+        review.publish()
+
+        comment = review.general_comments.get()
+        comment.issue_status = BaseComment.RESOLVED
+        comment.save()
+
+        issue = ReviewRequestIssue.objects.get()
+        self.assertEqual(issue.issue_status, BaseComment.RESOLVED)
+        self.assertEqual(issue.timestamp, comment.timestamp)
+
+    def test_issue_closed(self):
+        """Testing ReviewRequestIssue entries removed when a comment no longer
+        has an issue
+        """
+        review = self.create_review(self.review_request)
+        self.create_general_comment(review, issue_opened=True)
+        review.publish()
+
+        comment = review.general_comments.get()
+        comment.issue_opened = False
+        comment.issue_status = None
+        comment.save()
+
+        self.assertFalse(ReviewRequestIssue.objects.exists())
+
+    def test_comment_delete(self):
+        """Testing ReviewRequestIssue entries removed when deleting a comment
+        """
+        review = self.create_review(self.review_request, publish=True)
+        comment1 = self.create_general_comment(review, issue_opened=True)
+        comment2 = self.create_general_comment(review, issue_opened=True)
+
+        comment1.delete()
+
+        self.assertQuerysetEqual(
+            ReviewRequestIssue.objects.all(),
+            [comment2.pk],
+            transform=lambda issue: issue.comment_id)
+
+    def test_status_update_drop_open_issues(self):
+        """Testing ReviewRequestIssue entries updated when a status update
+        drops open issues
+        """
+        review = self.create_review(self.review_request, publish=True)
+        self.create_general_comment(review, issue_opened=True)
+
+        status_update = self.create_status_update(self.review_request,
+                                                  review=review)
+        status_update.drop_open_issues()
+
+        self.assertEqual(ReviewRequestIssue.objects.get().issue_status,
+                         BaseComment.DROPPED)
+
+    def test_ensure_indexed(self):
+        """Testing ReviewRequestIssue.objects.ensure_indexed with a review
+        request indexed before the index existed
+        """
+        review = self.create_review(self.review_request, publish=True)
+        comment = self.create_general_comment(review,
+                                              issue_opened=True,
+                                              issue_status=BaseComment.DROPPED)
+        draft_review = self.create_review(self.review_request)
+        self.create_general_comment(draft_review, issue_opened=True)
+
+        ReviewRequestIssue.objects.all().delete()
+        ReviewRequest.objects.filter(pk=self.review_request.pk).update(
+            issues_indexed=False,
+            extra_data={'key': 'value'})
+
+        # Only the marker should be written, leaving any out-of-date data
+        # on this instance alone.
+        review_request = ReviewRequest.objects.get(pk=self.review_request.pk)
+        ReviewRequest.objects.filter(pk=review_request.pk).update(
+            extra_data={'key': 'new-value'})
+        self.spy_on(ReviewRequest.save, owner=ReviewRequest)
+
+        ReviewRequestIssue.objects.ensure_indexed(review_request)
+        self.assertTrue(review_request.issues_indexed)
+        self.assertSpyNotCalled(ReviewRequest.save)
+
+        self.assertQuerysetEqual(
+            ReviewRequestIssue.objects.all(),
+            [(comment.pk, BaseComment.DROPPED)],
+            transform=lambda issue: (issue.comment_id, issue.issue_status))
+
+        review_request = ReviewRequest.objects.get(pk=self.review_request.pk)
+        self.assertTrue(review_request.issues_indexed)
+        self.assertEqual(review_request.extra_data, {'key': 'new-value'})
+
+        # Now that it's indexed, this shouldn't need to query anything.
+        with self.assertNumQueries(0):
+            ReviewRequestIssue.objects.ensure_indexed(review_request)
+
+    def test_fetch_issue_counts(self):
+        """Testing fetch_issue_counts with the issue index"""
+        review1 = self.create_review(self.review_request, publish=True)
+        self.create_general_comment(review1, issue_opened=True)
+        self.create_general_comment(review1,
+                                    issue_opened=True,
+                                    issue_status=BaseComment.RESOLVED)
+
+        review2 = self.create_review(self.review_request, publish=True)
+        self.create_general_comment(review2, issue_opened=True)
+
+        ReviewRequestIssue.objects.ensure_indexed(self.review_request)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                fetch_issue_counts(self.review_request),
+                {
+                    BaseComment.OPEN: 2,
+                    BaseComment.RESOLVED: 1,
+                    BaseComment.DROPPED: 0,
+                    BaseComment.VERIFYING_RESOLVED: 0,
+                    BaseComment.VERIFYING_DROPPED: 0,
+                })
@@ -162,15 +162,211 @@ class ReviewRequestPageDataTests(TestCase):
         self.assertIsInstance(entry, ChangeEntry)
         self.assertEqual(entry.changedesc, self.changedesc2)
 
-    def _build_data(self, entry_classes=None):
+    def test_query_data_with_max_entries(self):
+        """Testing ReviewRequestPageData.query_data_pre_etag and
+        query_data_post_etag with max_entries
+        """
+        data = self._build_data(max_entries=2)
+        data.query_data_pre_etag()
+
+        self.assertEqual(data.reviews, [self.review2])
+        self.assertEqual(data.changedescs, [self.changedesc2])
+        self.assertEqual(data.all_status_updates, [self.status_update1,
+                                                   self.status_update2])
+        self.assertEqual(data.latest_review_timestamp,
+                         self.review2.timestamp)
+        self.assertEqual(data.latest_changedesc_timestamp,
+                         self.changedesc2.timestamp)
+        self.assertTrue(data.has_older_entries)
+        self.assertEqual(data.older_entries_timestamp,
+                         self.review2.timestamp)
+
+        data.query_data_post_etag()
+
+        # Only comments on the loaded reviews should be loaded, but the
+        # issue summary table should contain all issues.
+        self.assertEqual(
+            data.all_comments,
+            [
+                self.general_comment2,
+                self.screenshot_comment2,
+                self.file_attachment_comment2,
+                self.diff_comment2,
+            ])
+        self.assertEqual(
+            data.issues,
+            [
+                self.general_comment1,
+                self.general_comment2,
+                self.file_attachment_comment1,
+                self.file_attachment_comment2,
+                self.diff_comment1,
+                self.diff_comment2,
+            ])
+        self.assertEqual(
+            data.issue_counts,
+            {
+                'total': 6,
+                'open': 2,
+                'resolved': 2,
+                'dropped': 2,
+                'verifying': 0,
+            })
+
+        # Issues on loaded comments should share the comment instances.
+        self.assertIs(data.issues[1], data.all_comments[0])
+        self.assertEqual(data.issues[0].review_obj, self.review1)
+
+        entries = data.get_entries()
+        self.assertEqual(len(entries['initial']), 1)
+        self.assertEqual(
+            [
+                (type(entry), entry.entry_id)
+                for entry in entries['main']
+            ],
+            [
+                (ReviewEntry, str(self.review2.pk)),
+                (ChangeEntry, str(self.changedesc2.pk)),
+            ])
+
+    def test_query_data_with_max_entries_and_before(self):
+        """Testing ReviewRequestPageData.query_data_pre_etag and
+        query_data_post_etag with max_entries and before
+        """
+        self._populate_review_request()
+
+        data = self._create_data(max_entries=2,
+                                 before=self.review2.timestamp)
+        data.query_data_pre_etag()
+        data.query_data_post_etag()
+
+        self.assertEqual(data.reviews, [self.review1])
+        self.assertEqual(data.changedescs, [self.changedesc1])
+        self.assertFalse(data.has_older_entries)
+        self.assertIsNone(data.older_entries_timestamp)
+        self.assertEqual(len(data.issues), 6)
+
+        entries = data.get_entries()
+        self.assertEqual(
+            [
+                (type(entry), entry.entry_id)
+                for entry in entries['main']
+            ],
+            [
+                (ReviewEntry, str(self.review1.pk)),
+                (ChangeEntry, str(self.changedesc1.pk)),
+            ])
+
+    def test_query_data_with_max_entries_and_replies(self):
+        """Testing ReviewRequestPageData.query_data_pre_etag with max_entries
+        includes older reviews with new replies
+        """
+        data = self._build_data(max_entries=1)
+
+        reply = self.create_reply(
+            self.review1,
+            timestamp=self.changedesc2.timestamp + timedelta(days=1),
+            publish=True)
+
+        data.query_data_pre_etag()
+
+        self.assertEqual(data.reviews, [reply, self.review1])
+        self.assertEqual(data.changedescs, [])
+        self.assertEqual(data.latest_review_timestamp, reply.timestamp)
+        self.assertEqual(data.latest_changedesc_timestamp,
+                         self.changedesc2.timestamp)
+        self.assertTrue(data.has_older_entries)
+        self.assertEqual(data.older_entries_timestamp, reply.timestamp)
+
+    def test_query_data_with_max_entries_and_same_timestamps(self):
+        """Testing ReviewRequestPageData.query_data_pre_etag with max_entries
+        and entries sharing a timestamp across pages
+        """
+        self.review_request = self.create_review_request(publish=True)
+
+        timestamp = timezone.now()
+        review1 = self.create_review(self.review_request,
+                                     timestamp=timestamp - timedelta(days=1),
+                                     publish=True)
+        review2 = self.create_review(self.review_request,
+                                     timestamp=timestamp,
+                                     publish=True)
+        review3 = self.create_review(self.review_request,
+                                     timestamp=timestamp,
+                                     publish=True)
+
+        data = self._create_data(max_entries=1)
+        data.query_data_pre_etag()
+
+        self.assertEqual(data.reviews, [review3])
+        self.assertTrue(data.has_older_entries)
+        self.assertEqual(data.older_entries_timestamp, timestamp)
+        self.assertEqual(data.older_entries_entry, ('review', review3.pk))
+        self.assertEqual(data.older_entries_before,
+                         '%s,review:%s' % (timestamp.isoformat(), review3.pk))
+
+        # The next page must include the other review at that timestamp.
+        data = self._create_data(max_entries=1,
+                                 before=data.older_entries_timestamp,
+                                 before_entry=data.older_entries_entry)
+        data.query_data_pre_etag()
+
+        self.assertEqual(data.reviews, [review2])
+        self.assertTrue(data.has_older_entries)
+        self.assertEqual(data.older_entries_entry, ('review', review2.pk))
+
+        data = self._create_data(max_entries=1,
+                                 before=data.older_entries_timestamp,
+                                 before_entry=data.older_entries_entry)
+        data.query_data_pre_etag()
+
+        self.assertEqual(data.reviews, [review1])
+        self.assertFalse(data.has_older_entries)
+        self.assertIsNone(data.older_entries_before)
+
+    def test_query_data_with_entry_ids(self):
+        """Testing ReviewRequestPageData.query_data_pre_etag and
+        query_data_post_etag with entry_ids
+        """
+        self._populate_review_request()
+
+        data = self._create_data(entry_ids={
+            'review': {str(self.review1.pk)},
+            'changedesc': {str(self.changedesc2.pk)},
+        })
+        data.query_data_pre_etag()
+        data.query_data_post_etag()
+
+        self.assertEqual(data.reviews, [self.review1])
+        self.assertEqual(data.changedescs, [self.changedesc2])
+        self.assertFalse(data.has_older_entries)
+        self.assertEqual(len(data.issues), 6)
+
+        entries = data.get_entries()
+        self.assertEqual(
+            [
+                (type(entry), entry.entry_id)
+                for entry in entries['main']
+            ],
+            [
+                (ReviewEntry, str(self.review1.pk)),
+                (ChangeEntry, str(self.changedesc2.pk)),
+            ])
+
+    def _build_data(self, entry_classes=None, **kwargs):
         self._populate_review_request()
 
+        return self._create_data(entry_classes=entry_classes,
+                                 **kwargs)
+
+    def _create_data(self, entry_classes=None, **kwargs):
         request = RequestFactory().get('/r/1/')
         request.user = self.review_request.submitter
 
         return ReviewRequestPageData(review_request=self.review_request,
                                      request=request,
-                                     entry_classes=entry_classes)
+                                     entry_classes=entry_classes,
+                                     **kwargs)
 
     def _test_query_data_pre_etag_with(self,
                                        entry_classes=None,
@@ -447,6 +447,120 @@ class ReviewRequestUpdatesViewTests(TestCase):
         })
         self.assertEqual(len(updates), 0)
 
+    def test_get_with_before(self) -> None:
+        """Testing ReviewRequestUpdatesView GET with ?before=..."""
+        with self.settings(REVIEW_REQUEST_PAGE_MAX_ENTRIES=1):
+            updates = self._get_updates({
+                'before': self.review2.timestamp.isoformat(),
+            })
+
+        self.assertEqual(len(updates), 2)
+
+        metadata, html = updates[0]
+        self.assertEqual(
+            metadata,
+            {
+                'addedTimestamp': '2017-09-17T17:00:00Z',
+                'collapsed': False,
+                'domElementID': 'review1',
+                'entryID': '1',
+                'entryType': 'review',
+                'etag': '',
+                'modelClass': 'RB.ReviewRequestPage.ReviewEntry',
+                'modelData': {
+                    'reviewData': {
+                        'authorName': 'dopey',
+                        'id': self.review1.pk,
+                        'public': True,
+                        'bodyTop': self.review1.body_top,
+                        'bodyBottom': self.review1.body_bottom,
+                        'shipIt': self.review1.ship_it,
+                    },
+                },
+                'type': 'entry',
+                'updatedTimestamp': '2017-09-17T17:00:00Z',
+                'viewClass': 'RB.ReviewRequestPage.ReviewEntryView',
+                'viewOptions': {},
+            })
+        self.assertTrue(html.startswith('<div id="review1"'))
+
+        metadata, html = updates[1]
+        self.assertEqual(
+            metadata,
+            {
+                'type': 'older-entries',
+                'hasOlderEntries': False,
+                'olderEntriesBefore': None,
+            })
+        self.assertEqual(html, '')
+
+    def test_get_with_before_and_older_entries(self) -> None:
+        """Testing ReviewRequestUpdatesView GET with ?before=... and older
+        entries remaining
+        """
+        review = self.create_review(
+            self.review_request,
+            timestamp=self.review1.timestamp + timedelta(days=5),
+            publish=True)
+
+        with self.settings(REVIEW_REQUEST_PAGE_MAX_ENTRIES=1):
+            updates = self._get_updates({
+                'before': self.review2.timestamp.isoformat(),
+            })
+
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(updates[0][0]['entryID'], str(review.pk))
+        self.assertEqual(
+            updates[1][0],
+            {
+                'type': 'older-entries',
+                'hasOlderEntries': True,
+                'olderEntriesBefore': '%s,review:%s' % (
+                    review.timestamp.isoformat(), review.pk),
+            })
+
+    def test_get_with_before_and_entry(self) -> None:
+        """Testing ReviewRequestUpdatesView GET with ?before=... containing
+        the last loaded entry
+        """
+        review = self.create_review(
+            self.review_request,
+            timestamp=self.review2.timestamp,
+            publish=True)
+
+        with self.settings(REVIEW_REQUEST_PAGE_MAX_ENTRIES=1):
+            updates = self._get_updates({
+                'before': '%s,review:%s' % (review.timestamp.isoformat(),
+                                            review.pk),
+            })
+
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(updates[0][0]['entryID'], str(self.review2.pk))
+        self.assertEqual(
+            updates[1][0],
+            {
+                'type': 'older-entries',
+                'hasOlderEntries': True,
+                'olderEntriesBefore': '%s,review:%s' % (
+                    self.review2.timestamp.isoformat(), self.review2.pk),
+            })
+
+    def test_get_with_invalid_before_entry(self) -> None:
+        """Testing ReviewRequestUpdatesView GET with invalid entry in
+        ?before=...
+        """
+        response = self.client.get(self._build_url(), {
+            'before': '%s,review' % self.review2.timestamp.isoformat(),
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_with_invalid_before(self) -> None:
+        """Testing ReviewRequestUpdatesView GET with invalid ?before=..."""
+        response = self.client.get(self._build_url(), {
+            'before': 'xyz',
+        })
+        self.assertEqual(response.status_code, 400)
+
     def test_post(self):
         """Testing ReviewRequestUpdatesView POST not allowed"""
         # 1 SQL query for SiteConfiguration in the middleware.
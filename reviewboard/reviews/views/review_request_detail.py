@@ -93,9 +93,14 @@ class ReviewRequestDetailView(ReviewRequestViewMixin,
         # Begin building data for the contents of the page. This will include
         # the reviews, change descriptions, and other content shown on the
         # page.
-        data = ReviewRequestPageData(review_request=review_request,
-                                     request=request,
-                                     last_visited=self.last_visited)
+        #
+        # On review requests with a long history, this may be limited to the
+        # most recently active entries, with older ones loaded on demand.
+        data = ReviewRequestPageData(
+            review_request=review_request,
+            request=request,
+            last_visited=self.last_visited,
+            max_entries=settings.REVIEW_REQUEST_PAGE_MAX_ENTRIES or None)
         self.data = data
 
         data.query_data_pre_etag()
@@ -124,6 +129,7 @@ class ReviewRequestDetailView(ReviewRequestViewMixin,
             etag_timestamp,
             draft_timestamp,
             data.latest_changedesc_timestamp,
+            data.max_entries,
             entry_etags,
             data.latest_review_timestamp,
             review_request.last_review_activity_timestamp,
@@ -186,7 +192,7 @@ class ReviewRequestDetailView(ReviewRequestViewMixin,
                 review_request.public and
                 review_request.status == review_request.PENDING_REVIEW):
                 visited.timestamp = django_timezone.now()
-                visited.save()
+                visited.save(update_fields=('timestamp',))
 
         return visited, last_visited
 
@@ -286,6 +292,9 @@ class ReviewRequestDetailView(ReviewRequestViewMixin,
             'review_request_visit': self.visited,
             'review_request_status_html': review_request_status_html,
             'entries': entries,
+            'has_older_entries': data.has_older_entries,
+            'older_entries_before': data.older_entries_before,
+            'older_entries_timestamp': data.older_entries_timestamp,
             'last_activity_time': self.last_activity_time,
             'last_visited': self.last_visited,
             'review': review,
@@ -51,8 +51,21 @@ class ReviewRequestUpdatesView(ReviewRequestViewMixin, ETagViewMixin,
         <html length>\\n
         <html content>
 
+    Older entries not initially shown on the page can be loaded by passing
+    ``?before=<timestamp>`` or ``?before=<timestamp>,<entry type>:<id>``.
+    This will send the most recently active reviews and changes before that
+    time or entry (up to
+    :setting:`REVIEW_REQUEST_PAGE_MAX_ENTRIES`), along with information
+    needed to add them to the page, followed by an ``older-entries`` update
+    for loading any remaining entries.
+
     The format is subject to change without notice, and should not be
     relied upon by third parties.
+
+    Version Changed:
+        7.0:
+        Added support for ``?before=``. Requests for specific entries now
+        only load the data for those entries.
     """
 
     def __init__(
@@ -70,6 +83,8 @@ class ReviewRequestUpdatesView(ReviewRequestViewMixin, ETagViewMixin,
         self.entry_ids = {}
         self.data = None
         self.since = None
+        self.before = None
+        self.before_entry = None
 
     def pre_dispatch(
         self,
@@ -131,8 +146,48 @@ class ReviewRequestUpdatesView(ReviewRequestViewMixin, ETagViewMixin,
 
         self.since = request.GET.get('since')
 
-        self.data = ReviewRequestPageData(self.review_request, request,
-                                          entry_classes=entry_classes)
+        before_str = request.GET.get('before')
+
+        if before_str:
+            # This may contain the last entry loaded at that timestamp, so
+            # that entries sharing the timestamp aren't skipped.
+            before_str, sep, before_entry_str = before_str.partition(',')
+
+            try:
+                before = dateutil.parser.parse(before_str)
+
+                if sep:
+                    before_entry_type, before_entry_id = \
+                        before_entry_str.split(':')
+                    self.before_entry = (before_entry_type,
+                                         int(before_entry_id))
+            except (OverflowError, ValueError) as e:
+                return HttpResponseBadRequest('Invalid ?before= value: %s'
+                                              % e)
+
+            if not is_aware(before):
+                before = make_aware(before, timezone.utc)
+
+            self.before = before
+
+        if self.entry_ids:
+            self.data = ReviewRequestPageData(
+                self.review_request,
+                request,
+                entry_classes=entry_classes,
+                entry_ids=self.entry_ids)
+        elif self.before:
+            self.data = ReviewRequestPageData(
+                self.review_request,
+                request,
+                entry_classes=entry_classes,
+                max_entries=(settings.REVIEW_REQUEST_PAGE_MAX_ENTRIES or
+                             None),
+                before=self.before,
+                before_entry=self.before_entry)
+        else:
+            self.data = ReviewRequestPageData(self.review_request, request,
+                                              entry_classes=entry_classes)
 
     def get_etag_data(
         self,
@@ -221,7 +276,13 @@ class ReviewRequestUpdatesView(ReviewRequestViewMixin, ETagViewMixin,
         # The current order (main, initial) is based on Python 2.7 sort order,
         # which our tests are based on. This could be changed in the future.
         all_entries = data.get_entries()
-        entries = all_entries['main'] + all_entries['initial']
+
+        if self.before:
+            # Only older main entries are being loaded. The rest of the page
+            # is already up-to-date.
+            entries = all_entries['main']
+        else:
+            entries = all_entries['main'] + all_entries['initial']
 
         if self.entry_ids:
             # If specific entry IDs have been requested, limit the results
@@ -265,6 +326,16 @@ class ReviewRequestUpdatesView(ReviewRequestViewMixin, ETagViewMixin,
                 'viewOptions': entry.get_js_view_data(),
             }
 
+            if self.before:
+                # These entries aren't on the page yet, so include what's
+                # needed to create them.
+                metadata.update({
+                    'collapsed': entry.collapsed,
+                    'domElementID': entry.get_dom_element_id(),
+                    'modelClass': entry.js_model_class,
+                    'viewClass': entry.js_view_class,
+                })
+
             if base_entry_context is None:
                 # Now that we know the context is needed for entries,
                 # we can construct and populate it.
@@ -298,6 +369,7 @@ class ReviewRequestUpdatesView(ReviewRequestViewMixin, ETagViewMixin,
         # the state of the issue summary table may have changed. We'll need
         # to send this along as well.
         if (needs_issue_summary_table and
+            not self.before and
             (since is None or
              data.latest_issue_timestamp.replace(microsecond=0) > since)):
             metadata = {
@@ -315,6 +387,18 @@ class ReviewRequestUpdatesView(ReviewRequestViewMixin, ETagViewMixin,
 
             self._write_update(payload, metadata, html)
 
+        if self.before:
+            # Let the page know whether there are still older entries left
+            # to load.
+            self._write_update(
+                payload,
+                {
+                    'type': 'older-entries',
+                    'hasOlderEntries': data.has_older_entries,
+                    'olderEntriesBefore': data.older_entries_before,
+                },
+                '')
+
         # The payload's complete. Close it out and send to the client.
         result = payload.getvalue()
         payload.close()
@@ -655,6 +655,94 @@ PRE_CREATION = Revision('PRE-CREATION')
 RevisionID: TypeAlias = Union[Revision, str]
 
 
+class FileLookup:
+    """Information on a file to look up as part of a batch.
+
+    This is passed to the batched file lookup methods, such as
+    :py:meth:`SCMTool.get_files`.
+
+    Version Added:
+        7.0
+    """
+
+    ######################
+    # Instance variables #
+    ######################
+
+    #: Extra context used to help look up the file.
+    context: FileLookupContext
+
+    #: The path to the file in the repository.
+    path: str
+
+    #: The revision of the file to look up.
+    revision: RevisionID
+
+    def __init__(
+        self,
+        path: str,
+        revision: RevisionID,
+        context: Optional[FileLookupContext] = None,
+    ) -> None:
+        """Initialize the lookup.
+
+        Args:
+            path (str):
+                The path to the file in the repository.
+
+            revision (Revision or str):
+                The revision of the file to look up.
+
+            context (FileLookupContext, optional):
+                Extra context used to help look up the file. If not
+                provided, an empty context will be used.
+        """
+        self.path = path
+        self.revision = revision
+        self.context = context or FileLookupContext()
+
+    def __eq__(
+        self,
+        other: object,
+    ) -> bool:
+        """Return whether this lookup is equal to another.
+
+        Args:
+            other (object):
+                The object to compare to.
+
+        Returns:
+            bool:
+            ``True`` if the two lookups are for the same path, revision, and
+            base commit ID.
+        """
+        return (isinstance(other, FileLookup) and
+                self.path == other.path and
+                self.revision == other.revision and
+                (self.context.base_commit_id ==
+                 other.context.base_commit_id))
+
+    def __repr__(self) -> str:
+        """Return a string representation of the lookup.
+
+        Returns:
+            str:
+            The string representation.
+        """
+        return '<FileLookup(path=%r, revision=%r, base_commit_id=%r)>' % (
+            self.path, str(self.revision), self.context.base_commit_id)
+
+
+#: The result of looking up a file in a batch.
+#:
+#: This is either the contents of the file, or the exception that would have
+#: been raised when looking up the file on its own.
+#:
+#: Version Added:
+#:     7.0
+FileLookupResult: TypeAlias = Union[bytes, Exception]
+
+
 class _SCMToolIDProperty(str):
     """A property that automatically determines the ID for an SCMTool.
 
@@ -841,6 +929,17 @@ class SCMTool:
     #:     4.0.5
     diffs_use_commit_ids_as_revisions: bool = False
 
+    #: Whether all files in a revision can be listed in one query.
+    #:
+    #: If ``True``, the SCMTool must implement
+    #: :py:meth:`get_file_index_revision` and :py:meth:`list_files`. These
+    #: will be used to check for the existence of many files in a revision
+    #: (for instance, when validating a large diff) without a query per file.
+    #:
+    #: Version Added:
+    #:     7.0
+    supports_file_index: bool = False
+
     #: Whether this prefers the Mirror Path value for communication.
     #:
     #: This will affect which field the repository configuration form will
@@ -997,6 +1096,53 @@ class SCMTool:
         """
         raise NotImplementedError
 
+    def get_files(
+        self,
+        lookups: Sequence[FileLookup],
+        **kwargs,
+    ) -> List[FileLookupResult]:
+        """Return the contents of several files from a repository.
+
+        By default, this calls :py:meth:`get_file` for each file. Subclasses
+        that can fetch several files in fewer round trips to the repository
+        should override this.
+
+        A failure to fetch one file must not prevent the other files from
+        being fetched. Instead, the exception that :py:meth:`get_file` would
+        have raised is returned in place of the file's contents.
+
+        Version Added:
+            7.0
+
+        Args:
+            lookups (list of FileLookup):
+                The files to fetch.
+
+            **kwargs (dict):
+                Additional keyword arguments. This is not currently used, but
+                is available for future expansion.
+
+        Returns:
+            list:
+            The contents of each file (as bytes) or the exception raised when
+            fetching it, in the same order as ``lookups``.
+        """
+        results: List[FileLookupResult] = []
+
+        for lookup in lookups:
+            context = lookup.context
+
+            try:
+                results.append(self.get_file(
+                    lookup.path,
+                    lookup.revision,
+                    base_commit_id=context.base_commit_id,
+                    context=context))
+            except Exception as e:
+                results.append(e)
+
+        return results
+
     def file_exists(
         self,
         path: str,
@@ -1070,6 +1216,76 @@ class SCMTool:
         except FileNotFoundError:
             return False
 
+    def get_file_index_revision(
+        self,
+        revision: RevisionID,
+        context: Optional[FileLookupContext] = None,
+        **kwargs,
+    ) -> Optional[str]:
+        """Return the revision to list when checking for a file.
+
+        This is used if :py:attr:`supports_file_index` is ``True``. The
+        result identifies the set of files to check a file against, and must
+        always refer to the same set of files. Subclasses should return
+        ``None`` for revisions that can change over time (such as
+        :py:data:`HEAD` or branch names), or that otherwise can't be listed.
+
+        Version Added:
+            7.0
+
+        Args:
+            revision (Revision):
+                The revision of the file being checked.
+
+            context (FileLookupContext, optional):
+                Extra context used to help look up the file.
+
+            **kwargs (dict):
+                Additional keyword arguments. This is not currently used, but
+                is available for future expansion.
+
+        Returns:
+            str:
+            The revision to list, or ``None`` if the file must be checked
+            individually.
+        """
+        return None
+
+    def list_files(
+        self,
+        revision: str,
+        **kwargs,
+    ) -> Sequence[str]:
+        """Return the paths of all files in a revision.
+
+        This is used if :py:attr:`supports_file_index` is ``True``, with
+        revisions returned from :py:meth:`get_file_index_revision`. Paths
+        must be in the same form as those passed to :py:meth:`file_exists`.
+
+        Version Added:
+            7.0
+
+        Args:
+            revision (str):
+                The revision to list.
+
+            **kwargs (dict):
+                Additional keyword arguments. This is not currently used, but
+                is available for future expansion.
+
+        Returns:
+            list of str:
+            The paths of all files in the revision.
+
+        Raises:
+            reviewboard.scmtools.errors.SCMError:
+                The repository tool encountered an error.
+
+            NotImplementedError:
+                Listing files is not available for this type of repository.
+        """
+        raise NotImplementedError
+
     def parse_diff_revision(
         self,
         filename: bytes,
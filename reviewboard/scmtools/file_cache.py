@@ -0,0 +1,473 @@
+"""An on-disk cache for files fetched from repositories.
+
+Files fetched from repositories are normally stored only in the main
+(memcached) cache, where large files are split across many keys and are
+often evicted quickly. Once evicted, they have to be fetched again from the
+repository, which may be slow.
+
+When :setting:`REPOSITORY_FILE_CACHE_MAX_SIZE` is set, a second tier of
+caching is used. Files are stored on local disk in
+:setting:`REPOSITORY_FILE_CACHE_DIR`, and looked up there before going
+back to the repository.
+
+The cache is content-addressed. Each file's contents are stored once, named
+after a SHA-256 hash of the contents, and small reference files map each
+lookup key (repository, path, revision, and base commit ID) to the content.
+Files shared between revisions, branches, or repositories are only stored
+once.
+
+Writes are atomic, so readers never see partially-written files, even
+across processes. Once the total size of the stored contents exceeds the
+maximum size, the least recently used files are removed.
+
+Version Added:
+    7.0
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class RepositoryFileCache:
+    """An on-disk, content-addressed LRU cache for repository files.
+
+    Version Added:
+        7.0
+    """
+
+    #: The fraction of the maximum size to shrink the cache to on eviction.
+    #:
+    #: Evicting below the maximum size avoids having to scan the cache again
+    #: on the next write.
+    EVICTION_TARGET_RATIO = 0.9
+
+    #: The minimum time between updates of a file's last-used time.
+    #:
+    #: This avoids a write to the filesystem for every read of a popular
+    #: file.
+    TOUCH_INTERVAL_SECS = 60
+
+    ######################
+    # Instance variables #
+    ######################
+
+    #: The maximum total size of the stored file contents, in bytes.
+    max_size: int
+
+    #: The directory containing the cache.
+    path: str
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            path (str):
+                The directory containing the cache. This will be created
+                when first needed.
+
+            max_size (int):
+                The maximum total size of the stored file contents, in bytes.
+        """
+        self.path = path
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @property
+    def size(self) -> int:
+        """The total size of the stored file contents, in bytes.
+
+        This is tracked for writes made by this process, and recomputed from
+        disk when evicting files.
+
+        Type:
+            int
+        """
+        with self._lock:
+            if self._size is None:
+                self._size = sum(
+                    size
+                    for blob_path, size, mtime in self._scan_dir('blobs')
+                )
+
+            return self._size
+
+    def get(
+        self,
+        key: str,
+    ) -> Optional[bytes]:
+        """Return the contents of a file in the cache.
+
+        Args:
+            key (str):
+                The key for the file.
+
+        Returns:
+            bytes:
+            The contents of the file, or ``None`` if not in the cache.
+        """
+        ref_path = self._get_ref_path(key)
+
+        try:
+            with open(ref_path, 'r') as fp:
+                blob_hash = fp.read()
+
+            blob_path = self._get_blob_path(blob_hash)
+
+            with open(blob_path, 'rb') as fp:
+                data = fp.read()
+        except FileNotFoundError:
+            # Either this was never cached, or the contents were evicted.
+            # In the latter case, the reference is no longer useful.
+            self._unlink(ref_path)
+
+            return None
+        except OSError as e:
+            logger.warning('Unable to read "%s" from the repository file '
+                           'cache in %s: %s',
+                           key, self.path, e)
+
+            return None
+
+        self._touch(ref_path)
+        self._touch(blob_path)
+
+        return data
+
+    def has(
+        self,
+        key: str,
+    ) -> bool:
+        """Return whether a file is in the cache.
+
+        Args:
+            key (str):
+                The key for the file.
+
+        Returns:
+            bool:
+            ``True`` if the file is in the cache.
+        """
+        try:
+            with open(self._get_ref_path(key), 'r') as fp:
+                blob_hash = fp.read()
+        except OSError:
+            return False
+
+        return os.path.isfile(self._get_blob_path(blob_hash))
+
+    def set(
+        self,
+        key: str,
+        data: bytes,
+    ) -> None:
+        """Store the contents of a file in the cache.
+
+        Files larger than the maximum size of the cache won't be stored.
+
+        Errors writing to the cache are logged and otherwise ignored.
+
+        Args:
+            key (str):
+                The key for the file.
+
+            data (bytes):
+                The contents of the file.
+        """
+        if len(data) > self.max_size:
+            return
+
+        blob_hash = hashlib.sha256(data).hexdigest()
+        blob_path = self._get_blob_path(blob_hash)
+
+        try:
+            if os.path.isfile(blob_path):
+                # Another file with the same contents is already stored.
+                self._touch(blob_path, force=True)
+                added_size = 0
+            else:
+                self._write_atomic(blob_path, data)
+                added_size = len(data)
+
+            self._write_atomic(self._get_ref_path(key),
+                               blob_hash.encode('ascii'))
+        except OSError as e:
+            logger.warning('Unable to write "%s" to the repository file '
+                           'cache in %s: %s',
+                           key, self.path, e)
+
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += added_size
+
+            needs_eviction = (self._size is None or
+                              self._size > self.max_size)
+
+        if needs_eviction:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used files until under the maximum size.
+
+        This recomputes the size of the cache from disk, which also accounts
+        for files written by other processes.
+
+        References to removed contents that haven't been used more recently
+        than any remaining contents are removed as well.
+        """
+        blobs = sorted(self._scan_dir('blobs'),
+                       key=lambda info: info[2])
+        size = sum(
+            blob_size
+            for blob_path, blob_size, mtime in blobs
+        )
+
+        if size > self.max_size:
+            target_size = int(self.max_size * self.EVICTION_TARGET_RATIO)
+            num_evicted = 0
+
+            for blob_path, blob_size, mtime in blobs:
+                if size <= target_size:
+                    break
+
+                self._unlink(blob_path)
+                size -= blob_size
+                num_evicted += 1
+
+            if num_evicted < len(blobs):
+                cutoff = blobs[num_evicted][2]
+            else:
+                cutoff = time.time()
+
+            for ref_path, ref_size, mtime in self._scan_dir('refs'):
+                if mtime < cutoff:
+                    self._unlink(ref_path)
+
+            logger.debug('Evicted %d files from the repository file cache '
+                         'in %s',
+                         num_evicted, self.path)
+
+        with self._lock:
+            self._size = size
+
+    def clear(self) -> None:
+        """Remove all files from the cache."""
+        for dirname in ('blobs', 'refs'):
+            for path, size, mtime in self._scan_dir(dirname):
+                self._unlink(path)
+
+        with self._lock:
+            self._size = 0
+
+    def _get_ref_path(
+        self,
+        key: str,
+    ) -> str:
+        """Return the path to the reference file for a key.
+
+        Args:
+            key (str):
+                The key for the file.
+
+        Returns:
+            str:
+            The path to the reference file.
+        """
+        key_hash = hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+        return os.path.join(self.path, 'refs', key_hash[:2], key_hash)
+
+    def _get_blob_path(
+        self,
+        blob_hash: str,
+    ) -> str:
+        """Return the path to the stored contents with a given hash.
+
+        Args:
+            blob_hash (str):
+                The SHA-256 hash of the contents.
+
+        Returns:
+            str:
+            The path to the stored contents.
+
+        Raises:
+            FileNotFoundError:
+                The hash was not valid. This is treated as a cache miss.
+        """
+        if len(blob_hash) != 64:
+            raise FileNotFoundError(blob_hash)
+
+        return os.path.join(self.path, 'blobs', blob_hash[:2], blob_hash)
+
+    def _write_atomic(
+        self,
+        path: str,
+        data: bytes,
+    ) -> None:
+        """Atomically write a file.
+
+        The data is written to a temporary file in the same directory, and
+        then moved into place.
+
+        Args:
+            path (str):
+                The path to write to.
+
+            data (bytes):
+                The data to write.
+
+        Raises:
+            OSError:
+                The file could not be written.
+        """
+        dirname = os.path.dirname(path)
+        os.makedirs(dirname, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=dirname, prefix='.tmp-')
+
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(data)
+
+            os.replace(temp_path, path)
+        except BaseException:
+            self._unlink(temp_path)
+            raise
+
+    def _touch(
+        self,
+        path: str,
+        force: bool = False,
+    ) -> None:
+        """Mark a file as recently used.
+
+        Args:
+            path (str):
+                The path to the file.
+
+            force (bool, optional):
+                Whether to update the file even if it was recently marked
+                as used.
+        """
+        try:
+            if (force or
+                (time.time() - os.stat(path).st_mtime >
+                 self.TOUCH_INTERVAL_SECS)):
+                os.utime(path)
+        except OSError:
+            pass
+
+    def _unlink(
+        self,
+        path: str,
+    ) -> None:
+        """Remove a file, ignoring any errors.
+
+        Args:
+            path (str):
+                The path to the file.
+        """
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _scan_dir(
+        self,
+        dirname: str,
+    ) -> List[Tuple[str, int, float]]:
+        """Return information on the files stored in a cache directory.
+
+        Temporary files from writes in progress are skipped.
+
+        Args:
+            dirname (str):
+                The name of the directory within the cache.
+
+        Returns:
+            list of tuple:
+            A list of 3-tuples of each file's path, size, and last-modified
+            time.
+        """
+        results: List[Tuple[str, int, float]] = []
+
+        try:
+            subdirs = list(os.scandir(os.path.join(self.path, dirname)))
+        except OSError:
+            return results
+
+        for subdir in subdirs:
+            try:
+                entries = list(os.scandir(subdir.path))
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                results.append((entry.path, st.st_size, st.st_mtime))
+
+        return results
+
+
+_file_caches: Dict[Tuple[str, int], RepositoryFileCache] = {}
+_file_caches_lock = threading.Lock()
+
+
+def get_repository_file_cache() -> Optional[RepositoryFileCache]:
+    """Return the on-disk repository file cache, if enabled.
+
+    The cache is enabled by setting :setting:`REPOSITORY_FILE_CACHE_MAX_SIZE`
+    to a positive value.
+
+    Version Added:
+        7.0
+
+    Returns:
+        RepositoryFileCache:
+        The cache, or ``None`` if disabled.
+    """
+    max_size = getattr(settings, 'REPOSITORY_FILE_CACHE_MAX_SIZE', 0)
+
+    if not max_size or max_size <= 0:
+        return None
+
+    path = (getattr(settings, 'REPOSITORY_FILE_CACHE_DIR', None) or
+            os.path.join(settings.SITE_DATA_DIR, 'repository-file-cache'))
+    key = (path, max_size)
+
+    with _file_caches_lock:
+        try:
+            return _file_caches[key]
+        except KeyError:
+            file_cache = RepositoryFileCache(path=path,
+                                             max_size=max_size)
+            _file_caches[key] = file_cache
+
+            return file_cache
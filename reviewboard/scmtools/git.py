@@ -6,7 +6,10 @@ import os
 import platform
 import re
 import stat
-from typing import Any, Dict
+import subprocess
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import (quote as urlquote,
                           urlparse,
                           urlsplit as urlsplit,
@@ -135,6 +138,41 @@ class GitTool(SCMTool):
 
         return self.client.get_file(path, revision)
 
+    def get_files(self, lookups, **kwargs):
+        """Return the contents of several files from the repository.
+
+        For local repositories, all the files are looked up together using a
+        single git-cat-file process.
+
+        Version Added:
+            7.0
+
+        Args:
+            lookups (list of reviewboard.scmtools.core.FileLookup):
+                The files to fetch.
+
+            **kwargs (dict):
+                Unused keyword arguments.
+
+        Returns:
+            list:
+            The contents of each file (as bytes) or the exception raised when
+            fetching it, in the same order as ``lookups``.
+        """
+        results = [b''] * len(lookups)
+        files = []
+        indexes = []
+
+        for i, lookup in enumerate(lookups):
+            if lookup.revision != PRE_CREATION:
+                files.append((lookup.path, lookup.revision))
+                indexes.append(i)
+
+        for i, result in zip(indexes, self.client.get_files(files)):
+            results[i] = result
+
+        return results
+
     def file_exists(self, path, revision=HEAD, **kwargs):
         if revision == PRE_CREATION:
             return False
@@ -750,6 +788,511 @@ class GitDiffParser(DiffParser):
                 setattr(file_info, attr, b'')
 
 
+class GitCatFileProcess:
+    """A long-running :command:`git cat-file` process for looking up objects.
+
+    This wraps a :command:`git cat-file --batch` process (or
+    :command:`git cat-file --batch-check`, for looking up only the types of
+    objects), sending object names over stdin and reading results from
+    stdout. This avoids the cost of starting :command:`git` and opening the
+    repository for every lookup.
+
+    Instances are not thread-safe, and are normally managed by a
+    :py:class:`GitCatFilePool`.
+
+    Version Added:
+        7.0
+    """
+
+    ######################
+    # Instance variables #
+    ######################
+
+    #: Whether this only looks up types and sizes of objects.
+    batch_check: bool
+
+    #: The time this process was last used, from :py:func:`time.monotonic`.
+    last_used: float
+
+    def __init__(
+        self,
+        git_dir: str,
+        *,
+        batch_check: bool = False,
+        local_site_name: Optional[str] = None,
+    ) -> None:
+        """Start the process.
+
+        Args:
+            git_dir (str):
+                The path to the Git repository.
+
+            batch_check (bool, optional):
+                Whether to only look up types and sizes of objects, rather
+                than their contents.
+
+            local_site_name (str, optional):
+                The name of the Local Site owning the repository, if any.
+
+        Raises:
+            OSError:
+                The process could not be started.
+        """
+        if batch_check:
+            batch_option = '--batch-check'
+        else:
+            batch_option = '--batch'
+
+        self.batch_check = batch_check
+        self.last_used = time.monotonic()
+        self._process = SCMTool.popen(
+            ['git', '--git-dir=%s' % git_dir, 'cat-file', batch_option],
+            local_site_name=local_site_name,
+            stdin=subprocess.PIPE,
+            stderr=subprocess.DEVNULL)
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the process is still running.
+
+        Type:
+            bool
+        """
+        return self._process.poll() is None
+
+    def lookup(
+        self,
+        object_name: str,
+    ) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """Look up an object.
+
+        Args:
+            object_name (str):
+                The name of the object to look up. This can be anything
+                understood by :command:`git rev-parse`, but must not contain
+                a newline.
+
+        Returns:
+            tuple:
+            A 2-tuple containing:
+
+            Tuple:
+                0 (bytes):
+                    The type of the object (such as ``b'blob'``), or
+                    ``None`` if the object could not be found.
+
+                1 (bytes):
+                    The contents of the object, or ``None`` if the object
+                    could not be found or if this is a batch-check process.
+
+        Raises:
+            OSError:
+                The process exited or could not be communicated with.
+        """
+        assert '\n' not in object_name
+
+        process = self._process
+        stdin = process.stdin
+        stdout = process.stdout
+        assert stdin is not None
+        assert stdout is not None
+
+        self.last_used = time.monotonic()
+
+        stdin.write(object_name.encode('utf-8') + b'\n')
+        stdin.flush()
+
+        header = stdout.readline()
+
+        if not header.endswith(b'\n'):
+            raise OSError('git cat-file exited unexpectedly')
+
+        header_parts = header.split()
+
+        if len(header_parts) != 3:
+            # This is "<name> missing" or "<name> ambiguous".
+            return None, None
+
+        object_type = header_parts[1]
+
+        if self.batch_check:
+            return object_type, None
+
+        size = int(header_parts[2])
+        contents = stdout.read(size)
+
+        # The contents are followed by a newline.
+        if len(contents) != size or stdout.read(1) != b'\n':
+            raise OSError('git cat-file exited unexpectedly')
+
+        return object_type, contents
+
+    def close(self) -> None:
+        """Stop the process."""
+        process = self._process
+
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        finally:
+            if process.stdout is not None:
+                process.stdout.close()
+
+
+class GitCatFilePool:
+    """A pool of :command:`git cat-file` processes for a repository.
+
+    Lookups are handed out to idle processes in the pool, starting new ones
+    as needed, up to a maximum number of processes. If all processes are
+    busy, lookups will wait for one to become available.
+
+    Processes that have been idle longer than the idle timeout are stopped.
+    If a process crashes during a lookup, it's discarded and the lookup is
+    retried once with a new process.
+
+    Pools are shared by all :py:class:`GitClient` instances for a repository
+    within a process. They should be fetched through :py:meth:`get`.
+
+    Version Added:
+        7.0
+    """
+
+    #: The default maximum number of processes per pool.
+    DEFAULT_MAX_PROCESSES = 4
+
+    #: The default number of seconds a process can be idle before stopping.
+    DEFAULT_IDLE_TIMEOUT = 60
+
+    _pools: Dict[Tuple[str, bool, Optional[str]], 'GitCatFilePool'] = {}
+    _pools_lock = threading.Lock()
+    _pools_pid: Optional[int] = None
+
+    @classmethod
+    def get(
+        cls,
+        git_dir: str,
+        *,
+        batch_check: bool = False,
+        local_site_name: Optional[str] = None,
+    ) -> 'GitCatFilePool':
+        """Return the shared pool for a repository.
+
+        Args:
+            git_dir (str):
+                The path to the Git repository.
+
+            batch_check (bool, optional):
+                Whether to return the pool for looking up only types and
+                sizes of objects.
+
+            local_site_name (str, optional):
+                The name of the Local Site owning the repository, if any.
+
+        Returns:
+            GitCatFilePool:
+            The pool for the repository.
+        """
+        key = (git_dir, batch_check, local_site_name)
+
+        with cls._pools_lock:
+            pid = os.getpid()
+
+            if cls._pools_pid != pid:
+                # This is either the first use or a new forked process.
+                # Processes from a parent process can't be shared, so start
+                # fresh.
+                cls._pools = {}
+                cls._pools_pid = pid
+
+            try:
+                pool = cls._pools[key]
+            except KeyError:
+                pool = cls(git_dir,
+                           batch_check=batch_check,
+                           local_site_name=local_site_name)
+                cls._pools[key] = pool
+
+        return pool
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Stop the processes in all shared pools."""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+
+        for pool in pools:
+            pool.close()
+
+    def __init__(
+        self,
+        git_dir: str,
+        *,
+        batch_check: bool = False,
+        local_site_name: Optional[str] = None,
+        max_processes: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            git_dir (str):
+                The path to the Git repository.
+
+            batch_check (bool, optional):
+                Whether to only look up types and sizes of objects.
+
+            local_site_name (str, optional):
+                The name of the Local Site owning the repository, if any.
+
+            max_processes (int, optional):
+                The maximum number of processes to run at once. Defaults to
+                :py:attr:`DEFAULT_MAX_PROCESSES`.
+
+            idle_timeout (float, optional):
+                The number of seconds a process can be idle before being
+                stopped. Defaults to :py:attr:`DEFAULT_IDLE_TIMEOUT`.
+        """
+        if max_processes is None:
+            max_processes = self.DEFAULT_MAX_PROCESSES
+
+        if idle_timeout is None:
+            idle_timeout = self.DEFAULT_IDLE_TIMEOUT
+
+        self.git_dir = git_dir
+        self.batch_check = batch_check
+        self.local_site_name = local_site_name
+        self.max_processes = max_processes
+        self.idle_timeout = idle_timeout
+
+        self._cond = threading.Condition()
+        self._idle: List[GitCatFileProcess] = []
+        self._num_processes = 0
+        self._reap_timer: Optional[threading.Timer] = None
+
+    @property
+    def num_processes(self) -> int:
+        """The number of running processes in the pool.
+
+        Type:
+            int
+        """
+        with self._cond:
+            return self._num_processes
+
+    def lookup(
+        self,
+        object_name: str,
+    ) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """Look up an object using a process from the pool.
+
+        See :py:meth:`GitCatFileProcess.lookup` for details.
+
+        Args:
+            object_name (str):
+                The name of the object to look up.
+
+        Returns:
+            tuple:
+            A 2-tuple of the object type and contents.
+
+        Raises:
+            OSError:
+                The lookup failed, even after retrying with a new process.
+        """
+        return self.lookup_many([object_name])[0]
+
+    def lookup_many(
+        self,
+        object_names: Sequence[str],
+    ) -> List[Tuple[Optional[bytes], Optional[bytes]]]:
+        """Look up several objects using a single process from the pool.
+
+        The objects are looked up in order over the same process, avoiding
+        the need to wait for a process for each object.
+
+        See :py:meth:`GitCatFileProcess.lookup` for details on the results.
+
+        Version Added:
+            7.0
+
+        Args:
+            object_names (list of str):
+                The names of the objects to look up.
+
+        Returns:
+            list of tuple:
+            A 2-tuple of the object type and contents for each object, in
+            the same order as ``object_names``.
+
+        Raises:
+            OSError:
+                The lookup failed, even after retrying with a new process.
+        """
+        results: List[Tuple[Optional[bytes], Optional[bytes]]] = []
+        retried = False
+
+        while len(results) < len(object_names):
+            process = self._acquire()
+
+            try:
+                for object_name in object_names[len(results):]:
+                    results.append(process.lookup(object_name))
+            except OSError as e:
+                # The process likely crashed. Throw it away, and try the
+                # remaining objects again with a new one.
+                self._discard(process)
+
+                if retried:
+                    raise
+
+                retried = True
+                logger.warning('git cat-file process for %s failed. '
+                               'Retrying with a new process: %s',
+                               self.git_dir, e)
+            except BaseException:
+                # The process may be in the middle of sending a result, so
+                # it can't be reused.
+                self._discard(process)
+                raise
+            else:
+                self._release(process)
+
+        return results
+
+    def close(self) -> None:
+        """Stop all idle processes in the pool.
+
+        Processes currently performing lookups will be returned to the pool
+        when finished.
+        """
+        with self._cond:
+            idle = self._idle
+            self._idle = []
+            self._num_processes -= len(idle)
+
+            if self._reap_timer is not None:
+                self._reap_timer.cancel()
+                self._reap_timer = None
+
+            self._cond.notify_all()
+
+        for process in idle:
+            process.close()
+
+    def reap_idle(self) -> None:
+        """Stop any processes that have exceeded the idle timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+
+        with self._cond:
+            self._reap_timer = None
+            expired = [
+                process
+                for process in self._idle
+                if process.last_used <= cutoff or not process.is_alive
+            ]
+
+            if expired:
+                self._idle = [
+                    process
+                    for process in self._idle
+                    if process not in expired
+                ]
+                self._num_processes -= len(expired)
+                self._cond.notify_all()
+
+            self._schedule_reap()
+
+        for process in expired:
+            process.close()
+
+    def _acquire(self) -> GitCatFileProcess:
+        """Return a process for a lookup.
+
+        This will return an idle process if available, start a new process
+        if under the limit, or otherwise wait for a process to be released.
+
+        Returns:
+            GitCatFileProcess:
+            The process to use.
+        """
+        with self._cond:
+            while True:
+                while self._idle:
+                    process = self._idle.pop()
+
+                    if process.is_alive:
+                        return process
+
+                    # This died while idle. Clean it up and try the next.
+                    self._num_processes -= 1
+                    process.close()
+
+                if self._num_processes < self.max_processes:
+                    self._num_processes += 1
+                    break
+
+                self._cond.wait()
+
+        try:
+            return GitCatFileProcess(self.git_dir,
+                                     batch_check=self.batch_check,
+                                     local_site_name=self.local_site_name)
+        except BaseException:
+            with self._cond:
+                self._num_processes -= 1
+                self._cond.notify()
+
+            raise
+
+    def _release(
+        self,
+        process: GitCatFileProcess,
+    ) -> None:
+        """Return a process to the pool after a lookup.
+
+        Args:
+            process (GitCatFileProcess):
+                The process to return.
+        """
+        with self._cond:
+            self._idle.append(process)
+            self._schedule_reap()
+            self._cond.notify()
+
+    def _discard(
+        self,
+        process: GitCatFileProcess,
+    ) -> None:
+        """Stop a process and remove it from the pool.
+
+        Args:
+            process (GitCatFileProcess):
+                The process to discard.
+        """
+        process.close()
+
+        with self._cond:
+            self._num_processes -= 1
+            self._cond.notify()
+
+    def _schedule_reap(self) -> None:
+        """Schedule stopping idle processes, if not already scheduled.
+
+        This must be called with the lock held.
+        """
+        if self._reap_timer is None and self._idle:
+            timer = threading.Timer(self.idle_timeout, self.reap_idle)
+            timer.daemon = True
+            timer.start()
+
+            self._reap_timer = timer
+
+
 class GitClient(SCMClient):
     FULL_SHA1_LENGTH = 40
 
@@ -837,6 +1380,72 @@ class GitClient(SCMClient):
         else:
             return self._cat_file(path, revision, "blob")
 
+    def get_files(self, files):
+        """Return the contents of several files.
+
+        For local repositories, all the files are looked up using a single
+        pooled git-cat-file process. Otherwise, each file is fetched in turn.
+
+        Version Added:
+            7.0
+
+        Args:
+            files (list of tuple):
+                A list of 2-tuples of the path and revision of each file to
+                fetch.
+
+        Returns:
+            list:
+            The contents of each file (as bytes) or the exception raised when
+            fetching it, in the same order as ``files``.
+        """
+        results = [None] * len(files)
+        batch = []
+
+        for i, (path, revision) in enumerate(files):
+            if self.git_dir and not self.raw_file_url:
+                try:
+                    commit = self._resolve_head(revision, path)
+                except SCMError as e:
+                    results[i] = e
+                    continue
+
+                if '\n' not in commit:
+                    batch.append((i, path, commit))
+                    continue
+
+            try:
+                results[i] = self.get_file(path, revision)
+            except Exception as e:
+                results[i] = e
+
+        if batch:
+            pool = GitCatFilePool.get(self.git_dir,
+                                      local_site_name=self.local_site_name)
+
+            try:
+                lookups = pool.lookup_many([
+                    commit
+                    for i, path, commit in batch
+                ])
+            except OSError as e:
+                for i, path, commit in batch:
+                    results[i] = self._make_cat_file_error(commit, e)
+            else:
+                for (i, path, commit), (object_type, contents) in zip(batch,
+                                                                      lookups):
+                    try:
+                        results[i] = self._get_cat_file_result(
+                            path=path,
+                            commit=commit,
+                            option='blob',
+                            object_type=object_type,
+                            contents=contents)
+                    except SCMError as e:
+                        results[i] = e
+
+        return results
+
     def get_file_exists(self, path, revision):
         if self.raw_file_url:
             try:
@@ -879,9 +1488,16 @@ class GitClient(SCMClient):
 
         Otherwise, "option" can be used to pass a switch to git-cat-file,
         e.g. to test or existence or get the type of "commit".
+
+        Blob contents and types are looked up using a shared pool of
+        long-running git-cat-file processes for the repository (see
+        :py:class:`GitCatFilePool`).
         """
         commit = self._resolve_head(revision, path)
 
+        if self.git_dir and option in ('blob', '-t') and '\n' not in commit:
+            return self._cat_file_batch(path, commit, option)
+
         p = self._run_git(['--git-dir=%s' % self.git_dir, 'cat-file',
                            option, commit])
         contents = force_bytes(p.stdout.read())
@@ -896,6 +1512,123 @@ class GitClient(SCMClient):
 
         return contents
 
+    def _cat_file_batch(self, path, commit, option):
+        """Look up a blob's content or an object's type using a pool.
+
+        Version Added:
+            7.0
+
+        Args:
+            path (str):
+                The path of the file being looked up.
+
+            commit (str):
+                The name of the object to look up.
+
+            option (str):
+                Either ``blob``, to return the contents of a blob, or ``-t``
+                to return the type of an object.
+
+        Returns:
+            bytes:
+            The contents or type of the object.
+
+        Raises:
+            reviewboard.scmtools.errors.FileNotFoundError:
+                The object could not be found.
+
+            reviewboard.scmtools.errors.SCMError:
+                The object was not a blob, or git-cat-file failed.
+        """
+        pool = GitCatFilePool.get(self.git_dir,
+                                  batch_check=(option == '-t'),
+                                  local_site_name=self.local_site_name)
+
+        try:
+            object_type, contents = pool.lookup(commit)
+        except OSError as e:
+            raise self._make_cat_file_error(commit, e)
+
+        return self._get_cat_file_result(path=path,
+                                         commit=commit,
+                                         option=option,
+                                         object_type=object_type,
+                                         contents=contents)
+
+    def _get_cat_file_result(self, path, commit, option, object_type,
+                             contents):
+        """Return the result of a pooled git-cat-file lookup.
+
+        Version Added:
+            7.0
+
+        Args:
+            path (str):
+                The path of the file being looked up.
+
+            commit (str):
+                The name of the object that was looked up.
+
+            option (str):
+                Either ``blob``, to return the contents of a blob, or ``-t``
+                to return the type of an object.
+
+            object_type (bytes):
+                The type of the object, or ``None`` if it was not found.
+
+            contents (bytes):
+                The contents of the object, or ``None`` if it was not found.
+
+        Returns:
+            bytes:
+            The contents or type of the object.
+
+        Raises:
+            reviewboard.scmtools.errors.FileNotFoundError:
+                The object could not be found.
+
+            reviewboard.scmtools.errors.SCMError:
+                The object was not a blob.
+        """
+        if object_type is None:
+            raise FileNotFoundError(path, revision=commit)
+
+        if option == '-t':
+            return object_type
+
+        if object_type != b'blob':
+            raise SCMError(_('"%(commit)s" is a %(type)s, not a file')
+                           % {
+                               'commit': commit,
+                               'type': object_type.decode('utf-8'),
+                           })
+
+        return contents
+
+    def _make_cat_file_error(self, commit, error):
+        """Return an error for a failed pooled git-cat-file lookup.
+
+        Version Added:
+            7.0
+
+        Args:
+            commit (str):
+                The name of the object being looked up.
+
+            error (OSError):
+                The error from the lookup.
+
+        Returns:
+            reviewboard.scmtools.errors.SCMError:
+            The error to raise or return.
+        """
+        return SCMError(_('Unable to look up "%(commit)s" in the local '
+                          'Git repository: %(error)s')
+                        % {
+                            'commit': commit,
+                            'error': error,
+                        })
+
     def _resolve_head(self, revision, path):
         if revision == HEAD:
             if path == "":
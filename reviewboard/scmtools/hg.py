@@ -4,6 +4,12 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import re
+import struct
+import subprocess
+import threading
+import time
 from datetime import datetime
 from typing import Any, Optional, TYPE_CHECKING, Union
 from urllib.parse import quote as urllib_quote, urlparse
@@ -25,8 +31,6 @@ from reviewboard.scmtools.errors import FileNotFoundError, SCMError
 from reviewboard.scmtools.git import GitDiffParser, strip_git_symlink_mode
 
 if TYPE_CHECKING:
-    import subprocess
-
     from reviewboard.diffviewer.parser import ParsedDiffFile
     from reviewboard.scmtools.core import (
         FileLookupContext,
@@ -50,10 +54,17 @@ class HgTool(SCMTool):
     diffs_use_absolute_paths = True
     supports_history = True
     supports_post_commit = True
+    supports_file_index = True
     dependencies = {
         'executables': ['hg'],
     }
 
+    #: A regex matching a full or abbreviated changeset ID.
+    #:
+    #: Version Added:
+    #:     7.0
+    CHANGESET_ID_RE = re.compile(r'^[0-9a-f]{12,40}$')
+
     def __init__(
         self,
         repository: Repository,
@@ -127,6 +138,79 @@ class HgTool(SCMTool):
             str(revision),
             base_commit_id=base_commit_id)
 
+    def get_file_index_revision(
+        self,
+        revision: RevisionID,
+        context: Optional[FileLookupContext] = None,
+        **kwargs,
+    ) -> Optional[str]:
+        """Return the revision to list when checking for a file.
+
+        Only changeset IDs can be listed, since they always refer to the same
+        set of files. Repositories accessed over HTTP can't be listed.
+
+        Version Added:
+            7.0
+
+        Args:
+            revision (reviewboard.scmtools.core.Revision):
+                The revision of the file being checked.
+
+            context (reviewboard.scmtools.core.FileLookupContext, optional):
+                Extra context used to help look up the file.
+
+            **kwargs (dict, unused):
+                Additional keyword arguments.
+
+        Returns:
+            str:
+            The changeset ID to list, or ``None`` if the file must be checked
+            individually.
+        """
+        if not isinstance(self.client, HgClient):
+            return None
+
+        if context is not None and context.base_commit_id is not None:
+            # This overrides the revision when fetching files. See
+            # HgClient.cat_file().
+            revision = context.base_commit_id
+
+        revision = str(revision)
+
+        if self.CHANGESET_ID_RE.match(revision):
+            return revision
+
+        return None
+
+    def list_files(
+        self,
+        revision: str,
+        **kwargs,
+    ) -> list[str]:
+        """Return the paths of all files in a changeset.
+
+        Version Added:
+            7.0
+
+        Args:
+            revision (str):
+                The changeset ID to list.
+
+            **kwargs (dict, unused):
+                Additional keyword arguments.
+
+        Returns:
+            list of str:
+            The paths of all files in the changeset.
+
+        Raises:
+            reviewboard.scmtools.errors.SCMError:
+                The files could not be listed.
+        """
+        assert isinstance(self.client, HgClient)
+
+        return self.client.list_files(revision)
+
     def parse_diff_revision(
         self,
         filename: bytes,
@@ -403,6 +487,17 @@ class HgTool(SCMTool):
 class HgDiffParser(DiffParser):
     """Diff parser for native Mercurial diffs."""
 
+    #: Prefixes for any line that may begin a file's headers.
+    #:
+    #: Version Added:
+    #:     7.0
+    FILE_HEADER_PREFIXES = (
+        b'# Parent',
+        b'diff -r',
+        b'Binary file ',
+        b'--- ',
+    )
+
     def __init__(
         self,
         data: bytes,
@@ -894,8 +989,553 @@ class HgWebClient(SCMClient):
         return json.loads(contents.decode('utf-8'))
 
 
+class HgCommandServer:
+    """A long-running Mercurial command server process.
+
+    This wraps a :command:`hg serve --cmdserver pipe` process, sending
+    commands over stdin and reading results from stdout using Mercurial's
+    command server protocol. This avoids the cost of starting a new
+    Mercurial interpreter and opening the repository for every command.
+
+    Instances are not thread-safe, and are normally managed by a
+    :py:class:`HgCommandServerPool`.
+
+    Version Added:
+        7.0
+    """
+
+    ######################
+    # Instance variables #
+    ######################
+
+    #: The time this process was last used, from :py:func:`time.monotonic`.
+    last_used: float
+
+    def __init__(
+        self,
+        hg_args: list[str],
+        *,
+        local_site_name: Optional[str] = None,
+    ) -> None:
+        """Start the process.
+
+        Args:
+            hg_args (list of str):
+                The global arguments to pass to :command:`hg`, such as the
+                repository path.
+
+            local_site_name (str, optional):
+                The name of the Local Site owning the repository, if any.
+
+        Raises:
+            OSError:
+                The process could not be started, or did not respond as a
+                command server.
+        """
+        self.last_used = time.monotonic()
+        self._process = SCMTool.popen(
+            ['hg'] + hg_args + ['serve', '--cmdserver', 'pipe'],
+            local_site_name=local_site_name,
+            stdin=subprocess.PIPE,
+            stderr=subprocess.DEVNULL)
+
+        try:
+            channel, data = self._read_channel()
+
+            if channel != b'o':
+                raise OSError('Unexpected Mercurial command server '
+                              'channel %r' % channel)
+
+            capabilities: list[bytes] = []
+
+            for line in data.splitlines():
+                if line.startswith(b'capabilities:'):
+                    capabilities = line.split(b':', 1)[1].split()
+
+            if b'runcommand' not in capabilities:
+                raise OSError('The Mercurial command server does not '
+                              'support runcommand')
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the process is still running.
+
+        Type:
+            bool
+        """
+        return self._process.poll() is None
+
+    def run_command(
+        self,
+        args: list[str],
+    ) -> tuple[int, bytes, bytes]:
+        """Run a Mercurial command.
+
+        Args:
+            args (list of str):
+                The arguments for the command, as would be passed to
+                :command:`hg`.
+
+        Returns:
+            tuple:
+            A 3-tuple containing:
+
+            Tuple:
+                0 (int):
+                    The exit code of the command.
+
+                1 (bytes):
+                    The standard output of the command.
+
+                2 (bytes):
+                    The standard error of the command.
+
+        Raises:
+            OSError:
+                The process exited or could not be communicated with.
+        """
+        stdin = self._process.stdin
+        assert stdin is not None
+
+        self.last_used = time.monotonic()
+
+        data = b'\0'.join(
+            arg.encode('utf-8')
+            for arg in args
+        )
+
+        stdin.write(b'runcommand\n' + struct.pack('>I', len(data)) + data)
+        stdin.flush()
+
+        stdout: list[bytes] = []
+        stderr: list[bytes] = []
+
+        while True:
+            channel, data = self._read_channel()
+
+            if channel == b'o':
+                stdout.append(data)
+            elif channel == b'e':
+                stderr.append(data)
+            elif channel == b'r':
+                return (struct.unpack('>i', data)[0],
+                        b''.join(stdout),
+                        b''.join(stderr))
+            elif channel in (b'I', b'L'):
+                # Commands are run non-interactively, so there's no input
+                # to provide.
+                stdin.write(struct.pack('>I', 0))
+                stdin.flush()
+            elif channel.isupper():
+                raise OSError('Unexpected required Mercurial command server '
+                              'channel %r' % channel)
+
+    def close(self) -> None:
+        """Stop the process."""
+        process = self._process
+
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        finally:
+            if process.stdout is not None:
+                process.stdout.close()
+
+    def _read_channel(self) -> tuple[bytes, bytes]:
+        """Read a message from the command server.
+
+        Returns:
+            tuple:
+            A 2-tuple containing:
+
+            Tuple:
+                0 (bytes):
+                    The channel of the message.
+
+                1 (bytes):
+                    The data of the message. This will be empty for input
+                    channels, which request data instead of sending it.
+
+        Raises:
+            OSError:
+                The process exited or could not be communicated with.
+        """
+        stdout = self._process.stdout
+        assert stdout is not None
+
+        header = stdout.read(5)
+
+        if len(header) != 5:
+            raise OSError('The Mercurial command server exited unexpectedly')
+
+        channel = header[:1]
+        length = struct.unpack('>I', header[1:])[0]
+
+        if channel in (b'I', b'L'):
+            # The length is the amount of input requested.
+            return channel, b''
+
+        data = stdout.read(length)
+
+        if len(data) != length:
+            raise OSError('The Mercurial command server exited unexpectedly')
+
+        return channel, data
+
+
+class HgCommandServerPool:
+    """A pool of Mercurial command servers for a repository.
+
+    Commands are handed out to idle processes in the pool, starting new ones
+    as needed, up to a maximum number of processes. If all processes are
+    busy, commands will wait for one to become available.
+
+    Processes that have been idle longer than the idle timeout are stopped.
+    If a process crashes during a command, it's discarded and the command is
+    retried once with a new process.
+
+    If a command server can't be started at all (for instance, if the
+    installed version of Mercurial doesn't support it), the pool is
+    disabled, and callers should fall back to running :command:`hg`
+    directly.
+
+    Pools are shared by all :py:class:`HgClient` instances for a repository
+    within a process. They should be fetched through :py:meth:`get`.
+
+    Version Added:
+        7.0
+    """
+
+    #: The default maximum number of processes per pool.
+    DEFAULT_MAX_PROCESSES = 4
+
+    #: The default number of seconds a process can be idle before stopping.
+    DEFAULT_IDLE_TIMEOUT = 60
+
+    _pools: dict[tuple[tuple[str, ...], Optional[str]],
+                 HgCommandServerPool] = {}
+    _pools_lock = threading.Lock()
+    _pools_pid: Optional[int] = None
+
+    ######################
+    # Instance variables #
+    ######################
+
+    #: Whether command servers can be used for this repository.
+    enabled: bool
+
+    @classmethod
+    def get(
+        cls,
+        hg_args: list[str],
+        *,
+        local_site_name: Optional[str] = None,
+    ) -> HgCommandServerPool:
+        """Return the shared pool for a repository.
+
+        Args:
+            hg_args (list of str):
+                The global arguments to pass to :command:`hg` when starting
+                command servers.
+
+            local_site_name (str, optional):
+                The name of the Local Site owning the repository, if any.
+
+        Returns:
+            HgCommandServerPool:
+            The pool for the repository.
+        """
+        key = (tuple(hg_args), local_site_name)
+
+        with cls._pools_lock:
+            pid = os.getpid()
+
+            if cls._pools_pid != pid:
+                # This is either the first use or a new forked process.
+                # Processes from a parent process can't be shared, so start
+                # fresh.
+                cls._pools = {}
+                cls._pools_pid = pid
+
+            try:
+                pool = cls._pools[key]
+            except KeyError:
+                pool = cls(hg_args,
+                           local_site_name=local_site_name)
+                cls._pools[key] = pool
+
+        return pool
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Stop the processes in all shared pools."""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+
+        for pool in pools:
+            pool.close()
+
+    def __init__(
+        self,
+        hg_args: list[str],
+        *,
+        local_site_name: Optional[str] = None,
+        max_processes: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            hg_args (list of str):
+                The global arguments to pass to :command:`hg` when starting
+                command servers.
+
+            local_site_name (str, optional):
+                The name of the Local Site owning the repository, if any.
+
+            max_processes (int, optional):
+                The maximum number of processes to run at once. Defaults to
+                :py:attr:`DEFAULT_MAX_PROCESSES`.
+
+            idle_timeout (float, optional):
+                The number of seconds a process can be idle before being
+                stopped. Defaults to :py:attr:`DEFAULT_IDLE_TIMEOUT`.
+        """
+        if max_processes is None:
+            max_processes = self.DEFAULT_MAX_PROCESSES
+
+        if idle_timeout is None:
+            idle_timeout = self.DEFAULT_IDLE_TIMEOUT
+
+        self.hg_args = hg_args
+        self.local_site_name = local_site_name
+        self.max_processes = max_processes
+        self.idle_timeout = idle_timeout
+        self.enabled = True
+
+        self._cond = threading.Condition()
+        self._idle: list[HgCommandServer] = []
+        self._num_processes = 0
+        self._reap_timer: Optional[threading.Timer] = None
+
+    @property
+    def num_processes(self) -> int:
+        """The number of running processes in the pool.
+
+        Type:
+            int
+        """
+        with self._cond:
+            return self._num_processes
+
+    def run_command(
+        self,
+        args: list[str],
+    ) -> tuple[int, bytes, bytes]:
+        """Run a Mercurial command using a process from the pool.
+
+        See :py:meth:`HgCommandServer.run_command` for details.
+
+        Args:
+            args (list of str):
+                The arguments for the command.
+
+        Returns:
+            tuple:
+            A 3-tuple of the exit code, standard output, and standard error
+            of the command.
+
+        Raises:
+            OSError:
+                The command could not be run, even after retrying with a new
+                process.
+        """
+        retried = False
+
+        while True:
+            try:
+                process = self._acquire()
+            except OSError as e:
+                logger.warning('Unable to start a Mercurial command server '
+                               'with arguments %r. Falling back to running '
+                               'hg for each command: %s',
+                               self.hg_args, e)
+                self.enabled = False
+                raise
+
+            try:
+                result = process.run_command(args)
+            except OSError as e:
+                # The process likely crashed. Throw it away, and try again
+                # with a new one.
+                self._discard(process)
+
+                if retried:
+                    raise
+
+                retried = True
+                logger.warning('Mercurial command server with arguments %r '
+                               'failed. Retrying with a new process: %s',
+                               self.hg_args, e)
+            except BaseException:
+                # The process may be in the middle of sending a result, so
+                # it can't be reused.
+                self._discard(process)
+                raise
+            else:
+                self._release(process)
+
+                return result
+
+    def close(self) -> None:
+        """Stop all idle processes in the pool.
+
+        Processes currently running commands will be returned to the pool
+        when finished.
+        """
+        with self._cond:
+            idle = self._idle
+            self._idle = []
+            self._num_processes -= len(idle)
+
+            if self._reap_timer is not None:
+                self._reap_timer.cancel()
+                self._reap_timer = None
+
+            self._cond.notify_all()
+
+        for process in idle:
+            process.close()
+
+    def reap_idle(self) -> None:
+        """Stop any processes that have exceeded the idle timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+
+        with self._cond:
+            self._reap_timer = None
+            expired = [
+                process
+                for process in self._idle
+                if process.last_used <= cutoff or not process.is_alive
+            ]
+
+            if expired:
+                self._idle = [
+                    process
+                    for process in self._idle
+                    if process not in expired
+                ]
+                self._num_processes -= len(expired)
+                self._cond.notify_all()
+
+            self._schedule_reap()
+
+        for process in expired:
+            process.close()
+
+    def _acquire(self) -> HgCommandServer:
+        """Return a process for a command.
+
+        This will return an idle process if available, start a new process
+        if under the limit, or otherwise wait for a process to be released.
+
+        Returns:
+            HgCommandServer:
+            The process to use.
+
+        Raises:
+            OSError:
+                A new process could not be started.
+        """
+        with self._cond:
+            while True:
+                while self._idle:
+                    process = self._idle.pop()
+
+                    if process.is_alive:
+                        return process
+
+                    # This died while idle. Clean it up and try the next.
+                    self._num_processes -= 1
+                    process.close()
+
+                if self._num_processes < self.max_processes:
+                    self._num_processes += 1
+                    break
+
+                self._cond.wait()
+
+        try:
+            return HgCommandServer(self.hg_args,
+                                   local_site_name=self.local_site_name)
+        except BaseException:
+            with self._cond:
+                self._num_processes -= 1
+                self._cond.notify()
+
+            raise
+
+    def _release(
+        self,
+        process: HgCommandServer,
+    ) -> None:
+        """Return a process to the pool after a command.
+
+        Args:
+            process (HgCommandServer):
+                The process to return.
+        """
+        with self._cond:
+            self._idle.append(process)
+            self._schedule_reap()
+            self._cond.notify()
+
+    def _discard(
+        self,
+        process: HgCommandServer,
+    ) -> None:
+        """Stop a process and remove it from the pool.
+
+        Args:
+            process (HgCommandServer):
+                The process to discard.
+        """
+        process.close()
+
+        with self._cond:
+            self._num_processes -= 1
+            self._cond.notify()
+
+    def _schedule_reap(self) -> None:
+        """Schedule stopping idle processes, if not already scheduled.
+
+        This must be called with the lock held.
+        """
+        if self._reap_timer is None and self._idle:
+            timer = threading.Timer(self.idle_timeout, self.reap_idle)
+            timer.daemon = True
+            timer.start()
+
+            self._reap_timer = timer
+
+
 class HgClient(SCMClient):
-    """Client implementation for using the hg tool."""
+    """Client implementation for using the hg tool.
+
+    Version Changed:
+        7.0:
+        Commands are now run through a pool of Mercurial command servers
+        (see :py:class:`HgCommandServerPool`) by default, rather than by
+        starting :command:`hg` for every command.
+    """
 
     COMMITS_PAGE_LIMIT = '31'
 
@@ -903,19 +1543,33 @@ class HgClient(SCMClient):
         self,
         path: str,
         local_site_name: Optional[str],
+        use_command_server: bool = True,
     ) -> None:
         """Initialize the client.
 
+        Version Changed:
+            7.0:
+            Added ``use_command_server``.
+
         Args:
             path (str):
                 The path to the repository.
 
             local_site_name (str, optional):
                 The name of the Local Site that the repository is part of.
+
+            use_command_server (bool, optional):
+                Whether to run commands through a pool of Mercurial command
+                servers. If the command servers can't be used, this will
+                fall back to running :command:`hg` for each command.
+
+                Version Added:
+                    7.0
         """
         super().__init__(path)
         self.default_args = None
         self.local_site_name = local_site_name
+        self.use_command_server = use_command_server
 
     def cat_file(
         self,
@@ -954,16 +1608,48 @@ class HgClient(SCMClient):
             rev = ""
 
         if path:
-            with self._run_hg(['cat', '--rev', str(rev), path]) as p:
-                assert p.stdout is not None
-                contents = p.stdout.read()
-                failure = p.wait()
+            failure, contents, errors = self._run_command(
+                ['cat', '--rev', str(rev), path])
 
             if not failure:
                 return contents
 
         raise FileNotFoundError(path, rev)
 
+    def list_files(
+        self,
+        rev: str,
+    ) -> list[str]:
+        """Return the paths of all files in a changeset.
+
+        Version Added:
+            7.0
+
+        Args:
+            rev (str):
+                The changeset to list.
+
+        Returns:
+            list of str:
+            The paths of all files in the changeset.
+
+        Raises:
+            reviewboard.scmtools.errors.SCMError:
+                The files could not be listed.
+        """
+        failure, contents, errors = self._run_command(
+            ['files', '--rev', rev, '--print0'])
+
+        if failure:
+            raise SCMError('Cannot list files in %s: %s'
+                           % (rev, force_str(errors)))
+
+        return [
+            force_str(path)
+            for path in contents.split(b'\0')
+            if path
+        ]
+
     def get_branches(self) -> list[Branch]:
         """Return open/inactive branches from repository in JSON.
 
@@ -971,21 +1657,20 @@ class HgClient(SCMClient):
             list of reviewboard.scmtools.core.Branch:
             The list of the branches.
         """
-        with self._run_hg(['branches', '--template', 'json']) as p:
-            if p.wait() != 0:
-                assert p.stderr is not None
-                raise SCMError('Cannot load branches: %s' % p.stderr.read())
-
-            assert p.stdout is not None
+        failure, contents, errors = self._run_command(
+            ['branches', '--template', 'json'])
 
-            return [
-                Branch(
-                    id=data['branch'],
-                    commit=data['node'],
-                    default=(data['branch'] == 'default'))
-                for data in json.loads(force_str(p.stdout.read()))
-                if not data['closed']
-            ]
+        if failure:
+            raise SCMError('Cannot load branches: %s' % errors)
+
+        return [
+            Branch(
+                id=data['branch'],
+                commit=data['node'],
+                default=(data['branch'] == 'default'))
+            for data in json.loads(force_str(contents))
+            if not data['closed']
+        ]
 
     def _get_commits(
         self,
@@ -1007,30 +1692,28 @@ class HgClient(SCMClient):
         """
         cmd = ['log'] + revset + ['--template', 'json']
 
-        with self._run_hg(cmd) as p:
-            if p.wait() != 0:
-                assert p.stderr is not None
-                raise SCMError('Cannot load commits: %s' % p.stderr.read())
+        failure, contents, errors = self._run_command(cmd)
 
-            results = []
+        if failure:
+            raise SCMError('Cannot load commits: %s' % errors)
 
-            assert p.stdout is not None
+        results = []
 
-            for data in json.loads(force_str(p.stdout.read())):
-                try:
-                    parent: Optional[str] = force_str(data['parents'][0])
+        for data in json.loads(force_str(contents)):
+            try:
+                parent: Optional[str] = force_str(data['parents'][0])
 
-                    if parent == INITIAL_COMMIT_ID:
-                        parent = ''
-                except IndexError:
-                    parent = None
+                if parent == INITIAL_COMMIT_ID:
+                    parent = ''
+            except IndexError:
+                parent = None
 
-                results.append(Commit(
-                    id=data['node'],
-                    message=data['desc'],
-                    author_name=data['user'],
-                    date=HgTool.date_tuple_to_iso8601(data['date']),
-                    parent=parent))
+            results.append(Commit(
+                id=data['node'],
+                message=data['desc'],
+                author_name=data['user'],
+                date=HgTool.date_tuple_to_iso8601(data['date']),
+                parent=parent))
 
         return results
 
@@ -1087,17 +1770,12 @@ class HgClient(SCMClient):
             commit = changesets[0]
             cmd = ['diff', '-c', revision]
 
-            with self._run_hg(cmd) as p:
+            failure, contents, errors = self._run_command(cmd)
 
-                if p.wait() != 0:
-                    assert p.stderr is not None
+            if failure:
+                raise SCMError(f'Cannot load patch {revision}: {errors}')
 
-                    e = p.stderr.read()
-                    raise SCMError(f'Cannot load patch {revision}: {e}')
-
-                assert p.stdout is not None
-
-                commit.diff = p.stdout.read()
+            commit.diff = contents
 
             return commit
 
@@ -1135,11 +1813,8 @@ class HgClient(SCMClient):
         self,
         config_name: str,
     ) -> Optional[str]:
-        with self._run_hg(['showconfig', config_name]) as p:
-            assert p.stdout is not None
-
-            contents = p.stdout.read()
-            failure = p.wait()
+        failure, contents, errors = self._run_command(
+            ['showconfig', config_name])
 
         if failure:
             # Just assume it's empty.
@@ -1147,6 +1822,56 @@ class HgClient(SCMClient):
 
         return contents.strip()
 
+    def _run_command(
+        self,
+        args: list[str],
+    ) -> tuple[int, bytes, bytes]:
+        """Run a Mercurial command and return its results.
+
+        If enabled, this will run the command through a pooled Mercurial
+        command server. Otherwise, or if a command server can't be used,
+        :command:`hg` will be run directly.
+
+        Version Added:
+            7.0
+
+        Args:
+            args (list of str):
+                The arguments to add to the :command:`hg` command.
+
+        Returns:
+            tuple:
+            A 3-tuple of the exit code, standard output, and standard error
+            of the command.
+        """
+        if not self.default_args:
+            self._calculate_default_args()
+
+        assert self.default_args is not None
+
+        if self.use_command_server:
+            pool = HgCommandServerPool.get(
+                [
+                    '--noninteractive',
+                    '--repository', self.path,
+                    '--cwd', self.path,
+                ],
+                local_site_name=self.local_site_name)
+
+            if pool.enabled:
+                try:
+                    return pool.run_command(self.default_args + args)
+                except OSError as e:
+                    logger.warning('Unable to run Mercurial command %r on '
+                                   'a command server. Running hg directly: '
+                                   '%s',
+                                   args, e)
+
+        with self._run_hg(args) as p:
+            contents, errors = p.communicate()
+
+        return p.returncode, contents, errors
+
     def _run_hg(
         self,
         args: list[str],
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import uuid
+from collections import Counter
 from importlib import import_module
 from time import time
 from typing import ClassVar
@@ -25,19 +26,44 @@ from reviewboard.hostingsvcs.base import hosting_service_registry
 from reviewboard.hostingsvcs.errors import MissingHostingServiceError
 from reviewboard.hostingsvcs.models import HostingServiceAccount
 from reviewboard.scmtools import scmtools_registry
-from reviewboard.scmtools.core import FileLookupContext
+from reviewboard.scmtools.core import Commit, FileLookupContext
 from reviewboard.scmtools.crypto_utils import (decrypt_password,
                                                encrypt_password)
+from reviewboard.scmtools.file_cache import get_repository_file_cache
 from reviewboard.scmtools.managers import RepositoryManager, ToolManager
 from reviewboard.scmtools.signals import (checked_file_exists,
                                           checking_file_exists,
                                           fetched_file, fetching_file)
+from reviewboard.scmtools.single_flight import (SingleFlight,
+                                                run_single_flight)
 from reviewboard.site.models import LocalSite
 
 
 logger = logging.getLogger(__name__)
 
 
+class _FileCacheMiss(Exception):
+    """A fetched file was not found in cache.
+
+    This is used internally by :py:class:`Repository` to detect a cache miss
+    without fetching the file.
+
+    Version Added:
+        7.0
+    """
+
+
+class _CommitIndexMiss(Exception):
+    """An index of commits was not found in cache.
+
+    This is used internally by :py:class:`Repository` to detect a cache miss
+    without fetching commits.
+
+    Version Added:
+        7.0
+    """
+
+
 class Tool(models.Model):
     """A configured source code management tool.
 
@@ -164,6 +190,58 @@ class Repository(models.Model):
     #: for a longer period of time. This is set to cache for 1 day.
     COMMITS_CACHE_PERIOD_LONG = 60 * 60 * 24  # 1 day
 
+    #: The period of time to cache the latest commits and branches when
+    #: notified of pushes, in seconds.
+    #:
+    #: Once a webhook has notified Review Board of a push to the repository
+    #: (see :py:meth:`invalidate_commit_caches`), the latest commits and
+    #: branches are kept until the next push, rather than being refreshed
+    #: every :py:attr:`COMMITS_CACHE_PERIOD_SHORT` seconds. This period
+    #: limits how stale they can become if a notification is lost.
+    #:
+    #: Version Added:
+    #:     7.0
+    COMMITS_PUSH_NOTIFIED_CACHE_PERIOD = 60 * 60
+
+    #: The amount of time an index of commits on a branch is cached, in
+    #: seconds.
+    #:
+    #: Version Added:
+    #:     7.0
+    COMMIT_INDEX_CACHE_PERIOD = 60 * 60 * 24  # 1 day
+
+    #: The maximum number of commits stored in an index of commits.
+    #:
+    #: Version Added:
+    #:     7.0
+    COMMIT_INDEX_MAX_COMMITS = 1000
+
+    #: The amount of time a missing file is cached, in seconds.
+    #:
+    #: Negative results from :py:meth:`get_file_exists` are only cached
+    #: briefly, since a file may appear once new commits are pushed.
+    #:
+    #: Version Added:
+    #:     7.0
+    FILE_EXISTS_NEGATIVE_CACHE_PERIOD = 60
+
+    #: The amount of time an index of files in a revision is cached, in
+    #: seconds.
+    #:
+    #: Version Added:
+    #:     7.0
+    FILE_INDEX_CACHE_PERIOD = 60 * 60 * 24  # 1 day
+
+    #: The number of existence checks in a revision before indexing it.
+    #:
+    #: For repositories that support it, once this many file existence
+    #: checks have gone to the repository for the same revision, all files in
+    #: that revision are listed in one query and used for further checks.
+    #:
+    #: Version Added:
+    #:     7.0
+    FILE_INDEX_MIN_LOOKUPS = 3
+
     #: The fallback encoding for text-based files in repositories.
     #:
     #: This is used if the file isn't valid UTF-8, and if the repository
@@ -594,6 +672,13 @@ class Repository(models.Model):
         beginning a file fetch from the repository (if not cached), and the
         :py:data:`~reviewboard.scmtools.signals.fetched_file` signal after.
 
+        Version Changed:
+            7.0:
+            If the on-disk repository file cache is enabled (through
+            :setting:`REPOSITORY_FILE_CACHE_MAX_SIZE`), files no longer in
+            the main cache will be looked up there before being fetched
+            from the repository.
+
         Args:
             path (unicode):
                 The path to the file in the repository.
@@ -659,16 +744,158 @@ class Repository(models.Model):
             context = FileLookupContext(request=request,
                                         base_commit_id=base_commit_id)
 
-        return cache_memoize(
-            self._make_file_cache_key(path=path,
-                                      revision=revision,
-                                      base_commit_id=context.base_commit_id),
-            lambda: [
-                self._get_file_uncached(path=path,
-                                        revision=revision,
-                                        context=context),
-            ],
-            large_data=True)[0]
+        cache_key = self._make_file_cache_key(
+            path=path,
+            revision=revision,
+            base_commit_id=context.base_commit_id)
+
+        found, data = self._get_cached_file(cache_key)
+
+        if found:
+            return data
+
+        def _fetch():
+            data = self._get_file_from_file_cache(cache_key=cache_key,
+                                                  path=path,
+                                                  revision=revision,
+                                                  context=context)
+            self._set_cached_file(cache_key, data)
+
+            return data
+
+        # If another worker is already fetching this file, wait for its
+        # result instead of fetching the file again.
+        return run_single_flight(
+            cache_key,
+            _fetch,
+            load_result=lambda: self._get_cached_file(cache_key))
+
+    def get_files(self, lookups):
+        """Return several files from the repository.
+
+        This works like :py:meth:`get_file`, but fetches any files that
+        aren't already in the cache together, in as few requests to the
+        repository or hosting service as the backend allows.
+
+        The :py:data:`~reviewboard.scmtools.signals.fetching_file` and
+        :py:data:`~reviewboard.scmtools.signals.fetched_file` signals will
+        be sent for each file that isn't cached.
+
+        A failure to fetch one file will not prevent the other files from
+        being fetched. Instead, the exception that :py:meth:`get_file` would
+        have raised is returned in place of the file's contents.
+
+        Version Added:
+            7.0
+
+        Args:
+            lookups (list of reviewboard.scmtools.core.FileLookup):
+                The files to fetch.
+
+        Returns:
+            list:
+            The contents of each file (as bytes) or the exception raised when
+            fetching it, in the same order as ``lookups``.
+
+        Raises:
+            TypeError:
+                One or more of the provided lookups had a path or revision
+                of an invalid type. Details are contained in the error
+                message.
+        """
+        file_cache = get_repository_file_cache()
+        results = [None] * len(lookups)
+        misses = {}
+
+        for i, lookup in enumerate(lookups):
+            if not isinstance(lookup.path, str):
+                raise TypeError('"path" must be a Unicode string, not %s'
+                                % type(lookup.path))
+
+            if not isinstance(lookup.revision, str):
+                raise TypeError('"revision" must be a Unicode string, not %s'
+                                % type(lookup.revision))
+
+            cache_key = self._make_file_cache_key(
+                path=lookup.path,
+                revision=lookup.revision,
+                base_commit_id=lookup.context.base_commit_id)
+
+            if cache_key in misses:
+                # This file was already requested earlier in the batch.
+                misses[cache_key][1].append(i)
+                continue
+
+            found, data = self._get_cached_file(cache_key)
+
+            if found:
+                results[i] = data
+                continue
+
+            if file_cache is not None:
+                data = file_cache.get(cache_key)
+
+                if data is not None:
+                    self._set_cached_file(cache_key, data)
+                    results[i] = data
+                    continue
+
+            misses[cache_key] = (lookup, [i])
+
+        def _fetch(cache_keys):
+            fetched = self._get_files_uncached(
+                [misses[cache_key][0] for cache_key in cache_keys])
+
+            for cache_key, result in zip(cache_keys, fetched):
+                if isinstance(result, bytes):
+                    self._set_cached_file(cache_key, result)
+
+                    if file_cache is not None:
+                        file_cache.set(cache_key, result)
+
+                for i in misses[cache_key][1]:
+                    results[i] = result
+
+        # Fetch any files that no other worker is already fetching, and
+        # then wait for the results of the rest.
+        flights = {
+            cache_key: SingleFlight(cache_key)
+            for cache_key in misses.keys()
+        }
+        owned_keys = [
+            cache_key
+            for cache_key, flight in flights.items()
+            if flight.acquire()
+        ]
+
+        owned_key_set = set(owned_keys)
+
+        if owned_keys:
+            try:
+                _fetch(owned_keys)
+            finally:
+                for cache_key in owned_keys:
+                    flights[cache_key].release()
+
+        unresolved_keys = []
+
+        for cache_key, flight in flights.items():
+            if cache_key in owned_key_set:
+                continue
+
+            found, data = flight.wait(
+                lambda: self._get_cached_file(cache_key))
+
+            if found:
+                for i in misses[cache_key][1]:
+                    results[i] = data
+            else:
+                unresolved_keys.append(cache_key)
+
+        if unresolved_keys:
+            _fetch(unresolved_keys)
+
+        return results
 
     def get_file_exists(self, path, revision, base_commit_id=None,
                         request=None, context=None):
@@ -679,7 +906,14 @@ class Repository(models.Model):
         repository.
 
         The result of this call will be cached, making future lookups
-        of this path and revision on this repository faster.
+        of this path and revision on this repository faster. Missing files
+        are cached for :py:attr:`FILE_EXISTS_NEGATIVE_CACHE_PERIOD`.
+
+        If the SCMTool supports file indexes (see
+        :py:attr:`SCMTool.supports_file_index
+        <reviewboard.scmtools.core.SCMTool.supports_file_index>`), then once
+        several files have been checked in a revision, all the files in that
+        revision will be listed and cached, and used to answer further checks.
 
         This will send the
         :py:data:`~reviewboard.scmtools.signals.checking_file_exists` signal
@@ -750,17 +984,45 @@ class Repository(models.Model):
             revision=revision,
             base_commit_id=context.base_commit_id)
 
-        if cache.get(make_cache_key(key)) == '1':
+        full_key = make_cache_key(key)
+        cached_value = cache.get(full_key)
+
+        if cached_value == '1':
             return True
+        elif cached_value == '0':
+            return False
 
-        exists = self._get_file_exists_uncached(path=path,
-                                                revision=revision,
-                                                context=context)
+        file_index = self._get_file_index(revision=revision,
+                                          context=context)
 
-        if exists:
-            cache_memoize(key, lambda: '1')
+        if file_index is not None:
+            return path in file_index
 
-        return exists
+        def _fetch():
+            exists = self._get_file_exists_uncached(path=path,
+                                                    revision=revision,
+                                                    context=context)
+
+            if exists:
+                cache_memoize(key, lambda: '1', force_overwrite=True)
+            else:
+                # This must last at least as long as any workers may be
+                # waiting on this check.
+                cache.add(full_key, '0',
+                          max(self.FILE_EXISTS_NEGATIVE_CACHE_PERIOD,
+                              SingleFlight.DEFAULT_WAIT_TIMEOUT))
+
+            return exists
+
+        def _load_result():
+            value = cache.get(full_key)
+
+            return value is not None, value == '1'
+
+        # If another worker is already checking this file, wait for its
+        # result instead of checking again.
+        return run_single_flight(key, _fetch,
+                                 load_result=_load_result)
 
     def get_branches(self):
         """Return a list of all branches on the repository.
@@ -786,15 +1048,19 @@ class Repository(models.Model):
         """
         hosting_service = self.hosting_service
 
-        cache_key = make_cache_key('repository-branches:%s' % self.pk)
-
         if hosting_service:
             branches_callable = lambda: hosting_service.get_branches(self)
         else:
             branches_callable = self.get_scmtool().get_branches
 
-        return cache_memoize(cache_key, branches_callable,
-                             self.BRANCHES_CACHE_PERIOD)
+        if self._get_commits_invalidated_time() is None:
+            cache_period = self.BRANCHES_CACHE_PERIOD
+        else:
+            cache_period = self.COMMITS_PUSH_NOTIFIED_CACHE_PERIOD
+
+        return cache_memoize(self._make_branches_cache_key(),
+                             branches_callable,
+                             cache_period)
 
     def get_commit_cache_key(self, commit_id):
         """Return the cache key used for a commit ID.
@@ -829,6 +1095,17 @@ class Repository(models.Model):
         :py:attr:`Commit.parent` of the last entry as the ``start`` parameter
         in order to paginate through the history of commits in the repository.
 
+        The commits on each branch are kept in a compact index in cache. When
+        the latest commits need to be refreshed, any new commits are merged
+        into the index, and older pages of commits are served from the index
+        instead of being fetched again. The latest commits are refreshed
+        after :py:attr:`COMMITS_CACHE_PERIOD_SHORT` seconds, or after a push
+        notification if the repository's webhooks are configured.
+
+        Version Changed:
+            7.0:
+            Added the index of commits on each branch.
+
         Args:
             branch (unicode, optional):
                 The branch to limit commits to. This may not be supported by
@@ -872,15 +1149,28 @@ class Repository(models.Model):
         # the "new review request" page more frequently than they're pushing
         # code, and will usually save 1 API request when they go to actually
         # create a new review request.
-        if branch and start:
-            cache_period = self.COMMITS_CACHE_PERIOD_LONG
+        if start:
+            commits = self._get_commits_from_index(branch=branch,
+                                                   start=start)
+
+            if commits is None:
+                if branch:
+                    cache_period = self.COMMITS_CACHE_PERIOD_LONG
+                else:
+                    cache_period = self.COMMITS_CACHE_PERIOD_SHORT
+
+                cache_key = make_cache_key('repository-commits:%s:%s:%s'
+                                           % (self.pk, branch, start))
+                commits = cache_memoize(cache_key, commits_callable,
+                                        cache_period)
+
+                self._extend_commit_index(branch=branch,
+                                          start=start,
+                                          commits=commits)
         else:
-            cache_period = self.COMMITS_CACHE_PERIOD_SHORT
-
-        cache_key = make_cache_key('repository-commits:%s:%s:%s'
-                                   % (self.pk, branch, start))
-        commits = cache_memoize(cache_key, commits_callable,
-                                cache_period)
+            commits = self._get_latest_commits(
+                branch=branch,
+                commits_callable=commits_callable)
 
         for commit in commits:
             cache.set(self.get_commit_cache_key(commit.id),
@@ -888,6 +1178,28 @@ class Repository(models.Model):
 
         return commits
 
+    def invalidate_commit_caches(self):
+        """Invalidate the cached branches and latest commits.
+
+        This is called when a webhook notifies Review Board of a push to the
+        repository. The next call to :py:meth:`get_commits` for any branch
+        will fetch the latest commits and merge them into the cached index
+        of commits, and the next call to :py:meth:`get_branches` will fetch
+        the branches again.
+
+        Once this has been called, the branches and latest commits will be
+        cached for :py:attr:`COMMITS_PUSH_NOTIFIED_CACHE_PERIOD` seconds
+        instead of their usual periods, since further pushes are expected to
+        be notified.
+
+        Version Added:
+            7.0
+        """
+        cache.set(make_cache_key(self._make_commits_invalidated_cache_key()),
+                  time(),
+                  self.COMMIT_INDEX_CACHE_PERIOD)
+        cache.delete(make_cache_key(self._make_branches_cache_key()))
+
     def get_change(self, revision):
         """Return an individual change/commit in the repository.
 
@@ -1143,6 +1455,569 @@ class Repository(models.Model):
             quote(base_commit_id or ''),
             quote(self.raw_file_url or ''))
 
+    def _make_file_index_cache_key(self, revision):
+        """Make a cache key for an index of files in a revision.
+
+        Version Added:
+            7.0
+
+        Args:
+            revision (unicode):
+                The revision being indexed.
+
+        Returns:
+            unicode:
+            A cache key representing the index.
+        """
+        return 'file-index:%s:%s' % (self.pk, quote(revision))
+
+    def _make_branches_cache_key(self):
+        """Make a cache key for the list of branches.
+
+        Version Added:
+            7.0
+
+        Returns:
+            unicode:
+            A cache key representing the list of branches.
+        """
+        return 'repository-branches:%s' % self.pk
+
+    def _make_commit_index_cache_key(self, branch):
+        """Make a cache key for an index of commits on a branch.
+
+        Version Added:
+            7.0
+
+        Args:
+            branch (unicode):
+                The branch being indexed, or ``None`` for the default
+                history of the repository.
+
+        Returns:
+            unicode:
+            A cache key representing the index.
+        """
+        return 'repository-commit-index:%s:%s' % (self.pk,
+                                                  quote(branch or ''))
+
+    def _make_commits_invalidated_cache_key(self):
+        """Make a cache key for the last time commit caches were invalidated.
+
+        Version Added:
+            7.0
+
+        Returns:
+            unicode:
+            A cache key representing the invalidation time.
+        """
+        return 'repository-commits-invalidated:%s' % self.pk
+
+    @cached_property
+    def _file_indexes(self):
+        """Indexes of files loaded by this instance, keyed by revision.
+
+        A value of ``None`` indicates that the revision can't be indexed.
+
+        Version Added:
+            7.0
+
+        Type:
+            dict
+        """
+        return {}
+
+    @cached_property
+    def _file_index_lookups(self):
+        """Counts of uncached existence checks, keyed by index revision.
+
+        Version Added:
+            7.0
+
+        Type:
+            collections.Counter
+        """
+        return Counter()
+
+    def _get_file_index(self, revision, context):
+        """Return an index of files for a file existence check.
+
+        The index is loaded from cache if available. Otherwise, once
+        :py:attr:`FILE_INDEX_MIN_LOOKUPS` checks have been made for the same
+        revision, the files will be listed from the repository and cached.
+
+        Version Added:
+            7.0
+
+        Args:
+            revision (unicode):
+                The revision of the file being checked.
+
+            context (reviewboard.scmtools.core.FileLookupContext):
+                Extra context used to help look up the file.
+
+        Returns:
+            frozenset:
+            The set of paths in the revision, or ``None`` if the check can't
+            use an index.
+        """
+        scmtool_cls = self.scmtool_class
+
+        if (not scmtool_cls or
+            not scmtool_cls.supports_file_index or
+            self.hosting_account_id is not None):
+            return None
+
+        tool = self.get_scmtool()
+        index_revision = tool.get_file_index_revision(revision,
+                                                      context=context)
+
+        if index_revision is None:
+            return None
+
+        file_indexes = self._file_indexes
+
+        if index_revision in file_indexes:
+            return file_indexes[index_revision]
+
+        key = self._make_file_index_cache_key(index_revision)
+
+        def _on_miss():
+            raise _FileCacheMiss()
+
+        def _load_result():
+            try:
+                return True, cache_memoize(key, _on_miss, large_data=True)
+            except _FileCacheMiss:
+                return False, None
+
+        found, paths = _load_result()
+
+        if not found:
+            self._file_index_lookups[index_revision] += 1
+
+            if (self._file_index_lookups[index_revision] <
+                self.FILE_INDEX_MIN_LOOKUPS):
+                return None
+
+            def _fetch():
+                return cache_memoize(
+                    key,
+                    lambda: sorted(tool.list_files(index_revision)),
+                    expiration=self.FILE_INDEX_CACHE_PERIOD,
+                    large_data=True)
+
+            try:
+                paths = run_single_flight(key, _fetch,
+                                          load_result=_load_result)
+            except Exception as e:
+                logger.warning('Unable to list files in revision %s of '
+                               'repository %s. Checking files '
+                               'individually: %s',
+                               index_revision, self.pk, e)
+                file_indexes[index_revision] = None
+
+                return None
+
+        file_index = frozenset(paths)
+        file_indexes[index_revision] = file_index
+
+        return file_index
+
+    def _get_commits_invalidated_time(self):
+        """Return the last time commit caches were invalidated.
+
+        Version Added:
+            7.0
+
+        Returns:
+            float:
+            The time of the last push notification, or ``None`` if there
+            haven't been any recently.
+        """
+        return cache.get(
+            make_cache_key(self._make_commits_invalidated_cache_key()))
+
+    def _get_cached_commit_index(self, branch):
+        """Return an index of commits from cache, without fetching commits.
+
+        The index is a dictionary containing:
+
+        ``commits``:
+            A list of tuples of each commit's ID, author name, date,
+            message, and parent ID, from newest to oldest.
+
+        ``page_size``:
+            The number of commits in the latest page of commits.
+
+        ``updated``:
+            The time that the latest commits were fetched.
+
+        Version Added:
+            7.0
+
+        Args:
+            branch (unicode):
+                The branch of the index.
+
+        Returns:
+            dict:
+            The index, or ``None`` if not in cache.
+        """
+        def _on_miss():
+            raise _CommitIndexMiss()
+
+        try:
+            return cache_memoize(self._make_commit_index_cache_key(branch),
+                                 _on_miss,
+                                 large_data=True)
+        except _CommitIndexMiss:
+            return None
+
+    def _set_cached_commit_index(self, branch, index):
+        """Store an index of commits in cache.
+
+        Version Added:
+            7.0
+
+        Args:
+            branch (unicode):
+                The branch of the index.
+
+            index (dict):
+                The index to store.
+        """
+        index['commits'] = index['commits'][:self.COMMIT_INDEX_MAX_COMMITS]
+
+        cache_memoize(self._make_commit_index_cache_key(branch),
+                      lambda: index,
+                      expiration=self.COMMIT_INDEX_CACHE_PERIOD,
+                      large_data=True,
+                      force_overwrite=True)
+
+    def _is_commit_index_fresh(self, index):
+        """Return whether the latest commits in an index are up to date.
+
+        Version Added:
+            7.0
+
+        Args:
+            index (dict):
+                The index to check.
+
+        Returns:
+            bool:
+            ``True`` if the latest commits don't need to be fetched again.
+        """
+        invalidated_time = self._get_commits_invalidated_time()
+
+        if invalidated_time is None:
+            cache_period = self.COMMITS_CACHE_PERIOD_SHORT
+        elif index['updated'] <= invalidated_time:
+            return False
+        else:
+            cache_period = self.COMMITS_PUSH_NOTIFIED_CACHE_PERIOD
+
+        return time() - index['updated'] < cache_period
+
+    def _get_latest_commits(self, branch, commits_callable):
+        """Return the latest commits on a branch.
+
+        If the index of commits is up to date, the latest commits will be
+        returned from it. Otherwise, they'll be fetched and merged into the
+        index. Older commits in the index are kept if the new commits lead
+        directly to the previous latest commit, and any commits after it
+        match the index. Otherwise (for instance, if a merge placed other
+        commits after it), the index is replaced.
+
+        Version Added:
+            7.0
+
+        Args:
+            branch (unicode):
+                The branch to return commits for.
+
+            commits_callable (callable):
+                A function for fetching the latest commits.
+
+        Returns:
+            list of reviewboard.scmtools.core.Commit:
+            The latest commits.
+        """
+        old_index = self._get_cached_commit_index(branch)
+
+        if old_index is None or not self._is_commit_index_fresh(old_index):
+            def _fetch():
+                updated = time()
+                commits = commits_callable()
+                new_commits = [
+                    (commit.id, commit.author_name, commit.date,
+                     commit.message, commit.parent)
+                    for commit in commits
+                ]
+
+                if old_index is not None and old_index['commits']:
+                    old_commits = old_index['commits']
+                    old_head_id = old_commits[0][0]
+
+                    for i, commit in enumerate(commits):
+                        if commit.id == old_head_id:
+                            # History may not be linear. A merge can list
+                            # commits from another branch between the new
+                            # commits and the old head, or after the old
+                            # head, in which case the index no longer
+                            # matches the repository's listing.
+                            overlap = len(commits) - i
+                            old_ids = [
+                                old_commit[0]
+                                for old_commit in old_commits[:overlap]
+                            ]
+                            new_ids = [
+                                new_commit.id
+                                for new_commit in commits[i:]
+                            ]
+
+                            if ((i == 0 or
+                                 commits[i - 1].parent == old_head_id) and
+                                new_ids == old_ids):
+                                new_commits = (new_commits[:i] +
+                                               old_commits)
+
+                            break
+
+                index = {
+                    'commits': new_commits,
+                    'page_size': len(commits),
+                    'updated': updated,
+                }
+                self._set_cached_commit_index(branch, index)
+
+                return index
+
+            def _load_result():
+                index = self._get_cached_commit_index(branch)
+
+                return (index is not None and
+                        self._is_commit_index_fresh(index),
+                        index)
+
+            # If another worker is already refreshing this index, wait for
+            # its result instead of fetching again.
+            index = run_single_flight(
+                self._make_commit_index_cache_key(branch),
+                _fetch,
+                load_result=_load_result)
+        else:
+            index = old_index
+
+        return [
+            Commit(author_name=author_name,
+                   id=commit_id,
+                   date=date,
+                   message=message,
+                   parent=parent)
+            for commit_id, author_name, date, message, parent in
+            index['commits'][:index['page_size']]
+        ]
+
+    def _get_commits_from_index(self, branch, start):
+        """Return a page of commits from the index of commits on a branch.
+
+        Older commits don't change as new commits are pushed, so these are
+        returned even if the latest commits in the index are out of date.
+
+        Version Added:
+            7.0
+
+        Args:
+            branch (unicode):
+                The branch to return commits for.
+
+            start (unicode):
+                The ID of the first commit to return.
+
+        Returns:
+            list of reviewboard.scmtools.core.Commit:
+            The commits, or ``None`` if a full page of commits starting at
+            ``start`` isn't in the index.
+        """
+        index = self._get_cached_commit_index(branch)
+
+        if index is None:
+            return None
+
+        indexed_commits = index['commits']
+
+        for i, indexed_commit in enumerate(indexed_commits):
+            if indexed_commit[0] == start:
+                break
+        else:
+            return None
+
+        page = indexed_commits[i:i + index['page_size']]
+
+        if len(page) < index['page_size'] and page[-1][4]:
+            # There are older commits that haven't been indexed yet.
+            return None
+
+        return [
+            Commit(author_name=author_name,
+                   id=commit_id,
+                   date=date,
+                   message=message,
+                   parent=parent)
+            for commit_id, author_name, date, message, parent in page
+        ]
+
+    def _extend_commit_index(self, branch, start, commits):
+        """Add older commits to the end of the index of commits on a branch.
+
+        The commits are only added if they directly follow the oldest
+        commit in the index.
+
+        Version Added:
+            7.0
+
+        Args:
+            branch (unicode):
+                The branch of the index.
+
+            start (unicode):
+                The ID of the first of the commits.
+
+            commits (list of reviewboard.scmtools.core.Commit):
+                The commits to add.
+        """
+        index = self._get_cached_commit_index(branch)
+
+        if (index is not None and
+            index['commits'] and
+            index['commits'][-1][4] == start and
+            len(index['commits']) < self.COMMIT_INDEX_MAX_COMMITS):
+            index['commits'] += [
+                (commit.id, commit.author_name, commit.date,
+                 commit.message, commit.parent)
+                for commit in commits
+            ]
+            self._set_cached_commit_index(branch, index)
+
+    def _get_cached_file(self, cache_key):
+        """Return a file from the main cache, without fetching it.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (unicode):
+                The cache key for the file.
+
+        Returns:
+            tuple:
+            A 2-tuple of whether the file was found in cache, and the file
+            contents (or ``None`` if not found).
+        """
+        def _on_miss():
+            raise _FileCacheMiss()
+
+        try:
+            return True, cache_memoize(cache_key, _on_miss,
+                                       large_data=True)[0]
+        except _FileCacheMiss:
+            return False, None
+
+    def _set_cached_file(self, cache_key, data):
+        """Store a file in the main cache.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (unicode):
+                The cache key for the file.
+
+            data (bytes):
+                The file contents.
+        """
+        # See get_file for why the contents are wrapped in a list.
+        cache_memoize(cache_key,
+                      lambda: [data],
+                      large_data=True,
+                      force_overwrite=True)
+
+    def _get_file_from_file_cache(self, cache_key, path, revision, context):
+        """Return a file from the on-disk file cache or the repository.
+
+        This is called internally by :py:meth:`get_file` if the file isn't
+        already in the main cache. If the on-disk repository file cache is
+        enabled (see :py:mod:`reviewboard.scmtools.file_cache`), the file
+        will be looked up there first, and stored there once fetched.
+
+        Version Added:
+            7.0
+
+        Args:
+            cache_key (unicode):
+                The cache key for the file.
+
+            path (unicode):
+                The path to the file in the repository.
+
+            revision (unicode):
+                The revision of the file to retrieve.
+
+            context (reviewboard.scmtools.core.FileLookupContext):
+                Extra context used to help look up this file.
+
+        Returns:
+            bytes:
+            The resulting file contents.
+        """
+        file_cache = get_repository_file_cache()
+
+        if file_cache is not None:
+            data = file_cache.get(cache_key)
+
+            if data is not None:
+                return data
+
+        data = self._get_file_uncached(path=path,
+                                       revision=revision,
+                                       context=context)
+
+        if file_cache is not None:
+            file_cache.set(cache_key, data)
+
+        return data
+
+    def _has_file_in_file_cache(self, path, revision, base_commit_id):
+        """Return whether a file is in the on-disk file cache.
+
+        Version Added:
+            7.0
+
+        Args:
+            path (unicode):
+                The path to the file in the repository.
+
+            revision (unicode):
+                The revision of the file.
+
+            base_commit_id (unicode):
+                The ID of the commit containing the revision of the file.
+
+        Returns:
+            bool:
+            ``True`` if the on-disk file cache is enabled and contains the
+            file.
+        """
+        file_cache = get_repository_file_cache()
+
+        return (file_cache is not None and
+                file_cache.has(self._make_file_cache_key(
+                    path=path,
+                    revision=revision,
+                    base_commit_id=base_commit_id)))
+
     def _get_file_uncached(self, path, revision, context):
         """Return a file from the repository, bypassing cache.
 
@@ -1229,6 +2104,86 @@ class Repository(models.Model):
 
         return data
 
+    def _get_files_uncached(self, lookups):
+        """Return several files from the repository, bypassing cache.
+
+        This is called internally by :py:meth:`get_files` for any files that
+        aren't already in the cache.
+
+        This will send the
+        :py:data:`~reviewboard.scmtools.signals.fetching_file` signal before
+        beginning the fetch for each file, and the
+        :py:data:`~reviewboard.scmtools.signals.fetched_file` signal after
+        each file is successfully fetched.
+
+        Version Added:
+            7.0
+
+        Args:
+            lookups (list of reviewboard.scmtools.core.FileLookup):
+                The files to fetch.
+
+        Returns:
+            list:
+            The contents of each file (as bytes) or the exception raised when
+            fetching it, in the same order as ``lookups``.
+        """
+        for lookup in lookups:
+            context = lookup.context
+
+            fetching_file.send(sender=self,
+                               path=lookup.path,
+                               revision=lookup.revision,
+                               base_commit_id=context.base_commit_id,
+                               request=context.request,
+                               context=context)
+
+        log_timer = log_timed('Fetching %d files from %s'
+                              % (len(lookups), self),
+                              request=lookups[0].context.request)
+
+        try:
+            hosting_service = self.hosting_service
+
+            if hosting_service:
+                backend = hosting_service
+                results = hosting_service.get_files(self, lookups)
+            else:
+                backend = self.get_scmtool()
+                results = backend.get_files(lookups)
+        except Exception as e:
+            # The batch as a whole failed (for instance, if the repository
+            # couldn't be reached), so every file failed.
+            logger.exception('Error fetching %d files from repository %s: '
+                             '%s',
+                             len(lookups), self.pk, e)
+            results = [e] * len(lookups)
+        else:
+            assert len(results) == len(lookups), (
+                '%s.get_files() must return one result per file, not %s'
+                % (type(backend).__name__, len(results)))
+
+        log_timer.done()
+
+        for lookup, result in zip(lookups, results):
+            assert isinstance(result, (bytes, Exception)), (
+                '%s.get_files() must return byte strings or exceptions, '
+                'not %s'
+                % (type(backend).__name__, type(result)))
+
+            if isinstance(result, bytes):
+                context = lookup.context
+
+                fetched_file.send(sender=self,
+                                  path=lookup.path,
+                                  revision=lookup.revision,
+                                  base_commit_id=context.base_commit_id,
+                                  request=context.request,
+                                  context=context,
+                                  data=result)
+
+        return results
+
     def _get_file_exists_uncached(self, path, revision, context):
         """Check for file existence, bypassing cache.
 
@@ -1277,6 +2232,10 @@ class Repository(models.Model):
 
         if file_cache_key in cache:
             exists = True
+        elif self._has_file_in_file_cache(path=path,
+                                          revision=revision,
+                                          base_commit_id=base_commit_id):
+            exists = True
         else:
             # We didn't have that in the cache, so check from the repository.
             checking_file_exists.send(sender=self,
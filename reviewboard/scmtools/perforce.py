@@ -12,8 +12,10 @@ import socket
 import stat
 import subprocess
 import tempfile
+import threading
 import time
 from contextlib import contextmanager
+from hashlib import sha256
 from typing import TYPE_CHECKING, Union
 
 from django.conf import settings
@@ -222,6 +224,315 @@ class STunnelProxy(object):
                     pass
 
 
+class PerforceConnection(object):
+    """An open, authenticated connection to a Perforce server.
+
+    This holds a connected :py:class:`P4.P4` instance, along with any
+    stunnel proxy it connects through. Connections are managed by a
+    :py:class:`PerforceConnectionPool`.
+
+    Version Added:
+        7.0
+    """
+
+    def __init__(self, p4, proxy=None):
+        """Initialize the connection.
+
+        Args:
+            p4 (P4.P4):
+                The connected Perforce instance.
+
+            proxy (STunnelProxy, optional):
+                The stunnel proxy used for the connection, if any.
+        """
+        #: The connected Perforce instance.
+        self.p4 = p4
+
+        #: The stunnel proxy used for the connection, if any.
+        self.proxy = proxy
+
+        #: The time the connection was last used.
+        #:
+        #: This is from :py:func:`time.monotonic`.
+        self.last_used = time.monotonic()
+
+        #: The time the login ticket was last checked.
+        #:
+        #: This is from :py:func:`time.monotonic`, or ``None`` if the ticket
+        #: has not been checked on this connection.
+        self.last_ticket_check = None
+
+    @property
+    def is_alive(self):
+        """Whether the connection is still open.
+
+        Type:
+            bool
+        """
+        try:
+            return bool(self.p4.connected())
+        except Exception:
+            return False
+
+    def close(self):
+        """Close the connection and shut down any proxy."""
+        try:
+            if self.p4.connected():
+                self.p4.disconnect()
+        except Exception as e:
+            logger.debug('Error disconnecting from Perforce: %s', e)
+
+        if self.proxy:
+            try:
+                self.proxy.shutdown()
+            except Exception:
+                pass
+
+            self.proxy = None
+
+
+class PerforceConnectionPool(object):
+    """A pool of connections to a Perforce server.
+
+    Connections are handed out to operations as needed, opening new ones up
+    to a maximum number of connections. If all connections are busy,
+    operations will wait for one to become available.
+
+    Connections that have been idle longer than the idle timeout are closed,
+    and connections that have been dropped by the server are replaced.
+
+    Pools are shared by all :py:class:`PerforceClient` instances connecting
+    with the same settings within a process. They should be fetched through
+    :py:meth:`get`.
+
+    Version Added:
+        7.0
+    """
+
+    #: The default maximum number of connections per pool.
+    DEFAULT_MAX_CONNECTIONS = 4
+
+    #: The default number of seconds a connection can be idle before closing.
+    DEFAULT_IDLE_TIMEOUT = 5 * 60
+
+    _pools = {}
+    _pools_lock = threading.Lock()
+    _pools_pid = None
+
+    @classmethod
+    def get(cls, key):
+        """Return the shared pool for a set of connection settings.
+
+        Args:
+            key (tuple):
+                A key uniquely identifying the connection settings.
+
+        Returns:
+            PerforceConnectionPool:
+            The pool for the connection settings.
+        """
+        with cls._pools_lock:
+            pid = os.getpid()
+
+            if cls._pools_pid != pid:
+                # This is either the first use or a new forked process.
+                # Connections from a parent process can't be shared, so
+                # start fresh.
+                cls._pools = {}
+                cls._pools_pid = pid
+
+            try:
+                pool = cls._pools[key]
+            except KeyError:
+                pool = cls()
+                cls._pools[key] = pool
+
+        return pool
+
+    @classmethod
+    def close_all(cls):
+        """Close the connections in all shared pools."""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+
+        for pool in pools:
+            pool.close()
+
+    def __init__(self, max_connections=None, idle_timeout=None):
+        """Initialize the pool.
+
+        Args:
+            max_connections (int, optional):
+                The maximum number of connections to open at once. Defaults
+                to :py:attr:`DEFAULT_MAX_CONNECTIONS`.
+
+            idle_timeout (float, optional):
+                The number of seconds a connection can be idle before being
+                closed. Defaults to :py:attr:`DEFAULT_IDLE_TIMEOUT`.
+        """
+        if max_connections is None:
+            max_connections = self.DEFAULT_MAX_CONNECTIONS
+
+        if idle_timeout is None:
+            idle_timeout = self.DEFAULT_IDLE_TIMEOUT
+
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._num_connections = 0
+        self._reap_timer = None
+
+    @property
+    def num_connections(self):
+        """The number of open connections in the pool.
+
+        Type:
+            int
+        """
+        with self._cond:
+            return self._num_connections
+
+    def acquire(self, open_connection):
+        """Return a connection for an operation.
+
+        This will return an idle connection if available, open a new
+        connection if under the limit, or otherwise wait for a connection to
+        be released.
+
+        The connection must be handed back through :py:meth:`release` or
+        :py:meth:`discard` when finished.
+
+        Args:
+            open_connection (callable):
+                A function returning a new :py:class:`PerforceConnection`.
+
+        Returns:
+            PerforceConnection:
+            The connection to use.
+        """
+        with self._cond:
+            while True:
+                while self._idle:
+                    connection = self._idle.pop()
+
+                    if connection.is_alive:
+                        connection.last_used = time.monotonic()
+
+                        return connection
+
+                    # This was dropped while idle. Clean it up and try the
+                    # next.
+                    self._num_connections -= 1
+                    connection.close()
+
+                if self._num_connections < self.max_connections:
+                    self._num_connections += 1
+                    break
+
+                self._cond.wait()
+
+        try:
+            return open_connection()
+        except BaseException:
+            with self._cond:
+                self._num_connections -= 1
+                self._cond.notify()
+
+            raise
+
+    def release(self, connection):
+        """Return a connection to the pool after an operation.
+
+        Connections that are no longer open will be discarded.
+
+        Args:
+            connection (PerforceConnection):
+                The connection to return.
+        """
+        if not connection.is_alive:
+            self.discard(connection)
+            return
+
+        with self._cond:
+            connection.last_used = time.monotonic()
+            self._idle.append(connection)
+            self._schedule_reap()
+            self._cond.notify()
+
+    def discard(self, connection):
+        """Close a connection and remove it from the pool.
+
+        Args:
+            connection (PerforceConnection):
+                The connection to discard.
+        """
+        connection.close()
+
+        with self._cond:
+            self._num_connections -= 1
+            self._cond.notify()
+
+    def close(self):
+        """Close all idle connections in the pool.
+
+        Connections currently in use will be returned to the pool when
+        finished.
+        """
+        with self._cond:
+            idle = self._idle
+            self._idle = []
+            self._num_connections -= len(idle)
+
+            if self._reap_timer is not None:
+                self._reap_timer.cancel()
+                self._reap_timer = None
+
+            self._cond.notify_all()
+
+        for connection in idle:
+            connection.close()
+
+    def reap_idle(self):
+        """Close any connections that have exceeded the idle timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+
+        with self._cond:
+            self._reap_timer = None
+            expired = [
+                connection
+                for connection in self._idle
+                if connection.last_used <= cutoff
+            ]
+
+            if expired:
+                self._idle = [
+                    connection
+                    for connection in self._idle
+                    if connection not in expired
+                ]
+                self._num_connections -= len(expired)
+                self._cond.notify_all()
+
+            self._schedule_reap()
+
+        for connection in expired:
+            connection.close()
+
+    def _schedule_reap(self):
+        """Schedule closing idle connections, if not already scheduled.
+
+        This must be called with the lock held.
+        """
+        if self._reap_timer is None and self._idle:
+            timer = threading.Timer(self.idle_timeout, self.reap_idle)
+            timer.daemon = True
+            timer.start()
+
+            self._reap_timer = timer
+
+
 class PerforceClient(object):
     """Client for talking to a Perforce server.
 
@@ -237,11 +548,24 @@ class PerforceClient(object):
     #: We default this to 1 hour.
     TICKET_RENEWAL_SECS = 1 * 60 * 60
 
+    #: The number of seconds between login ticket checks on a connection.
+    #:
+    #: Pooled connections will reuse a checked ticket for this long before
+    #: checking whether it needs to be renewed.
+    #:
+    #: Version Added:
+    #:     7.0
+    TICKET_CHECK_INTERVAL_SECS = 5 * 60
+
     def __init__(self, path, username, password, encoding='', host=None,
                  client_name=None, local_site_name=None,
-                 use_ticket_auth=False):
+                 use_ticket_auth=False, use_connection_pool=True):
         """Initialize the client.
 
+        Version Changed:
+            7.0:
+            Added ``use_connection_pool``.
+
         Args:
             path (unicode):
                 The path to the repository (equivalent to :envvar:`P4PORT`).
@@ -269,6 +593,15 @@ class PerforceClient(object):
             use_ticket_auth (bool, optional):
                 Whether to use ticket-based authentication. By default, this
                 is not used.
+
+            use_connection_pool (bool, optional):
+                Whether :py:meth:`run_worker` should use long-lived
+                connections shared through a
+                :py:class:`PerforceConnectionPool`, rather than connecting
+                for every operation.
+
+                Version Added:
+                    7.0
         """
         if path.startswith('stunnel:'):
             path = path[8:]
@@ -284,6 +617,7 @@ class PerforceClient(object):
         self.client_name = client_name
         self.local_site_name = local_site_name
         self.use_ticket_auth = use_ticket_auth
+        self.use_connection_pool = use_connection_pool
 
         import P4
         self.p4 = P4.P4()
@@ -372,13 +706,48 @@ class PerforceClient(object):
                 with client.connect():
                     ...
         """
-        self.p4.user = force_str(self.username)
+        proxy = self._configure_p4(self.p4)
+
+        try:
+            with self.p4.connect():
+                if self.use_ticket_auth:
+                    # The ticket may not exist, may have expired, or may be
+                    # close to expiring. Check for those conditions and
+                    # possibly request/extend a ticket.
+                    self.check_refresh_ticket()
+
+                yield
+        finally:
+            if proxy:
+                try:
+                    proxy.shutdown()
+                except Exception:
+                    pass
+
+    def _configure_p4(self, p4):
+        """Configure a Perforce instance for connecting to the server.
+
+        If using stunnel, this will start the proxy that the instance will
+        connect through.
+
+        Version Added:
+            7.0
+
+        Args:
+            p4 (P4.P4):
+                The Perforce instance to configure.
+
+        Returns:
+            STunnelProxy:
+            The stunnel proxy that was started, if any.
+        """
+        p4.user = force_str(self.username)
 
         if self.encoding:
-            self.p4.charset = force_str(self.encoding)
+            p4.charset = force_str(self.encoding)
 
         # Exceptions will only be raised for errors, not warnings.
-        self.p4.exception_level = 1
+        p4.exception_level = 1
 
         if self.use_stunnel:
             # Spin up an stunnel client and then redirect through that
@@ -389,13 +758,13 @@ class PerforceClient(object):
             proxy = None
             p4_port = self.p4port
 
-        self.p4.port = force_str(p4_port)
+        p4.port = force_str(p4_port)
 
         if self.p4host:
-            self.p4.host = force_str(self.p4host)
+            p4.host = force_str(self.p4host)
 
         if self.client_name:
-            self.p4.client = force_str(self.client_name)
+            p4.client = force_str(self.client_name)
 
         if self.use_ticket_auth:
             # The repository is configured for ticket-based authentication.
@@ -420,28 +789,14 @@ class PerforceClient(object):
                     tickets_dir = None
 
             if tickets_dir:
-                self.p4.ticket_file = force_str(
+                p4.ticket_file = force_str(
                     os.path.join(tickets_dir, 'p4tickets'))
         else:
             # The repository does not use ticket-based authentication. We'll
             # need to set the password that's provided.
-            self.p4.password = force_str(self.password)
+            p4.password = force_str(self.password)
 
-        try:
-            with self.p4.connect():
-                if self.use_ticket_auth:
-                    # The ticket may not exist, may have expired, or may be
-                    # close to expiring. Check for those conditions and
-                    # possibly request/extend a ticket.
-                    self.check_refresh_ticket()
-
-                yield
-        finally:
-            if proxy:
-                try:
-                    proxy.shutdown()
-                except Exception:
-                    pass
+        return proxy
 
     @contextmanager
     def run_worker(self):
@@ -451,6 +806,14 @@ class PerforceClient(object):
         when the context is finished, and raising a suitable exception if
         anything goes wrong.
 
+        If :py:attr:`use_connection_pool` is set, an authenticated connection
+        will be borrowed from a pool shared by clients with the same
+        settings, and returned to the pool when the context is finished.
+
+        Version Changed:
+            7.0:
+            Added support for pooled connections.
+
         Context:
             The context for the connection. Once the context ends, the
             connection will close.
@@ -483,40 +846,150 @@ class PerforceClient(object):
         """
         from P4 import P4Exception
 
+        if self.use_connection_pool:
+            connect = self._connect_pooled
+        else:
+            connect = self.connect
+
         try:
-            with self.connect():
+            with connect():
                 yield
         except P4Exception as e:
-            error = str(e)
-
-            if 'Perforce password' in error or 'Password must be set' in error:
-                raise AuthenticationError(msg=error)
-            elif 'SSL library must be at least version' in error:
-                raise SCMError(_(
-                    'The specified Perforce port includes ssl:, but the '
-                    'p4python library was built without SSL support or the '
-                    'system library path is incorrect.'
-                ))
-            elif ('check $P4PORT' in error or
-                  (error.startswith('[P4.connect()] TCP connect to') and
-                   'failed.' in error)):
-                raise RepositoryNotFoundError
-            elif "To allow connection use the 'p4 trust' command" in error:
-                m = re.search(
-                    r'(?P<fingerprint>(?:[0-9A-F]{2}:){19}[0-9A-F]{2})',
-                    error)
-
-                if m:
-                    fingerprint = m.group('fingerprint')
-                else:
-                    fingerprint = None
+            raise self._convert_p4_exception(e)
+
+    def _convert_p4_exception(self, e):
+        """Return a suitable SCMError for an error from Perforce.
 
-                certificate = Certificate(fingerprint=fingerprint,
-                                          hostname=self.p4port)
+        Version Added:
+            7.0
 
-                raise UnverifiedCertificateError(certificate)
+        Args:
+            e (P4.P4Exception):
+                The error from Perforce.
+
+        Returns:
+            reviewboard.scmtools.errors.SCMError:
+            The error to raise or report. See :py:meth:`run_worker` for the
+            possible types.
+        """
+        error = str(e)
+
+        if 'Perforce password' in error or 'Password must be set' in error:
+            return AuthenticationError(msg=error)
+        elif 'SSL library must be at least version' in error:
+            return SCMError(_(
+                'The specified Perforce port includes ssl:, but the '
+                'p4python library was built without SSL support or the '
+                'system library path is incorrect.'
+            ))
+        elif ('check $P4PORT' in error or
+              (error.startswith('[P4.connect()] TCP connect to') and
+               'failed.' in error)):
+            return RepositoryNotFoundError()
+        elif "To allow connection use the 'p4 trust' command" in error:
+            m = re.search(
+                r'(?P<fingerprint>(?:[0-9A-F]{2}:){19}[0-9A-F]{2})',
+                error)
+
+            if m:
+                fingerprint = m.group('fingerprint')
             else:
-                raise SCMError(error)
+                fingerprint = None
+
+            certificate = Certificate(fingerprint=fingerprint,
+                                      hostname=self.p4port)
+
+            return UnverifiedCertificateError(certificate)
+        else:
+            return SCMError(error)
+
+    @contextmanager
+    def _connect_pooled(self):
+        """Borrow a pooled connection to the Perforce server.
+
+        While in the context, :py:attr:`p4` will be set to the pooled
+        connection's Perforce instance. Login tickets will be checked at
+        most once every :py:attr:`TICKET_CHECK_INTERVAL_SECS` seconds per
+        connection.
+
+        Version Added:
+            7.0
+
+        Context:
+            The context for the connection. Once the context ends, the
+            connection will be returned to the pool.
+
+            No variables are passed to the context.
+        """
+        pool = PerforceConnectionPool.get(self._get_connection_pool_key())
+        connection = pool.acquire(self._open_connection)
+        old_p4 = self.p4
+        self.p4 = connection.p4
+
+        try:
+            if self.use_ticket_auth:
+                now = time.monotonic()
+
+                if (connection.last_ticket_check is None or
+                    (now - connection.last_ticket_check >=
+                     self.TICKET_CHECK_INTERVAL_SECS)):
+                    self.check_refresh_ticket()
+                    connection.last_ticket_check = now
+
+            yield
+        finally:
+            self.p4 = old_p4
+            pool.release(connection)
+
+    def _open_connection(self):
+        """Open a new connection for the connection pool.
+
+        Version Added:
+            7.0
+
+        Returns:
+            PerforceConnection:
+            The new connection.
+        """
+        p4 = type(self.p4)()
+        proxy = self._configure_p4(p4)
+
+        try:
+            p4.connect()
+        except BaseException:
+            if proxy:
+                try:
+                    proxy.shutdown()
+                except Exception:
+                    pass
+
+            raise
+
+        return PerforceConnection(p4, proxy)
+
+    def _get_connection_pool_key(self):
+        """Return the key identifying the pool for this client's settings.
+
+        Version Added:
+            7.0
+
+        Returns:
+            tuple:
+            The key for the pool.
+        """
+        # The password is hashed, so that changing it will result in new
+        # connections, without holding onto the password in the key.
+        return (
+            self.p4port,
+            self.use_stunnel,
+            self.username,
+            sha256(force_str(self.password).encode('utf-8')).hexdigest(),
+            self.client_name,
+            self.p4host,
+            self.encoding,
+            self.local_site_name,
+            self.use_ticket_auth,
+        )
 
     def get_changeset(self, changeset_id):
         """Return information about a server-side changeset.
@@ -569,31 +1042,92 @@ class PerforceClient(object):
         if revision == PRE_CREATION:
             return b''
 
+        with self.run_worker():
+            return self._print_file(path, revision)
+
+    def get_files(self, files):
+        """Return the contents of several files.
+
+        All the files are fetched over a single connection to the server,
+        rather than connecting once per file.
+
+        Version Added:
+            7.0
+
+        Args:
+            files (list of tuple):
+                A list of 2-tuples of the depot path and revision of each
+                file to fetch.
+
+        Returns:
+            list:
+            The contents of each file (as bytes) or the exception raised when
+            fetching it, in the same order as ``files``.
+        """
+        from P4 import P4Exception
+
+        results = [b''] * len(files)
+        pending = [
+            i
+            for i, (path, revision) in enumerate(files)
+            if revision != PRE_CREATION
+        ]
+
+        if pending:
+            with self.run_worker():
+                for i in pending:
+                    path, revision = files[i]
+
+                    try:
+                        results[i] = self._print_file(path, revision)
+                    except P4Exception as e:
+                        # Report these the same way as errors raised by
+                        # run_worker(), such as for get_file().
+                        results[i] = self._convert_p4_exception(e)
+
+        return results
+
+    def _print_file(self, path, revision):
+        """Return the contents of a file using an open connection.
+
+        This must be called from within :py:meth:`run_worker`.
+
+        Version Added:
+            7.0
+
+        Args:
+            path (unicode):
+                The Perforce depot path, without a revision.
+
+            revision (unicode):
+                The revision for the path.
+
+        Returns:
+            bytes:
+            The contents of the file.
+        """
         if revision == HEAD:
             depot_path = path
         else:
             depot_path = '%s#%s' % (path, revision)
 
-        with self.run_worker():
-            fd, filename = tempfile.mkstemp(prefix='reviewboard.')
+        fd, filename = tempfile.mkstemp(prefix='reviewboard.')
 
-            try:
-                os.close(fd)
-                self.p4.run_print('-q', '-o', filename, depot_path)
-
-                if os.path.islink(filename):
-                    return b''
-                else:
-                    # p4 print will change the permissions on the file to be
-                    # read-only, which will break the unlink unless we fix it.
-                    os.chmod(filename, stat.S_IREAD | stat.S_IWRITE)
+        try:
+            os.close(fd)
+            self.p4.run_print('-q', '-o', filename, depot_path)
 
-                    with open(filename, 'rb') as f:
-                        return f.read()
-            finally:
-                os.unlink(filename)
+            if os.path.islink(filename):
+                return b''
+            else:
+                # p4 print will change the permissions on the file to be
+                # read-only, which will break the unlink unless we fix it.
+                os.chmod(filename, stat.S_IREAD | stat.S_IWRITE)
 
-        return b''
+                with open(filename, 'rb') as f:
+                    return f.read()
+        finally:
+            os.unlink(filename)
 
     def get_file_stat(self, path, revision):
         """Return status information about a file in the repository.
@@ -759,7 +1293,8 @@ class PerforceTool(SCMTool):
                                 password=password,
                                 host=p4_host,
                                 client_name=p4_client,
-                                local_site_name=local_site_name)
+                                local_site_name=local_site_name,
+                                use_connection_pool=False)
         client.get_info()
 
     def get_changeset(self, changeset_id, allow_empty=False):
@@ -821,6 +1356,31 @@ class PerforceTool(SCMTool):
         """
         return self.client.get_file(path, revision)
 
+    def get_files(self, lookups, **kwargs):
+        """Return the contents of several files in the repository.
+
+        All the files are fetched over a single connection to the server.
+
+        Version Added:
+            7.0
+
+        Args:
+            lookups (list of reviewboard.scmtools.core.FileLookup):
+                The files to fetch.
+
+            **kwargs (dict):
+                Unused keyword arguments.
+
+        Returns:
+            list:
+            The contents of each file (as bytes) or the exception raised when
+            fetching it, in the same order as ``lookups``.
+        """
+        return self.client.get_files([
+            (lookup.path, lookup.revision)
+            for lookup in lookups
+        ])
+
     def file_exists(self, path, revision=HEAD, **kwargs):
         """Return whether a particular file exists in a repository.
 
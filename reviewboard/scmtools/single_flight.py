@@ -0,0 +1,283 @@
+"""Coalescing of concurrent identical repository lookups.
+
+When a large review request is published, many reviewers may open it at
+the same time. Without coordination, every web worker would miss the same
+cache keys and send identical requests to the repository or hosting
+service.
+
+This module provides a "single-flight" mechanism built on a lock stored in
+the main cache. The first worker to look up a given key takes the lock and
+performs the lookup. Other workers wait for the result to appear in cache,
+rather than performing the same lookup themselves.
+
+The number of lookups performed and coalesced are tracked in
+:py:data:`single_flight_stats`.
+
+Version Added:
+    7.0
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+from django.core.cache import cache
+from djblets.cache.backend import make_cache_key
+
+
+logger = logging.getLogger(__name__)
+
+
+_T = TypeVar('_T')
+
+
+#: Counts of single-flight lookups.
+#:
+#: These are tracked per-process, and may be updated from several threads
+#: at once. They contain:
+#:
+#: ``fetches``:
+#:     The number of lookups performed while holding the lock.
+#:
+#: ``coalesced``:
+#:     The number of lookups that used the result from another worker's
+#:     lookup.
+#:
+#: ``fallbacks``:
+#:     The number of lookups performed without the lock, after another
+#:     worker's lookup finished without providing a result (for instance,
+#:     if it failed).
+#:
+#: ``timeouts``:
+#:     The number of lookups performed without the lock, after timing out
+#:     waiting for another worker's result.
+#:
+#: Version Added:
+#:     7.0
+single_flight_stats: Counter[str] = Counter(fetches=0,
+                                            coalesced=0,
+                                            fallbacks=0,
+                                            timeouts=0)
+
+_single_flight_stats_lock = threading.Lock()
+
+
+def _increment_stat(name: str) -> None:
+    """Increment a counter in single_flight_stats.
+
+    Version Added:
+        7.0
+
+    Args:
+        name (str):
+            The name of the counter to increment.
+    """
+    with _single_flight_stats_lock:
+        single_flight_stats[name] += 1
+
+
+class SingleFlight:
+    """A cache-backed lock for coalescing a lookup across workers.
+
+    Version Added:
+        7.0
+    """
+
+    #: The default number of seconds before a held lock expires.
+    #:
+    #: This ensures that a worker that dies while holding the lock doesn't
+    #: block lookups forever.
+    DEFAULT_LOCK_TIMEOUT = 60
+
+    #: The default maximum number of seconds to wait for a result.
+    DEFAULT_WAIT_TIMEOUT = 30
+
+    #: The default number of seconds between checks for a result.
+    DEFAULT_POLL_INTERVAL = 0.05
+
+    ######################
+    # Instance variables #
+    ######################
+
+    #: The key identifying the lookup.
+    key: str
+
+    #: The number of seconds before a held lock expires.
+    lock_timeout: int
+
+    #: The number of seconds between checks for a result.
+    poll_interval: float
+
+    #: The maximum number of seconds to wait for a result.
+    wait_timeout: float
+
+    def __init__(
+        self,
+        key: str,
+        *,
+        lock_timeout: int = DEFAULT_LOCK_TIMEOUT,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        """Initialize the lock.
+
+        Args:
+            key (str):
+                The key identifying the lookup.
+
+            lock_timeout (int, optional):
+                The number of seconds before a held lock expires.
+
+            wait_timeout (float, optional):
+                The maximum number of seconds to wait for a result.
+
+            poll_interval (float, optional):
+                The number of seconds between checks for a result.
+        """
+        self.key = key
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+        self._lock_key = make_cache_key('single-flight-lock:%s' % key)
+        self._token: Optional[str] = None
+
+    def acquire(self) -> bool:
+        """Attempt to take the lock for the lookup.
+
+        Returns:
+            bool:
+            ``True`` if the lock was taken, and the caller must perform the
+            lookup and then call :py:meth:`release`. ``False`` if another
+            worker is performing the lookup.
+        """
+        token = uuid.uuid4().hex
+
+        if cache.add(self._lock_key, token, self.lock_timeout):
+            self._token = token
+            _increment_stat('fetches')
+
+            return True
+
+        return False
+
+    def release(self) -> None:
+        """Release the lock.
+
+        This must be called once the result has been stored in cache.
+        """
+        if self._token is not None:
+            if cache.get(self._lock_key) == self._token:
+                cache.delete(self._lock_key)
+
+            self._token = None
+
+    def wait(
+        self,
+        load_result: Callable[[], Tuple[bool, Any]],
+    ) -> Tuple[bool, Any]:
+        """Wait for another worker's result.
+
+        This will return once the result has been found, the other worker
+        has released the lock without providing a result, or the wait
+        times out.
+
+        Args:
+            load_result (callable):
+                A function returning a 2-tuple of whether the result was
+                found, and the result.
+
+        Returns:
+            tuple:
+            A 2-tuple of whether the result was found, and the result.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            time.sleep(self.poll_interval)
+
+            found, result = load_result()
+
+            if found:
+                _increment_stat('coalesced')
+
+                return True, result
+
+            if cache.get(self._lock_key) is None:
+                # The lock was released. Check for the result one last time,
+                # in case it was stored just before the lock was released.
+                found, result = load_result()
+
+                if found:
+                    _increment_stat('coalesced')
+                else:
+                    _increment_stat('fallbacks')
+
+                return found, result
+
+            if time.monotonic() >= deadline:
+                _increment_stat('timeouts')
+                logger.warning('Timed out after %s seconds waiting for '
+                               'another worker to look up "%s"',
+                               self.wait_timeout, self.key)
+
+                return False, None
+
+
+def run_single_flight(
+    key: str,
+    func: Callable[[], _T],
+    *,
+    load_result: Callable[[], Tuple[bool, _T]],
+    **kwargs,
+) -> _T:
+    """Perform a lookup, coalescing it with identical concurrent lookups.
+
+    If no other worker is performing the lookup, ``func`` will be called
+    while holding a lock. It must store its result in a form that
+    ``load_result`` can load before returning.
+
+    Otherwise, this will wait for the other worker's result. If that worker
+    doesn't provide a result in time, ``func`` will be called without the
+    lock.
+
+    Version Added:
+        7.0
+
+    Args:
+        key (str):
+            The key identifying the lookup.
+
+        func (callable):
+            The function performing the lookup and storing the result.
+
+        load_result (callable):
+            A function returning a 2-tuple of whether the result was found,
+            and the result.
+
+        **kwargs (dict):
+            Additional keyword arguments for :py:class:`SingleFlight`.
+
+    Returns:
+        object:
+        The result of the lookup.
+    """
+    flight = SingleFlight(key, **kwargs)
+
+    if flight.acquire():
+        try:
+            return func()
+        finally:
+            flight.release()
+
+    found, result = flight.wait(load_result)
+
+    if found:
+        return result
+
+    return func()
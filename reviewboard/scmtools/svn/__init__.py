@@ -1006,6 +1006,18 @@ class SVNDiffParser(DiffParser):
 
     BINARY_STRING = b'Cannot display: file marked as a binary type.'
 
+    #: Prefixes for any line that may begin a file's headers.
+    #:
+    #: This adds empty ``Index:`` lines used for property changes.
+    #:
+    #: Version Added:
+    #:     7.0
+    FILE_HEADER_PREFIXES = (
+        b'Index:',
+        b'--- ',
+        b'*** ',
+    )
+
     def __init__(
         self,
         data: bytes,
@@ -0,0 +1,245 @@
+"""Unit tests for reviewboard.scmtools.file_cache.
+
+Version Added:
+    7.0
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+import kgb
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from reviewboard.scmtools.core import FileLookup
+from reviewboard.scmtools.file_cache import (RepositoryFileCache,
+                                             get_repository_file_cache)
+from reviewboard.testing import TestCase
+
+
+class RepositoryFileCacheTests(TestCase):
+    """Unit tests for RepositoryFileCache."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.cache_dir = tempfile.mkdtemp(prefix='rb-tests-')
+        self.file_cache = RepositoryFileCache(path=self.cache_dir,
+                                              max_size=100)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+        super().tearDown()
+
+    def test_get_and_set(self):
+        """Testing RepositoryFileCache.get and set"""
+        file_cache = self.file_cache
+
+        self.assertIsNone(file_cache.get('key1'))
+        self.assertFalse(file_cache.has('key1'))
+
+        file_cache.set('key1', b'Hello, world!\n')
+        file_cache.set('key2', b'')
+
+        self.assertEqual(file_cache.get('key1'), b'Hello, world!\n')
+        self.assertEqual(file_cache.get('key2'), b'')
+        self.assertTrue(file_cache.has('key1'))
+        self.assertEqual(file_cache.size, 14)
+
+        # A new instance should see the same files.
+        file_cache = RepositoryFileCache(path=self.cache_dir,
+                                         max_size=100)
+        self.assertEqual(file_cache.get('key1'), b'Hello, world!\n')
+        self.assertEqual(file_cache.size, 14)
+
+    def test_set_with_shared_contents(self):
+        """Testing RepositoryFileCache.set stores identical contents once"""
+        file_cache = self.file_cache
+
+        file_cache.set('key1', b'Hello, world!\n')
+        file_cache.set('key2', b'Hello, world!\n')
+        file_cache.set('key3', b'Goodbye\n')
+
+        self.assertEqual(file_cache.get('key1'), b'Hello, world!\n')
+        self.assertEqual(file_cache.get('key2'), b'Hello, world!\n')
+        self.assertEqual(file_cache.get('key3'), b'Goodbye\n')
+        self.assertEqual(file_cache.size, 22)
+        self.assertEqual(len(file_cache._scan_dir('blobs')), 2)
+
+    def test_set_atomic(self):
+        """Testing RepositoryFileCache.set doesn't leave partial files on
+        error
+        """
+        file_cache = self.file_cache
+        data = b'Hello, world!\n'
+
+        # Block the final location with a non-empty directory, so that
+        # moving the written file into place fails.
+        blob_path = file_cache._get_blob_path(
+            hashlib.sha256(data).hexdigest())
+        os.makedirs(os.path.join(blob_path, 'subdir'))
+
+        with self.assertLogs('reviewboard.scmtools.file_cache'):
+            file_cache.set('key1', data)
+
+        self.assertIsNone(file_cache.get('key1'))
+
+        for dirpath, dirnames, filenames in os.walk(self.cache_dir):
+            self.assertEqual(filenames, [])
+
+    def test_set_with_too_large(self):
+        """Testing RepositoryFileCache.set with a file larger than the
+        maximum size
+        """
+        file_cache = self.file_cache
+        file_cache.set('key1', b'x' * 101)
+
+        self.assertIsNone(file_cache.get('key1'))
+        self.assertEqual(file_cache.size, 0)
+
+    def test_evict(self):
+        """Testing RepositoryFileCache evicts least recently used files"""
+        file_cache = self.file_cache
+
+        for i in range(4):
+            file_cache.set('key%d' % i, (b'%d' % i) * 30)
+
+            # Make sure each file has a distinct last-used time.
+            for path, size, mtime in file_cache._scan_dir('blobs'):
+                os.utime(path, (mtime - 10, mtime - 10))
+
+            for path, size, mtime in file_cache._scan_dir('refs'):
+                os.utime(path, (mtime - 10, mtime - 10))
+
+            if i == 1:
+                # Mark the first file as used.
+                file_cache.TOUCH_INTERVAL_SECS = 0
+                file_cache.get('key0')
+                file_cache.TOUCH_INTERVAL_SECS = 60
+
+        # The 4th file pushed the cache over the limit, and the least
+        # recently used file should have been removed, along with its
+        # reference.
+        self.assertEqual(file_cache.size, 90)
+        self.assertEqual(file_cache.get('key0'), b'0' * 30)
+        self.assertIsNone(file_cache.get('key1'))
+        self.assertEqual(file_cache.get('key2'), b'2' * 30)
+        self.assertEqual(file_cache.get('key3'), b'3' * 30)
+        self.assertEqual(len(file_cache._scan_dir('refs')), 3)
+
+    def test_get_with_evicted_contents(self):
+        """Testing RepositoryFileCache.get with contents removed by another
+        process
+        """
+        file_cache = self.file_cache
+        file_cache.set('key1', b'Hello, world!\n')
+
+        for path, size, mtime in file_cache._scan_dir('blobs'):
+            os.unlink(path)
+
+        self.assertIsNone(file_cache.get('key1'))
+        self.assertEqual(file_cache._scan_dir('refs'), [])
+
+    def test_clear(self):
+        """Testing RepositoryFileCache.clear"""
+        file_cache = self.file_cache
+        file_cache.set('key1', b'Hello, world!\n')
+        file_cache.clear()
+
+        self.assertIsNone(file_cache.get('key1'))
+        self.assertEqual(file_cache.size, 0)
+
+
+class RepositoryFileCacheIntegrationTests(kgb.SpyAgency, TestCase):
+    """Unit tests for the repository file cache in Repository."""
+
+    fixtures = ['test_scmtools']
+
+    def setUp(self):
+        super().setUp()
+
+        self.cache_dir = tempfile.mkdtemp(prefix='rb-tests-')
+
+        settings_override = override_settings(
+            REPOSITORY_FILE_CACHE_DIR=self.cache_dir,
+            REPOSITORY_FILE_CACHE_MAX_SIZE=1024 * 1024)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.repository = self.create_repository(tool_name='Git')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+        super().tearDown()
+
+    def test_get_repository_file_cache(self):
+        """Testing get_repository_file_cache"""
+        file_cache = get_repository_file_cache()
+
+        self.assertIsNotNone(file_cache)
+        self.assertEqual(file_cache.path, self.cache_dir)
+        self.assertEqual(file_cache.max_size, 1024 * 1024)
+        self.assertIs(get_repository_file_cache(), file_cache)
+
+        with self.settings(REPOSITORY_FILE_CACHE_MAX_SIZE=0):
+            self.assertIsNone(get_repository_file_cache())
+
+    def test_get_file(self):
+        """Testing Repository.get_file with the repository file cache"""
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+
+        self.spy_on(scmtool_cls.get_file,
+                    owner=scmtool_cls)
+
+        self.assertEqual(repository.get_file(path='readme',
+                                             revision='e965047'),
+                         b'Hello\n')
+        self.assertSpyCallCount(scmtool_cls.get_file, 1)
+
+        # Clearing the main cache should fall back to the file cache.
+        cache.clear()
+
+        self.assertEqual(repository.get_file(path='readme',
+                                             revision='e965047'),
+                         b'Hello\n')
+        self.assertTrue(repository.get_file_exists(path='readme',
+                                                   revision='e965047'))
+        self.assertSpyCallCount(scmtool_cls.get_file, 1)
+
+    def test_get_files(self):
+        """Testing Repository.get_files with the repository file cache"""
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+
+        self.spy_on(scmtool_cls.get_files,
+                    owner=scmtool_cls)
+
+        repository.get_file(path='readme',
+                            revision='e965047')
+        cache.clear()
+
+        self.assertEqual(
+            repository.get_files([
+                FileLookup(path='readme', revision='e965047'),
+                FileLookup(path='readme', revision='d6613f5'),
+            ]),
+            [b'Hello\n', b'Hello there\n'])
+        self.assertEqual(
+            scmtool_cls.get_files.last_call.args[0],
+            [FileLookup(path='readme', revision='d6613f5')])
+
+        cache.clear()
+
+        self.assertEqual(
+            repository.get_files([
+                FileLookup(path='readme', revision='d6613f5'),
+            ]),
+            [b'Hello there\n'])
+        self.assertSpyCallCount(scmtool_cls.get_files, 1)
@@ -1,6 +1,7 @@
 # coding=utf-8
 
 import os
+import threading
 import unittest
 
 import kgb
@@ -9,9 +10,13 @@ from djblets.testing.decorators import add_fixtures
 from reviewboard import get_manual_url
 from reviewboard.diffviewer.parser import DiffParserError
 from reviewboard.diffviewer.testing.mixins import DiffParserTestingMixin
-from reviewboard.scmtools.core import PRE_CREATION
+from reviewboard.scmtools.core import FileLookup, PRE_CREATION
 from reviewboard.scmtools.errors import SCMError, FileNotFoundError
-from reviewboard.scmtools.git import ShortSHA1Error, GitClient, GitTool
+from reviewboard.scmtools.git import (GitCatFilePool,
+                                      GitCatFileProcess,
+                                      GitClient,
+                                      GitTool,
+                                      ShortSHA1Error)
 from reviewboard.scmtools.tests.testcases import SCMTestCase
 from reviewboard.testing.testcase import TestCase
 
@@ -1365,6 +1370,212 @@ class GitTests(DiffParserTestingMixin, kgb.SpyAgency, SCMTestCase):
             ))
 
 
+class GitCatFilePoolTests(kgb.SpyAgency, SCMTestCase):
+    """Unit tests for GitCatFilePool."""
+
+    fixtures = ['test_scmtools']
+
+    def setUp(self):
+        super().setUp()
+
+        self.git_dir = os.path.join(os.path.dirname(__file__),
+                                    '..', 'testdata', 'git_repo')
+        repository = self.create_repository(path=self.git_dir,
+                                            tool_name='Git')
+
+        try:
+            self.tool = repository.get_scmtool()
+        except ImportError:
+            raise unittest.SkipTest('git binary not found')
+
+        GitCatFilePool.close_all()
+
+    def tearDown(self):
+        GitCatFilePool.close_all()
+
+        super().tearDown()
+
+    def test_get_file_reuses_process(self):
+        """Testing GitTool.get_file reuses pooled git cat-file processes"""
+        self.spy_on(GitCatFileProcess.__init__)
+
+        self.assertEqual(self.tool.get_file('readme', 'e965047'),
+                         b'Hello\n')
+        self.assertEqual(self.tool.get_file('readme', 'd6613f5'),
+                         b'Hello there\n')
+        self.assertTrue(self.tool.file_exists('readme', 'e965047'))
+        self.assertFalse(self.tool.file_exists('readme', 'a62df6c'))
+
+        # One process for contents, and one for types.
+        self.assertSpyCallCount(GitCatFileProcess.__init__, 2)
+
+    def test_get_file_with_non_blob(self):
+        """Testing GitTool.get_file with a non-blob object"""
+        with self.assertRaisesMessage(SCMError, 'is a commit, not a file'):
+            self.tool.get_file('readme', 'a62df6c')
+
+    def test_get_files(self):
+        """Testing GitTool.get_files"""
+        self.spy_on(GitCatFileProcess.__init__)
+
+        results = self.tool.get_files([
+            FileLookup(path='readme', revision='e965047'),
+            FileLookup(path='readme', revision=PRE_CREATION),
+            FileLookup(path='readme', revision='a62df6c'),
+            FileLookup(path='readme', revision='0000000'),
+            FileLookup(path='', revision='HEAD'),
+            FileLookup(path='readme', revision='d6613f5'),
+        ])
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[0], b'Hello\n')
+        self.assertEqual(results[1], b'')
+        self.assertIsInstance(results[2], SCMError)
+        self.assertIn('is a commit, not a file', str(results[2]))
+        self.assertIsInstance(results[3], FileNotFoundError)
+        self.assertIsInstance(results[4], SCMError)
+        self.assertEqual(results[5], b'Hello there\n')
+
+        self.assertSpyCallCount(GitCatFileProcess.__init__, 1)
+
+    def test_lookup_many(self):
+        """Testing GitCatFilePool.lookup_many"""
+        pool = GitCatFilePool(self.git_dir)
+        self.spy_on(pool._acquire)
+
+        try:
+            self.assertEqual(
+                pool.lookup_many(['e965047', '0000000', 'd6613f5']),
+                [
+                    (b'blob', b'Hello\n'),
+                    (None, None),
+                    (b'blob', b'Hello there\n'),
+                ])
+            self.assertSpyCallCount(pool._acquire, 1)
+        finally:
+            pool.close()
+
+    def test_lookup_many_with_crash(self):
+        """Testing GitCatFilePool.lookup_many retries remaining objects after
+        a process crashes
+        """
+        pool = GitCatFilePool(self.git_dir)
+        self.spy_on(GitCatFileProcess.lookup,
+                    owner=GitCatFileProcess,
+                    op=kgb.SpyOpMatchInOrder([
+                        {
+                            'call_original': True,
+                        },
+                        {
+                            'op': kgb.SpyOpRaise(OSError('Crashed')),
+                        },
+                        {
+                            'call_original': True,
+                        },
+                    ]))
+
+        try:
+            with self.assertLogs('reviewboard.scmtools.git'):
+                self.assertEqual(
+                    pool.lookup_many(['e965047', 'd6613f5']),
+                    [
+                        (b'blob', b'Hello\n'),
+                        (b'blob', b'Hello there\n'),
+                    ])
+
+            self.assertSpyCallCount(GitCatFileProcess.lookup, 3)
+            self.assertEqual(pool.num_processes, 1)
+        finally:
+            pool.close()
+
+    def test_lookup_with_crash(self):
+        """Testing GitCatFilePool.lookup retries after a process crashes"""
+        pool = GitCatFilePool(self.git_dir)
+        self.spy_on(GitCatFileProcess.lookup,
+                    owner=GitCatFileProcess,
+                    op=kgb.SpyOpMatchInOrder([
+                        {
+                            'op': kgb.SpyOpRaise(OSError('Crashed')),
+                        },
+                        {
+                            'call_original': True,
+                        },
+                    ]))
+
+        try:
+            with self.assertLogs('reviewboard.scmtools.git'):
+                self.assertEqual(pool.lookup('e965047'),
+                                 (b'blob', b'Hello\n'))
+
+            self.assertEqual(pool.num_processes, 1)
+        finally:
+            pool.close()
+
+    def test_lookup_with_dead_idle_process(self):
+        """Testing GitCatFilePool.lookup replaces processes that exited while
+        idle
+        """
+        pool = GitCatFilePool(self.git_dir)
+
+        try:
+            pool.lookup('e965047')
+
+            process = pool._idle[0]
+            process._process.kill()
+            process._process.wait()
+
+            self.assertEqual(pool.lookup('d6613f5'),
+                             (b'blob', b'Hello there\n'))
+            self.assertEqual(pool.num_processes, 1)
+            self.assertIsNot(pool._idle[0], process)
+        finally:
+            pool.close()
+
+    def test_reap_idle(self):
+        """Testing GitCatFilePool.reap_idle stops idle processes"""
+        pool = GitCatFilePool(self.git_dir)
+
+        try:
+            pool.lookup('e965047')
+            self.assertEqual(pool.num_processes, 1)
+
+            pool.reap_idle()
+            self.assertEqual(pool.num_processes, 1)
+
+            pool._idle[0].last_used -= pool.idle_timeout + 1
+            pool.reap_idle()
+            self.assertEqual(pool.num_processes, 0)
+        finally:
+            pool.close()
+
+    def test_lookup_with_max_processes(self):
+        """Testing GitCatFilePool.lookup waits for a process when at the
+        maximum number of processes
+        """
+        pool = GitCatFilePool(self.git_dir, max_processes=1)
+        results = []
+
+        try:
+            process = pool._acquire()
+
+            thread = threading.Thread(
+                target=lambda: results.append(pool.lookup('e965047')))
+            thread.start()
+            thread.join(0.2)
+
+            # The lookup must wait for the only process to be released.
+            self.assertTrue(thread.is_alive())
+            self.assertEqual(results, [])
+
+            pool._release(process)
+            thread.join()
+
+            self.assertEqual(results, [(b'blob', b'Hello\n')])
+            self.assertEqual(pool.num_processes, 1)
+        finally:
+            pool.close()
+
+
 class GitAuthFormTests(TestCase):
     """Unit tests for GitTool's authentication form."""
 
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import json
 import os
+import subprocess
+import sys
 import unittest
 from typing import Optional, TYPE_CHECKING
 
@@ -16,9 +18,13 @@ from reviewboard.scmtools.core import (
     HEAD,
     PRE_CREATION,
     Revision,
+    SCMTool,
 )
 from reviewboard.scmtools.errors import SCMError, FileNotFoundError
-from reviewboard.scmtools.hg import (HgDiffParser,
+from reviewboard.scmtools.hg import (HgClient,
+                                     HgCommandServer,
+                                     HgCommandServerPool,
+                                     HgDiffParser,
                                      HgGitDiffParser,
                                      HgTool,
                                      HgWebClient)
@@ -421,6 +427,27 @@ class MercurialTests(DiffParserTestingMixin, SCMTestCase):
         self.assertTrue(self.tool.file_exists('doc/readme', rev))
         self.assertFalse(self.tool.file_exists('doc/readme2', rev))
 
+    def test_get_file_index_revision(self) -> None:
+        """Testing HgTool.get_file_index_revision"""
+        context = FileLookupContext(base_commit_id='661e5dd3c493')
+
+        self.assertEqual(
+            self.tool.get_file_index_revision(Revision('661e5dd3c493')),
+            '661e5dd3c493')
+        self.assertEqual(
+            self.tool.get_file_index_revision(Revision('bogusrevision'),
+                                              context=context),
+            '661e5dd3c493')
+        self.assertIsNone(self.tool.get_file_index_revision(HEAD))
+        self.assertIsNone(self.tool.get_file_index_revision(Revision('1')))
+
+    def test_list_files(self) -> None:
+        """Testing HgTool.list_files"""
+        files = self.tool.list_files('661e5dd3c493')
+
+        self.assertIn('doc/readme', files)
+        self.assertNotIn('doc/readme2', files)
+
     def test_get_file_base_commit_id_override(self) -> None:
         """Testing base_commit_id overrides revision in HgTool.get_file"""
         base_commit_id = '661e5dd3c493'
@@ -1150,6 +1177,214 @@ class HgWebClientTests(kgb.SpyAgency, TestCase):
         return json.dumps(obj).encode('utf-8')
 
 
+class HgCommandServerTests(kgb.SpyAgency, TestCase):
+    """Unit tests for HgCommandServer, HgCommandServerPool, and HgClient's
+    use of them.
+    """
+
+    #: A fake command server, speaking Mercurial's command server protocol.
+    FAKE_SERVER = '\n'.join([
+        'import struct, sys',
+        'inp = sys.stdin.buffer',
+        'out = sys.stdout.buffer',
+        'def send(channel, data):',
+        '    out.write(channel + struct.pack(">I", len(data)) + data)',
+        '    out.flush()',
+        'send(b"o", b"capabilities: getencoding runcommand\\n"',
+        '           b"encoding: UTF-8")',
+        'while inp.readline():',
+        '    size = struct.unpack(">I", inp.read(4))[0]',
+        '    args = inp.read(size).split(b"\\0")',
+        '    if b"prompt" in args:',
+        '        out.write(b"L" + struct.pack(">I", 4096))',
+        '        out.flush()',
+        '        assert struct.unpack(">I", inp.read(4))[0] == 0',
+        '    if b"showconfig" in args:',
+        '        send(b"r", struct.pack(">i", 1))',
+        '    elif b"fail" in args:',
+        '        send(b"e", b"abort: failed\\n")',
+        '        send(b"r", struct.pack(">i", 255))',
+        '    else:',
+        '        send(b"d", b"debug output")',
+        '        send(b"o", b" ".join(args))',
+        '        send(b"r", struct.pack(">i", 0))',
+    ])
+
+    def setUp(self) -> None:
+        """Set up the test."""
+        super().setUp()
+
+        HgCommandServerPool.close_all()
+
+        @self.spy_for(SCMTool.popen, owner=SCMTool)
+        def _popen(cls, command, local_site_name=None, env={}, **kwargs):
+            if command[-3:] == ['serve', '--cmdserver', 'pipe']:
+                command = [sys.executable, '-c', self.FAKE_SERVER]
+            else:
+                command = [
+                    sys.executable, '-c',
+                    'import sys\n'
+                    'if "showconfig" in sys.argv:\n'
+                    '    sys.exit(1)\n'
+                    'sys.stdout.write(" ".join(sys.argv[1:]))',
+                ] + command
+
+            return SCMTool.popen.call_original(command, local_site_name,
+                                               env, **kwargs)
+
+    def tearDown(self) -> None:
+        """Tear down the test."""
+        HgCommandServerPool.close_all()
+
+        super().tearDown()
+
+    def test_run_command(self) -> None:
+        """Testing HgCommandServer.run_command"""
+        server = HgCommandServer(['--repository', '/repo'])
+
+        try:
+            self.assertEqual(server.run_command(['cat', '--rev', '1', 'f']),
+                             (0, b'cat --rev 1 f', b''))
+            self.assertEqual(server.run_command(['fail']),
+                             (255, b'', b'abort: failed\n'))
+            self.assertTrue(server.is_alive)
+        finally:
+            server.close()
+
+        self.assertFalse(server.is_alive)
+
+    def test_run_command_with_input_request(self) -> None:
+        """Testing HgCommandServer.run_command with a request for input"""
+        server = HgCommandServer(['--repository', '/repo'])
+
+        try:
+            self.assertEqual(server.run_command(['prompt']),
+                             (0, b'prompt', b''))
+        finally:
+            server.close()
+
+    def test_init_without_command_server(self) -> None:
+        """Testing HgCommandServer with a process that isn't a command
+        server
+        """
+        SCMTool.popen.unspy()
+
+        self.spy_on(
+            SCMTool.popen,
+            owner=SCMTool,
+            op=kgb.SpyOpReturn(subprocess.Popen(
+                [sys.executable, '-c', 'print("unknown command")'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE)))
+
+        with self.assertRaises(OSError):
+            HgCommandServer(['--repository', '/repo'])
+
+    def test_pool_reuses_process(self) -> None:
+        """Testing HgCommandServerPool.run_command reuses processes"""
+        self.spy_on(HgCommandServer.__init__)
+
+        pool = HgCommandServerPool.get(['--repository', '/repo'])
+
+        self.assertIs(HgCommandServerPool.get(['--repository', '/repo']),
+                      pool)
+        self.assertEqual(pool.run_command(['log']), (0, b'log', b''))
+        self.assertEqual(pool.run_command(['branches']),
+                         (0, b'branches', b''))
+        self.assertEqual(pool.num_processes, 1)
+        self.assertSpyCallCount(HgCommandServer.__init__, 1)
+
+    def test_pool_with_crash(self) -> None:
+        """Testing HgCommandServerPool.run_command retries after a process
+        crashes
+        """
+        pool = HgCommandServerPool(['--repository', '/repo'])
+        self.spy_on(HgCommandServer.run_command,
+                    owner=HgCommandServer,
+                    op=kgb.SpyOpMatchInOrder([
+                        {
+                            'op': kgb.SpyOpRaise(OSError('Crashed')),
+                        },
+                        {
+                            'call_original': True,
+                        },
+                    ]))
+
+        try:
+            with self.assertLogs('reviewboard.scmtools.hg'):
+                self.assertEqual(pool.run_command(['log']),
+                                 (0, b'log', b''))
+
+            self.assertEqual(pool.num_processes, 1)
+        finally:
+            pool.close()
+
+    def test_pool_reap_idle(self) -> None:
+        """Testing HgCommandServerPool.reap_idle stops idle processes"""
+        pool = HgCommandServerPool(['--repository', '/repo'])
+
+        try:
+            pool.run_command(['log'])
+            self.assertEqual(pool.num_processes, 1)
+
+            pool.reap_idle()
+            self.assertEqual(pool.num_processes, 1)
+
+            pool._idle[0].last_used -= pool.idle_timeout + 1
+            pool.reap_idle()
+            self.assertEqual(pool.num_processes, 0)
+        finally:
+            pool.close()
+
+    def test_client_uses_command_server(self) -> None:
+        """Testing HgClient runs commands through a command server"""
+        self.spy_on(HgCommandServer.__init__)
+        self.spy_on(HgClient._run_hg,
+                    owner=HgClient)
+
+        client = HgClient('/repo', None)
+
+        self.assertEqual(client.cat_file('f', '1'),
+                         b'--noninteractive --repository /repo --cwd /repo '
+                         b'--config ui.ssh=rbssh cat --rev 1 f')
+        self.assertEqual(
+            HgClient('/repo', None).cat_file('f', '2'),
+            b'--noninteractive --repository /repo --cwd /repo '
+            b'--config ui.ssh=rbssh cat --rev 2 f')
+
+        self.assertSpyCallCount(HgCommandServer.__init__, 1)
+        self.assertSpyNotCalled(HgClient._run_hg)
+
+    def test_client_with_failed_command(self) -> None:
+        """Testing HgClient maps command server failures to errors"""
+        client = HgClient('/repo', None)
+
+        with self.assertRaises(FileNotFoundError):
+            client.cat_file('fail', '1')
+
+    def test_client_without_command_server(self) -> None:
+        """Testing HgClient falls back to running hg when a command server
+        can't be started
+        """
+        self.spy_on(HgCommandServer.__init__,
+                    owner=HgCommandServer,
+                    op=kgb.SpyOpRaise(OSError('Not supported')))
+
+        with self.assertLogs('reviewboard.scmtools.hg'):
+            self.assertEqual(
+                HgClient('/repo', None).cat_file('f', '1'),
+                b'hg --noninteractive --repository /repo --cwd /repo '
+                b'--config ui.ssh=rbssh cat --rev 1 f')
+
+        # The pool should have been disabled, so no new command servers
+        # will be attempted.
+        self.assertEqual(
+            HgClient('/repo', None).cat_file('f', '2'),
+            b'hg --noninteractive --repository /repo --cwd /repo '
+            b'--config ui.ssh=rbssh cat --rev 2 f')
+        self.assertSpyCallCount(HgCommandServer.__init__, 1)
+
+
 class HgAuthFormTests(TestCase):
     """Unit tests for HgTool's authentication form."""
 
@@ -26,7 +26,10 @@ from reviewboard.scmtools.errors import (AuthenticationError,
                                          RepositoryNotFoundError,
                                          SCMError,
                                          UnverifiedCertificateError)
-from reviewboard.scmtools.perforce import PerforceTool, STunnelProxy
+from reviewboard.scmtools.perforce import (PerforceConnection,
+                                           PerforceConnectionPool,
+                                           PerforceTool,
+                                           STunnelProxy)
 from reviewboard.scmtools.tests.testcases import SCMTestCase
 from reviewboard.site.models import LocalSite
 from reviewboard.testing import online_only
@@ -43,8 +46,22 @@ if P4 is not None:
 
         def connect(self):
             return self
+
+    class ConnectedDummyP4(DummyP4):
+        """A dummy wrapper around P4 that reports itself as connected.
+
+        This is used for tests that need connections to be kept in a
+        connection pool.
+        """
+
+        def connected(self):
+            return True
+
+        def disconnect(self):
+            pass
 else:
     DummyP4 = None
+    ConnectedDummyP4 = None
 
 
 class BasePerforceTestCase(SpyAgency, SCMTestCase):
@@ -313,6 +330,79 @@ class PerforceTests(DiffParserTestingMixin, BasePerforceTestCase):
                 raise P4Exception(err_msg)
 
     @online_only
+    def test_run_worker_with_connection_pool(self):
+        """Testing PerforceTool.run_worker reuses pooled connections"""
+        self.repository.extra_data['use_ticket_auth'] = True
+
+        tool = PerforceTool(self.repository)
+        p4 = ConnectedDummyP4()
+        client = tool.client
+        client.p4 = p4
+
+        self.spy_on(client.check_refresh_ticket, call_original=False)
+        self.spy_on(client._open_connection)
+
+        try:
+            with client.run_worker():
+                pooled_p4 = client.p4
+
+            self.assertIs(client.p4, p4)
+
+            with client.run_worker():
+                self.assertIs(client.p4, pooled_p4)
+
+            self.assertIsNot(pooled_p4, p4)
+            self.assertSpyCallCount(client._open_connection, 1)
+
+            # The ticket should only have been checked for the new
+            # connection.
+            self.assertSpyCallCount(client.check_refresh_ticket, 1)
+        finally:
+            PerforceConnectionPool.close_all()
+
+    def test_get_files_with_errors(self):
+        """Testing PerforceClient.get_files translates per-file errors"""
+        self.repository.extra_data['use_ticket_auth'] = False
+
+        tool = PerforceTool(self.repository)
+        client = tool.client
+        client.p4 = ConnectedDummyP4()
+
+        errors = {
+            '//depot/auth': P4Exception(
+                'Perforce password (P4PASSWD) invalid or unset.'),
+            '//depot/missing': P4Exception(
+                'Connect to server failed; check $P4PORT.'),
+            '//depot/other': P4Exception('no such file(s).'),
+        }
+
+        def _print_file(_self, path, revision):
+            if path in errors:
+                raise errors[path]
+
+            return b'content'
+
+        self.spy_on(client._print_file, call_fake=_print_file)
+
+        try:
+            results = client.get_files([
+                ('//depot/auth', '1'),
+                ('//depot/missing', '1'),
+                ('//depot/other', '1'),
+                ('//depot/good', '1'),
+                ('//depot/new', PRE_CREATION),
+            ])
+        finally:
+            PerforceConnectionPool.close_all()
+
+        self.assertEqual(len(results), 5)
+        self.assertIsInstance(results[0], AuthenticationError)
+        self.assertIsInstance(results[1], RepositoryNotFoundError)
+        self.assertIs(type(results[2]), SCMError)
+        self.assertEqual(str(results[2]), 'no such file(s).')
+        self.assertEqual(results[3], b'content')
+        self.assertEqual(results[4], b'')
+
     def test_changeset(self):
         """Testing PerforceTool.get_changeset"""
         desc = self.tool.get_changeset(157)
@@ -861,6 +951,122 @@ class PerforceStunnelTests(BasePerforceTestCase):
                          '227bdd87b052fcad9369e65c7bf23fd0')
 
 
+class PerforceConnectionPoolTests(SpyAgency, TestCase):
+    """Unit tests for PerforceConnectionPool."""
+
+    class FakeP4(object):
+        """A fake Perforce instance for tracking connection state."""
+
+        def __init__(self):
+            self.is_connected = True
+
+        def connected(self):
+            return self.is_connected
+
+        def disconnect(self):
+            self.is_connected = False
+
+    def setUp(self):
+        super(PerforceConnectionPoolTests, self).setUp()
+
+        self.pool = PerforceConnectionPool()
+
+    def tearDown(self):
+        self.pool.close()
+
+        super(PerforceConnectionPoolTests, self).tearDown()
+
+    def test_get(self):
+        """Testing PerforceConnectionPool.get"""
+        pool = PerforceConnectionPool.get(('p4.example.com:1666', 'user'))
+
+        try:
+            self.assertIs(
+                PerforceConnectionPool.get(('p4.example.com:1666', 'user')),
+                pool)
+            self.assertIsNot(
+                PerforceConnectionPool.get(('p4.example.com:1666', 'user2')),
+                pool)
+        finally:
+            PerforceConnectionPool.close_all()
+
+    def test_acquire_reuses_connection(self):
+        """Testing PerforceConnectionPool.acquire reuses released
+        connections
+        """
+        pool = self.pool
+        connection = pool.acquire(self._open_connection)
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(self._open_connection), connection)
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_acquire_with_dropped_connection(self):
+        """Testing PerforceConnectionPool.acquire replaces connections
+        dropped while idle
+        """
+        pool = self.pool
+        connection = pool.acquire(self._open_connection)
+        pool.release(connection)
+
+        connection.p4.is_connected = False
+        new_connection = pool.acquire(self._open_connection)
+
+        self.assertIsNot(new_connection, connection)
+        self.assertTrue(new_connection.is_alive)
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_release_with_dropped_connection(self):
+        """Testing PerforceConnectionPool.release discards dropped
+        connections
+        """
+        pool = self.pool
+        connection = pool.acquire(self._open_connection)
+        connection.p4.is_connected = False
+        pool.release(connection)
+
+        self.assertEqual(pool.num_connections, 0)
+        self.assertEqual(pool._idle, [])
+
+    def test_acquire_with_error(self):
+        """Testing PerforceConnectionPool.acquire with an error opening a
+        connection
+        """
+        def _open_connection():
+            raise ValueError('Connection refused')
+
+        pool = self.pool
+
+        with self.assertRaises(ValueError):
+            pool.acquire(_open_connection)
+
+        self.assertEqual(pool.num_connections, 0)
+
+    def test_reap_idle(self):
+        """Testing PerforceConnectionPool.reap_idle closes idle connections"""
+        pool = self.pool
+        connection = pool.acquire(self._open_connection)
+        pool.release(connection)
+
+        pool.reap_idle()
+        self.assertEqual(pool.num_connections, 1)
+        self.assertTrue(connection.is_alive)
+
+        connection.last_used -= pool.idle_timeout + 1
+        pool.reap_idle()
+        self.assertEqual(pool.num_connections, 0)
+        self.assertFalse(connection.is_alive)
+
+    def _open_connection(self):
+        """Return a new connection for the pool.
+
+        Returns:
+            reviewboard.scmtools.perforce.PerforceConnection:
+            The new connection.
+        """
+        return PerforceConnection(self.FakeP4())
+
+
 class PerforceAuthFormTests(TestCase):
     """Unit tests for PerforceTool's authentication form."""
 
@@ -2,19 +2,24 @@ import os
 
 import kgb
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.db.models import Q
+from djblets.cache.backend import make_cache_key
 from djblets.testing.decorators import add_fixtures
 
 from reviewboard.hostingsvcs.errors import MissingHostingServiceError
 from reviewboard.hostingsvcs.github import GitHub
 from reviewboard.hostingsvcs.models import HostingServiceAccount
-from reviewboard.scmtools.core import FileLookupContext
+from reviewboard.scmtools.core import (Commit, FileLookup,
+                                       FileLookupContext)
+from reviewboard.scmtools.errors import FileNotFoundError
 from reviewboard.scmtools.git import GitTool
 from reviewboard.scmtools.models import Repository, Tool
 from reviewboard.scmtools.signals import (checked_file_exists,
                                           checking_file_exists,
                                           fetched_file, fetching_file)
+from reviewboard.testing.scmtool import TestTool
 from reviewboard.testing.testcase import TestCase
 
 
@@ -261,6 +266,173 @@ class RepositoryTests(kgb.SpyAgency, TestCase):
             context=context,
             data=b'Hello\n')
 
+    def test_get_files(self):
+        """Testing Repository.get_files"""
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+
+        self.spy_on(scmtool_cls.get_files,
+                    owner=scmtool_cls)
+        self.spy_on(scmtool_cls.get_file,
+                    owner=scmtool_cls)
+
+        results = repository.get_files([
+            FileLookup(path='readme', revision='e965047'),
+            FileLookup(path='readme', revision='d6613f5'),
+            FileLookup(path='readme', revision='e965047'),
+        ])
+
+        self.assertEqual(results, [b'Hello\n', b'Hello there\n', b'Hello\n'])
+
+        # Both files should have been fetched in one batch, without a
+        # duplicate lookup.
+        self.assertSpyCallCount(scmtool_cls.get_files, 1)
+        self.assertSpyNotCalled(scmtool_cls.get_file)
+        self.assertEqual(
+            scmtool_cls.get_files.last_call.args[0],
+            [
+                FileLookup(path='readme', revision='e965047'),
+                FileLookup(path='readme', revision='d6613f5'),
+            ])
+
+    def test_get_files_caching(self):
+        """Testing Repository.get_files uses and populates the file cache"""
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+
+        self.spy_on(scmtool_cls.get_files,
+                    owner=scmtool_cls)
+
+        self.assertEqual(repository.get_file(path='readme',
+                                             revision='e965047'),
+                         b'Hello\n')
+
+        results = repository.get_files([
+            FileLookup(path='readme', revision='e965047'),
+            FileLookup(path='readme', revision='d6613f5'),
+        ])
+
+        self.assertEqual(results, [b'Hello\n', b'Hello there\n'])
+        self.assertSpyCallCount(scmtool_cls.get_files, 1)
+        self.assertEqual(
+            scmtool_cls.get_files.last_call.args[0],
+            [FileLookup(path='readme', revision='d6613f5')])
+
+        # The fetched file should now be available to get_file() and
+        # get_files().
+        self.spy_on(scmtool_cls.get_file,
+                    owner=scmtool_cls)
+
+        self.assertEqual(repository.get_file(path='readme',
+                                             revision='d6613f5'),
+                         b'Hello there\n')
+        self.assertEqual(
+            repository.get_files([
+                FileLookup(path='readme', revision='d6613f5'),
+            ]),
+            [b'Hello there\n'])
+
+        self.assertSpyNotCalled(scmtool_cls.get_file)
+        self.assertSpyCallCount(scmtool_cls.get_files, 1)
+
+    def test_get_files_with_errors(self):
+        """Testing Repository.get_files with files that can't be fetched"""
+        repository = self.repository
+
+        results = repository.get_files([
+            FileLookup(path='readme', revision='e965047'),
+            FileLookup(path='missing', revision='0' * 40),
+        ])
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], b'Hello\n')
+        self.assertIsInstance(results[1], FileNotFoundError)
+
+        # The error should not have been cached.
+        self.assertNotIn(
+            make_cache_key(repository._make_file_cache_key(
+                path='missing',
+                revision='0' * 40,
+                base_commit_id=None)),
+            cache)
+
+    def test_get_files_with_batch_error(self):
+        """Testing Repository.get_files with the whole batch failing"""
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+        error = Exception('Oh no')
+
+        self.spy_on(scmtool_cls.get_files,
+                    owner=scmtool_cls,
+                    op=kgb.SpyOpRaise(error))
+
+        with self.assertLogs('reviewboard.scmtools.models'):
+            results = repository.get_files([
+                FileLookup(path='readme', revision='e965047'),
+                FileLookup(path='readme', revision='d6613f5'),
+            ])
+
+        self.assertEqual(results, [error, error])
+
+    def test_get_files_signals(self):
+        """Testing Repository.get_files emits signals"""
+        def on_fetching_file(**kwargs):
+            pass
+
+        def on_fetched_file(**kwargs):
+            pass
+
+        repository = self.repository
+
+        fetching_file.connect(on_fetching_file, sender=repository)
+        fetched_file.connect(on_fetched_file, sender=repository)
+
+        self.spy_on(on_fetching_file)
+        self.spy_on(on_fetched_file)
+
+        request = self.create_http_request()
+        context = FileLookupContext(request=request,
+                                    base_commit_id='def456')
+
+        repository.get_files([
+            FileLookup(path='readme',
+                       revision='e965047',
+                       context=context),
+            FileLookup(path='missing',
+                       revision='0' * 40,
+                       context=context),
+        ])
+
+        self.assertSpyCallCount(on_fetching_file, 2)
+        self.assertSpyCalledWith(
+            on_fetching_file,
+            sender=repository,
+            path='readme',
+            revision='e965047',
+            base_commit_id='def456',
+            request=request,
+            context=context)
+        self.assertSpyCalledWith(
+            on_fetching_file,
+            sender=repository,
+            path='missing',
+            revision='0' * 40,
+            base_commit_id='def456',
+            request=request,
+            context=context)
+
+        # Only the file that was fetched should emit fetched_file.
+        self.assertSpyCallCount(on_fetched_file, 1)
+        self.assertSpyCalledWith(
+            on_fetched_file,
+            sender=repository,
+            path='readme',
+            revision='e965047',
+            base_commit_id='def456',
+            request=request,
+            context=context,
+            data=b'Hello\n')
+
     def test_get_file_exists_caching_when_exists(self):
         """Testing Repository.get_file_exists caches result when exists"""
         path = 'readme'
@@ -313,7 +485,7 @@ class RepositoryTests(kgb.SpyAgency, TestCase):
         self.assertSpyCallCount(scmtool_cls.file_exists, 2)
 
     def test_get_file_exists_caching_when_not_exists(self):
-        """Testing Repository.get_file_exists doesn't cache result when the
+        """Testing Repository.get_file_exists caches result briefly when the
         file does not exist
         """
         path = 'readme'
@@ -345,7 +517,7 @@ class RepositoryTests(kgb.SpyAgency, TestCase):
             revision=revision,
             context=context))
 
-        self.assertSpyCallCount(scmtool_cls.file_exists, 4)
+        self.assertSpyCallCount(scmtool_cls.file_exists, 2)
         self.assertSpyCalledWith(
             scmtool_cls.file_exists.calls[0],
             path,
@@ -355,19 +527,116 @@ class RepositoryTests(kgb.SpyAgency, TestCase):
             scmtool_cls.file_exists.calls[1],
             path,
             revision=revision,
-            base_commit_id=None)
-        self.assertSpyCalledWith(
-            scmtool_cls.file_exists.calls[2],
-            path,
-            revision=revision,
             base_commit_id=base_commit_id)
-        self.assertSpyCalledWith(
-            scmtool_cls.file_exists.calls[3],
+
+        # Once the negative result expires, the file should be checked again.
+        cache.delete(make_cache_key(repository._make_file_exists_cache_key(
+            path=path,
+            revision=revision,
+            base_commit_id=base_commit_id)))
+
+        self.assertFalse(repository.get_file_exists(
+            path=path,
+            revision=revision,
+            context=context))
+
+        self.assertSpyCallCount(scmtool_cls.file_exists, 3)
+        self.assertSpyLastCalledWith(
+            scmtool_cls.file_exists,
             path,
             revision=revision,
             base_commit_id=base_commit_id,
             context=context)
 
+    def test_get_file_exists_with_file_index(self):
+        """Testing Repository.get_file_exists with an SCMTool supporting
+        file indexes
+        """
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+        revision = 'a' * 40
+
+        self._enable_file_index(scmtool_cls)
+        self.spy_on(scmtool_cls.file_exists,
+                    owner=scmtool_cls,
+                    op=kgb.SpyOpReturn(True))
+        self.spy_on(scmtool_cls.list_files,
+                    owner=scmtool_cls,
+                    op=kgb.SpyOpReturn(['a.txt', 'b.txt', 'dir/c.txt']))
+
+        # The first checks go to the repository individually.
+        for i in range(Repository.FILE_INDEX_MIN_LOOKUPS - 1):
+            self.assertTrue(repository.get_file_exists(
+                path='file%s.txt' % i,
+                revision=revision))
+
+        self.assertSpyNotCalled(scmtool_cls.list_files)
+
+        # Further checks use the index.
+        self.assertTrue(repository.get_file_exists(path='a.txt',
+                                                   revision=revision))
+        self.assertTrue(repository.get_file_exists(path='dir/c.txt',
+                                                   revision=revision))
+        self.assertFalse(repository.get_file_exists(path='d.txt',
+                                                    revision=revision))
+
+        self.assertSpyCallCount(scmtool_cls.list_files, 1)
+        self.assertSpyLastCalledWith(scmtool_cls.list_files, revision)
+        self.assertSpyCallCount(scmtool_cls.file_exists,
+                                Repository.FILE_INDEX_MIN_LOOKUPS - 1)
+
+        # Another instance should use the cached index right away.
+        repository = Repository.objects.get(pk=repository.pk)
+
+        self.assertTrue(repository.get_file_exists(path='b.txt',
+                                                   revision=revision))
+        self.assertSpyCallCount(scmtool_cls.list_files, 1)
+        self.assertSpyCallCount(scmtool_cls.file_exists,
+                                Repository.FILE_INDEX_MIN_LOOKUPS - 1)
+
+    def test_get_file_exists_with_file_index_error(self):
+        """Testing Repository.get_file_exists with an error listing files
+        for a file index
+        """
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+        revision = 'a' * 40
+
+        self._enable_file_index(scmtool_cls)
+        self.spy_on(scmtool_cls.file_exists,
+                    owner=scmtool_cls,
+                    op=kgb.SpyOpReturn(True))
+        self.spy_on(scmtool_cls.list_files,
+                    owner=scmtool_cls,
+                    op=kgb.SpyOpRaise(NotImplementedError()))
+
+        num_lookups = Repository.FILE_INDEX_MIN_LOOKUPS + 2
+
+        with self.assertLogs('reviewboard.scmtools.models'):
+            for i in range(num_lookups):
+                self.assertTrue(repository.get_file_exists(
+                    path='file%s.txt' % i,
+                    revision=revision))
+
+        self.assertSpyCallCount(scmtool_cls.list_files, 1)
+        self.assertSpyCallCount(scmtool_cls.file_exists, num_lookups)
+
+    def _enable_file_index(self, scmtool_cls):
+        """Enable file indexes for an SCMTool.
+
+        Args:
+            scmtool_cls (type):
+                The SCMTool class.
+        """
+        old_supports_file_index = scmtool_cls.supports_file_index
+        scmtool_cls.supports_file_index = True
+        self.addCleanup(setattr, scmtool_cls, 'supports_file_index',
+                        old_supports_file_index)
+
+        self.spy_on(scmtool_cls.get_file_index_revision,
+                    owner=scmtool_cls,
+                    call_fake=lambda _self, revision, **kwargs: revision)
+
     def test_get_file_exists_caching_with_fetched_file(self):
         """Testing Repository.get_file_exists uses get_file's cached result"""
         path = 'readme'
@@ -462,6 +731,187 @@ class RepositoryTests(kgb.SpyAgency, TestCase):
             request=request,
             context=context)
 
+    def test_get_branches_with_invalidate_commit_caches(self):
+        """Testing Repository.get_branches after
+        Repository.invalidate_commit_caches
+        """
+        repository = self.create_repository(tool_name='Test')
+
+        self.spy_on(TestTool.get_branches,
+                    owner=TestTool)
+
+        branches = repository.get_branches()
+        self.assertEqual(repository.get_branches(), branches)
+        self.assertSpyCallCount(TestTool.get_branches, 1)
+
+        repository.invalidate_commit_caches()
+
+        self.assertEqual(repository.get_branches(), branches)
+        self.assertSpyCallCount(TestTool.get_branches, 2)
+
+    def test_get_commits_caching(self):
+        """Testing Repository.get_commits caches the latest commits"""
+        repository = self.create_repository(tool_name='Test')
+        self._spy_on_get_commits(head=10)
+
+        commits = repository.get_commits(branch='main')
+        self.assertEqual([commit.id for commit in commits],
+                         ['10', '9', '8'])
+        self.assertEqual(repository.get_commits(branch='main'), commits)
+        self.assertSpyCallCount(TestTool.get_commits, 1)
+
+        # Other branches are indexed separately.
+        repository.get_commits(branch='other')
+        self.assertSpyCallCount(TestTool.get_commits, 2)
+
+    def test_get_commits_with_index(self):
+        """Testing Repository.get_commits merges new commits into the index
+        and serves older commits from it
+        """
+        repository = self.create_repository(tool_name='Test')
+        self._spy_on_get_commits(head=10)
+
+        repository.get_commits(branch='main')
+
+        # Fetching the next page should add it to the index.
+        commits = repository.get_commits(branch='main', start='7')
+        self.assertEqual([commit.id for commit in commits],
+                         ['7', '6', '5'])
+        self.assertSpyCallCount(TestTool.get_commits, 2)
+
+        # Simulate a push, and make sure only the latest commits are
+        # fetched.
+        self._spy_on_get_commits(head=12)
+        repository.invalidate_commit_caches()
+
+        commits = repository.get_commits(branch='main')
+        self.assertEqual([commit.id for commit in commits],
+                         ['12', '11', '10'])
+        self.assertSpyCallCount(TestTool.get_commits, 1)
+        self.assertSpyCalledWith(TestTool.get_commits,
+                                 branch='main',
+                                 start=None)
+
+        index = repository._get_cached_commit_index('main')
+        self.assertEqual(
+            [indexed_commit[0] for indexed_commit in index['commits']],
+            ['12', '11', '10', '9', '8', '7', '6', '5'])
+
+        # Older pages should come from the index.
+        commits = repository.get_commits(branch='main', start='9')
+        self.assertEqual(
+            commits,
+            [
+                Commit('user', '9', '2013-01-01T09:00:00', 'Commit 9', '8'),
+                Commit('user', '8', '2013-01-01T08:00:00', 'Commit 8', '7'),
+                Commit('user', '7', '2013-01-01T07:00:00', 'Commit 7', '6'),
+            ])
+        self.assertSpyCallCount(TestTool.get_commits, 1)
+
+        # A partial page in the index must be fetched.
+        commits = repository.get_commits(branch='main', start='6')
+        self.assertEqual([commit.id for commit in commits],
+                         ['6', '5', '4'])
+        self.assertSpyCallCount(TestTool.get_commits, 2)
+
+    def test_get_commits_with_index_and_rewritten_history(self):
+        """Testing Repository.get_commits replaces the index when the
+        previous latest commit is no longer present
+        """
+        repository = self.create_repository(tool_name='Test')
+        self._spy_on_get_commits(head=10)
+
+        repository.get_commits()
+
+        self._spy_on_get_commits(head=20)
+        repository.invalidate_commit_caches()
+        repository.get_commits()
+
+        index = repository._get_cached_commit_index(None)
+        self.assertEqual(
+            [indexed_commit[0] for indexed_commit in index['commits']],
+            ['20', '19', '18'])
+
+    def test_get_commits_with_index_and_merge(self):
+        """Testing Repository.get_commits replaces the index when a merge
+        lists other commits after the previous latest commit
+        """
+        repository = self.create_repository(tool_name='Test')
+        self._spy_on_get_commits(head=10)
+
+        repository.get_commits()
+
+        # Merge a branch based on commit 8. Its commit is older than 10,
+        # so it's listed after it.
+        listing = [
+            Commit('user', 'merge', '2013-01-01T11:00:00', 'Merge', '10'),
+            Commit('user', '10', '2013-01-01T10:00:00', 'Commit 10', '9'),
+            Commit('user', 'branch', '2013-01-01T09:30:00', 'Branch', '8'),
+            Commit('user', '9', '2013-01-01T09:00:00', 'Commit 9', '8'),
+            Commit('user', '8', '2013-01-01T08:00:00', 'Commit 8', '7'),
+            Commit('user', '7', '2013-01-01T07:00:00', 'Commit 7', '6'),
+        ]
+
+        def _get_commits(_self, branch=None, start=None):
+            i = 0
+
+            if start:
+                i = [commit.id for commit in listing].index(start)
+
+            return listing[i:i + 3]
+
+        TestTool.get_commits.unspy()
+        self.spy_on(TestTool.get_commits,
+                    owner=TestTool,
+                    call_fake=_get_commits)
+
+        repository.invalidate_commit_caches()
+        commits = repository.get_commits()
+        self.assertEqual([commit.id for commit in commits],
+                         ['merge', '10', 'branch'])
+
+        index = repository._get_cached_commit_index(None)
+        self.assertEqual(
+            [indexed_commit[0] for indexed_commit in index['commits']],
+            ['merge', '10', 'branch'])
+
+        # The next page must come from the repository, rather than the
+        # old index.
+        commits = repository.get_commits(start='9')
+        self.assertEqual([commit.id for commit in commits],
+                         ['9', '8', '7'])
+        self.assertSpyCallCount(TestTool.get_commits, 2)
+
+    def test_get_commits_with_push_notifications(self):
+        """Testing Repository.get_commits caches the latest commits for
+        longer after a push notification
+        """
+        repository = self.create_repository(tool_name='Test')
+        self._spy_on_get_commits(head=10)
+
+        repository.get_commits()
+
+        # Without push notifications, the latest commits are only cached
+        # briefly.
+        self._age_commit_index(repository,
+                               repository.COMMITS_CACHE_PERIOD_SHORT)
+        repository.get_commits()
+        self.assertSpyCallCount(TestTool.get_commits, 2)
+
+        repository.invalidate_commit_caches()
+        repository.get_commits()
+        self.assertSpyCallCount(TestTool.get_commits, 3)
+
+        self._age_commit_index(repository,
+                               repository.COMMITS_CACHE_PERIOD_SHORT)
+        repository.get_commits()
+        self.assertSpyCallCount(TestTool.get_commits, 3)
+
+        self._age_commit_index(repository,
+                               repository.COMMITS_PUSH_NOTIFIED_CACHE_PERIOD)
+        repository.get_commits()
+        self.assertSpyCallCount(TestTool.get_commits, 4)
+
     def test_hosting_service(self):
         """Testing Repository.hosting_service with a valid hosting service"""
         account = HostingServiceAccount.objects.create(
@@ -810,3 +1260,55 @@ class RepositoryTests(kgb.SpyAgency, TestCase):
             'ERROR:reviewboard.scmtools.models:Error finding registered '
             'SCMTool "xxxtool" in repository ID 2.',
         ])
+
+    def _spy_on_get_commits(self, head):
+        """Spy on TestTool.get_commits, simulating a repository's history.
+
+        If already spied on, the history will be updated and the recorded
+        calls will be reset.
+
+        Args:
+            head (int):
+                The ID of the latest commit in the repository.
+        """
+        def _get_commits(_self, branch=None, start=None):
+            start = int(start or self._commits_head)
+
+            return [
+                Commit('user', str(i), '2013-01-01T%02d:00:00' % i,
+                       'Commit %d' % i, str(i - 1))
+                for i in range(start, max(start - 3, 0), -1)
+            ]
+
+        if hasattr(self, '_commits_head'):
+            TestTool.get_commits.reset_calls()
+        else:
+            self.spy_on(TestTool.get_commits,
+                        owner=TestTool,
+                        call_fake=_get_commits)
+
+        self._commits_head = head
+
+    def _age_commit_index(self, repository, seconds):
+        """Make the latest commits in an index appear older.
+
+        Any push notification will also appear older.
+
+        Args:
+            repository (reviewboard.scmtools.models.Repository):
+                The repository owning the index.
+
+            seconds (int):
+                The number of seconds to age the index by.
+        """
+        index = repository._get_cached_commit_index(None)
+        index['updated'] -= seconds
+        repository._set_cached_commit_index(None, index)
+
+        invalidated_time = repository._get_commits_invalidated_time()
+
+        if invalidated_time is not None:
+            cache.set(
+                make_cache_key(
+                    repository._make_commits_invalidated_cache_key()),
+                invalidated_time - seconds)
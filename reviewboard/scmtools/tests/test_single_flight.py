@@ -0,0 +1,275 @@
+"""Unit tests for reviewboard.scmtools.single_flight.
+
+Version Added:
+    7.0
+"""
+
+from __future__ import annotations
+
+import os
+
+import kgb
+from django.core.cache import cache
+from djblets.cache.backend import make_cache_key
+
+from reviewboard.scmtools.core import FileLookup
+from reviewboard.scmtools.models import Repository
+from reviewboard.scmtools.single_flight import (SingleFlight,
+                                                run_single_flight,
+                                                single_flight_stats)
+from reviewboard.testing import TestCase
+
+
+class SingleFlightTests(TestCase):
+    """Unit tests for SingleFlight and run_single_flight."""
+
+    def setUp(self):
+        super().setUp()
+
+        cache.clear()
+        single_flight_stats.clear()
+
+    def test_acquire_and_release(self):
+        """Testing SingleFlight.acquire and release"""
+        flight1 = SingleFlight('test-key')
+        flight2 = SingleFlight('test-key')
+
+        self.assertTrue(flight1.acquire())
+        self.assertFalse(flight2.acquire())
+
+        # Releasing a lock that isn't held should have no effect.
+        flight2.release()
+        self.assertFalse(SingleFlight('test-key').acquire())
+
+        flight1.release()
+        self.assertTrue(flight2.acquire())
+        flight2.release()
+
+        self.assertEqual(single_flight_stats['fetches'], 2)
+
+    def test_wait_with_result(self):
+        """Testing SingleFlight.wait with a result from another worker"""
+        flight = SingleFlight('test-key', poll_interval=0)
+        results = [(False, None), (True, 'result')]
+
+        self.assertTrue(SingleFlight('test-key').acquire())
+        self.assertEqual(flight.wait(lambda: results.pop(0)),
+                         (True, 'result'))
+        self.assertEqual(single_flight_stats['coalesced'], 1)
+
+    def test_wait_with_released_lock(self):
+        """Testing SingleFlight.wait with the lock released without a
+        result
+        """
+        flight = SingleFlight('test-key', poll_interval=0)
+
+        self.assertEqual(flight.wait(lambda: (False, None)),
+                         (False, None))
+        self.assertEqual(single_flight_stats['fallbacks'], 1)
+
+    def test_wait_with_timeout(self):
+        """Testing SingleFlight.wait with timeout"""
+        flight = SingleFlight('test-key',
+                              poll_interval=0,
+                              wait_timeout=0)
+
+        self.assertTrue(SingleFlight('test-key').acquire())
+
+        with self.assertLogs('reviewboard.scmtools.single_flight'):
+            self.assertEqual(flight.wait(lambda: (False, None)),
+                             (False, None))
+
+        self.assertEqual(single_flight_stats['timeouts'], 1)
+
+    def test_run_single_flight(self):
+        """Testing run_single_flight without concurrent lookups"""
+        self.assertEqual(
+            run_single_flight('test-key',
+                              lambda: 'result',
+                              load_result=lambda: (False, None)),
+            'result')
+        self.assertEqual(single_flight_stats['fetches'], 1)
+
+        # The lock should have been released.
+        self.assertTrue(SingleFlight('test-key').acquire())
+
+    def test_run_single_flight_with_error(self):
+        """Testing run_single_flight releases the lock on error"""
+        def _func():
+            raise ValueError('oh no')
+
+        with self.assertRaises(ValueError):
+            run_single_flight('test-key', _func,
+                              load_result=lambda: (False, None))
+
+        self.assertTrue(SingleFlight('test-key').acquire())
+
+    def test_run_single_flight_with_concurrent_lookup(self):
+        """Testing run_single_flight with a concurrent lookup"""
+        def _func():
+            raise AssertionError('This should not be called.')
+
+        self.assertTrue(SingleFlight('test-key').acquire())
+        self.assertEqual(
+            run_single_flight('test-key', _func,
+                              load_result=lambda: (True, 'result'),
+                              poll_interval=0),
+            'result')
+        self.assertEqual(single_flight_stats['coalesced'], 1)
+
+
+class RepositorySingleFlightTests(kgb.SpyAgency, TestCase):
+    """Unit tests for coalescing lookups in Repository."""
+
+    fixtures = ['test_scmtools']
+
+    def setUp(self):
+        super().setUp()
+
+        cache.clear()
+        single_flight_stats.clear()
+
+        self.repository = self.create_repository(
+            path=os.path.join(os.path.dirname(__file__), '..', 'testdata',
+                              'git_repo'),
+            tool_name='Git')
+
+    def test_get_file_with_concurrent_fetch(self):
+        """Testing Repository.get_file waits for a concurrent fetch"""
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+        cache_key = repository._make_file_cache_key(path='readme',
+                                                    revision='e965047',
+                                                    base_commit_id=None)
+
+        self.spy_on(scmtool_cls.get_file,
+                    owner=scmtool_cls)
+
+        # Simulate another worker fetching the file, storing it once we
+        # begin waiting.
+        self.assertTrue(SingleFlight(cache_key).acquire())
+        self.spy_on(
+            Repository._get_cached_file,
+            owner=Repository,
+            op=kgb.SpyOpMatchInOrder([
+                {
+                    'args': (cache_key,),
+                    'call_original': True,
+                },
+                {
+                    'args': (cache_key,),
+                    'op': kgb.SpyOpReturn((True, b'Hello\n')),
+                },
+            ]))
+
+        self.assertEqual(repository.get_file(path='readme',
+                                             revision='e965047'),
+                         b'Hello\n')
+        self.assertSpyNotCalled(scmtool_cls.get_file)
+        self.assertEqual(single_flight_stats['coalesced'], 1)
+
+    def test_get_file_with_failed_concurrent_fetch(self):
+        """Testing Repository.get_file fetches the file if a concurrent
+        fetch fails
+        """
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+
+        self.spy_on(scmtool_cls.get_file,
+                    owner=scmtool_cls)
+
+        # Simulate another worker failing to fetch the file, releasing the
+        # lock without a result.
+        self.spy_on(SingleFlight.acquire,
+                    owner=SingleFlight,
+                    op=kgb.SpyOpReturn(False))
+
+        self.assertEqual(repository.get_file(path='readme',
+                                             revision='e965047'),
+                         b'Hello\n')
+        self.assertSpyCallCount(scmtool_cls.get_file, 1)
+        self.assertEqual(single_flight_stats['fallbacks'], 1)
+
+    def test_get_file_exists_with_concurrent_check(self):
+        """Testing Repository.get_file_exists waits for a concurrent check"""
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+        key = repository._make_file_exists_cache_key(path='readme',
+                                                     revision='e965047',
+                                                     base_commit_id=None)
+
+        self.spy_on(scmtool_cls.file_exists,
+                    owner=scmtool_cls)
+
+        # Simulate another worker finding that the file doesn't exist once
+        # we begin waiting.
+        self.assertTrue(SingleFlight(key).acquire())
+
+        def _wait(_self, load_result):
+            cache.set(make_cache_key(key), '0')
+
+            return SingleFlight.wait.call_original(_self, load_result)
+
+        self.spy_on(SingleFlight.wait,
+                    owner=SingleFlight,
+                    call_fake=_wait)
+
+        self.assertFalse(repository.get_file_exists(path='readme',
+                                                    revision='e965047'))
+        self.assertSpyNotCalled(scmtool_cls.file_exists)
+        self.assertEqual(single_flight_stats['coalesced'], 1)
+
+    def test_get_file_exists_leaves_result_for_waiters(self):
+        """Testing Repository.get_file_exists leaves a result for waiting
+        workers
+        """
+        repository = self.repository
+        key = repository._make_file_exists_cache_key(path='readme',
+                                                     revision='1234567',
+                                                     base_commit_id=None)
+
+        self.assertFalse(repository.get_file_exists(path='readme',
+                                                    revision='1234567'))
+        self.assertEqual(cache.get(make_cache_key(key)), '0')
+        self.assertEqual(single_flight_stats['fetches'], 1)
+
+        self.assertTrue(repository.get_file_exists(path='readme',
+                                                   revision='e965047'))
+        self.assertEqual(single_flight_stats['fetches'], 2)
+
+    def test_get_files_with_concurrent_fetch(self):
+        """Testing Repository.get_files waits for concurrent fetches"""
+        repository = self.repository
+        scmtool_cls = repository.scmtool_class
+        cache_key = repository._make_file_cache_key(path='readme',
+                                                    revision='e965047',
+                                                    base_commit_id=None)
+
+        self.spy_on(scmtool_cls.get_files,
+                    owner=scmtool_cls)
+
+        # Simulate another worker fetching the first file.
+        self.assertTrue(SingleFlight(cache_key).acquire())
+
+        def _get_cached_file(_self, key):
+            if (key == cache_key and
+                len(Repository._get_cached_file.calls) > 2):
+                return True, b'Hello\n'
+
+            return Repository._get_cached_file.call_original(_self, key)
+
+        self.spy_on(Repository._get_cached_file,
+                    owner=Repository,
+                    call_fake=_get_cached_file)
+
+        self.assertEqual(
+            repository.get_files([
+                FileLookup(path='readme', revision='e965047'),
+                FileLookup(path='readme', revision='d6613f5'),
+            ]),
+            [b'Hello\n', b'Hello there\n'])
+        self.assertSpyCallCount(scmtool_cls.get_files, 1)
+        self.assertEqual(
+            scmtool_cls.get_files.last_call.args[0],
+            [FileLookup(path='readme', revision='d6613f5')])
+        self.assertEqual(single_flight_stats['coalesced'], 1)
@@ -422,6 +422,80 @@ INK_DEFAULT_THEME = 'light'
 HEALTHCHECK_IPS = []
 
 
+#: The maximum size of the on-disk cache for repository files, in bytes.
+#:
+#: When set, files fetched from repositories are also stored on local disk
+#: in :setting:`REPOSITORY_FILE_CACHE_DIR`, and are looked up there when no
+#: longer in the main cache, before fetching them from the repository again.
+#: The least recently used files are removed once the cache exceeds this
+#: size.
+#:
+#: This is disabled by default.
+#:
+#: Version Added:
+#:     7.0
+#:
+#: Type:
+#:     int
+#:
+#: Example:
+#:     REPOSITORY_FILE_CACHE_MAX_SIZE = 10 * 1024 * 1024 * 1024
+REPOSITORY_FILE_CACHE_MAX_SIZE = 0
+
+#: The directory used for the on-disk cache for repository files.
+#:
+#: This defaults to a :file:`repository-file-cache` directory within the
+#: site's data directory.
+#:
+#: Version Added:
+#:     7.0
+#:
+#: Type:
+#:     str
+REPOSITORY_FILE_CACHE_DIR = None
+
+#: The maximum number of reviews and changes initially shown on a review
+#: request page.
+#:
+#: When set, only the most recently active reviews and changes will be loaded
+#: when viewing a review request, and older ones will be loaded on demand.
+#: This bounds the time and memory needed to show review requests with a long
+#: history. The issue summary table will still list all issues.
+#:
+#: This is disabled by default.
+#:
+#: Version Added:
+#:     7.0
+#:
+#: Type:
+#:     int
+#:
+#: Example:
+#:     REVIEW_REQUEST_PAGE_MAX_ENTRIES = 50
+REVIEW_REQUEST_PAGE_MAX_ENTRIES = 0
+
+#: Whether to serve dashboard views from a precomputed inbox.
+#:
+#: When enabled, an inbox table listing the open review requests each user
+#: is involved in (as the owner, as a reviewer, through a review group, or
+#: by starring them) is kept up-to-date as review requests change. The
+#: incoming and overview dashboard views, the sidebar counts, and the
+#: ``to-users`` filters in the API will then use it, instead of querying
+#: the reviewers of every review request.
+#:
+#: After enabling this, run :command:`rb-site manage <path> rebuild-inbox`
+#: to populate the inbox.
+#:
+#: This is disabled by default.
+#:
+#: Version Added:
+#:     7.0
+#:
+#: Type:
+#:     bool
+DASHBOARD_INBOX_ENABLED = False
+
+
 # Load local settings.  This can override anything in here, but at the very
 # least it needs to define database connectivity.
 try:
@@ -503,6 +577,10 @@ else:
 if not LOGGING_DIRECTORY:
     LOGGING_DIRECTORY = os.path.join(LOCAL_ROOT, 'logs')
 
+if not REPOSITORY_FILE_CACHE_DIR:
+    REPOSITORY_FILE_CACHE_DIR = os.path.join(SITE_DATA_DIR,
+                                             'repository-file-cache')
+
 HTDOCS_ROOT = os.path.join(LOCAL_ROOT, 'htdocs')
 STATIC_ROOT = os.path.join(HTDOCS_ROOT, 'static')
 MEDIA_ROOT = os.path.join(HTDOCS_ROOT, 'media')
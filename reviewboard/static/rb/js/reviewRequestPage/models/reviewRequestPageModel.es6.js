@@ -83,6 +83,37 @@ RB.ReviewRequestPage.ReviewRequestPage = RB.ReviewablePage.extend({
         this.entries.add(entry);
     },
 
+    /**
+     * Load entries older than those currently shown on the page.
+     *
+     * On review requests with a long history, only the most recently active
+     * entries are initially shown. This loads the next set of older entries.
+     *
+     * For each entry loaded, an ``olderEntryLoaded`` event will be triggered
+     * with the entry's metadata and HTML. Once loaded, an
+     * ``appliedUpdate:older-entries`` event will be triggered with
+     * information on whether there are still older entries to load.
+     *
+     * Version Added:
+     *     7.0
+     *
+     * Args:
+     *     before (string):
+     *         The position that entries must have been last active before.
+     *         This is the value provided by the server, containing a
+     *         timestamp (in ISO 8601 format) and optionally the last entry
+     *         loaded at that time.
+     *
+     *     onDone (function, optional):
+     *         Optional function to call after everything is loaded.
+     */
+    loadOlderEntries(before, onDone) {
+        this._loadUpdates({
+            before: before,
+            onDone: onDone,
+        });
+    },
+
     /**
      * Watch for updates to an entry.
      *
@@ -230,6 +261,10 @@ RB.ReviewRequestPage.ReviewRequestPage = RB.ReviewablePage.extend({
      *         server.
      *
      * Option Args:
+     *     before (string, optional):
+     *         A position provided by the server, used to load older entries
+     *         not yet shown on the page, instead of checking for updates.
+     *
      *     entries (Array):
      *         A list of entry models that need to be checked for updates.
      *
@@ -275,7 +310,9 @@ RB.ReviewRequestPage.ReviewRequestPage = RB.ReviewablePage.extend({
 
         const timestamp = this._watchedUpdatesLastTimestamp;
 
-        if (timestamp !== null) {
+        if (options.before) {
+            urlQuery.push(`before=${encodeURIComponent(options.before)}`);
+        } else if (timestamp !== null) {
             urlQuery.push(`since=${timestamp.toISOString()}`);
         }
 
@@ -297,7 +334,7 @@ RB.ReviewRequestPage.ReviewRequestPage = RB.ReviewablePage.extend({
                 dataType: 'arraybuffer',
                 noActivityIndicator: true,
                 success: arrayBuffer => this._processUpdatesFromPayload(
-                    arrayBuffer, options.onDone),
+                    arrayBuffer, options.onDone, !options.before),
             });
     },
 
@@ -314,10 +351,17 @@ RB.ReviewRequestPage.ReviewRequestPage = RB.ReviewablePage.extend({
      *     onDone (function, optional):
      *         The function to call when all updates have been parsed and
      *         applied.
+     *
+     *     trackTimestamps (boolean, optional):
+     *         Whether to track the latest updated timestamp, for future
+     *         checks for updates. This is disabled when loading older
+     *         entries.
      */
-    _processUpdatesFromPayload(arrayBuffer, onDone) {
+    _processUpdatesFromPayload(arrayBuffer, onDone, trackTimestamps=true) {
         if (arrayBuffer.byteLength === 0) {
-            onDone(0);
+            if (_.isFunction(onDone)) {
+                onDone(0);
+            }
 
             return;
         }
@@ -340,7 +384,8 @@ RB.ReviewRequestPage.ReviewRequestPage = RB.ReviewablePage.extend({
                 this._reloadFromUpdate(null, metadata, html);
             }
 
-            if (metadata.hasOwnProperty('updatedTimestamp')) {
+            if (trackTimestamps &&
+                metadata.hasOwnProperty('updatedTimestamp')) {
                 const newTimestamp =
                     moment.utc(metadata.updatedTimestamp).toDate();
                 const lastTimestamp = this._watchedUpdatesLastTimestamp;
@@ -460,6 +505,11 @@ RB.ReviewRequestPage.ReviewRequestPage = RB.ReviewablePage.extend({
         const entry = this.entries.get(metadata.entryID);
 
         if (!entry) {
+            if (metadata.modelClass) {
+                /* This is an older entry that isn't on the page yet. */
+                this.trigger('olderEntryLoaded', metadata, html);
+            }
+
             return;
         }
 
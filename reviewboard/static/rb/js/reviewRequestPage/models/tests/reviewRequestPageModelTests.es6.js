@@ -623,6 +623,57 @@ suite('rb/reviewRequestPage/models/ReviewRequestPage', function() {
                 });
             });
 
+            it('Older entries', function(done) {
+                spyOn($, 'ajax').and.callFake(function(options) {
+                    expect(options.dataType).toBe('arraybuffer');
+                    expect(options.url).toBe(
+                        '/r/123/_updates/?before=' +
+                        encodeURIComponent('2017-07-01T00:00:00+00:00'));
+
+                    const metadata = new Blob([
+                        '{"type": "entry", ',
+                        '"entryType": "my-entry", ',
+                        '"entryID": "3", ',
+                        '"addedTimestamp": "2017-06-01T00:00:00", ',
+                        '"updatedTimestamp": "2017-06-01T00:00:00", ',
+                        '"modelClass": "RB.ReviewRequestPage.Entry", ',
+                        '"viewClass": "RB.ReviewRequestPage.EntryView", ',
+                        '"modelData": {}}',
+                    ]);
+                    const html = new Blob(['<div id="my-entry3"></div>']);
+
+                    let blob = RB.DataUtils.buildBlob([
+                        [{
+                            type: 'uint32',
+                            values: [metadata.size],
+                        }],
+                        metadata,
+                        [{
+                            type: 'uint32',
+                            values: [html.size],
+                        }],
+                        html,
+                    ]);
+
+                    RB.DataUtils.readBlobAsArrayBuffer(blob, options.success);
+                });
+
+                page.loadOlderEntries('2017-07-01T00:00:00+00:00', () => {
+                    expect(page.trigger).toHaveBeenCalledWith(
+                        'olderEntryLoaded',
+                        jasmine.objectContaining({
+                            entryID: '3',
+                            modelClass: 'RB.ReviewRequestPage.Entry',
+                        }),
+                        '<div id="my-entry3"></div>');
+
+                    /* Older entries shouldn't affect checks for updates. */
+                    expect(page._watchedUpdatesLastTimestamp).toBe(null);
+
+                    done();
+                });
+            });
+
             it('Updates containing Unicode in HTML', function(done) {
                 spyOn(entry1, 'beforeApplyUpdate');
                 spyOn(entry1, 'afterApplyUpdate');
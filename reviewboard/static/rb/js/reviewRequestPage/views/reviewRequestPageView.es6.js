@@ -18,6 +18,7 @@ RB.ReviewRequestPage.ReviewRequestPageView = RB.ReviewablePageView.extend({
     events: _.extend({
         'click #collapse-all': '_onCollapseAllClicked',
         'click #expand-all': '_onExpandAllClicked',
+        'click #show-older-entries': '_onShowOlderEntriesClicked',
     }, RB.ReviewablePageView.prototype.events),
 
     /**
@@ -51,6 +52,14 @@ RB.ReviewRequestPage.ReviewRequestPageView = RB.ReviewablePageView.extend({
         this.listenTo(this.model, 'updatesProcessed',
                       () => this.diffFragmentQueue.loadFragments());
 
+        /*
+         * Listen for older entries loaded on demand, adding them to the page
+         * and updating the control for loading more.
+         */
+        this.listenTo(this.model, 'olderEntryLoaded', this._addOlderEntry);
+        this.listenTo(this.model, 'appliedUpdate:older-entries',
+                      this._onOlderEntriesLoaded);
+
         /*
          * Listen for updates to any entries on the page. When updated,
          * we'll store the collapse state on the entry so we can re-apply it
@@ -351,6 +360,107 @@ RB.ReviewRequestPage.ReviewRequestPageView = RB.ReviewablePageView.extend({
         this._entryViews.forEach(entryView => entryView.expand());
     },
 
+    /**
+     * Add an older entry loaded from the server to the page.
+     *
+     * The entry will be placed among the other entries on the page based on
+     * the time it was added.
+     *
+     * Version Added:
+     *     7.0
+     *
+     * Args:
+     *     metadata (object):
+     *         The metadata for the entry.
+     *
+     *     html (string):
+     *         The HTML for the entry.
+     */
+    _addOlderEntry(metadata, html) {
+        const ModelClass = Djblets.getObjectByName(metadata.modelClass);
+        const ViewClass = Djblets.getObjectByName(metadata.viewClass);
+        const $el = $(html);
+        const entry = new ModelClass(_.extend({
+            id: metadata.entryID,
+            collapsed: metadata.collapsed,
+            addedTimestamp: metadata.addedTimestamp,
+            updatedTimestamp: metadata.updatedTimestamp,
+            etag: metadata.etag,
+            typeID: metadata.entryType,
+            reviewRequestEditor: this.model.reviewRequestEditor,
+        }, metadata.modelData), {
+            parse: true,
+        });
+        const addedTimestamp = entry.get('addedTimestamp');
+        const nextEntryView = _.find(
+            this._entryViews,
+            entryView => entryView.model.get('addedTimestamp') >
+                         addedTimestamp);
+
+        if (nextEntryView) {
+            $el.insertBefore(nextEntryView.$el);
+        } else {
+            $el.appendTo(this.$('#reviews'));
+        }
+
+        this.addEntryView(new ViewClass(_.extend({
+            el: $el,
+            reviewRequestEditorView: this.reviewRequestEditorView,
+            model: entry,
+        }, metadata.viewOptions)));
+    },
+
+    /**
+     * Handler for when a set of older entries has been loaded.
+     *
+     * This will update the control for loading older entries, removing it
+     * if there are none left to load.
+     *
+     * Version Added:
+     *     7.0
+     *
+     * Args:
+     *     metadata (object):
+     *         The metadata for the update.
+     */
+    _onOlderEntriesLoaded(metadata) {
+        const $olderEntries = this.$('#older-entries');
+
+        if (metadata.hasOlderEntries) {
+            $olderEntries
+                .data('before', metadata.olderEntriesBefore)
+                .removeClass('-is-loading');
+        } else {
+            $olderEntries.remove();
+        }
+    },
+
+    /**
+     * Handle a press on the Show Older Entries link.
+     *
+     * This will load the next set of older entries from the server.
+     *
+     * Version Added:
+     *     7.0
+     *
+     * Args:
+     *     e (Event):
+     *         The event which triggered the action.
+     */
+    _onShowOlderEntriesClicked(e) {
+        e.preventDefault();
+        e.stopPropagation();
+
+        const $olderEntries = this.$('#older-entries');
+
+        if ($olderEntries.hasClass('-is-loading')) {
+            return;
+        }
+
+        $olderEntries.addClass('-is-loading');
+        this.model.loadOlderEntries($olderEntries.data('before'));
+    },
+
     /**
      * Handler for when an issue in the issue summary table is clicked.
      *
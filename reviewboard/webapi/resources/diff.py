@@ -20,6 +20,7 @@ from djblets.webapi.fields import (DateTimeFieldType,
                                    ResourceFieldType,
                                    StringFieldType)
 
+from reviewboard.diffviewer.chunk_warmup import chunk_warmup_queue
 from reviewboard.diffviewer.errors import DiffTooBigError, EmptyDiffError
 from reviewboard.diffviewer.features import dvcs_feature
 from reviewboard.diffviewer.models import DiffSet
@@ -102,6 +103,18 @@ class DiffResource(WebAPIResource):
                            'review requests created with commit history.',
             'added_in': '4.0',
         },
+        'warm_up_status': {
+            'type': DictFieldType,
+            'description': 'The status of preparing the diff in the '
+                           'background after upload, if enabled on the '
+                           'server. This contains ``state`` (one of '
+                           '``queued``, ``running``, ``done``, or '
+                           '``failed``), ``num_files``, '
+                           '``num_files_warmed``, and ``timestamp``. This '
+                           'will be ``null`` if the diff has not been '
+                           'queued for preparation.',
+            'added_in': '7.0',
+        },
     }
     item_child_resources = [
         resources.diffcommit,
@@ -490,6 +503,29 @@ class DiffResource(WebAPIResource):
         return super(DiffResource, self).get_links(
             child_resources, obj=obj, request=request, *args, **kwargs)
 
+    def serialize_warm_up_status_field(self, obj, *args, **kwargs):
+        """Serialize the ``warm_up_status`` field.
+
+        Version Added:
+            7.0
+
+        Args:
+            obj (reviewboard.diffviewer.models.diffset.DiffSet):
+                The DiffSet being serialized.
+
+            *args (tuple):
+                Unused positional arguments.
+
+            **kwargs (dict):
+                Unused keyword arguments.
+
+        Returns:
+            dict:
+            The warm-up status for the diff, or ``None`` if it has not been
+            queued.
+        """
+        return chunk_warmup_queue.get_status(obj.pk)
+
     def serialize_object(self, obj, request=None, *args, **kwargs):
         """Serialize a DiffSet.
 
@@ -419,6 +419,8 @@ class ReviewRequestResource(MarkdownFieldsMixin, WebAPIResource):
 
         if is_list:
             q = Q()
+            status = ReviewRequest.string_to_status(
+                request.GET.get('status', 'pending'))
 
             if 'to-groups' in request.GET:
                 for group_name in request.GET.get('to-groups').split(','):
@@ -427,7 +429,9 @@ class ReviewRequestResource(MarkdownFieldsMixin, WebAPIResource):
 
             if 'to-users' in request.GET:
                 for username in request.GET.get('to-users').split(','):
-                    q = q & self.model.objects.get_to_user_query(username)
+                    q = q & self.model.objects.get_to_user_query(
+                        username,
+                        status=status)
 
             if 'to-users-directly' in request.GET:
                 to_users_directly = \
@@ -435,12 +439,14 @@ class ReviewRequestResource(MarkdownFieldsMixin, WebAPIResource):
 
                 for username in to_users_directly:
                     q = q & self.model.objects.get_to_user_directly_query(
-                        username)
+                        username,
+                        status=status)
 
             if 'to-users-groups' in request.GET:
                 for username in request.GET.get('to-users-groups').split(','):
                     q = q & self.model.objects.get_to_user_groups_query(
-                        username)
+                        username,
+                        status=status)
 
             if 'from-user' in request.GET:
                 q = q & self.model.objects.get_from_user_query(
@@ -496,9 +502,6 @@ class ReviewRequestResource(MarkdownFieldsMixin, WebAPIResource):
             if 'last-updated-to' in kwargs:
                 q = q & Q(last_updated__lt=kwargs['last-updated-to'])
 
-            status = ReviewRequest.string_to_status(
-                request.GET.get('status', 'pending'))
-
             can_submit_as = request.user.has_perm(
                 'reviews.can_submit_as_another_user', local_site)
 
@@ -9,6 +9,7 @@ from djblets.webapi.errors import (INVALID_ATTRIBUTE, INVALID_FORM_DATA,
                                    PERMISSION_DENIED)
 from djblets.webapi.testing.decorators import webapi_test_template
 
+from reviewboard.diffviewer.chunk_warmup import ChunkWarmUpQueue
 from reviewboard.diffviewer.features import dvcs_feature
 from reviewboard.diffviewer.models import DiffSet
 from reviewboard.reviews.models import DefaultReviewer
@@ -608,6 +609,32 @@ class ResourceItemTests(ExtraDataItemMixin, ReviewRequestChildItemMixin,
         self.assertNotIn('commits', item_rsp['links'])
         self.assertNotIn('commit_count', item_rsp)
 
+    @webapi_test_template
+    def test_get_with_warm_up_status(self):
+        """Testing the GET <URL> API includes warm_up_status"""
+        review_request = self.create_review_request(create_repository=True,
+                                                    publish=True)
+        diffset = self.create_diffset(review_request)
+        url = get_diff_item_url(review_request, diffset.revision)
+
+        rsp = self.api_get(url, expected_mimetype=diff_item_mimetype)
+
+        self.assertEqual(rsp['stat'], 'ok')
+        self.assertIsNone(rsp['diff']['warm_up_status'])
+
+        queue = ChunkWarmUpQueue(run_in_background=False)
+        queue.enqueue(diffset)
+        queue.drain()
+
+        rsp = self.api_get(url, expected_mimetype=diff_item_mimetype)
+
+        self.assertEqual(rsp['stat'], 'ok')
+
+        status = rsp['diff']['warm_up_status']
+        self.assertEqual(status['state'], 'done')
+        self.assertEqual(status['num_files'], 0)
+        self.assertEqual(status['num_files_warmed'], 0)
+
     @webapi_test_template
     def test_get_patch(self):
         """Testing the GET <URL> API with Accept: text/x-patch"""